@@ -1,14 +1,11 @@
 from django.shortcuts import render
-from core.repositories.cylinder_repository import CylinderRepository
-from core.utils.view_helper import group_cylinder_types, calculate_risk_level
+from core.utils.view_helper import get_cylinder_type_groups, calculate_risk_level
 
 
 def alerts(request):
     """위험도 알림 리스트 - 용기종류별 집계"""
-    inventory_data = CylinderRepository.get_inventory_summary()
-    
-    # 용기종류별 집계 (헬퍼 함수 사용)
-    cylinder_types_dict = group_cylinder_types(inventory_data)
+    # 용기종류별 집계 (스냅샷 버전 기준 캐시)
+    cylinder_types_dict = get_cylinder_type_groups()
     
     alerts_list = []
     
@@ -189,6 +189,35 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = f'{_script_name}/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# 마감된 기간의 보고서 Excel 저장 위치 (reports/artifacts.py, 외부 공개 경로가 아님)
+REPORT_ARTIFACT_DIR = os.getenv('REPORT_ARTIFACT_DIR', str(BASE_DIR / '.cache' / 'reports'))
+
+# 백그라운드 작업 (core/jobs.py) - 켜면 대용량 Excel/QR PDF/견적서를 run_jobs 워커가 생성한다.
+# 결과 파일은 MEDIA_ROOT/jobs/ 아래에 저장되고 보관 시간이 지나면 워커가 삭제한다.
+BACKGROUND_JOBS_ENABLED = os.getenv('BACKGROUND_JOBS_ENABLED', 'False') == 'True'
+# 실행 중 작업의 heartbeat가 이 시간(초) 넘게 끊기면 워커가 죽은 것으로 보고 다시 대기열에 넣는다.
+BACKGROUND_JOB_TIMEOUT = int(os.getenv('BACKGROUND_JOB_TIMEOUT', '300'))
+BACKGROUND_JOB_RETENTION_HOURS = int(os.getenv('BACKGROUND_JOB_RETENTION_HOURS', '72'))
+
+# =============================================================================
+# Cache
+# =============================================================================
+# snapshot: 스냅샷 파생 집계(재고 요약/용기종류 그룹) 캐시 - gunicorn 워커 간 공유를 위해 파일 기반
+# 키에 스냅샷 버전이 들어가므로(core/utils/snapshot_cache.py) TIMEOUT은 오래된 파일 정리용
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'snapshot': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('SNAPSHOT_CACHE_DIR', str(BASE_DIR / '.cache' / 'snapshot')),
+        'TIMEOUT': int(os.getenv('SNAPSHOT_CACHE_TIMEOUT', '3600')),
+        'OPTIONS': {
+            'MAX_ENTRIES': 2000,
+        },
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
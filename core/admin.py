@@ -2,7 +2,8 @@ from django.contrib import admin
 from django.urls import reverse
 from django.utils.html import format_html
 from django.shortcuts import redirect
-from core.models import Translation, EndUserMaster, EndUserDefault, EndUserException, ValveGroup, ValveGroupMapping, HiddenCylinderType
+from core.models import Translation, EndUserMaster, EndUserDefault, EndUserException, ValveGroup, ValveGroupMapping, HiddenCylinderType, BackgroundJob
+from core.utils.translation import invalidate_translations
 
 
 @admin.register(Translation)
@@ -36,12 +37,14 @@ class TranslationAdmin(admin.ModelAdmin):
     def activate_translations(self, request, queryset):
         """선택한 번역들을 활성화"""
         count = queryset.update(is_active=True)
+        invalidate_translations()  # queryset.update는 시그널이 없으므로 직접 무효화
         self.message_user(request, f'{count}개의 번역이 활성화되었습니다.')
     activate_translations.short_description = '선택한 번역 활성화'
     
     def deactivate_translations(self, request, queryset):
         """선택한 번역들을 비활성화"""
         count = queryset.update(is_active=False)
+        invalidate_translations()  # queryset.update는 시그널이 없으므로 직접 무효화
         self.message_user(request, f'{count}개의 번역이 비활성화되었습니다.')
     deactivate_translations.short_description = '선택한 번역 비활성화'
 
@@ -194,3 +197,16 @@ class HiddenCylinderTypeAdmin(admin.ModelAdmin):
         queryset.delete()
         self.message_user(request, f'{count}개의 용기종류가 다시 표시됩니다.')
     unhide_cylinder_types.short_description = '선택한 용기종류 숨김 해제'
+
+
+@admin.register(BackgroundJob)
+class BackgroundJobAdmin(admin.ModelAdmin):
+    """백그라운드 작업 조회 (실행은 run_jobs 명령)"""
+    list_display = ['label', 'job_type', 'status', 'created_by', 'attempts', 'created_at', 'finished_at']
+    list_filter = ['status', 'job_type', 'created_at']
+    search_fields = ['label', 'job_type', 'error']
+    readonly_fields = [
+        'token', 'job_type', 'params', 'params_key', 'label', 'created_by', 'attempts', 'worker',
+        'error', 'result_path', 'result_filename', 'content_type', 'created_at', 'started_at', 'heartbeat_at',
+        'finished_at',
+    ]
@@ -0,0 +1,279 @@
+"""
+백그라운드 작업 큐 (DB 기반)
+
+대용량 Excel/QR PDF/견적서 DOCX 생성을 gunicorn 요청 워커 밖에서 실행한다.
+브로커 없이 cy_background_job 테이블을 큐로 쓰며 PostgreSQL/SQLite 모두에서 동작한다.
+
+흐름:
+    1. 뷰: is_enabled()이면 enqueue_response()로 작업을 등록하고 상태 페이지로 이동
+    2. 워커: python manage.py run_jobs 가 claim_next()로 작업을 가져와 run()으로 실행
+       실행 중에는 heartbeat 스레드가 heartbeat_at을 갱신하고, 끊긴 작업은 reap_stale()이 다시 대기열에 넣는다.
+    3. 결과: MEDIA_ROOT/jobs/<token>/<파일명> 에 저장, 상태 페이지가 폴링 후 다운로드
+
+핸들러는 각 앱의 jobs.py에서 @register('<앱>.<작업>')로 등록한다.
+핸들러는 params(dict)를 받아 (내용, 파일명, Content-Type)을 반환하며,
+내용은 bytes, bytes 청크 iterable, 또는 이미 만들어진 파일 경로(str/Path) 중 하나다.
+
+BACKGROUND_JOBS_ENABLED가 꺼져 있으면(기본값) 뷰는 기존처럼 요청 안에서 바로 생성한다.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import socket
+import tempfile
+import threading
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.shortcuts import redirect
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from core.models import BackgroundJob, JobStatus
+
+logger = logging.getLogger(__name__)
+
+RESULT_SUBDIR = 'jobs'
+
+# 실행 중 heartbeat_at 갱신 간격 (초) - BACKGROUND_JOB_TIMEOUT보다 충분히 짧아야 한다.
+HEARTBEAT_INTERVAL = 30
+
+_handlers: Dict[str, Callable] = {}
+_discovered = False
+
+
+def register(job_type: str):
+    """작업 핸들러 등록 데코레이터"""
+    def decorator(func):
+        _handlers[job_type] = func
+        return func
+    return decorator
+
+
+def _autodiscover():
+    """각 앱의 jobs.py를 한 번만 import해 핸들러를 등록한다."""
+    global _discovered
+    if not _discovered:
+        autodiscover_modules('jobs')
+        _discovered = True
+
+
+def get_handler(job_type: str) -> Optional[Callable]:
+    _autodiscover()
+    return _handlers.get(job_type)
+
+
+def is_enabled() -> bool:
+    """백그라운드 작업 사용 여부 (run_jobs 워커를 띄운 환경에서만 켠다)"""
+    return bool(getattr(settings, 'BACKGROUND_JOBS_ENABLED', False))
+
+
+def _params_key(job_type: str, params: dict) -> str:
+    raw = json.dumps([job_type, params], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def enqueue(job_type: str, params: dict, label: str = '', user=None) -> BackgroundJob:
+    """
+    작업 등록
+
+    같은 사용자가 같은 작업을 다시 요청하면(다운로드 버튼 연타 등) 대기/실행 중인 작업을 재사용한다.
+    """
+    if get_handler(job_type) is None:
+        raise ValueError(f"등록되지 않은 작업 종류: {job_type}")
+
+    created_by = user if user is not None and user.is_authenticated else None
+    key = _params_key(job_type, params)
+    existing = BackgroundJob.objects.filter(
+        params_key=key,
+        created_by=created_by,
+        status__in=[JobStatus.QUEUED, JobStatus.RUNNING],
+    ).first()
+    if existing:
+        return existing
+
+    return BackgroundJob.objects.create(
+        job_type=job_type,
+        params=params,
+        params_key=key,
+        label=label[:200],
+        created_by=created_by,
+    )
+
+
+def enqueue_response(request, job_type: str, params: dict, label: str = ''):
+    """작업을 등록하고 상태(폴링) 페이지로 이동하는 응답"""
+    job = enqueue(job_type, params, label=label, user=request.user)
+    return redirect('core:job_status', token=job.token)
+
+
+def worker_name() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim_next(worker: str) -> Optional[BackgroundJob]:
+    """
+    가장 오래된 대기 작업 하나를 RUNNING으로 바꾸고 반환 (없으면 None)
+
+    PostgreSQL은 SKIP LOCKED로 워커끼리 대기 없이 나눠 가진다.
+    SQLite 등은 status=QUEUED 조건부 UPDATE로 한 워커만 가져가도록 한다.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        qs = BackgroundJob.objects.filter(status=JobStatus.QUEUED).order_by('created_at', 'id')
+        if connection.features.has_select_for_update_skip_locked:
+            qs = qs.select_for_update(skip_locked=True)
+        job = qs.first()
+        if job is None:
+            return None
+        claimed = BackgroundJob.objects.filter(pk=job.pk, status=JobStatus.QUEUED).update(
+            status=JobStatus.RUNNING,
+            started_at=now,
+            heartbeat_at=now,
+            worker=worker,
+            attempts=F('attempts') + 1,
+        )
+    if not claimed:
+        return None
+    job.refresh_from_db()
+    return job
+
+
+def result_dir(job: BackgroundJob) -> Path:
+    return Path(settings.MEDIA_ROOT) / RESULT_SUBDIR / str(job.token)
+
+
+def result_file(job: BackgroundJob) -> Optional[Path]:
+    """완료된 작업의 결과 파일 경로 (파일이 없으면 None)"""
+    if job.status != JobStatus.DONE or not job.result_path:
+        return None
+    path = Path(settings.MEDIA_ROOT) / job.result_path
+    return path if path.is_file() else None
+
+
+def _write_result(job: BackgroundJob, content, filename: str) -> Path:
+    """결과를 임시 파일에 쓴 뒤 이름을 바꿔, 다운로드가 덜 쓴 파일을 보지 않게 한다."""
+    directory = result_dir(job)
+    directory.mkdir(parents=True, exist_ok=True)
+    # 다운로드 파일명은 DB에 따로 두고, 디스크에는 확장자만 살린 안전한 이름으로 저장
+    target = directory / f"result{Path(filename).suffix}"
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            if isinstance(content, (bytes, bytearray)):
+                f.write(content)
+            elif isinstance(content, (str, Path)):
+                with open(content, 'rb') as src:
+                    shutil.copyfileobj(src, f)
+            else:
+                for chunk in content:
+                    f.write(chunk)
+        os.replace(tmp_path, target)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+    return target
+
+
+def _owned(job: BackgroundJob):
+    """이 워커가 실행 중인 작업 행 (reap_stale이 다시 대기열에 넣었으면 비어 있다)"""
+    return BackgroundJob.objects.filter(pk=job.pk, status=JobStatus.RUNNING, worker=job.worker)
+
+
+def _heartbeat(job: BackgroundJob, stop: threading.Event):
+    """run() 동안 HEARTBEAT_INTERVAL마다 heartbeat_at 갱신 (별도 스레드, 자체 DB 연결)"""
+    try:
+        while not stop.wait(HEARTBEAT_INTERVAL):
+            if not _owned(job).update(heartbeat_at=timezone.now()):
+                break
+    except Exception as e:
+        logger.warning(f"백그라운드 작업 heartbeat 실패 ({job.job_type} {job.token}): {e}")
+    finally:
+        connection.close()
+
+
+def run(job: BackgroundJob) -> bool:
+    """RUNNING 상태로 가져온 작업 실행. 성공 여부를 반환한다."""
+    handler = get_handler(job.job_type)
+    stop = threading.Event()
+    heartbeat = threading.Thread(target=_heartbeat, args=(job, stop), name=f'job-heartbeat-{job.pk}', daemon=True)
+    heartbeat.start()
+    try:
+        try:
+            if handler is None:
+                raise ValueError(f"등록되지 않은 작업 종류: {job.job_type}")
+            content, filename, content_type = handler(job.params)
+            path = _write_result(job, content, filename)
+        except Exception as e:
+            logger.exception(f"백그라운드 작업 실패 ({job.job_type} {job.token}): {e}")
+            _owned(job).update(
+                status=JobStatus.FAILED,
+                error=str(e)[:2000],
+                finished_at=timezone.now(),
+            )
+            return False
+    finally:
+        stop.set()
+        heartbeat.join()
+
+    finished = _owned(job).update(
+        status=JobStatus.DONE,
+        result_path=path.relative_to(settings.MEDIA_ROOT).as_posix(),
+        result_filename=filename,
+        content_type=content_type,
+        error='',
+        finished_at=timezone.now(),
+    )
+    if not finished:
+        # heartbeat가 끊겨 다른 워커에게 넘어간 작업 (결과는 그 워커가 다시 기록한다)
+        logger.warning(f"백그라운드 작업 소유권 상실 ({job.job_type} {job.token}), 결과를 기록하지 않음")
+        return False
+    return True
+
+
+def reap_stale(timeout_seconds: int, max_attempts: int = 3) -> int:
+    """
+    워커가 죽어 RUNNING으로 남은 작업 정리
+
+    heartbeat_at이 timeout_seconds 넘게 갱신되지 않은 작업은 시도 횟수가 남았으면 다시 대기열로,
+    아니면 실패 처리한다. (오래 걸려도 heartbeat가 살아 있으면 건드리지 않는다)
+    """
+    cutoff = timezone.now() - timedelta(seconds=timeout_seconds)
+    stale = BackgroundJob.objects.filter(status=JobStatus.RUNNING).filter(
+        Q(heartbeat_at__lt=cutoff) | Q(heartbeat_at__isnull=True, started_at__lt=cutoff)
+    )
+    requeued = stale.filter(attempts__lt=max_attempts).update(
+        status=JobStatus.QUEUED,
+        worker='',
+        started_at=None,
+        heartbeat_at=None,
+    )
+    failed = stale.update(
+        status=JobStatus.FAILED,
+        error='작업 시간 초과 (워커 중단)',
+        finished_at=timezone.now(),
+    )
+    return requeued + failed
+
+
+def purge_finished(retention_hours: int) -> int:
+    """보관 기간이 지난 완료/실패 작업과 결과 파일 삭제"""
+    cutoff = timezone.now() - timedelta(hours=retention_hours)
+    old_jobs = BackgroundJob.objects.filter(
+        status__in=[JobStatus.DONE, JobStatus.FAILED],
+        finished_at__lt=cutoff,
+    )
+    count = 0
+    for job in old_jobs.iterator():
+        shutil.rmtree(result_dir(job), ignore_errors=True)
+        job.delete()
+        count += 1
+    return count
@@ -5,7 +5,7 @@ import os
 
 
 class Command(BaseCommand):
-    help = 'sync_cylinder_current_single 함수를 cylinder_no_trimmed 기준으로 업데이트'
+    help = 'sync_cylinder_current_single 함수를 trimmed cylinder_no 기준으로 업데이트'
 
     def handle(self, *args, **options):
         # SQL 파일 읽기
@@ -38,8 +38,8 @@ class Command(BaseCommand):
             if result:
                 # ON CONFLICT 부분만 확인
                 func_def = result[0]
-                if 'ON CONFLICT (cylinder_no_trimmed)' in func_def:
-                    self.stdout.write("  [OK] ON CONFLICT (cylinder_no_trimmed) 확인됨\n")
+                if 'ON CONFLICT (cylinder_no)' in func_def:
+                    self.stdout.write("  [OK] ON CONFLICT (cylinder_no) 확인됨\n")
                 else:
                     self.stdout.write("  [경고] ON CONFLICT 설정 확인 필요\n")
             
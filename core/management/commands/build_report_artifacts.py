@@ -0,0 +1,89 @@
+"""마감된 기간의 보고서 저장본(report_artifact) 채우기"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from reports import artifacts, payloads
+from reports.models import ReportType
+
+
+class Command(BaseCommand):
+    help = '지난 일/주/월 보고서의 화면 데이터와 Excel을 미리 계산해 report_artifact에 저장 (열린 기간 행도 미리 생성, 매일 실행)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=14, help='일일 보고서: 최근 N일 (기본 14)')
+        parser.add_argument('--weeks', type=int, default=8, help='주간 보고서: 최근 N주 (기본 8)')
+        parser.add_argument('--months', type=int, default=6, help='월간 보고서: 최근 N개월 (기본 6)')
+        parser.add_argument('--force', action='store_true', help='저장본이 있어도 다시 계산')
+
+    def handle(self, *args, **options):
+        if not artifacts.is_enabled():
+            self.stdout.write(self.style.ERROR(
+                "무효화 Trigger가 없어 저장본을 사용할 수 없습니다. 먼저 실행: "
+                "python manage.py migrate reports && "
+                "python manage.py execute_sql_file sql/create_report_artifact_invalidation.sql"
+            ))
+            return
+
+        force = options['force']
+        today = timezone.localdate()
+        built = {'payload': 0, 'xlsx': 0}
+
+        # 열린 기간(오늘/이번 주/이번 달)과 다음 기간의 행을 미리 만들어 둔다. (reports/artifacts.py)
+        this_week_start = today - timedelta(days=today.weekday())
+        this_month_start = today.replace(day=1)
+        next_month_start = (this_month_start + timedelta(days=32)).replace(day=1)
+        after_next_month_start = (next_month_start + timedelta(days=32)).replace(day=1)
+        tomorrow = today + timedelta(days=1)
+        opened = artifacts.ensure_rows([
+            (ReportType.DAILY, today, today),
+            (ReportType.DAILY, tomorrow, tomorrow),
+            (ReportType.WEEKLY, this_week_start, this_week_start + timedelta(days=6)),
+            (ReportType.WEEKLY, this_week_start + timedelta(weeks=1), this_week_start + timedelta(days=13)),
+            (ReportType.MONTHLY, this_month_start, next_month_start - timedelta(days=1)),
+            (ReportType.MONTHLY, next_month_start, after_next_month_start - timedelta(days=1)),
+        ])
+        if opened:
+            self.stdout.write(f"  열린 기간 저장본 행 {opened}건 생성\n")
+
+        def run(report_type, start_date, end_date, payload_builder, xlsx_builder=None):
+            payload_built, xlsx_built = artifacts.build(
+                report_type, start_date, end_date,
+                payload_builder=payload_builder,
+                xlsx_builder=xlsx_builder,
+                force=force,
+            )
+            built['payload'] += int(payload_built)
+            built['xlsx'] += int(xlsx_built)
+            if payload_built or xlsx_built:
+                self.stdout.write(f"  {report_type} {start_date} ~ {end_date}\n")
+
+        # 일일: 어제부터 N일
+        for offset in range(1, options['days'] + 1):
+            day = today - timedelta(days=offset)
+            run(ReportType.DAILY, day, day, lambda d=day: payloads.build_daily_payload(d))
+
+        # 주간: 지난 주(월~일)부터 N주
+        for offset in range(1, options['weeks'] + 1):
+            start_date = this_week_start - timedelta(weeks=offset)
+            end_date = start_date + timedelta(days=6)
+            run(
+                ReportType.WEEKLY, start_date, end_date,
+                lambda s=start_date, e=end_date: payloads.build_weekly_payload(s, e),
+                lambda s=start_date, e=end_date: payloads.build_weekly_xlsx(s, e),
+            )
+
+        # 월간: 지난 달부터 N개월
+        month_start = today.replace(day=1)
+        for _ in range(options['months']):
+            end_date = month_start - timedelta(days=1)
+            month_start = end_date.replace(day=1)
+            run(
+                ReportType.MONTHLY, month_start, end_date,
+                lambda s=month_start, e=end_date: payloads.build_monthly_payload(s, e),
+                lambda s=month_start, e=end_date: payloads.build_monthly_xlsx(s, e),
+            )
+
+        self.stdout.write(f"  화면 데이터: {built['payload']:,}건, Excel: {built['xlsx']:,}건 저장\n")
+        self.stdout.write(self.style.SUCCESS("[완료] 보고서 저장본 채우기 완료"))
@@ -2,6 +2,8 @@
 from django.core.management.base import BaseCommand
 from django.db import connection
 
+from core.utils.snapshot_sync import sync_cylinders
+
 
 class Command(BaseCommand):
     help = 'condition_code가 990인 용기 확인'
@@ -45,10 +47,8 @@ class Command(BaseCommand):
             # 재동기화
             if results:
                 self.stdout.write("\n재동기화 중...\n")
-                for row in results:
-                    cylinder_no = row[0]
-                    cursor.execute("SELECT sync_cylinder_current_single(%s)", [cylinder_no])
-                    self.stdout.write(f"  {cylinder_no} 동기화 완료")
+                updated, _errors = sync_cylinders(cursor, [row[0] for row in results])
+                self.stdout.write(f"  {updated}개 동기화 완료")
                 
                 # 다시 확인
                 cursor.execute("""
@@ -0,0 +1,109 @@
+"""cy_cylinder_current 중복 병합 및 정규화 키 적용 (1회성)"""
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+
+TRIM_CHECK_NAME = 'cy_cylinder_current_no_trimmed_chk'
+
+
+class Command(BaseCommand):
+    help = 'cy_cylinder_current 공백 중복을 최신 1행으로 병합하고 RTRIM 용기번호 UNIQUE 제약 적용'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='실제 변경 없이 병합 대상만 확인'
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options.get('dry_run', False)
+
+        with connection.cursor() as cursor:
+            # 1. 중복 현황 확인
+            self.stdout.write("=== 중복 현황 확인 ===\n")
+            cursor.execute("""
+                SELECT
+                    COUNT(*),
+                    COUNT(DISTINCT RTRIM(cylinder_no)),
+                    COUNT(*) FILTER (WHERE cylinder_no <> RTRIM(cylinder_no))
+                FROM cy_cylinder_current
+            """)
+            total, unique_count, untrimmed = cursor.fetchone()
+            self.stdout.write(f"  전체 레코드: {total}개\n")
+            self.stdout.write(f"  고유 용기번호(RTRIM): {unique_count}개\n")
+            self.stdout.write(f"  병합 대상 중복: {total - unique_count}개\n")
+            self.stdout.write(f"  공백 포함 용기번호: {untrimmed}개\n")
+
+            if dry_run:
+                self.stdout.write("\n[DRY RUN] 변경 없이 종료\n")
+                return
+
+            with transaction.atomic():
+                # 정리 중 스냅샷 쓰기(리스너/동기화)를 막는다. 읽기는 계속 가능.
+                cursor.execute("LOCK TABLE cy_cylinder_current IN SHARE ROW EXCLUSIVE MODE")
+
+                # 2. 중복 병합: RTRIM 용기번호별로 가장 최근 갱신된 1행만 남긴다.
+                self.stdout.write("\n=== 중복 병합 ===\n")
+                cursor.execute("""
+                    DELETE FROM cy_cylinder_current c
+                    USING (
+                        SELECT ctid,
+                               ROW_NUMBER() OVER (
+                                   PARTITION BY RTRIM(cylinder_no)
+                                   ORDER BY snapshot_updated_at DESC NULLS LAST,
+                                            (cylinder_no = RTRIM(cylinder_no)) DESC
+                               ) AS rn
+                        FROM cy_cylinder_current
+                    ) d
+                    WHERE c.ctid = d.ctid
+                      AND d.rn > 1
+                """)
+                self.stdout.write(f"  삭제된 중복 레코드: {cursor.rowcount}개\n")
+
+                # 3. 남은 행의 용기번호를 RTRIM 값으로 정규화
+                cursor.execute("""
+                    UPDATE cy_cylinder_current
+                    SET cylinder_no = RTRIM(cylinder_no)
+                    WHERE cylinder_no <> RTRIM(cylinder_no)
+                """)
+                self.stdout.write(f"  정규화된 용기번호: {cursor.rowcount}개\n")
+
+                # 4. 정규화 키 제약 적용
+                #    - PK(cylinder_no): Upsert의 ON CONFLICT (cylinder_no) 대상
+                #    - CHECK: 공백 포함 용기번호 저장 차단 → RTRIM 기준으로도 UNIQUE
+                self.stdout.write("\n=== 제약조건 적용 ===\n")
+                cursor.execute("""
+                    SELECT 1 FROM pg_constraint
+                    WHERE conrelid = 'cy_cylinder_current'::regclass AND contype = 'p'
+                """)
+                if cursor.fetchone() is None:
+                    cursor.execute("ALTER TABLE cy_cylinder_current ADD PRIMARY KEY (cylinder_no)")
+                    self.stdout.write("  PK(cylinder_no) 추가\n")
+
+                cursor.execute(f"ALTER TABLE cy_cylinder_current DROP CONSTRAINT IF EXISTS {TRIM_CHECK_NAME}")
+                cursor.execute(f"""
+                    ALTER TABLE cy_cylinder_current
+                    ADD CONSTRAINT {TRIM_CHECK_NAME} CHECK (cylinder_no = RTRIM(cylinder_no))
+                """)
+                self.stdout.write("  CHECK (cylinder_no = RTRIM(cylinder_no)) 추가\n")
+
+                # add_cylinder_no_trimmed로 추가된 보조 컬럼은 PK + CHECK로 대체되어 어떤 동기화 경로도 채우지 않으므로 제거
+                #   (RTRIM 조회는 idx_cy_cylinder_current_no_rtrim 표현식 인덱스가 담당)
+                cursor.execute("""
+                    SELECT 1 FROM information_schema.columns
+                    WHERE table_name = 'cy_cylinder_current' AND column_name = 'cylinder_no_trimmed'
+                """)
+                if cursor.fetchone():
+                    cursor.execute("ALTER TABLE cy_cylinder_current DROP COLUMN cylinder_no_trimmed")
+                    self.stdout.write("  cylinder_no_trimmed 컬럼 제거\n")
+
+            cursor.execute("ANALYZE cy_cylinder_current")
+
+            # 5. 최종 확인
+            cursor.execute("SELECT COUNT(*), COUNT(DISTINCT RTRIM(cylinder_no)) FROM cy_cylinder_current")
+            after_total, after_unique = cursor.fetchone()
+            self.stdout.write("\n=== 정리 결과 ===\n")
+            self.stdout.write(f"  정리 전: {total}개\n")
+            self.stdout.write(f"  정리 후: {after_total}개 (고유 {after_unique}개)\n")
+            self.stdout.write(self.style.SUCCESS("\n[완료] cy_cylinder_current 중복 병합 및 제약 적용 완료"))
@@ -0,0 +1,44 @@
+"""cy_status_history 월 파티션 미리 만들기 (cron용)"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = 'cy_status_history(상태 이력 월 파티션)의 이번 달 ~ N개월 뒤 파티션을 미리 생성'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months',
+            type=int,
+            default=3,
+            help='이번 달 이후 몇 개월치를 미리 만들지 (기본값: 3)'
+        )
+
+    def handle(self, *args, **options):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass('cy_status_history') IS NOT NULL")
+            if not cursor.fetchone()[0]:
+                self.stdout.write(self.style.ERROR(
+                    "cy_status_history가 없습니다. 먼저 실행: "
+                    "python manage.py execute_sql_file sql/create_status_history_partitioned.sql"
+                ))
+                return
+
+            month = timezone.localdate().replace(day=1)
+            created = []
+            for _ in range(options['months'] + 1):
+                # 파티션마다 트랜잭션을 나눠 부모 잠금을 짧게 잡는다.
+                with transaction.atomic():
+                    cursor.execute("SELECT cy_status_history_ensure_partition(%s::timestamp)", [month])
+                    if cursor.fetchone()[0]:
+                        created.append(month.strftime('%Y-%m'))
+                month = (month.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+        if created:
+            self.stdout.write(f"  생성한 파티션: {', '.join(created)}\n")
+        else:
+            self.stdout.write("  새로 만들 파티션이 없습니다.\n")
+        self.stdout.write(self.style.SUCCESS("[완료] cy_status_history 파티션 확인 완료"))
@@ -2,6 +2,8 @@
 from django.core.management.base import BaseCommand
 from django.db import connection
 
+from core.utils.snapshot_sync import sync_cylinders
+
 
 class Command(BaseCommand):
     help = 'CF4 YC 용기 문제 해결: NULL EndUser 정책 추가 및 cylinder_type_key 재계산'
@@ -52,15 +54,9 @@ class Command(BaseCommand):
             null_cylinder_nos = [row[0] for row in cursor.fetchall()]
             self.stdout.write(f"  재동기화 대상: {len(null_cylinder_nos)}개 용기\n")
             
-            success_count = 0
-            for i, cylinder_no in enumerate(null_cylinder_nos, 1):
-                try:
-                    cursor.execute("SELECT sync_cylinder_current_single(%s)", [cylinder_no])
-                    success_count += 1
-                    if i % 20 == 0:
-                        self.stdout.write(f"  진행 중: {i}/{len(null_cylinder_nos)}...\n")
-                except Exception as e:
-                    self.stdout.write(f"  [오류] {cylinder_no}: {str(e)}\n")
+            success_count, error_count = sync_cylinders(cursor, null_cylinder_nos)
+            if error_count:
+                self.stdout.write(f"  [오류] {error_count}개 실패 (로그 확인)\n")
             
             self.stdout.write(f"  성공: {success_count}개\n")
             
@@ -79,15 +75,9 @@ class Command(BaseCommand):
             all_cylinder_nos = [row[0] for row in cursor.fetchall()]
             self.stdout.write(f"  재동기화 대상: {len(all_cylinder_nos)}개 용기\n")
             
-            success_count = 0
-            for i, cylinder_no in enumerate(all_cylinder_nos, 1):
-                try:
-                    cursor.execute("SELECT sync_cylinder_current_single(%s)", [cylinder_no])
-                    success_count += 1
-                    if i % 20 == 0:
-                        self.stdout.write(f"  진행 중: {i}/{len(all_cylinder_nos)}...\n")
-                except Exception as e:
-                    self.stdout.write(f"  [오류] {cylinder_no}: {str(e)}\n")
+            success_count, error_count = sync_cylinders(cursor, all_cylinder_nos)
+            if error_count:
+                self.stdout.write(f"  [오류] {error_count}개 실패 (로그 확인)\n")
             
             self.stdout.write(f"  성공: {success_count}개\n")
             
@@ -2,6 +2,8 @@
 from django.core.management.base import BaseCommand
 from django.db import connection
 
+from core.utils.snapshot_sync import sync_cylinders
+
 
 class Command(BaseCommand):
     help = 'COS 가스의 정책이 매칭되지 않아 SDC로 표시된 용기를 NULL로 수정'
@@ -40,15 +42,9 @@ class Command(BaseCommand):
             sdc_cylinders = [row[0] for row in cursor.fetchall()]
             self.stdout.write(f"SDC로 표시된 COS 용기: {len(sdc_cylinders)}개\n")
             
-            updated = 0
-            for cylinder_no in sdc_cylinders:
-                try:
-                    cursor.execute("SELECT sync_cylinder_current_single(%s)", [cylinder_no])
-                    updated += 1
-                    if updated % 100 == 0:
-                        self.stdout.write(f"  진행: {updated}/{len(sdc_cylinders)}")
-                except Exception as e:
-                    self.stdout.write(self.style.ERROR(f"  오류 ({cylinder_no}): {str(e)}"))
+            updated, errors = sync_cylinders(cursor, sdc_cylinders)
+            if errors:
+                self.stdout.write(self.style.ERROR(f"  오류: {errors}개 실패 (로그 확인)"))
             
             self.stdout.write(self.style.SUCCESS(f"\n재동기화 완료: {updated}개"))
             
@@ -0,0 +1,75 @@
+"""
+cy_cylinder_current 스냅샷 리스너 - Django Management Command
+
+fcms_cdc Trigger의 NOTIFY(cy_cylinder_changed)를 받아 변경 용기만 배치로 갱신한다.
+사전 작업: sql/create_snapshot_notify_triggers.sql 적용
+
+실행 방법:
+    python manage.py listen_cylinder_changes
+    python manage.py listen_cylinder_changes --debounce 2 --max-batch 1000
+
+systemd 유닛으로 관리 가능 (deploy/cynow-snapshot-listener.service)
+"""
+import logging
+import signal
+
+from django.core.management.base import BaseCommand
+
+from core.utils.snapshot_listener import SnapshotListener
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'cy_cylinder_current 스냅샷 리스너 (LISTEN/NOTIFY 기반 증분 갱신)'
+
+    def add_arguments(self, parser):
+        """커맨드 인자 정의"""
+        parser.add_argument(
+            '--debounce',
+            type=float,
+            default=1.0,
+            help='NOTIFY를 모아서 처리할 대기 시간 초 (기본값: 1.0)'
+        )
+        parser.add_argument(
+            '--max-batch',
+            type=int,
+            default=500,
+            help='한 번에 갱신할 최대 용기 수 (기본값: 500)'
+        )
+        parser.add_argument(
+            '--reconnect-delay',
+            type=float,
+            default=5.0,
+            help='DB 연결 오류 시 재연결 대기 초 (기본값: 5.0)'
+        )
+
+    def handle(self, *args, **options):
+        """커맨드 실행"""
+        listener = SnapshotListener(
+            debounce=options['debounce'],
+            max_batch=options['max_batch'],
+            reconnect_delay=options['reconnect_delay'],
+        )
+
+        # systemd stop(SIGTERM) 시 대기열을 비우고 정상 종료
+        signal.signal(signal.SIGTERM, lambda signum, frame: listener.stop())
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'[Snapshot Listener] 리스너 시작 중...\n'
+                f'  - debounce: {options["debounce"]}s\n'
+                f'  - max batch: {options["max_batch"]}'
+            )
+        )
+
+        try:
+            listener.start()
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('[Snapshot Listener] Ctrl+C 감지, 종료 중...'))
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f'[Snapshot Listener] 오류: {e}'))
+            raise
+        finally:
+            listener.stop()
+            self.stdout.write(self.style.SUCCESS('[Snapshot Listener] 리스너 종료됨'))
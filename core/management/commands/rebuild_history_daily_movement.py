@@ -0,0 +1,34 @@
+"""cy_history_daily_movement 전체 재계산"""
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+
+class Command(BaseCommand):
+    help = 'cy_history_daily_movement(일별 이동 집계) 전체 재계산 - 최초 적재/정합성 복구용'
+
+    def handle(self, *args, **options):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass('cy_history_daily_movement') IS NOT NULL")
+            if not cursor.fetchone()[0]:
+                self.stdout.write(self.style.ERROR(
+                    "cy_history_daily_movement가 없습니다. 먼저 실행: "
+                    "python manage.py execute_sql_file sql/create_history_daily_movement.sql"
+                ))
+                return
+
+            with transaction.atomic():
+                cursor.execute("SELECT cy_history_daily_movement_rebuild()")
+                rows = cursor.fetchone()[0]
+
+            cursor.execute("""
+                SELECT
+                    (SELECT COALESCE(SUM(cnt), 0) FROM cy_history_daily_movement),
+                    (SELECT COUNT(DISTINCT (RTRIM("CYLINDER_NO"), "HISTORY_SEQ", "MOVE_DATE"::DATE, TRIM("MOVE_CODE")))
+                     FROM "fcms_cdc"."tr_cylinder_status_histories"
+                     WHERE "MOVE_DATE" IS NOT NULL AND "MOVE_CODE" IS NOT NULL)
+            """)
+            cube_total, history_total = cursor.fetchone()
+
+        self.stdout.write(f"  집계 행: {rows:,}개\n")
+        self.stdout.write(f"  집계 건수 합계: {cube_total:,} / 이력(중복 제외): {history_total:,}\n")
+        self.stdout.write(self.style.SUCCESS("[완료] cy_history_daily_movement 재계산 완료"))
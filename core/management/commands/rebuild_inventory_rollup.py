@@ -0,0 +1,32 @@
+"""cy_inventory_rollup 전체 재계산"""
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+
+class Command(BaseCommand):
+    help = 'cy_inventory_rollup(재고 요약 롤업) 전체 재계산 - 최초 적재/정합성 복구용'
+
+    def handle(self, *args, **options):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass('cy_inventory_rollup') IS NOT NULL")
+            if not cursor.fetchone()[0]:
+                self.stdout.write(self.style.ERROR(
+                    "cy_inventory_rollup이 없습니다. 먼저 실행: "
+                    "python manage.py execute_sql_file sql/create_inventory_rollup.sql"
+                ))
+                return
+
+            with transaction.atomic():
+                cursor.execute("SELECT cy_inventory_rollup_rebuild()")
+                groups = cursor.fetchone()[0]
+
+            cursor.execute("""
+                SELECT
+                    (SELECT COALESCE(SUM(qty), 0) FROM cy_inventory_rollup),
+                    (SELECT COUNT(*) FROM cy_cylinder_current WHERE dashboard_enduser IS NOT NULL)
+            """)
+            rollup_qty, snapshot_qty = cursor.fetchone()
+
+        self.stdout.write(f"  롤업 그룹: {groups:,}개\n")
+        self.stdout.write(f"  롤업 수량 합계: {rollup_qty:,} / 스냅샷: {snapshot_qty:,}\n")
+        self.stdout.write(self.style.SUCCESS("[완료] cy_inventory_rollup 재계산 완료"))
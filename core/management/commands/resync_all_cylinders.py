@@ -2,6 +2,8 @@
 from django.core.management.base import BaseCommand
 from django.db import connection
 
+from core.utils.snapshot_sync import sync_cylinders
+
 
 class Command(BaseCommand):
     help = '전체 용기 재동기화 (CDC 데이터 기준)'
@@ -25,20 +27,10 @@ class Command(BaseCommand):
             cursor.execute('SELECT RTRIM("CYLINDER_NO") FROM "fcms_cdc"."ma_cylinders"')
             cylinder_nos = [row[0] for row in cursor.fetchall()]
             
-            success_count = 0
-            error_count = 0
+            def report(done, total):
+                self.stdout.write(f"  진행 중: {done}/{total} ({done*100//total}%)...\n")
             
-            for i, cylinder_no in enumerate(cylinder_nos, 1):
-                try:
-                    cursor.execute("SELECT sync_cylinder_current_single(%s)", [cylinder_no])
-                    success_count += 1
-                except Exception as e:
-                    error_count += 1
-                    if error_count <= 5:
-                        self.stdout.write(f"  [오류] {cylinder_no}: {str(e)[:50]}\n")
-                
-                if i % 500 == 0:
-                    self.stdout.write(f"  진행 중: {i}/{len(cylinder_nos)} ({i*100//len(cylinder_nos)}%)...\n")
+            success_count, error_count = sync_cylinders(cursor, cylinder_nos, progress=report)
             
             self.stdout.write(f"\n  성공: {success_count}개\n")
             self.stdout.write(f"  실패: {error_count}개\n")
@@ -2,6 +2,8 @@
 from django.core.management.base import BaseCommand
 from django.db import connection
 
+from core.utils.snapshot_sync import sync_cylinders
+
 
 class Command(BaseCommand):
     help = 'CF4 YC 용기 재동기화하여 cylinder_type_key 재계산'
@@ -24,18 +26,7 @@ class Command(BaseCommand):
             self.stdout.write(f"  재동기화 대상: {len(cylinder_nos)}개 용기\n")
             
             # 각 용기 재동기화
-            success_count = 0
-            error_count = 0
-            
-            for i, cylinder_no in enumerate(cylinder_nos, 1):
-                try:
-                    cursor.execute("SELECT sync_cylinder_current_single(%s)", [cylinder_no])
-                    success_count += 1
-                    if i % 20 == 0:
-                        self.stdout.write(f"  진행 중: {i}/{len(cylinder_nos)}...\n")
-                except Exception as e:
-                    error_count += 1
-                    self.stdout.write(f"  [오류] {cylinder_no}: {str(e)}\n")
+            success_count, error_count = sync_cylinders(cursor, cylinder_nos)
             
             self.stdout.write(f"\n=== 재동기화 완료 ===\n")
             self.stdout.write(f"  성공: {success_count}개\n")
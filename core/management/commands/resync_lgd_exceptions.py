@@ -2,6 +2,8 @@
 from django.core.management.base import BaseCommand
 from django.db import connection
 
+from core.utils.snapshot_sync import sync_cylinders
+
 
 class Command(BaseCommand):
     help = 'LGD 예외 용기 재동기화'
@@ -61,15 +63,11 @@ class Command(BaseCommand):
             lgd_cylinder_nos = [row[0] for row in cursor.fetchall()]
             self.stdout.write(f"  재동기화 대상: {len(lgd_cylinder_nos)}개\n")
             
-            success_count = 0
-            for i, cylinder_no in enumerate(lgd_cylinder_nos, 1):
-                try:
-                    cursor.execute("SELECT sync_cylinder_current_single(%s)", [cylinder_no])
-                    success_count += 1
-                except Exception as e:
-                    self.stdout.write(f"  [오류] {cylinder_no}: {str(e)}\n")
+            success_count, error_count = sync_cylinders(cursor, lgd_cylinder_nos)
             
             self.stdout.write(f"  성공: {success_count}개\n")
+            if error_count:
+                self.stdout.write(f"  [오류] {error_count}개 실패 (로그 확인)\n")
             
             # 4. 결과 확인
             self.stdout.write("\n=== 재동기화 후 CF4 YC 용기 현황 ===\n")
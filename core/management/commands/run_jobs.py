@@ -0,0 +1,116 @@
+"""
+백그라운드 작업 워커 - Django Management Command
+
+cy_background_job에 쌓인 Excel/PDF/DOCX 생성 작업을 gunicorn 밖에서 처리한다.
+사전 작업: python manage.py migrate core, .env에 BACKGROUND_JOBS_ENABLED=True
+
+실행 방법:
+    python manage.py run_jobs
+    python manage.py run_jobs --once          # 대기 작업만 처리하고 종료 (cron용)
+    python manage.py run_jobs --poll 1 --nice 10
+
+systemd 유닛으로 관리 가능 (deploy/cynow-job-worker.service)
+"""
+import logging
+import os
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from core import jobs
+from cylinders import qr_labels
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = '백그라운드 작업 워커 (Excel/QR PDF/견적서 생성)'
+
+    def add_arguments(self, parser):
+        """커맨드 인자 정의"""
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='대기 중인 작업을 모두 처리한 뒤 종료'
+        )
+        parser.add_argument(
+            '--poll',
+            type=float,
+            default=2.0,
+            help='대기 작업이 없을 때 다시 확인할 간격 초 (기본값: 2.0)'
+        )
+        parser.add_argument(
+            '--nice',
+            type=int,
+            default=0,
+            help='워커 프로세스 CPU 우선순위를 낮춤 (os.nice 증가값, 기본값: 0)'
+        )
+
+    def handle(self, *args, **options):
+        """커맨드 실행"""
+        if options['nice']:
+            os.nice(options['nice'])
+
+        timeout = getattr(settings, 'BACKGROUND_JOB_TIMEOUT', 300)
+        retention_hours = getattr(settings, 'BACKGROUND_JOB_RETENTION_HOURS', 72)
+        worker = jobs.worker_name()
+
+        # systemd stop(SIGTERM) 시 실행 중인 작업을 마치고 종료
+        stopping = {'flag': False}
+
+        def stop(signum, frame):
+            stopping['flag'] = True
+
+        signal.signal(signal.SIGTERM, stop)
+
+        # QR 라벨 대량 생성은 이 워커에서만 작은 공유 프로세스 풀로 병렬 계산
+        qr_labels.enable_process_pool()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'[Job Worker] 워커 시작: {worker}\n'
+                f'  - poll: {options["poll"]}s\n'
+                f'  - heartbeat timeout: {timeout}s, 보관: {retention_hours}시간'
+            )
+        )
+        if not jobs.is_enabled():
+            self.stdout.write(self.style.WARNING(
+                '[Job Worker] BACKGROUND_JOBS_ENABLED가 꺼져 있어 화면에서는 작업이 등록되지 않습니다.'
+            ))
+
+        last_maintenance = 0.0
+        try:
+            while not stopping['flag']:
+                close_old_connections()
+
+                # 중단된 작업/오래된 결과 정리 (1분에 한 번)
+                if time.monotonic() - last_maintenance >= 60:
+                    reaped = jobs.reap_stale(timeout)
+                    purged = jobs.purge_finished(retention_hours)
+                    if reaped or purged:
+                        logger.info(f"[Job Worker] 중단 작업 {reaped}건 정리, 만료 결과 {purged}건 삭제")
+                    last_maintenance = time.monotonic()
+
+                job = jobs.claim_next(worker)
+                if job is None:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll'])
+                    continue
+
+                started = time.monotonic()
+                ok = jobs.run(job)
+                elapsed = time.monotonic() - started
+                message = f'[Job Worker] {job.job_type} {job.token} ({elapsed:.1f}s)'
+                if ok:
+                    self.stdout.write(self.style.SUCCESS(f'{message} 완료'))
+                else:
+                    self.stdout.write(self.style.ERROR(f'{message} 실패'))
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('[Job Worker] Ctrl+C 감지, 종료 중...'))
+        finally:
+            qr_labels.shutdown_process_pool()
+            self.stdout.write(self.style.SUCCESS('[Job Worker] 워커 종료됨'))
@@ -1,8 +1,13 @@
 """cy_cylinder_current 스냅샷 테이블 동기화"""
 from django.core.management.base import BaseCommand
-from django.db import connection
+from django.db import connection, transaction
 from django.utils import timezone
 from datetime import timedelta
+from core.utils import snapshot_sync, sync_cursor
+
+
+# cy_sync_cursor 소비자 이름 (sync_cylinder_snapshot 명령과 공유)
+SYNC_CONSUMER = 'cy_cylinder_current'
 
 
 class Command(BaseCommand):
@@ -12,13 +17,25 @@ class Command(BaseCommand):
         parser.add_argument(
             '--incremental',
             action='store_true',
-            help='증분 갱신 (최근 1시간 내 변경된 용기만)'
+            help='증분 갱신 (마지막 커서 이후 변경된 용기만)'
         )
         parser.add_argument(
             '--hours',
             type=int,
-            default=1,
-            help='증분 갱신 시간 범위 (기본값: 1시간)'
+            default=None,
+            help='지정 시 워터마크 대신 최근 N시간 내 변경된 용기만 갱신 (기존 방식)'
+        )
+        parser.add_argument(
+            '--overlap-minutes',
+            type=int,
+            default=sync_cursor.DEFAULT_OVERLAP_MINUTES,
+            help='워터마크 증분 시 타임스탬프를 겹쳐 읽는 시간 (CDC 지연 적재 대비, 분)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=snapshot_sync.BATCH_SIZE,
+            help='sync_cylinder_current_batch 1회 호출당 용기 수'
         )
 
     def handle(self, *args, **options):
@@ -26,7 +43,17 @@ class Command(BaseCommand):
         hours = options['hours']
         
         with connection.cursor() as cursor:
-            if incremental:
+            # 이번 실행의 워터마크 상한 (용기 목록 조회 전에 캡처)
+            until = sync_cursor.capture_high_marks(cursor)
+            
+            if incremental and hours is None:
+                # 증분 갱신: 저장된 워터마크 이후 변경된 용기만
+                since = sync_cursor.read_watermarks(SYNC_CONSUMER)
+                self.stdout.write(f"증분 갱신 모드 (워터마크): {since}")
+                cylinder_nos = sync_cursor.changed_cylinder_nos(
+                    cursor, since, until, options['overlap_minutes']
+                )
+            elif incremental:
                 # 증분 갱신: 최근 N시간 내 변경된 용기만
                 cutoff_time = timezone.now() - timedelta(hours=hours)
                 self.stdout.write(f"증분 갱신 모드: {cutoff_time} 이후 변경된 용기만 갱신")
@@ -43,12 +70,13 @@ class Command(BaseCommand):
                     )
                     SELECT "CYLINDER_NO" FROM updated_cylinders
                 """, [cutoff_time, cutoff_time, cutoff_time])
+                cylinder_nos = [row[0] for row in cursor.fetchall()]
             else:
                 # 전체 갱신
                 self.stdout.write("전체 갱신 모드: 모든 용기 갱신")
                 cursor.execute('SELECT "CYLINDER_NO" FROM "fcms_cdc"."ma_cylinders"')
+                cylinder_nos = [row[0] for row in cursor.fetchall()]
             
-            cylinder_nos = [row[0] for row in cursor.fetchall()]
             total = len(cylinder_nos)
             
             if total == 0:
@@ -57,22 +85,25 @@ class Command(BaseCommand):
             
             self.stdout.write(f"총 {total:,}개 용기 갱신 시작...")
             
-            # 각 용기에 대해 sync_cylinder_current_single 함수 호출
-            updated = 0
-            errors = 0
+            # sync_cylinder_current_batch 함수를 청크 단위로 호출
+            # 커서는 스냅샷 쓰기와 같은 트랜잭션에서 전진한다.
+            def report(done, total_count):
+                self.stdout.write(f"진행: {done:,}/{total_count:,} ({done*100//total_count}%)")
             
-            for i, cylinder_no in enumerate(cylinder_nos, 1):
-                try:
-                    cursor.execute("SELECT sync_cylinder_current_single(%s)", [cylinder_no])
-                    updated += 1
-                    
-                    if i % 100 == 0:
-                        self.stdout.write(f"진행: {i:,}/{total:,} ({i*100//total}%)")
-                except Exception as e:
-                    errors += 1
-                    self.stdout.write(self.style.ERROR(f"오류 (용기번호: {cylinder_no}): {str(e)}"))
+            with transaction.atomic():
+                updated, errors = snapshot_sync.sync_cylinders(
+                    cursor, cylinder_nos, batch_size=options['batch_size'], progress=report
+                )
+                # 원천에서 삭제된 용기는 변경 목록에 잡히지 않으므로 따로 정리
+                orphaned = snapshot_sync.delete_orphaned_cylinders(cursor)
+                
+                # --hours 지정 시에는 구간이 워터마크와 무관하므로 커서를 건드리지 않는다.
+                if hours is None or not incremental:
+                    sync_cursor.save_watermarks(SYNC_CONSUMER, until)
             
             self.stdout.write(self.style.SUCCESS(f"\n갱신 완료: {updated:,}개 성공, {errors}개 실패"))
+            if orphaned:
+                self.stdout.write(f"원천에 없는 용기 {orphaned:,}개 삭제")
             
             # 통계 확인
             cursor.execute("""
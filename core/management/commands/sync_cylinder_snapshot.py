@@ -5,7 +5,62 @@ from core.utils.view_helper import parse_cylinder_spec, parse_valve_spec, parse_
 from core.utils.cylinder_type import generate_cylinder_type_key
 from datetime import timedelta
 import hashlib
-from core.utils.status_mapper import map_condition_code_to_status
+from core.utils.status_mapper import map_condition_code_to_status, CONDITION_CODE_TO_STATUS
+from core.utils import snapshot_cache, snapshot_sync, sync_cursor
+
+
+# cy_sync_cursor 소비자 이름 (sync_cylinder_current 명령과 공유)
+SYNC_CONSUMER = 'cy_cylinder_current'
+
+# 용기별 원천 데이터 조회 (upsert_cylinder 입력 형식, WHERE 절은 호출 측에서 추가)
+SOURCE_SQL = """
+    SELECT 
+        RTRIM(c."CYLINDER_NO") as "CYLINDER_NO",
+        COALESCE(i."DISPLAY_NAME", i."FORMAL_NAME", '') as gas_name,
+        c."CAPACITY",
+        COALESCE(c."VALVE_SPEC_CODE", '') as valve_spec_code,
+        COALESCE(vs."NAME", '') as valve_spec_name,
+        COALESCE(c."CYLINDER_SPEC_CODE", '') as cylinder_spec_code,
+        COALESCE(cs."NAME", '') as cylinder_spec_name,
+        COALESCE(c."USE_DEPARTMENT_CODE", '') as usage_place,
+        COALESCE(ls."POSITION_USER_NAME", '') as location,
+        ls."CONDITION_CODE",
+        ls."MOVE_DATE",
+        c."WITHSTAND_PRESSURE_MAINTE_DATE",
+        c."MANUFACTURE_DATE",
+        GREATEST(
+            COALESCE(c."UPDATE_DATETIME", c."ADD_DATETIME"),
+            COALESCE(ls."MOVE_DATE", NOW())
+        ) as source_updated_at
+    FROM "fcms_cdc"."ma_cylinders" c
+    LEFT JOIN "fcms_cdc"."ma_items" i ON c."ITEM_CODE" = i."ITEM_CODE"
+    LEFT JOIN "fcms_cdc"."ma_cylinder_specs" cs ON c."CYLINDER_SPEC_CODE" = cs."CYLINDER_SPEC_CODE"
+    LEFT JOIN "fcms_cdc"."ma_valve_specs" vs ON c."VALVE_SPEC_CODE" = vs."VALVE_SPEC_CODE"
+    LEFT JOIN "fcms_cdc"."tr_latest_cylinder_statuses" ls ON RTRIM(c."CYLINDER_NO") = RTRIM(ls."CYLINDER_NO")
+"""
+
+# 전체 재생성(bulk) 시 사용하는 스테이징 테이블 (고정 이름이므로 아래 advisory lock으로 한 번에 하나만 실행)
+STAGING_TABLE = 'cy_cylinder_current_staging'
+
+# bulk 적재 대상 컬럼 (upsert_cylinder의 INSERT 컬럼과 동일)
+SNAPSHOT_COLUMNS = [
+    'cylinder_no',
+    'raw_gas_name', 'raw_capacity',
+    'raw_valve_spec_code', 'raw_valve_spec_name',
+    'raw_cylinder_spec_code', 'raw_cylinder_spec_name',
+    'raw_usage_place', 'raw_location', 'raw_condition_code', 'raw_position_user_name',
+    'dashboard_gas_name', 'dashboard_capacity',
+    'dashboard_valve_spec_code', 'dashboard_valve_spec_name', 'dashboard_valve_group_name',
+    'dashboard_cylinder_spec_code', 'dashboard_cylinder_spec_name',
+    'dashboard_usage_place', 'dashboard_location',
+    'dashboard_status', 'dashboard_enduser',
+    'cylinder_type_key', 'cylinder_type_key_raw',
+    'condition_code', 'move_date', 'pressure_due_date', 'last_event_at',
+    'source_updated_at', 'snapshot_updated_at',
+    'status_category', 'is_available',
+    'manufacture_date', 'pressure_test_date', 'pressure_test_term', 'pressure_expire_date',
+    'needs_fcms_fix',
+]
 
 
 class Command(BaseCommand):
@@ -13,82 +68,79 @@ class Command(BaseCommand):
     
     def add_arguments(self, parser):
         parser.add_argument('--full', action='store_true', help='전체 재생성')
+        parser.add_argument('--row-by-row', action='store_true', help='--full 시 집합 연산 대신 용기별 upsert 사용 (기존 방식)')
         parser.add_argument('--cylinder-no', type=str, help='특정 용기만 갱신')
         parser.add_argument('--batch-size', type=int, default=1000, help='배치 크기')
+        parser.add_argument(
+            '--overlap-minutes', type=int, default=sync_cursor.DEFAULT_OVERLAP_MINUTES,
+            help='증분 갱신 시 타임스탬프 워터마크를 겹쳐 읽는 시간 (CDC 지연 적재 대비, 분)'
+        )
     
     def handle(self, *args, **options):
         with connection.cursor() as cursor:
             if options['full']:
-                self.full_sync(cursor, options['batch_size'])
+                if connection.vendor == 'postgresql' and not options['row_by_row']:
+                    self.bulk_full_sync(cursor)
+                else:
+                    self.full_sync(cursor, options['batch_size'])
             elif options['cylinder_no']:
                 self.sync_single(cursor, options['cylinder_no'])
             else:
-                self.incremental_sync(cursor, options['batch_size'])
+                self.incremental_sync(cursor, options['batch_size'], options['overlap_minutes'])
+        # 모든 쓰기가 커밋된 뒤 캐시 세대를 올린다.
+        snapshot_cache.bump_generation()
     
-    def incremental_sync(self, cursor, batch_size):
-        """증분 갱신: VIEW와 스냅샷 비교하여 변경된 것만 업데이트"""
+    def incremental_sync(self, cursor, batch_size, overlap_minutes=sync_cursor.DEFAULT_OVERLAP_MINUTES):
+        """
+        증분 갱신: 소스 테이블별 워터마크(cy_sync_cursor) 이후 변경된 용기만 업데이트
+        - ma_cylinders.UPDATE_DATETIME / tr_latest_cylinder_statuses.MOVE_DATE / tr_cylinder_status_histories.MOVE_DATE
+        - 커서는 스냅샷 쓰기와 같은 트랜잭션에서 전진한다.
+        """
         self.stdout.write("증분 갱신 시작...")
         
-        # 1. VIEW에서 최신 데이터 조회 (변경된 것만)
-        cursor.execute("""
-            SELECT 
-                RTRIM(c."CYLINDER_NO") as "CYLINDER_NO",
-                COALESCE(i."DISPLAY_NAME", i."FORMAL_NAME", '') as gas_name,
-                c."CAPACITY",
-                COALESCE(c."VALVE_SPEC_CODE", '') as valve_spec_code,
-                COALESCE(vs."NAME", '') as valve_spec_name,
-                COALESCE(c."CYLINDER_SPEC_CODE", '') as cylinder_spec_code,
-                COALESCE(cs."NAME", '') as cylinder_spec_name,
-                COALESCE(c."USE_DEPARTMENT_CODE", '') as usage_place,
-                COALESCE(ls."POSITION_USER_NAME", '') as location,
-                ls."CONDITION_CODE",
-                ls."MOVE_DATE",
-                c."WITHSTAND_PRESSURE_MAINTE_DATE",
-                c."MANUFACTURE_DATE",
-                GREATEST(
-                    COALESCE(c."UPDATE_DATETIME", c."ADD_DATETIME"),
-                    COALESCE(ls."MOVE_DATE", NOW())
-                ) as source_updated_at
-            FROM "fcms_cdc"."ma_cylinders" c
-            LEFT JOIN "fcms_cdc"."ma_items" i ON c."ITEM_CODE" = i."ITEM_CODE"
-            LEFT JOIN "fcms_cdc"."ma_cylinder_specs" cs ON c."CYLINDER_SPEC_CODE" = cs."CYLINDER_SPEC_CODE"
-            LEFT JOIN "fcms_cdc"."ma_valve_specs" vs ON c."VALVE_SPEC_CODE" = vs."VALVE_SPEC_CODE"
-            LEFT JOIN "fcms_cdc"."tr_latest_cylinder_statuses" ls ON RTRIM(c."CYLINDER_NO") = RTRIM(ls."CYLINDER_NO")
-            WHERE RTRIM(c."CYLINDER_NO") IN (
-                SELECT cylinder_no FROM cy_cylinder_current
-                WHERE snapshot_updated_at < NOW() - INTERVAL '5 minutes'
-                OR source_updated_at > snapshot_updated_at
-            )
-            OR RTRIM(c."CYLINDER_NO") NOT IN (SELECT cylinder_no FROM cy_cylinder_current)
-            ORDER BY RTRIM(c."CYLINDER_NO")
-            LIMIT %s
-        """, [batch_size])
+        since = sync_cursor.read_watermarks(SYNC_CONSUMER)
+        until = sync_cursor.capture_high_marks(cursor)
+        if not any(since.values()):
+            self.stdout.write(self.style.WARNING("저장된 커서가 없어 전체 용기를 대상으로 갱신합니다. (--full 권장)"))
         
-        rows = cursor.fetchall()
-        self.stdout.write(f"갱신 대상: {len(rows)}건")
+        cylinder_nos = sync_cursor.changed_cylinder_nos(cursor, since, until, overlap_minutes)
+        self.stdout.write(f"갱신 대상: {len(cylinder_nos)}건")
         
         updated = 0
-        for row in rows:
-            try:
-                cylinder_no = row[0] if row and len(row) > 0 else 'UNKNOWN'
-                if not row:
-                    self.stdout.write(self.style.WARNING(f"건너뜀 (용기번호: {cylinder_no}): 데이터 없음"))
-                    continue
-                if len(row) < 14:
-                    self.stdout.write(self.style.WARNING(f"건너뜀 (용기번호: {cylinder_no}): 컬럼 부족 (expected 14, got {len(row)})"))
-                    continue
-                self.upsert_cylinder(cursor, row)
-                updated += 1
-            except Exception as e:
-                cylinder_no = row[0] if row and len(row) > 0 else 'UNKNOWN'
-                self.stdout.write(self.style.ERROR(f"오류 (용기번호: {cylinder_no}): {str(e)}"))
+        with transaction.atomic():
+            for i in range(0, len(cylinder_nos), batch_size):
+                chunk = cylinder_nos[i:i+batch_size]
+                cursor.execute(SOURCE_SQL + """
+                    WHERE RTRIM(c."CYLINDER_NO") = ANY(%s)
+                    ORDER BY RTRIM(c."CYLINDER_NO")
+                """, [chunk])
+                rows = cursor.fetchall()
+                
+                for row in rows:
+                    try:
+                        # 행 단위 savepoint: 한 용기 실패가 전체 트랜잭션을 깨뜨리지 않도록
+                        with transaction.atomic():
+                            self.upsert_cylinder(cursor, row)
+                        updated += 1
+                    except Exception as e:
+                        cylinder_no = row[0] if row and len(row) > 0 else 'UNKNOWN'
+                        self.stdout.write(self.style.ERROR(f"오류 (용기번호: {cylinder_no}): {str(e)}"))
+            
+            # 원천에서 삭제된 용기는 워터마크로 잡히지 않으므로 따로 정리
+            orphaned = snapshot_sync.delete_orphaned_cylinders(cursor)
+            sync_cursor.save_watermarks(SYNC_CONSUMER, until)
         
         self.stdout.write(self.style.SUCCESS(f"갱신 완료: {updated}건"))
+        if orphaned:
+            self.stdout.write(f"원천에 없는 용기 {orphaned}건 삭제")
     
     def full_sync(self, cursor, batch_size):
         """전체 재생성"""
         self.stdout.write("전체 재생성 시작...")
         
+        # 소스 조회 전에 워터마크 상한을 잡아둔다 (이후 변경분은 다음 증분 갱신에서 처리)
+        until = sync_cursor.capture_high_marks(cursor)
+        
         # 기존 데이터 삭제
         cursor.execute("TRUNCATE TABLE cy_cylinder_current;")
         self.stdout.write("기존 데이터 삭제 완료")
@@ -96,7 +148,7 @@ class Command(BaseCommand):
         # VIEW에서 전체 데이터 조회 (모두 가져옴)
         cursor.execute("""
             SELECT 
-                c."CYLINDER_NO",
+                RTRIM(c."CYLINDER_NO") as "CYLINDER_NO",
                 COALESCE(i."DISPLAY_NAME", i."FORMAL_NAME", '') as gas_name,
                 c."CAPACITY",
                 COALESCE(c."VALVE_SPEC_CODE", '') as valve_spec_code,
@@ -117,8 +169,8 @@ class Command(BaseCommand):
             LEFT JOIN "fcms_cdc"."ma_items" i ON c."ITEM_CODE" = i."ITEM_CODE"
             LEFT JOIN "fcms_cdc"."ma_cylinder_specs" cs ON c."CYLINDER_SPEC_CODE" = cs."CYLINDER_SPEC_CODE"
             LEFT JOIN "fcms_cdc"."ma_valve_specs" vs ON c."VALVE_SPEC_CODE" = vs."VALVE_SPEC_CODE"
-            LEFT JOIN "fcms_cdc"."tr_latest_cylinder_statuses" ls ON c."CYLINDER_NO" = ls."CYLINDER_NO"
-            ORDER BY c."CYLINDER_NO"
+            LEFT JOIN "fcms_cdc"."tr_latest_cylinder_statuses" ls ON RTRIM(c."CYLINDER_NO") = RTRIM(ls."CYLINDER_NO")
+            ORDER BY RTRIM(c."CYLINDER_NO")
         """)
         
         # 모든 데이터를 먼저 가져옴 (INSERT로 cursor가 덮어쓰이는 것을 방지)
@@ -141,13 +193,242 @@ class Command(BaseCommand):
             
             self.stdout.write(f"진행: {total}건 처리됨")
         
+        with transaction.atomic():
+            sync_cursor.save_watermarks(SYNC_CONSUMER, until)
+        
         self.stdout.write(self.style.SUCCESS(f"전체 재생성 완료: {total}건"))
     
+    def bulk_full_sync(self, cursor):
+        """
+        전체 재생성 (bulk) - 세션 advisory lock을 잡은 경우에만 실행
+        cron과 수동 --full이 겹치면 같은 스테이징 테이블을 지우고 덮어쓰게 되므로 나중 실행은 건너뛴다.
+        """
+        cursor.execute("SELECT pg_try_advisory_lock(hashtext(%s))", [STAGING_TABLE])
+        if not cursor.fetchone()[0]:
+            self.stdout.write(self.style.WARNING("다른 전체 재생성(--full)이 실행 중이라 건너뜁니다."))
+            return
+        try:
+            self._bulk_full_sync(cursor)
+        finally:
+            cursor.execute("SELECT pg_advisory_unlock(hashtext(%s))", [STAGING_TABLE])
+    
+    def _bulk_full_sync(self, cursor):
+        """
+        전체 재생성 (집합 연산 기반)
+        - 밸브 그룹 / EndUser(예외 → 기본값) / 950·952 상태 보정을 용기별 조회 대신 조인으로 한 번에 계산
+        - 결과는 UNLOGGED 스테이징 테이블에 적재한 뒤 단일 트랜잭션에서 본 테이블과 교체
+        - 교체는 DELETE + INSERT라서 커밋 전까지 조회 쪽은 기존 스냅샷을 그대로 본다 (빈 테이블 노출 없음)
+        - 일별 이동 집계(cy_history_daily_movement)는 교체 중 키 이동 Trigger를 끄고 교체 후 한 번 재계산
+        """
+        self.stdout.write("전체 재생성 시작 (bulk)...")
+        
+        columns = ', '.join(SNAPSHOT_COLUMNS)
+        
+        # 소스 조회 전에 워터마크 상한을 잡아둔다 (이후 변경분은 다음 증분 갱신에서 처리)
+        until = sync_cursor.capture_high_marks(cursor)
+        
+        cursor.execute(f"DROP TABLE IF EXISTS {STAGING_TABLE}")
+        cursor.execute(f"""
+            CREATE UNLOGGED TABLE {STAGING_TABLE}
+            (LIKE cy_cylinder_current INCLUDING DEFAULTS)
+        """)
+        
+        codes = list(CONDITION_CODE_TO_STATUS.keys())
+        statuses = [CONDITION_CODE_TO_STATUS[c] for c in codes]
+        
+        cursor.execute(f"""
+            INSERT INTO {STAGING_TABLE} ({columns})
+            WITH src AS (
+                SELECT DISTINCT ON (RTRIM(c."CYLINDER_NO"))
+                    RTRIM(c."CYLINDER_NO") as cylinder_no,
+                    COALESCE(i."DISPLAY_NAME", i."FORMAL_NAME", '') as gas_name,
+                    c."CAPACITY" as capacity,
+                    COALESCE(c."VALVE_SPEC_CODE", '') as valve_spec_code,
+                    COALESCE(vs."NAME", '') as valve_spec_name,
+                    COALESCE(c."CYLINDER_SPEC_CODE", '') as cylinder_spec_code,
+                    COALESCE(cs."NAME", '') as cylinder_spec_name,
+                    COALESCE(c."USE_DEPARTMENT_CODE", '') as usage_place,
+                    COALESCE(ls."POSITION_USER_NAME", '') as location,
+                    COALESCE(ls."CONDITION_CODE", '') as condition_code,
+                    ls."MOVE_DATE" as move_date,
+                    c."WITHSTAND_PRESSURE_MAINTE_DATE" as withstand_date,
+                    c."MANUFACTURE_DATE" as manufacture_date,
+                    GREATEST(
+                        COALESCE(c."UPDATE_DATETIME", c."ADD_DATETIME"),
+                        COALESCE(ls."MOVE_DATE", NOW())
+                    ) as source_updated_at
+                FROM "fcms_cdc"."ma_cylinders" c
+                LEFT JOIN "fcms_cdc"."ma_items" i ON c."ITEM_CODE" = i."ITEM_CODE"
+                LEFT JOIN "fcms_cdc"."ma_cylinder_specs" cs ON c."CYLINDER_SPEC_CODE" = cs."CYLINDER_SPEC_CODE"
+                LEFT JOIN "fcms_cdc"."ma_valve_specs" vs ON c."VALVE_SPEC_CODE" = vs."VALVE_SPEC_CODE"
+                LEFT JOIN "fcms_cdc"."tr_latest_cylinder_statuses" ls ON RTRIM(c."CYLINDER_NO") = RTRIM(ls."CYLINDER_NO")
+                ORDER BY RTRIM(c."CYLINDER_NO"),
+                         COALESCE(c."UPDATE_DATETIME", c."ADD_DATETIME") DESC NULLS LAST,
+                         ls."MOVE_DATE" DESC NULLS LAST
+            ),
+            -- 폐기/정비(950/952)로 기록된 용기만 히스토리 최신 상태를 조회 (get_latest_condition_code와 동일)
+            hist_latest AS (
+                SELECT DISTINCT ON (RTRIM(h."CYLINDER_NO"))
+                    RTRIM(h."CYLINDER_NO") as cylinder_no,
+                    h."CONDITION_CODE" as condition_code
+                FROM "fcms_cdc"."tr_cylinder_status_histories" h
+                WHERE RTRIM(h."CYLINDER_NO") IN (
+                    SELECT cylinder_no FROM src WHERE condition_code IN ('950', '952')
+                )
+                ORDER BY RTRIM(h."CYLINDER_NO"), h."MOVE_DATE" DESC
+            ),
+            status_map AS (
+                SELECT * FROM unnest(%s::text[], %s::text[]) AS m(code, status)
+            ),
+            enduser_exception AS (
+                SELECT DISTINCT ON (RTRIM(cylinder_no))
+                    RTRIM(cylinder_no) as cylinder_no, enduser
+                FROM cy_enduser_exception
+                WHERE is_active = TRUE
+                ORDER BY RTRIM(cylinder_no), id
+            ),
+            enduser_gas_default AS (
+                SELECT DISTINCT ON (gas_name, capacity)
+                    gas_name, capacity, default_enduser
+                FROM cy_enduser_default
+                WHERE (valve_spec_code IS NULL OR valve_spec_code = '')
+                  AND (cylinder_spec_code IS NULL OR cylinder_spec_code = '')
+                  AND is_active = TRUE
+                ORDER BY gas_name, capacity, id
+            ),
+            enduser_global_default AS (
+                SELECT (
+                    SELECT default_enduser
+                    FROM cy_enduser_default
+                    WHERE (gas_name IS NULL OR gas_name = '')
+                      AND capacity IS NULL
+                      AND (valve_spec_code IS NULL OR valve_spec_code = '')
+                      AND (cylinder_spec_code IS NULL OR cylinder_spec_code = '')
+                      AND is_active = TRUE
+                    ORDER BY id
+                    LIMIT 1
+                ) as default_enduser
+            ),
+            valve_group AS (
+                SELECT DISTINCT ON (RTRIM(vgm.valve_spec_code), RTRIM(vgm.valve_spec_name))
+                    RTRIM(vgm.valve_spec_code) as valve_spec_code,
+                    RTRIM(vgm.valve_spec_name) as valve_spec_name,
+                    vg.group_name
+                FROM cy_valve_group_mapping vgm
+                JOIN cy_valve_group vg ON vgm.group_id = vg.id
+                WHERE vgm.is_active = TRUE
+                  AND vg.is_active = TRUE
+                ORDER BY RTRIM(vgm.valve_spec_code), RTRIM(vgm.valve_spec_name), vgm.id
+            ),
+            resolved AS (
+                SELECT
+                    s.*,
+                    CASE
+                        WHEN s.condition_code IN ('950', '952')
+                         AND COALESCE(hl.condition_code, '') != ''
+                         AND hl.condition_code NOT IN ('950', '952')
+                        THEN hl.condition_code
+                        ELSE s.condition_code
+                    END as effective_condition_code,
+                    COALESCE(
+                        ex.enduser,
+                        ed.default_enduser,
+                        eg.default_enduser,
+                        ea.default_enduser,
+                        'FPK'
+                    ) as enduser,
+                    COALESCE(vg.group_name, '') as valve_group_name
+                FROM src s
+                LEFT JOIN hist_latest hl ON hl.cylinder_no = s.cylinder_no
+                LEFT JOIN enduser_exception ex ON ex.cylinder_no = s.cylinder_no
+                LEFT JOIN cy_enduser_default ed
+                    ON ed.gas_name = s.gas_name
+                   AND ed.capacity = s.capacity
+                   AND ed.valve_spec_code = s.valve_spec_code
+                   AND ed.cylinder_spec_code = s.cylinder_spec_code
+                   AND ed.is_active = TRUE
+                LEFT JOIN enduser_gas_default eg
+                    ON eg.gas_name = s.gas_name
+                   AND eg.capacity = s.capacity
+                CROSS JOIN enduser_global_default ea
+                LEFT JOIN valve_group vg
+                    ON vg.valve_spec_code = BTRIM(s.valve_spec_code)
+                   AND vg.valve_spec_name = BTRIM(s.valve_spec_name)
+            ),
+            final AS (
+                SELECT
+                    r.*,
+                    CASE
+                        WHEN r.effective_condition_code = '' THEN '기타'
+                        ELSE COALESCE(sm.status, '기타')
+                    END as status,
+                    -- generate_type_key와 동일한 문자열: gas|capacity|valve_key|cylinder_spec_code|enduser
+                    MD5(
+                        r.gas_name || '|' ||
+                        CASE WHEN r.capacity IS NULL OR r.capacity = 0 THEN '' ELSE r.capacity::text END || '|' ||
+                        COALESCE(NULLIF(r.valve_group_name, ''), r.valve_spec_code) || '|' ||
+                        r.cylinder_spec_code || '|' ||
+                        r.enduser
+                    ) as type_key
+                FROM resolved r
+                LEFT JOIN status_map sm ON sm.code = BTRIM(r.effective_condition_code)
+            )
+            SELECT
+                cylinder_no,
+                gas_name, capacity,
+                valve_spec_code, valve_spec_name,
+                cylinder_spec_code, cylinder_spec_name,
+                usage_place, location, effective_condition_code, location,
+                gas_name, capacity,
+                valve_spec_code, valve_spec_name, valve_group_name,
+                cylinder_spec_code, cylinder_spec_name,
+                usage_place, location,
+                status, enduser,
+                type_key, type_key,
+                effective_condition_code, move_date, withstand_date, move_date,
+                source_updated_at, NOW(),
+                status, status IN ('보관:미회수', '보관:회수'),
+                manufacture_date,
+                withstand_date,
+                CASE WHEN withstand_date IS NOT NULL THEN 5 END,
+                withstand_date + INTERVAL '1825 days',
+                FALSE
+            FROM final
+        """, [codes, statuses])
+        staged = cursor.rowcount
+        self.stdout.write(f"스테이징 적재 완료: {staged}건")
+        
+        cursor.execute("SELECT to_regclass('cy_history_daily_movement') IS NOT NULL")
+        has_daily_movement = bool(cursor.fetchone()[0])
+        
+        # 교체 (단일 트랜잭션)
+        with transaction.atomic():
+            if has_daily_movement:
+                # 용기마다 이력을 다시 훑는 키 이동 Trigger 대신 교체 후 한 번 재계산 (트랜잭션 로컬 설정)
+                cursor.execute("SELECT set_config('cynow.skip_daily_movement_rekey', 'on', true)")
+            cursor.execute("DELETE FROM cy_cylinder_current")
+            removed = cursor.rowcount
+            cursor.execute(f"""
+                INSERT INTO cy_cylinder_current ({columns})
+                SELECT {columns} FROM {STAGING_TABLE}
+            """)
+            inserted = cursor.rowcount
+            if has_daily_movement:
+                cursor.execute("SELECT set_config('cynow.skip_daily_movement_rekey', 'off', true)")
+                cursor.execute("SELECT cy_history_daily_movement_rebuild()")
+            sync_cursor.save_watermarks(SYNC_CONSUMER, until)
+        
+        cursor.execute(f"DROP TABLE IF EXISTS {STAGING_TABLE}")
+        cursor.execute("ANALYZE cy_cylinder_current")
+        
+        self.stdout.write(f"기존 스냅샷 {removed}건 → 신규 {inserted}건으로 교체")
+        self.stdout.write(self.style.SUCCESS(f"전체 재생성 완료: {inserted}건"))
+    
     def sync_single(self, cursor, cylinder_no):
         """단일 용기 갱신"""
         cursor.execute("""
             SELECT 
-                c."CYLINDER_NO",
+                RTRIM(c."CYLINDER_NO") as "CYLINDER_NO",
                 COALESCE(i."DISPLAY_NAME", i."FORMAL_NAME", '') as gas_name,
                 c."CAPACITY",
                 COALESCE(c."VALVE_SPEC_CODE", '') as valve_spec_code,
@@ -168,8 +449,8 @@ class Command(BaseCommand):
             LEFT JOIN "fcms_cdc"."ma_items" i ON c."ITEM_CODE" = i."ITEM_CODE"
             LEFT JOIN "fcms_cdc"."ma_cylinder_specs" cs ON c."CYLINDER_SPEC_CODE" = cs."CYLINDER_SPEC_CODE"
             LEFT JOIN "fcms_cdc"."ma_valve_specs" vs ON c."VALVE_SPEC_CODE" = vs."VALVE_SPEC_CODE"
-            LEFT JOIN "fcms_cdc"."tr_latest_cylinder_statuses" ls ON c."CYLINDER_NO" = ls."CYLINDER_NO"
-            WHERE c."CYLINDER_NO" = %s
+            LEFT JOIN "fcms_cdc"."tr_latest_cylinder_statuses" ls ON RTRIM(c."CYLINDER_NO") = RTRIM(ls."CYLINDER_NO")
+            WHERE RTRIM(c."CYLINDER_NO") = RTRIM(%s)
         """, [cylinder_no])
         
         row = cursor.fetchone()
@@ -178,13 +459,14 @@ class Command(BaseCommand):
             self.stdout.write(self.style.SUCCESS(f"용기 {cylinder_no} 갱신 완료"))
         else:
             # 용기 삭제된 경우
-            cursor.execute("DELETE FROM cy_cylinder_current WHERE cylinder_no = %s", [cylinder_no])
+            cursor.execute("DELETE FROM cy_cylinder_current WHERE cylinder_no = RTRIM(%s)", [cylinder_no])
             self.stdout.write(f"용기 {cylinder_no} 삭제됨 (스냅샷에서 제거)")
     
     def upsert_cylinder(self, cursor, raw_data):
         """단일 용기 Upsert (실제 테이블 구조에 맞춤)"""
         # Raw 값 추출 (인덱스 변경됨)
-        cylinder_no = raw_data[0]
+        # PK는 RTRIM된 값만 허용 (cy_cylinder_current_no_trimmed_chk)
+        cylinder_no = (raw_data[0] or '').rstrip()
         raw_gas_name = raw_data[1] or ''
         raw_capacity = raw_data[2]
         raw_valve_spec_code = raw_data[3] or ''
@@ -3,6 +3,8 @@ from django.core.management.base import BaseCommand
 from django.db import connection
 from pathlib import Path
 
+from core.utils.snapshot_sync import sync_cylinders
+
 
 class Command(BaseCommand):
     help = 'sync_cylinder_current_single 함수 업데이트 (정책이 없으면 NULL 사용)'
@@ -39,15 +41,9 @@ class Command(BaseCommand):
                 """)
                 
                 cos_cylinders = [row[0] for row in cursor.fetchall()]
-                updated = 0
-                for cylinder_no in cos_cylinders:
-                    try:
-                        cursor.execute("SELECT sync_cylinder_current_single(%s)", [cylinder_no])
-                        updated += 1
-                        if updated % 100 == 0:
-                            self.stdout.write(f"  진행: {updated}/{len(cos_cylinders)}")
-                    except Exception as e:
-                        self.stdout.write(self.style.ERROR(f"  오류 ({cylinder_no}): {str(e)}"))
+                updated, errors = sync_cylinders(cursor, cos_cylinders)
+                if errors:
+                    self.stdout.write(self.style.ERROR(f"  오류: {errors}개 실패 (로그 확인)"))
                 
                 self.stdout.write(self.style.SUCCESS(f"\nCOS 용기 재동기화 완료: {updated}개"))
                 
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.9 on 2026-10-17 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_hiddencylindertype_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncCursor',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('consumer', models.CharField(help_text='커서를 사용하는 동기화 대상 (예: cy_cylinder_current)', max_length=100, verbose_name='소비자')),
+                ('source', models.CharField(help_text='fcms_cdc 소스 테이블명', max_length=100, verbose_name='소스 테이블')),
+                ('last_value', models.CharField(blank=True, help_text='마지막으로 반영한 워터마크 (타임스탬프/시퀀스를 텍스트로 저장)', max_length=64, null=True, verbose_name='마지막 값')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일시')),
+            ],
+            options={
+                'verbose_name': '동기화 커서',
+                'verbose_name_plural': '동기화 커서',
+                'db_table': 'cy_sync_cursor',
+                'unique_together': {('consumer', 'source')},
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.9 on 2026-10-17 09:00
+
+import uuid
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_synccursor'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BackgroundJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.UUIDField(default=uuid.uuid4, editable=False, unique=True, verbose_name='토큰')),
+                ('job_type', models.CharField(help_text='core/jobs.py에 등록된 핸들러 이름', max_length=100, verbose_name='작업 종류')),
+                ('params', models.JSONField(default=dict, verbose_name='파라미터')),
+                ('params_key', models.CharField(help_text='같은 작업 중복 등록 방지용 (job_type + params 해시)', max_length=64, verbose_name='파라미터 키')),
+                ('label', models.CharField(blank=True, default='', max_length=200, verbose_name='표시명')),
+                ('status', models.CharField(choices=[('QUEUED', '대기'), ('RUNNING', '실행중'), ('DONE', '완료'), ('FAILED', '실패')], default='QUEUED', max_length=10, verbose_name='상태')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='시도 횟수')),
+                ('worker', models.CharField(blank=True, default='', max_length=100, verbose_name='워커')),
+                ('error', models.TextField(blank=True, default='', verbose_name='오류')),
+                ('result_path', models.CharField(blank=True, default='', help_text='MEDIA_ROOT 기준 상대 경로', max_length=500, verbose_name='결과 파일')),
+                ('result_filename', models.CharField(blank=True, default='', max_length=255, verbose_name='다운로드 파일명')),
+                ('content_type', models.CharField(blank=True, default='', max_length=100, verbose_name='Content-Type')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='요청일시')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='시작일시')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='종료일시')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='요청자')),
+            ],
+            options={
+                'verbose_name': '백그라운드 작업',
+                'verbose_name_plural': '백그라운드 작업',
+                'db_table': 'cy_background_job',
+                'ordering': ['-created_at'],
+                'indexes': [
+                    models.Index(fields=['status', 'created_at'], name='idx_bg_job_status'),
+                    models.Index(fields=['params_key', 'status'], name='idx_bg_job_params'),
+                ],
+            },
+        ),
+    ]
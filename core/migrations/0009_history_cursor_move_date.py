@@ -0,0 +1,32 @@
+# Generated by Django 5.2.9 on 2026-10-17 09:00
+
+from django.db import migrations
+
+
+def history_cursor_to_move_date(apps, schema_editor):
+    """
+    tr_cylinder_status_histories 커서가 HISTORY_SEQ 값을 담고 있으므로 MOVE_DATE 기준으로 바꾼다.
+    같은 MOVE_DATE 기반인 tr_latest_cylinder_statuses 커서 값으로 맞추고, 없으면 지운다(다음 실행에서 전체 대상).
+    """
+    SyncCursor = apps.get_model('core', 'SyncCursor')
+    for cursor in SyncCursor.objects.filter(source='tr_cylinder_status_histories'):
+        latest = SyncCursor.objects.filter(
+            consumer=cursor.consumer,
+            source='tr_latest_cylinder_statuses',
+        ).first()
+        if latest and latest.last_value:
+            cursor.last_value = latest.last_value
+            cursor.save(update_fields=['last_value'])
+        else:
+            cursor.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_backgroundjob'),
+    ]
+
+    operations = [
+        migrations.RunPython(history_cursor_to_move_date, migrations.RunPython.noop),
+    ]
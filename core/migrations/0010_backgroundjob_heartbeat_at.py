@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-18 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_history_cursor_move_date'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='backgroundjob',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, help_text='실행 중 워커가 주기적으로 갱신 (끊기면 reap_stale이 정리)', null=True, verbose_name='최근 응답'),
+        ),
+    ]
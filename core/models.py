@@ -1,3 +1,5 @@
+import uuid
+
 from django.db import models
 from django.utils import timezone
 
@@ -232,3 +234,101 @@ class HiddenCylinderType(models.Model):
     
     def __str__(self):
         return f"[숨김] {self.gas_name} {self.capacity or ''} {self.enduser or ''}"
+
+
+class SyncCursor(models.Model):
+    """CDC 소스 테이블별 증분 동기화 커서 (high-water mark)"""
+    consumer = models.CharField(
+        max_length=100,
+        verbose_name='소비자',
+        help_text='커서를 사용하는 동기화 대상 (예: cy_cylinder_current)'
+    )
+    source = models.CharField(
+        max_length=100,
+        verbose_name='소스 테이블',
+        help_text='fcms_cdc 소스 테이블명'
+    )
+    last_value = models.CharField(
+        max_length=64,
+        null=True,
+        blank=True,
+        verbose_name='마지막 값',
+        help_text='마지막으로 반영한 워터마크 (타임스탬프/시퀀스를 텍스트로 저장)'
+    )
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일시')
+    
+    class Meta:
+        db_table = 'cy_sync_cursor'
+        verbose_name = '동기화 커서'
+        verbose_name_plural = '동기화 커서'
+        unique_together = [['consumer', 'source']]
+    
+    def __str__(self):
+        return f"{self.consumer} / {self.source} = {self.last_value}"
+
+
+class JobStatus(models.TextChoices):
+    QUEUED = 'QUEUED', '대기'
+    RUNNING = 'RUNNING', '실행중'
+    DONE = 'DONE', '완료'
+    FAILED = 'FAILED', '실패'
+
+
+class BackgroundJob(models.Model):
+    """백그라운드 작업 (Excel/PDF/DOCX 생성) - core/jobs.py, run_jobs 명령이 처리"""
+    token = models.UUIDField(default=uuid.uuid4, unique=True, editable=False, verbose_name='토큰')
+    job_type = models.CharField(max_length=100, verbose_name='작업 종류', help_text='core/jobs.py에 등록된 핸들러 이름')
+    params = models.JSONField(default=dict, verbose_name='파라미터')
+    params_key = models.CharField(
+        max_length=64,
+        verbose_name='파라미터 키',
+        help_text='같은 작업 중복 등록 방지용 (job_type + params 해시)'
+    )
+    label = models.CharField(max_length=200, blank=True, default='', verbose_name='표시명')
+    status = models.CharField(
+        max_length=10,
+        choices=JobStatus.choices,
+        default=JobStatus.QUEUED,
+        verbose_name='상태'
+    )
+    created_by = models.ForeignKey(
+        'auth.User',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        verbose_name='요청자'
+    )
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name='시도 횟수')
+    worker = models.CharField(max_length=100, blank=True, default='', verbose_name='워커')
+    error = models.TextField(blank=True, default='', verbose_name='오류')
+    result_path = models.CharField(
+        max_length=500,
+        blank=True,
+        default='',
+        verbose_name='결과 파일',
+        help_text='MEDIA_ROOT 기준 상대 경로'
+    )
+    result_filename = models.CharField(max_length=255, blank=True, default='', verbose_name='다운로드 파일명')
+    content_type = models.CharField(max_length=100, blank=True, default='', verbose_name='Content-Type')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='요청일시')
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name='시작일시')
+    heartbeat_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='최근 응답',
+        help_text='실행 중 워커가 주기적으로 갱신 (끊기면 reap_stale이 정리)'
+    )
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name='종료일시')
+    
+    class Meta:
+        db_table = 'cy_background_job'
+        verbose_name = '백그라운드 작업'
+        verbose_name_plural = '백그라운드 작업'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='idx_bg_job_status'),
+            models.Index(fields=['params_key', 'status'], name='idx_bg_job_params'),
+        ]
+    
+    def __str__(self):
+        return f"[{self.get_status_display()}] {self.label or self.job_type}"
@@ -1,7 +1,11 @@
 """cy_cylinder_current 테이블 조회 전용 Repository"""
+import json
+import re
 from django.db import connection
-from typing import List, Dict, Optional
-from core.utils.translation import translate_list
+from typing import Dict, Iterator, List, Optional, Tuple
+from core.repositories.history_repository import HistoryRepository
+from core.utils import page_cursor, snapshot_cache
+from core.utils.translation import translate_list, translate_text
 
 
 class CylinderRepository:
@@ -10,29 +14,74 @@ class CylinderRepository:
     @staticmethod
     def _current_table_sql() -> str:
         """
-        cy_cylinder_current는 Oracle CHAR trailing space 때문에
-        같은 용기번호가 공백 유무로 중복될 수 있다. (예: '22E27597' vs '22E27597   ')
-        PostgreSQL에서는 DISTINCT ON으로 RTRIM(cylinder_no) 기준 최신 1행만 사용한다.
+        cy_cylinder_current FROM 절
+
+        cylinder_no는 RTRIM된 값만 저장된다. (CHECK 제약 + PK, compact_cylinder_current 참고)
+        예전처럼 공백 유무로 중복될 수 없으므로 DISTINCT ON 없이 테이블을 바로 읽는다.
         """
-        if connection.vendor == 'postgresql':
-            return """
-                (
-                    SELECT DISTINCT ON (RTRIM(cylinder_no)) *
-                    FROM cy_cylinder_current
-                    ORDER BY RTRIM(cylinder_no), snapshot_updated_at DESC
-                ) c
-            """
         return "cy_cylinder_current c"
     
+    _rollup_available: Optional[bool] = None
+
+    _search_doc_available: Optional[bool] = None
+
+    @classmethod
+    def _has_search_doc(cls) -> bool:
+        """cy_cylinder_current.search_doc 적용 여부 (sql/create_cylinder_search_doc.sql, 프로세스당 1회 확인)"""
+        if cls._search_doc_available is None:
+            if connection.vendor != 'postgresql':
+                cls._search_doc_available = False
+            else:
+                with connection.cursor() as cursor:
+                    cursor.execute("""
+                        SELECT 1 FROM information_schema.columns
+                        WHERE table_name = 'cy_cylinder_current' AND column_name = 'search_doc'
+                    """)
+                    cls._search_doc_available = cursor.fetchone() is not None
+        return cls._search_doc_available
+
+    @classmethod
+    def _has_inventory_rollup(cls) -> bool:
+        """cy_inventory_rollup 적용 여부 (sql/create_inventory_rollup.sql, 프로세스당 1회 확인)"""
+        if cls._rollup_available is None:
+            if connection.vendor != 'postgresql':
+                cls._rollup_available = False
+            else:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT to_regclass('cy_inventory_rollup') IS NOT NULL")
+                    cls._rollup_available = bool(cursor.fetchone()[0])
+        return cls._rollup_available
+
     @staticmethod
     def get_inventory_summary(filters: Optional[Dict] = None) -> List[Dict]:
         """
         용기종류별 집계 (대시보드용)
         실제로 fcms_cdc.ma_cylinders에 존재하는 용기만 조회 (고아 데이터 제외)
         
+        cy_inventory_rollup이 있으면 스냅샷 Trigger가 증감으로 유지하는 사전 집계를 읽고,
+        없으면(미적용 환경/SQLite) 스냅샷을 직접 GROUP BY 한다.
+        
+        집계 결과(번역 전)는 스냅샷 버전 기준 공유 캐시(core.utils.snapshot_cache)에 두고,
+        번역은 캐시에서 꺼낸 뒤 적용해 번역 수정이 바로 반영되도록 한다.
+        
         Returns:
             List[Dict]: 용기종류 × 상태 × 위치별 수량 집계
         """
+        results = snapshot_cache.cached(
+            'inventory_summary',
+            filters or {},
+            lambda: CylinderRepository._query_inventory_summary(filters),
+        )
+        
+        # 번역 적용
+        return translate_list(results, ['gas_name', 'valve_spec', 'cylinder_spec'])
+
+    @staticmethod
+    def _query_inventory_summary(filters: Optional[Dict] = None) -> List[Dict]:
+        """get_inventory_summary()의 DB 집계 (번역 전)"""
+        if CylinderRepository._has_inventory_rollup():
+            return CylinderRepository._get_inventory_summary_from_rollup(filters)
+        
         with connection.cursor() as cursor:
             current_table = CylinderRepository._current_table_sql()
             query = """
@@ -78,7 +127,7 @@ class CylinderRepository:
                     RTRIM(c.dashboard_valve_spec_name) as valve_spec_raw
                 FROM {current_table}
                 INNER JOIN "fcms_cdc"."ma_cylinders" mc 
-                    ON RTRIM(c.cylinder_no) = RTRIM(mc."CYLINDER_NO")
+                    ON c.cylinder_no = RTRIM(mc."CYLINDER_NO")
                 WHERE c.dashboard_enduser IS NOT NULL
             """
             query = query.format(current_table=current_table)
@@ -143,13 +192,242 @@ class CylinderRepository:
             
             cursor.execute(query, params)
             columns = [col[0] for col in cursor.description]
-            results = [dict(zip(columns, row)) for row in cursor.fetchall()]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    @staticmethod
+    def _get_inventory_summary_from_rollup(filters: Optional[Dict] = None) -> List[Dict]:
+        """_query_inventory_summary()의 롤업 테이블 경로 (컬럼/정렬 동일, 번역 전)"""
+        query = """
+            SELECT
+                r.cylinder_type_key,
+                r.gas_name,
+                r.capacity,
+                r.valve_spec,
+                r.cylinder_spec,
+                r.status,
+                r.enduser,
+                r.qty,
+                r.available_qty,
+                r.valve_spec_raw
+            FROM cy_inventory_rollup r
+            WHERE r.qty > 0
+        """
+        params = []
+        if filters:
+            if 'gas_name' in filters:
+                query += " AND r.gas_name = %s"
+                params.append(filters['gas_name'])
+            if 'status' in filters:
+                query += " AND r.status = %s"
+                params.append(filters['status'])
+            if 'cylinder_type_key' in filters:
+                query += " AND r.cylinder_type_key = %s"
+                params.append(filters['cylinder_type_key'])
+            if 'enduser' in filters:
+                query += " AND r.enduser = RTRIM(%s)"
+                params.append(filters['enduser'])
+        query += " ORDER BY r.gas_name, r.enduser, r.status"
+        
+        with connection.cursor() as cursor:
+            cursor.execute(query, params)
+            columns = [col[0] for col in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    
+    # 정렬 컬럼 매핑 (SQL injection 방지)
+    _SORT_COLUMNS = {
+        'cylinder_no': 'c.cylinder_no',
+        'gas_name': 'c.dashboard_gas_name',
+        'status': 'c.dashboard_status',
+        'location': 'c.dashboard_location',
+        'capacity': 'c.dashboard_capacity',
+        'last_event_at': 'c.last_event_at',
+        'pressure_expire_date': 'c.pressure_expire_date',
+        'manufacture_date': 'c.manufacture_date',
+    }
+
+    # 목록 조회 SELECT (get_cylinder_list / get_cylinder_page 공용)
+    _LIST_SELECT_SQL = """
+            SELECT 
+                c.cylinder_no,
+                c.dashboard_gas_name as gas_name,
+                c.dashboard_capacity as capacity,
+                -- 밸브 그룹명이 빈 문자열이면 원래 밸브명으로 fallback (빈 문자열 때문에 '-'로 보이는 문제 방지)
+                COALESCE(
+                    NULLIF(RTRIM(c.dashboard_valve_group_name), ''),
+                    NULLIF(RTRIM(c.dashboard_valve_spec_name), ''),
+                    ''
+                ) as valve_spec,
+                -- 파싱은 번역/그룹명 대신 raw 밸브명으로 수행할 수 있도록 별도 제공
+                COALESCE(NULLIF(RTRIM(c.dashboard_valve_spec_name), ''), '') as valve_spec_raw,
+                c.dashboard_cylinder_spec_name as cylinder_spec,
+                c.dashboard_usage_place as usage_place,
+                c.dashboard_status as status,
+                c.dashboard_location as location,
+                c.pressure_due_date,
+                c.last_event_at,
+                c.snapshot_updated_at as source_updated_at,
+                c.cylinder_type_key,
+                c.manufacture_date,
+                c.pressure_test_date,
+                c.pressure_test_term,
+                c.pressure_expire_date,
+                c.needs_fcms_fix,
+                tcs."MOVE_REPORT_NO" as move_report_no,
+                CONCAT(
+                    COALESCE(tcs."MANUFACTURE_LOT_NO", ''),
+                    CASE WHEN tcs."MANUFACTURE_LOT_BRANCH" IS NOT NULL AND tcs."MANUFACTURE_LOT_BRANCH" != '' 
+                         THEN CONCAT('-', tcs."MANUFACTURE_LOT_BRANCH") 
+                         ELSE '' 
+                    END
+                ) as manufacture_lot,
+                CONCAT(
+                    COALESCE(tcs."FILLING_LOT_HEADER", ''),
+                    COALESCE(tcs."FILLING_LOT_NO", ''),
+                    CASE WHEN tcs."FILLING_LOT_BRANCH" IS NOT NULL AND tcs."FILLING_LOT_BRANCH" != '' 
+                         THEN CONCAT('-', tcs."FILLING_LOT_BRANCH") 
+                         ELSE '' 
+                    END
+                ) as filling_lot,
+                mc."WEIGHT" as cylinder_weight
+    """
+
+    # 목록/개수 공용 FROM 절 (스냅샷 + 원천 존재 여부 + 최신 상태)
+    _LIST_FROM_SQL = """
+        FROM cy_cylinder_current c
+        INNER JOIN "fcms_cdc"."ma_cylinders" mc
+            ON c.cylinder_no = RTRIM(mc."CYLINDER_NO")
+        LEFT JOIN "fcms_cdc"."tr_latest_cylinder_statuses" tcs
+            ON RTRIM(mc."CYLINDER_NO") = RTRIM(tcs."CYLINDER_NO")
+        WHERE c.dashboard_enduser IS NOT NULL
+    """
+
+    @staticmethod
+    def _build_list_conditions(filters: Optional[Dict] = None, days: Optional[int] = None, search_query: Optional[str] = None) -> Tuple[List[str], List]:
+        """
+        목록/개수 공용 WHERE 조건
+
+        개수(get_cylinder_count)와 목록(get_cylinder_list/get_cylinder_page)이 같은 조건을 써야
+        페이지 수가 실제 목록과 어긋나지 않는다.
+
+        Returns:
+            (조건 리스트, 파라미터 리스트)
+        """
+        params = []
+        conditions = []
+        
+        # 검색어 처리 (다중어 검색: 공백으로 구분된 각 단어가 모두 매칭되어야 함)
+        if search_query and search_query.strip() and CylinderRepository._has_search_doc():
+            # 6개 필드를 이어 붙인 search_doc(pg_trgm GIN 인덱스)에서 단어별로 찾는다.
+            for word in search_query.strip().split():
+                conditions.append("c.search_doc ILIKE %s")
+                params.append(f"%{word}%")
+        elif search_query and search_query.strip():
+            search_words = search_query.strip().split()
+            word_conditions = []
             
-            # 번역 적용
-            results = translate_list(results, ['gas_name', 'valve_spec', 'cylinder_spec'])
+            for word in search_words:
+                if not word:
+                    continue
+                search_term = f"%{word}%"
+                # 각 단어는 6개 필드 중 하나라도 일치하면 됨 (OR)
+                search_conditions = [
+                    "c.cylinder_no ILIKE %s",  # 용기번호
+                    "COALESCE(NULLIF(RTRIM(c.dashboard_valve_group_name), ''), NULLIF(RTRIM(c.dashboard_valve_spec_name), ''), '') ILIKE %s",  # 밸브형식
+                    "c.dashboard_cylinder_spec_name ILIKE %s",  # 용기재질
+                    "CONCAT(COALESCE(tcs.\"MANUFACTURE_LOT_NO\", ''), CASE WHEN tcs.\"MANUFACTURE_LOT_BRANCH\" IS NOT NULL AND tcs.\"MANUFACTURE_LOT_BRANCH\" != '' THEN CONCAT('-', tcs.\"MANUFACTURE_LOT_BRANCH\") ELSE '' END) ILIKE %s",  # 제조lot
+                    "CONCAT(COALESCE(tcs.\"FILLING_LOT_HEADER\", ''), COALESCE(tcs.\"FILLING_LOT_NO\", ''), CASE WHEN tcs.\"FILLING_LOT_BRANCH\" IS NOT NULL AND tcs.\"FILLING_LOT_BRANCH\" != '' THEN CONCAT('-', tcs.\"FILLING_LOT_BRANCH\") ELSE '' END) ILIKE %s",  # 충전lot
+                    "tcs.\"MOVE_REPORT_NO\" ILIKE %s"  # 최근이동서
+                ]
+                word_conditions.append(f"({' OR '.join(search_conditions)})")
+                params.extend([search_term] * 6)  # 각 조건마다 같은 검색어 사용
             
-            return results
+            # 모든 단어가 매칭되어야 함 (AND)
+            if word_conditions:
+                conditions.append(f"({' AND '.join(word_conditions)})")
+        
+        if filters:
+            if 'cylinder_no' in filters:
+                conditions.append("c.cylinder_no = RTRIM(%s)")
+                params.append(filters['cylinder_no'])
+            if 'gas_name' in filters:
+                conditions.append("c.dashboard_gas_name = %s")
+                params.append(filters['gas_name'])
+            if 'gases' in filters and filters['gases']:
+                gas_list = filters['gases']
+                placeholders = ', '.join(['%s'] * len(gas_list))
+                conditions.append(f"c.dashboard_gas_name IN ({placeholders})")
+                params.extend(gas_list)
+            # 단일 상태 필터 (보관:미회수/보관:회수는 condition_code로 분리)
+            if 'status' in filters:
+                st = filters['status']
+                if st == '보관:미회수':
+                    conditions.append("(c.dashboard_status = '보관:미회수' OR (c.dashboard_status = '보관' AND COALESCE(c.condition_code, '') != '102'))")
+                elif st == '보관:회수':
+                    conditions.append("(c.dashboard_status = '보관:회수' OR (c.dashboard_status = '보관' AND c.condition_code = '102'))")
+                else:
+                    conditions.append("c.dashboard_status = %s")
+                    params.append(st)
+            # 다중 상태 필터 (보관:미회수/보관:회수 특별 처리)
+            if 'statuses' in filters and filters['statuses']:
+                status_list = filters['statuses']
+                normal_statuses = []
+                has_bogwan_mihoesu = False
+                has_bogwan_hoesu = False
+                for st in status_list:
+                    if st == '보관:미회수':
+                        has_bogwan_mihoesu = True
+                    elif st == '보관:회수':
+                        has_bogwan_hoesu = True
+                    else:
+                        normal_statuses.append(st)
+                or_conditions = []
+                if normal_statuses:
+                    placeholders = ', '.join(['%s'] * len(normal_statuses))
+                    or_conditions.append(f"c.dashboard_status IN ({placeholders})")
+                    params.extend(normal_statuses)
+                if has_bogwan_mihoesu:
+                    or_conditions.append("(c.dashboard_status = '보관:미회수' OR (c.dashboard_status = '보관' AND COALESCE(c.condition_code, '') != '102'))")
+                if has_bogwan_hoesu:
+                    or_conditions.append("(c.dashboard_status = '보관:회수' OR (c.dashboard_status = '보관' AND c.condition_code = '102'))")
+                if or_conditions:
+                    conditions.append(f"({' OR '.join(or_conditions)})")
+            if 'location' in filters:
+                conditions.append("c.dashboard_location = %s")
+                params.append(filters['location'])
+            if 'locations' in filters and filters['locations']:
+                loc_list = filters['locations']
+                placeholders = ', '.join(['%s'] * len(loc_list))
+                conditions.append(f"c.dashboard_location IN ({placeholders})")
+                params.extend(loc_list)
+            if 'cylinder_type_key' in filters:
+                conditions.append("c.cylinder_type_key = %s")
+                params.append(filters['cylinder_type_key'])
+            if 'cylinder_type_keys' in filters and filters['cylinder_type_keys']:
+                keys = filters['cylinder_type_keys']
+                placeholders = ', '.join(['%s'] * len(keys))
+                conditions.append(f"c.cylinder_type_key IN ({placeholders})")
+                params.extend(keys)
+            if 'enduser' in filters:
+                conditions.append("c.dashboard_enduser = %s")
+                params.append(filters['enduser'])
+            if 'valve_spec' in filters:
+                conditions.append("COALESCE(NULLIF(RTRIM(c.dashboard_valve_group_name), ''), NULLIF(RTRIM(c.dashboard_valve_spec_name), ''), '') = %s")
+                params.append(filters['valve_spec'])
+            if 'cylinder_spec' in filters:
+                conditions.append("c.dashboard_cylinder_spec_name = %s")
+                params.append(filters['cylinder_spec'])
+        
+        if days is not None:
+            conditions.append("(c.last_event_at IS NULL OR c.last_event_at >= NOW() - INTERVAL %s)")
+            params.append(f'{days} days')
+        
+        return conditions, params
     
+    @staticmethod
+    def _translate_list_rows(results: List[Dict]) -> List[Dict]:
+        # valve_spec_raw는 파싱용 raw 값이므로 번역하지 않는다.
+        return translate_list(results, ['gas_name', 'valve_spec', 'cylinder_spec', 'usage_place', 'location'])
+
     @staticmethod
     def get_cylinder_list(filters: Optional[Dict] = None, limit: Optional[int] = None, offset: Optional[int] = None, days: Optional[int] = None, sort_by: str = 'cylinder_no', sort_order: str = 'asc', search_query: Optional[str] = None) -> List[Dict]:
         """
@@ -158,7 +436,7 @@ class CylinderRepository:
         Args:
             filters: 필터 조건
             limit: 최대 개수
-            offset: 오프셋 (페이지네이션용)
+            offset: 오프셋 (페이지네이션용, 깊은 페이지는 get_cylinder_page 권장)
             days: 최근 N일 이내 데이터만 (last_event_at 기준)
             sort_by: 정렬 기준 컬럼
             sort_order: 정렬 순서 (asc/desc)
@@ -167,196 +445,327 @@ class CylinderRepository:
         Returns:
             List[Dict]: 개별 용기 정보
         """
+        conditions, params = CylinderRepository._build_list_conditions(filters, days, search_query)
+        query = CylinderRepository._LIST_SELECT_SQL + CylinderRepository._LIST_FROM_SQL
+        if conditions:
+            query += " AND " + " AND ".join(conditions)
+        
+        order_col = CylinderRepository._SORT_COLUMNS.get(sort_by, 'c.cylinder_no')
+        order_dir = 'DESC' if sort_order == 'desc' else 'ASC'
+        query += f" ORDER BY {order_col} {order_dir}"
+        
+        if limit:
+            query += " LIMIT %s"
+            params.append(int(limit))
+        if offset:
+            query += " OFFSET %s"
+            params.append(int(offset))
+        
         with connection.cursor() as cursor:
-            current_table = CylinderRepository._current_table_sql()
-            query = """
-                SELECT 
-                    RTRIM(c.cylinder_no) as cylinder_no,
-                    c.dashboard_gas_name as gas_name,
-                    c.dashboard_capacity as capacity,
-                    -- 밸브 그룹명이 빈 문자열이면 원래 밸브명으로 fallback (빈 문자열 때문에 '-'로 보이는 문제 방지)
-                    COALESCE(
-                        NULLIF(RTRIM(c.dashboard_valve_group_name), ''),
-                        NULLIF(RTRIM(c.dashboard_valve_spec_name), ''),
-                        ''
-                    ) as valve_spec,
-                    -- 파싱은 번역/그룹명 대신 raw 밸브명으로 수행할 수 있도록 별도 제공
-                    COALESCE(NULLIF(RTRIM(c.dashboard_valve_spec_name), ''), '') as valve_spec_raw,
-                    c.dashboard_cylinder_spec_name as cylinder_spec,
-                    c.dashboard_usage_place as usage_place,
-                    c.dashboard_status as status,
-                    c.dashboard_location as location,
-                    c.pressure_due_date,
-                    c.last_event_at,
-                    c.snapshot_updated_at as source_updated_at,
-                    c.cylinder_type_key,
-                    c.manufacture_date,
-                    c.pressure_test_date,
-                    c.pressure_test_term,
-                    c.pressure_expire_date,
-                    c.needs_fcms_fix,
-                    tcs."MOVE_REPORT_NO" as move_report_no,
-                    CONCAT(
-                        COALESCE(tcs."MANUFACTURE_LOT_NO", ''),
-                        CASE WHEN tcs."MANUFACTURE_LOT_BRANCH" IS NOT NULL AND tcs."MANUFACTURE_LOT_BRANCH" != '' 
-                             THEN CONCAT('-', tcs."MANUFACTURE_LOT_BRANCH") 
-                             ELSE '' 
-                        END
-                    ) as manufacture_lot,
-                    CONCAT(
-                        COALESCE(tcs."FILLING_LOT_HEADER", ''),
-                        COALESCE(tcs."FILLING_LOT_NO", ''),
-                        CASE WHEN tcs."FILLING_LOT_BRANCH" IS NOT NULL AND tcs."FILLING_LOT_BRANCH" != '' 
-                             THEN CONCAT('-', tcs."FILLING_LOT_BRANCH") 
-                             ELSE '' 
-                        END
-                    ) as filling_lot,
-                    mc."WEIGHT" as cylinder_weight
-                FROM {current_table}
-                INNER JOIN "fcms_cdc"."ma_cylinders" mc 
-                    ON RTRIM(c.cylinder_no) = RTRIM(mc."CYLINDER_NO")
-                LEFT JOIN "fcms_cdc"."tr_latest_cylinder_statuses" tcs
-                    ON RTRIM(mc."CYLINDER_NO") = RTRIM(tcs."CYLINDER_NO")
-                WHERE c.dashboard_enduser IS NOT NULL
-            """
-            query = query.format(current_table=current_table)
-            
-            params = []
-            conditions = []
-            
-            # 검색어 처리 (다중어 검색: 공백으로 구분된 각 단어가 모두 매칭되어야 함)
-            if search_query and search_query.strip():
-                search_words = search_query.strip().split()
-                word_conditions = []
-                
-                for word in search_words:
-                    if not word:
-                        continue
-                    search_term = f"%{word}%"
-                    # 각 단어는 6개 필드 중 하나라도 일치하면 됨 (OR)
-                    search_conditions = [
-                        "c.cylinder_no ILIKE %s",  # 용기번호
-                        "COALESCE(NULLIF(RTRIM(c.dashboard_valve_group_name), ''), NULLIF(RTRIM(c.dashboard_valve_spec_name), ''), '') ILIKE %s",  # 밸브형식
-                        "c.dashboard_cylinder_spec_name ILIKE %s",  # 용기재질
-                        "CONCAT(COALESCE(tcs.\"MANUFACTURE_LOT_NO\", ''), CASE WHEN tcs.\"MANUFACTURE_LOT_BRANCH\" IS NOT NULL AND tcs.\"MANUFACTURE_LOT_BRANCH\" != '' THEN CONCAT('-', tcs.\"MANUFACTURE_LOT_BRANCH\") ELSE '' END) ILIKE %s",  # 제조lot
-                        "CONCAT(COALESCE(tcs.\"FILLING_LOT_HEADER\", ''), COALESCE(tcs.\"FILLING_LOT_NO\", ''), CASE WHEN tcs.\"FILLING_LOT_BRANCH\" IS NOT NULL AND tcs.\"FILLING_LOT_BRANCH\" != '' THEN CONCAT('-', tcs.\"FILLING_LOT_BRANCH\") ELSE '' END) ILIKE %s",  # 충전lot
-                        "tcs.\"MOVE_REPORT_NO\" ILIKE %s"  # 최근이동서
-                    ]
-                    word_conditions.append(f"({' OR '.join(search_conditions)})")
-                    params.extend([search_term] * 6)  # 각 조건마다 같은 검색어 사용
-                
-                # 모든 단어가 매칭되어야 함 (AND)
-                if word_conditions:
-                    conditions.append(f"({' AND '.join(word_conditions)})")
-            
-            if filters:
-                if 'cylinder_no' in filters:
-                    conditions.append("RTRIM(c.cylinder_no) = %s")
-                    params.append(filters['cylinder_no'])
-                if 'gas_name' in filters:
-                    conditions.append("c.dashboard_gas_name = %s")
-                    params.append(filters['gas_name'])
-                if 'gases' in filters and filters['gases']:
-                    gas_list = filters['gases']
-                    placeholders = ', '.join(['%s'] * len(gas_list))
-                    conditions.append(f"c.dashboard_gas_name IN ({placeholders})")
-                    params.extend(gas_list)
-                # 단일 상태 필터 (보관:미회수/보관:회수는 condition_code로 분리)
-                if 'status' in filters:
-                    st = filters['status']
-                    if st == '보관:미회수':
-                        conditions.append("(c.dashboard_status = '보관:미회수' OR (c.dashboard_status = '보관' AND COALESCE(c.condition_code, '') != '102'))")
-                    elif st == '보관:회수':
-                        conditions.append("(c.dashboard_status = '보관:회수' OR (c.dashboard_status = '보관' AND c.condition_code = '102'))")
-                    else:
-                        conditions.append("c.dashboard_status = %s")
-                        params.append(st)
-                # 다중 상태 필터 (보관:미회수/보관:회수 특별 처리)
-                if 'statuses' in filters and filters['statuses']:
-                    status_list = filters['statuses']
-                    normal_statuses = []
-                    has_bogwan_mihoesu = False
-                    has_bogwan_hoesu = False
-                    for st in status_list:
-                        if st == '보관:미회수':
-                            has_bogwan_mihoesu = True
-                        elif st == '보관:회수':
-                            has_bogwan_hoesu = True
-                        else:
-                            normal_statuses.append(st)
-                    or_conditions = []
-                    if normal_statuses:
-                        placeholders = ', '.join(['%s'] * len(normal_statuses))
-                        or_conditions.append(f"c.dashboard_status IN ({placeholders})")
-                        params.extend(normal_statuses)
-                    if has_bogwan_mihoesu:
-                        or_conditions.append("(c.dashboard_status = '보관:미회수' OR (c.dashboard_status = '보관' AND COALESCE(c.condition_code, '') != '102'))")
-                    if has_bogwan_hoesu:
-                        or_conditions.append("(c.dashboard_status = '보관:회수' OR (c.dashboard_status = '보관' AND c.condition_code = '102'))")
-                    if or_conditions:
-                        conditions.append(f"({' OR '.join(or_conditions)})")
-                if 'location' in filters:
-                    conditions.append("c.dashboard_location = %s")
-                    params.append(filters['location'])
-                if 'locations' in filters and filters['locations']:
-                    loc_list = filters['locations']
-                    placeholders = ', '.join(['%s'] * len(loc_list))
-                    conditions.append(f"c.dashboard_location IN ({placeholders})")
-                    params.extend(loc_list)
-                if 'cylinder_type_key' in filters:
-                    conditions.append("c.cylinder_type_key = %s")
-                    params.append(filters['cylinder_type_key'])
-                if 'cylinder_type_keys' in filters and filters['cylinder_type_keys']:
-                    keys = filters['cylinder_type_keys']
-                    placeholders = ', '.join(['%s'] * len(keys))
-                    conditions.append(f"c.cylinder_type_key IN ({placeholders})")
-                    params.extend(keys)
-                if 'enduser' in filters:
-                    conditions.append("c.dashboard_enduser = %s")
-                    params.append(filters['enduser'])
-                if 'valve_spec' in filters:
-                    conditions.append("COALESCE(NULLIF(RTRIM(c.dashboard_valve_group_name), ''), NULLIF(RTRIM(c.dashboard_valve_spec_name), ''), '') = %s")
-                    params.append(filters['valve_spec'])
-                if 'cylinder_spec' in filters:
-                    conditions.append("c.dashboard_cylinder_spec_name = %s")
-                    params.append(filters['cylinder_spec'])
-            
-            if days is not None:
-                conditions.append("(c.last_event_at IS NULL OR c.last_event_at >= NOW() - INTERVAL %s)")
-                params.append(f'{days} days')
-            
-            if conditions:
-                query += " AND " + " AND ".join(conditions)
-            
-            # 정렬 컬럼 매핑 (SQL injection 방지)
-            sort_columns = {
-                'cylinder_no': 'RTRIM(c.cylinder_no)',
-                'gas_name': 'c.dashboard_gas_name',
-                'status': 'c.dashboard_status',
-                'location': 'c.dashboard_location',
-                'capacity': 'c.dashboard_capacity',
-                'last_event_at': 'c.last_event_at',
-                'pressure_expire_date': 'c.pressure_expire_date',
-                'manufacture_date': 'c.manufacture_date',
+            cursor.execute(query, params)
+            columns = [col[0] for col in cursor.description]
+            results = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        
+        # 번역 적용
+        return CylinderRepository._translate_list_rows(results)
+
+    @staticmethod
+    def iter_cylinder_list(filters: Optional[Dict] = None, days: Optional[int] = None, sort_by: str = 'cylinder_no', sort_order: str = 'asc', search_query: Optional[str] = None, chunk_size: int = 2000) -> Iterator[Dict]:
+        """
+        개별 용기 리스트를 서버 측 커서로 순차 조회 (엑셀 스트리밍 다운로드용)
+        
+        get_cylinder_list와 같은 조건/정렬이지만 전체 결과를 메모리에 올리지 않고
+        chunk_size 행씩 읽어 번역한 뒤 한 행씩 돌려준다.
+        """
+        conditions, params = CylinderRepository._build_list_conditions(filters, days, search_query)
+        query = CylinderRepository._LIST_SELECT_SQL + CylinderRepository._LIST_FROM_SQL
+        if conditions:
+            query += " AND " + " AND ".join(conditions)
+        
+        order_col = CylinderRepository._SORT_COLUMNS.get(sort_by, 'c.cylinder_no')
+        order_dir = 'DESC' if sort_order == 'desc' else 'ASC'
+        query += f" ORDER BY {order_col} {order_dir}, c.cylinder_no {order_dir}"
+        
+        # PostgreSQL에서는 이름 있는 커서(WITH HOLD)로 열려 서버에서 조금씩 가져온다.
+        with connection.chunked_cursor() as cursor:
+            cursor.execute(query, params)
+            columns = [col[0] for col in cursor.description]
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                results = [dict(zip(columns, row)) for row in rows]
+                yield from CylinderRepository._translate_list_rows(results)
+
+    _tcs_ship_date_column: Optional[str] = None
+
+    _tcs_ship_date_column_ready: bool = False
+
+    @classmethod
+    def _get_tcs_ship_date_column(cls) -> Optional[str]:
+        """
+        fcms_cdc.tr_latest_cylinder_statuses 에서 출하일자(Shipping Date)로 보이는 컬럼 (프로세스당 1회 탐지)
+
+        환경/버전별로 컬럼명이 다를 수 있어 information_schema에서 찾는다.
+        반환값은 소문자 식별자([a-z0-9_])만 허용하므로 SQL에 그대로 넣어도 안전하다.
+        """
+        if cls._tcs_ship_date_column_ready:
+            return cls._tcs_ship_date_column
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT LOWER(column_name) AS col
+                    FROM information_schema.columns
+                    WHERE table_schema = %s
+                      AND table_name = %s
+                    """,
+                    ["fcms_cdc", "tr_latest_cylinder_statuses"],
+                )
+                cols = [r[0] for r in cursor.fetchall() if r and r[0]]
+        except Exception:
+            cols = []
+
+        # 우선순위: 흔한 컬럼명들
+        priority = [
+            "shipping_date",
+            "ship_date",
+            "shipping_dt",
+            "ship_dt",
+            "shipped_date",
+            "out_date",
+            "out_dt",
+            "delivery_date",
+            "deliver_date",
+        ]
+
+        col = None
+        for p in priority:
+            if p in cols:
+                col = p
+                break
+
+        # 다음 후보: ship + date 같은 패턴
+        if col is None:
+            for c in cols:
+                if "ship" in c and ("date" in c or "dt" in c):
+                    col = c
+                    break
+
+        if col is not None and not re.match(r"^[a-z0-9_]+$", col):
+            col = None
+
+        cls._tcs_ship_date_column = col
+        cls._tcs_ship_date_column_ready = True
+        return col
+
+    @staticmethod
+    def _json_rows(value) -> List[Dict]:
+        # psycopg는 json 컬럼을 바로 list로 돌려주지만, 드라이버 설정에 따라 문자열일 수 있다.
+        if value is None:
+            return []
+        if isinstance(value, (str, bytes)):
+            return json.loads(value)
+        return value
+
+    @staticmethod
+    def get_cylinder_detail(cylinder_no: str, history_limit: int = 20, maintenance_limit: int = 20) -> Optional[Dict]:
+        """
+        용기 상세 화면 데이터 (한 번의 조회)
+
+        PK(cylinder_no) 단건 조회에 출하일자, 최근 이력, 메모, 정비 입출고 로그를
+        JSON 집계 서브쿼리로 붙여 한 번의 왕복으로 가져온다.
+
+        Args:
+            cylinder_no: 용기번호 (앞뒤 공백은 제거해서 비교)
+            history_limit: 최근 상태 이력 행 수
+            maintenance_limit: 최근 정비 입출고 로그 행 수
+
+        Returns:
+            None (용기 없음) 또는
+            {
+                'cylinder': 목록과 같은 컬럼 + ship_date,
+                'history': [{'history_seq', 'move_date', 'move_code', 'condition_code',
+                             'location_code', 'move_report_no'}, ...] (최신순),
+                'memos': [{'id', 'parent_id', 'author_name', 'content',
+                           'created_at', 'updated_at'}, ...] (활성 메모/답글, 작성순),
+                'maintenance': [{'id', 'event_type', 'event_date', 'vendor_name',
+                                 'reference_no', 'remarks'}, ...] (최신순),
             }
-            order_col = sort_columns.get(sort_by, 'c.cylinder_no')
-            order_dir = 'DESC' if sort_order == 'desc' else 'ASC'
-            query += f" ORDER BY {order_col} {order_dir}"
-            
-            if limit:
-                query += f" LIMIT {limit}"
-            if offset:
-                query += f" OFFSET {offset}"
-            
+        """
+        cylinder_no = (cylinder_no or '').strip()
+        if not cylinder_no:
+            return None
+
+        if connection.vendor != 'postgresql':
+            cylinders = CylinderRepository.get_cylinder_list(filters={'cylinder_no': cylinder_no}, limit=1)
+            if not cylinders:
+                return None
+            cylinder = cylinders[0]
+            cylinder['ship_date'] = None
+            return {'cylinder': cylinder, 'history': [], 'memos': [], 'maintenance': []}
+
+        ship_col = CylinderRepository._get_tcs_ship_date_column()
+        ship_expr = f'tcs."{ship_col.upper()}"' if ship_col else 'NULL'
+        history_sql = HistoryRepository.cylinder_history_sql(
+            'c.cylinder_no',
+            ['history_seq', 'move_date', 'move_code', 'condition_code', 'location_code', 'move_report_no'],
+        )
+
+        query = CylinderRepository._LIST_SELECT_SQL + f""",
+                {ship_expr} as ship_date,
+                (
+                    SELECT COALESCE(json_agg(x ORDER BY x.move_date DESC NULLS LAST, x.history_seq DESC NULLS LAST), '[]'::json)
+                    FROM ({history_sql} LIMIT %s) x
+                ) as history,
+                (
+                    SELECT COALESCE(json_agg(m ORDER BY m.created_at), '[]'::json)
+                    FROM (
+                        SELECT id, parent_id, author_name, content, created_at, updated_at
+                        FROM cylinder_memo
+                        WHERE cylinder_no = c.cylinder_no
+                          AND is_active
+                    ) m
+                ) as memos,
+                (
+                    SELECT COALESCE(json_agg(l ORDER BY l.event_date DESC, l.id DESC), '[]'::json)
+                    FROM (
+                        SELECT id, event_type, event_date, vendor_name, reference_no, remarks
+                        FROM cylinder_maintenance_log
+                        WHERE cylinder_no = c.cylinder_no
+                        ORDER BY event_date DESC, id DESC
+                        LIMIT %s
+                    ) l
+                ) as maintenance
+        """ + CylinderRepository._LIST_FROM_SQL + " AND c.cylinder_no = %s"
+
+        with connection.cursor() as cursor:
+            cursor.execute(query, [int(history_limit), int(maintenance_limit), cylinder_no])
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            columns = [col[0] for col in cursor.description]
+
+        cylinder = dict(zip(columns, row))
+        history = CylinderRepository._json_rows(cylinder.pop('history'))
+        memos = CylinderRepository._json_rows(cylinder.pop('memos'))
+        maintenance = CylinderRepository._json_rows(cylinder.pop('maintenance'))
+
+        return {
+            'cylinder': CylinderRepository._translate_list_rows([cylinder])[0],
+            'history': history,
+            'memos': memos,
+            'maintenance': maintenance,
+        }
+
+    @staticmethod
+    def get_cylinder_page(filters: Optional[Dict] = None, days: Optional[int] = None, sort_by: str = 'cylinder_no', sort_order: str = 'asc', search_query: Optional[str] = None, page_size: int = 50, cursor_token: Optional[str] = None, offset: Optional[int] = None, last_page_size: Optional[int] = None) -> Dict:
+        """
+        개별 용기 리스트 - Keyset(seek) 페이지네이션
+        
+        OFFSET 대신 (정렬 컬럼, 용기번호) 기준 "이 행 이후/이전" 조건으로 읽으므로
+        몇 번째 페이지든 정렬 인덱스에서 page_size + 1행만 읽는다.
+        정렬 컬럼이 NULL인 행은 PostgreSQL 기본 규칙(ASC: 마지막, DESC: 처음)을 따른다.
+        
+        Args:
+            filters / days / sort_by / sort_order / search_query: get_cylinder_list와 동일
+            page_size: 페이지 크기
+            cursor_token: 이전 응답의 next_cursor/prev_cursor (None이면 첫 페이지)
+            offset: 커서 없이 페이지 번호로 바로 이동할 때의 OFFSET (이후 이전/다음은 커서로 이동)
+            last_page_size: 지정 시 목록 끝에서 이 개수만큼 읽음 (마지막 페이지)
+        
+        Returns:
+            Dict: rows, next_cursor, prev_cursor, has_next, has_previous
+        """
+        sort_by = sort_by if sort_by in CylinderRepository._SORT_COLUMNS else 'cylinder_no'
+        sort_order = 'desc' if sort_order == 'desc' else 'asc'
+        sort_col = CylinderRepository._SORT_COLUMNS[sort_by]
+        
+        seek = None
+        if last_page_size is None and not offset:
+            seek = page_cursor.decode_cursor(cursor_token, sort_by, sort_order)
+        backward = last_page_size is not None or (seek is not None and seek['direction'] == 'prev')
+        
+        conditions, params = CylinderRepository._build_list_conditions(filters, days, search_query)
+        
+        # 읽는 방향 기준 정렬: 역방향(이전 페이지/마지막 페이지)은 정렬을 뒤집어 읽고 나중에 되돌린다.
+        desc = (sort_order == 'desc') != backward
+        nulls_last = (sort_order == 'asc') != backward
+        cmp_op = '<' if desc else '>'
+        
+        if seek is not None:
+            if sort_by == 'cylinder_no':
+                conditions.append(f"c.cylinder_no {cmp_op} %s")
+                params.append(seek['cylinder_no'])
+            elif seek['value'] is None:
+                if nulls_last:
+                    conditions.append(f"({sort_col} IS NULL AND c.cylinder_no {cmp_op} %s)")
+                else:
+                    conditions.append(f"({sort_col} IS NOT NULL OR c.cylinder_no {cmp_op} %s)")
+                params.append(seek['cylinder_no'])
+            else:
+                seek_sql = f"{sort_col} {cmp_op} %s OR ({sort_col} = %s AND c.cylinder_no {cmp_op} %s)"
+                if nulls_last:
+                    seek_sql += f" OR {sort_col} IS NULL"
+                conditions.append(f"({seek_sql})")
+                params.extend([seek['value'], seek['value'], seek['cylinder_no']])
+        
+        order_dir = 'DESC' if desc else 'ASC'
+        nulls = 'LAST' if nulls_last else 'FIRST'
+        if sort_by == 'cylinder_no':
+            order_sql = f"c.cylinder_no {order_dir}"
+        else:
+            order_sql = f"{sort_col} {order_dir} NULLS {nulls}, c.cylinder_no {order_dir}"
+        
+        fetch_size = last_page_size if last_page_size is not None else page_size
+        query = (
+            CylinderRepository._LIST_SELECT_SQL.rstrip()
+            + f",\n                    {sort_col} AS _sort_value\n"
+            + CylinderRepository._LIST_FROM_SQL
+        )
+        if conditions:
+            query += " AND " + " AND ".join(conditions)
+        query += f" ORDER BY {order_sql} LIMIT %s"
+        params.append(int(fetch_size) + 1)
+        if offset and not backward:
+            query += " OFFSET %s"
+            params.append(int(offset))
+        
+        with connection.cursor() as cursor:
             cursor.execute(query, params)
             columns = [col[0] for col in cursor.description]
             results = [dict(zip(columns, row)) for row in cursor.fetchall()]
-            
-            # 번역 적용
-            # valve_spec_raw는 파싱용 raw 값이므로 번역하지 않는다.
-            results = translate_list(results, ['gas_name', 'valve_spec', 'cylinder_spec', 'usage_place', 'location'])
-            
-            return results
+        
+        has_more = len(results) > fetch_size
+        results = results[:fetch_size]
+        if backward:
+            results.reverse()
+        
+        if last_page_size is not None:
+            has_next, has_previous = False, has_more
+        elif backward:
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, seek is not None or bool(offset)
+        
+        next_cursor = prev_cursor = None
+        if results:
+            first, last = results[0], results[-1]
+            if has_next:
+                next_cursor = page_cursor.encode_cursor(sort_by, sort_order, 'next', last['_sort_value'], last['cylinder_no'])
+            if has_previous:
+                prev_cursor = page_cursor.encode_cursor(sort_by, sort_order, 'prev', first['_sort_value'], first['cylinder_no'])
+        for row in results:
+            row.pop('_sort_value', None)
+        
+        return {
+            'rows': CylinderRepository._translate_list_rows(results),
+            'next_cursor': next_cursor,
+            'prev_cursor': prev_cursor,
+            'has_next': has_next,
+            'has_previous': has_previous,
+        }
     
     @staticmethod
     def get_cylinder_count(filters: Optional[Dict] = None, days: Optional[int] = None, search_query: Optional[str] = None) -> int:
@@ -372,129 +781,141 @@ class CylinderRepository:
         Returns:
             int: 용기 개수
         """
+        conditions, params = CylinderRepository._build_list_conditions(filters, days, search_query)
+        query = "SELECT COUNT(*) " + CylinderRepository._LIST_FROM_SQL
+        if conditions:
+            query += " AND " + " AND ".join(conditions)
+        
         with connection.cursor() as cursor:
-            current_table = CylinderRepository._current_table_sql()
-            query = """
-                SELECT COUNT(*) 
-                FROM {current_table}
-                INNER JOIN "fcms_cdc"."ma_cylinders" mc 
-                    ON RTRIM(c.cylinder_no) = RTRIM(mc."CYLINDER_NO")
-                LEFT JOIN "fcms_cdc"."tr_latest_cylinder_statuses" tcs
-                    ON RTRIM(mc."CYLINDER_NO") = RTRIM(tcs."CYLINDER_NO")
-                WHERE c.dashboard_enduser IS NOT NULL
-            """
-            query = query.format(current_table=current_table)
-            
-            params = []
-            conditions = []
-            
-            # 검색어 처리 (다중어 검색: 공백으로 구분된 각 단어가 모두 매칭되어야 함)
-            if search_query and search_query.strip():
-                search_words = search_query.strip().split()
-                word_conditions = []
-                
-                for word in search_words:
-                    if not word:
-                        continue
-                    search_term = f"%{word}%"
-                    # 각 단어는 6개 필드 중 하나라도 일치하면 됨 (OR)
-                    search_conditions = [
-                        "c.cylinder_no ILIKE %s",  # 용기번호
-                        "COALESCE(c.dashboard_valve_group_name, c.dashboard_valve_spec_name) ILIKE %s",  # 밸브형식
-                        "c.dashboard_cylinder_spec_name ILIKE %s",  # 용기재질
-                        "CONCAT(COALESCE(tcs.\"MANUFACTURE_LOT_NO\", ''), CASE WHEN tcs.\"MANUFACTURE_LOT_BRANCH\" IS NOT NULL AND tcs.\"MANUFACTURE_LOT_BRANCH\" != '' THEN CONCAT('-', tcs.\"MANUFACTURE_LOT_BRANCH\") ELSE '' END) ILIKE %s",  # 제조lot
-                        "CONCAT(COALESCE(tcs.\"FILLING_LOT_HEADER\", ''), COALESCE(tcs.\"FILLING_LOT_NO\", ''), CASE WHEN tcs.\"FILLING_LOT_BRANCH\" IS NOT NULL AND tcs.\"FILLING_LOT_BRANCH\" != '' THEN CONCAT('-', tcs.\"FILLING_LOT_BRANCH\") ELSE '' END) ILIKE %s",  # 충전lot
-                        "tcs.\"MOVE_REPORT_NO\" ILIKE %s"  # 최근이동서
-                    ]
-                    word_conditions.append(f"({' OR '.join(search_conditions)})")
-                    params.extend([search_term] * 6)  # 각 조건마다 같은 검색어 사용
-                
-                # 모든 단어가 매칭되어야 함 (AND)
-                if word_conditions:
-                    conditions.append(f"({' AND '.join(word_conditions)})")
-            
-            if filters:
-                if 'cylinder_no' in filters:
-                    conditions.append("RTRIM(c.cylinder_no) = %s")
-                    params.append(filters['cylinder_no'])
-                if 'gas_name' in filters:
-                    conditions.append("c.dashboard_gas_name = %s")
-                    params.append(filters['gas_name'])
-                if 'gases' in filters and filters['gases']:
-                    gas_list = filters['gases']
-                    placeholders = ', '.join(['%s'] * len(gas_list))
-                    conditions.append(f"c.dashboard_gas_name IN ({placeholders})")
-                    params.extend(gas_list)
-                # 단일 상태 필터 (보관:미회수/보관:회수는 condition_code로 분리)
-                if 'status' in filters:
-                    st = filters['status']
-                    if st == '보관:미회수':
-                        conditions.append("(c.dashboard_status = '보관:미회수' OR (c.dashboard_status = '보관' AND COALESCE(c.condition_code, '') != '102'))")
-                    elif st == '보관:회수':
-                        conditions.append("(c.dashboard_status = '보관:회수' OR (c.dashboard_status = '보관' AND c.condition_code = '102'))")
-                    else:
-                        conditions.append("c.dashboard_status = %s")
-                        params.append(st)
-                # 다중 상태 필터 (보관:미회수/보관:회수 특별 처리)
-                if 'statuses' in filters and filters['statuses']:
-                    status_list = filters['statuses']
-                    normal_statuses = []
-                    has_bogwan_mihoesu = False
-                    has_bogwan_hoesu = False
-                    for st in status_list:
-                        if st == '보관:미회수':
-                            has_bogwan_mihoesu = True
-                        elif st == '보관:회수':
-                            has_bogwan_hoesu = True
-                        else:
-                            normal_statuses.append(st)
-                    or_conditions = []
-                    if normal_statuses:
-                        placeholders = ', '.join(['%s'] * len(normal_statuses))
-                        or_conditions.append(f"c.dashboard_status IN ({placeholders})")
-                        params.extend(normal_statuses)
-                    if has_bogwan_mihoesu:
-                        or_conditions.append("(c.dashboard_status = '보관:미회수' OR (c.dashboard_status = '보관' AND COALESCE(c.condition_code, '') != '102'))")
-                    if has_bogwan_hoesu:
-                        or_conditions.append("(c.dashboard_status = '보관:회수' OR (c.dashboard_status = '보관' AND c.condition_code = '102'))")
-                    if or_conditions:
-                        conditions.append(f"({' OR '.join(or_conditions)})")
-                if 'location' in filters:
-                    conditions.append("c.dashboard_location = %s")
-                    params.append(filters['location'])
-                if 'locations' in filters and filters['locations']:
-                    loc_list = filters['locations']
-                    placeholders = ', '.join(['%s'] * len(loc_list))
-                    conditions.append(f"c.dashboard_location IN ({placeholders})")
-                    params.extend(loc_list)
-                if 'cylinder_type_key' in filters:
-                    conditions.append("c.cylinder_type_key = %s")
-                    params.append(filters['cylinder_type_key'])
-                if 'cylinder_type_keys' in filters and filters['cylinder_type_keys']:
-                    keys = filters['cylinder_type_keys']
-                    placeholders = ', '.join(['%s'] * len(keys))
-                    conditions.append(f"c.cylinder_type_key IN ({placeholders})")
-                    params.extend(keys)
-                if 'enduser' in filters:
-                    conditions.append("c.dashboard_enduser = %s")
-                    params.append(filters['enduser'])
-                if 'valve_spec' in filters:
-                    conditions.append("COALESCE(c.dashboard_valve_group_name, c.dashboard_valve_spec_name) = %s")
-                    params.append(filters['valve_spec'])
-                if 'cylinder_spec' in filters:
-                    conditions.append("c.dashboard_cylinder_spec_name = %s")
-                    params.append(filters['cylinder_spec'])
-            
-            if days is not None:
-                conditions.append("(c.last_event_at IS NULL OR c.last_event_at >= NOW() - INTERVAL %s)")
-                params.append(f'{days} days')
-            
-            if conditions:
-                query += " AND " + " AND ".join(conditions)
-            
             cursor.execute(query, params)
             return cursor.fetchone()[0]
+
+    @staticmethod
+    def get_cylinder_count_fast(filters: Optional[Dict] = None, days: Optional[int] = None, search_query: Optional[str] = None) -> int:
+        """
+        목록 화면용 개수 조회
+        
+        자유 검색어가 없으면 필터 조합별 개수를 스냅샷 버전 기준 공유 캐시에 두어
+        페이지 이동/정렬 변경 시 COUNT를 다시 돌리지 않는다.
+        검색어가 있으면 조합이 너무 다양하므로 그대로 센다.
+        """
+        if search_query and search_query.strip():
+            return CylinderRepository.get_cylinder_count(filters, days, search_query)
+        
+        # days 조건은 NOW() 기준이라 스냅샷이 그대로여도 값이 바뀔 수 있어 짧게 유지
+        return snapshot_cache.cached(
+            'cylinder_count',
+            {'filters': filters or {}, 'days': days},
+            lambda: CylinderRepository.get_cylinder_count(filters, days),
+            timeout=300 if days is not None else None,
+        )
     
+    # 패싯 이름 → 그룹 식 (상태는 재고 요약과 같이 레거시 '보관'을 미회수/회수로 분리)
+    # status_raw는 dashboard_status 원값 - 목록 필터 status/statuses와 같은 기준의 개수 (자동완성용)
+    _FACET_COLUMNS = {
+        'status': """
+            CASE
+                WHEN c.dashboard_status = '보관' THEN
+                    CASE WHEN c.condition_code = '102' THEN '보관:회수' ELSE '보관:미회수' END
+                ELSE c.dashboard_status
+            END
+        """,
+        'location': 'c.dashboard_location',
+        'gas_name': 'c.dashboard_gas_name',
+        'enduser': 'c.dashboard_enduser',
+        'status_raw': 'c.dashboard_status',
+    }
+
+    @staticmethod
+    def get_facet_counts(filters: Optional[Dict] = None, days: Optional[int] = None, search_query: Optional[str] = None) -> Dict:
+        """
+        필터 조건에 맞는 용기의 상태/위치/가스/EndUser별 개수 (스마트 검색 추천, 자동완성용)
+        
+        GROUPING SETS로 네 가지 집계와 전체 개수를 쿼리 한 번에 구한다.
+        검색어가 없으면 스냅샷 버전 기준 공유 캐시를 사용한다.
+        위치/가스명은 번역 후 이름으로 합산한다.
+        
+        Returns:
+            Dict: {'total': int, 'status': {...}, 'location': {...}, 'gas_name': {...}, 'enduser': {...},
+                   'status_raw': {...}}
+        """
+        if search_query and search_query.strip():
+            rows = CylinderRepository._query_facet_counts(filters, days, search_query)
+        else:
+            rows = snapshot_cache.cached(
+                'cylinder_facets',
+                {'filters': filters or {}, 'days': days},
+                lambda: CylinderRepository._query_facet_counts(filters, days),
+                timeout=300 if days is not None else None,
+            )
+        
+        facets = {'total': 0}
+        for name in CylinderRepository._FACET_COLUMNS:
+            facets[name] = {}
+        
+        for facet, value, count in rows:
+            if facet is None:
+                facets['total'] = count
+                continue
+            if value is None or value == '':
+                continue
+            if facet in ('location', 'gas_name'):
+                value = translate_text(facet, value) or value
+            facets[facet][value] = facets[facet].get(value, 0) + count
+        
+        return facets
+
+    @staticmethod
+    def _query_facet_counts(filters: Optional[Dict] = None, days: Optional[int] = None, search_query: Optional[str] = None) -> List[tuple]:
+        """get_facet_counts()의 DB 집계 - [(패싯 이름 또는 None(전체), 값, 개수), ...]"""
+        names = list(CylinderRepository._FACET_COLUMNS)
+        exprs = [CylinderRepository._FACET_COLUMNS[name].strip() for name in names]
+        
+        conditions, params = CylinderRepository._build_list_conditions(filters, days, search_query)
+        # GROUPING(식) = 0 인 컬럼이 그 행의 그룹핑 셋 (모두 1이면 전체 행)
+        select_cols = [f"{expr} AS f{i}" for i, expr in enumerate(exprs)]
+        select_cols += [f"GROUPING({expr}) AS g{i}" for i, expr in enumerate(exprs)]
+        query = "SELECT " + ", ".join(select_cols) + ", COUNT(*) AS cnt "
+        query += CylinderRepository._LIST_FROM_SQL
+        if conditions:
+            query += " AND " + " AND ".join(conditions)
+        query += " GROUP BY GROUPING SETS (" + ", ".join(f"({expr})" for expr in exprs) + ", ())"
+        
+        with connection.cursor() as cursor:
+            cursor.execute(query, params)
+            raw_rows = cursor.fetchall()
+        
+        n = len(names)
+        rows = []
+        for raw in raw_rows:
+            values, groupings, count = raw[:n], raw[n:2 * n], raw[-1]
+            facet, value = None, None
+            for i in range(n):
+                if groupings[i] == 0:
+                    facet, value = names[i], values[i]
+                    break
+            rows.append((facet, value, count))
+        return rows
+
+    @staticmethod
+    def get_gas_names() -> List[str]:
+        """
+        스냅샷에 존재하는 가스명 목록 (dashboard_gas_name 원본, 스냅샷 버전 기준 캐시)
+        
+        자연어 검색 파서가 하드코딩 목록 대신 실제 데이터의 가스명으로 매칭할 때 사용한다.
+        """
+        def build():
+            with connection.cursor() as cursor:
+                cursor.execute("""
+                    SELECT DISTINCT RTRIM(c.dashboard_gas_name)
+                    FROM cy_cylinder_current c
+                    WHERE c.dashboard_gas_name IS NOT NULL
+                      AND c.dashboard_enduser IS NOT NULL
+                """)
+                return sorted({row[0] for row in cursor.fetchall() if row[0]})
+        
+        return snapshot_cache.cached('gas_names', None, build)
+
     @staticmethod
     def get_filter_options() -> Dict[str, List[str]]:
         """
@@ -512,7 +933,7 @@ class CylinderRepository:
                     c.dashboard_cylinder_spec_name as cylinder_spec
                 FROM cy_cylinder_current c
                 INNER JOIN "fcms_cdc"."ma_cylinders" mc 
-                    ON RTRIM(c.cylinder_no) = RTRIM(mc."CYLINDER_NO")
+                    ON c.cylinder_no = RTRIM(mc."CYLINDER_NO")
                 WHERE c.dashboard_gas_name IS NOT NULL
                   AND c.dashboard_enduser IS NOT NULL
                 ORDER BY c.dashboard_gas_name, c.dashboard_location, valve_spec, cylinder_spec
@@ -9,6 +9,7 @@ from typing import Dict, List, Optional, Tuple
 
 from django.db import connection
 
+from core.utils import snapshot_cache
 from core.utils.status_mapper import map_condition_code_to_status
 from core.utils.view_helper import parse_valve_spec, extract_valve_type
 
@@ -29,6 +30,99 @@ class HistoryRepository:
 
     _cached_available_move_codes: Optional[set] = None
 
+    _timeline_available: Optional[bool] = None
+
+    _partitioned_history_available: Optional[bool] = None
+
+    _daily_movement_available: Optional[bool] = None
+
+    _snapshot_columnar_available: Optional[bool] = None
+
+    # 용기별 이력 조회 컬럼: cy_cylinder_timeline(sql/create_cylinder_timeline.sql) / 원천 이력 테이블
+    _TIMELINE_COLUMNS = {
+        "cylinder_no": "t.cylinder_no",
+        "history_seq": "t.history_seq",
+        "move_date": "t.move_date",
+        "move_code": "t.move_code",
+        "condition_code": "t.condition_code",
+        "location_code": "t.location_code",
+        "move_report_no": "t.move_report_no",
+        "manufacture_lot": "t.manufacture_lot",
+        "filling_lot": "t.filling_lot",
+    }
+    _HISTORY_SOURCE_COLUMNS = {
+        "cylinder_no": 'RTRIM(h."CYLINDER_NO")',
+        "history_seq": 'h."HISTORY_SEQ"',
+        "move_date": 'h."MOVE_DATE"',
+        "move_code": 'TRIM(h."MOVE_CODE")',
+        "condition_code": 'TRIM(h."CONDITION_CODE")',
+        "location_code": 'RTRIM(h."LOCATION_CODE")',
+        "move_report_no": 'NULLIF(RTRIM(h."MOVE_REPORT_NO"), \'\')',
+        "manufacture_lot": """NULLIF(CONCAT(COALESCE(h."MANUFACTURE_LOT_HEADER", ''), COALESCE(h."MANUFACTURE_LOT_NO", ''), CASE WHEN h."MANUFACTURE_LOT_BRANCH" IS NOT NULL AND h."MANUFACTURE_LOT_BRANCH" != '' THEN '-' || h."MANUFACTURE_LOT_BRANCH" ELSE '' END), '')""",
+        "filling_lot": """NULLIF(CONCAT(COALESCE(h."FILLING_LOT_HEADER", ''), COALESCE(h."FILLING_LOT_NO", ''), CASE WHEN h."FILLING_LOT_BRANCH" IS NOT NULL AND h."FILLING_LOT_BRANCH" != '' THEN '-' || h."FILLING_LOT_BRANCH" ELSE '' END), '')""",
+    }
+
+    @classmethod
+    def history_table_sql(cls) -> str:
+        """
+        기간 조회용 이력 테이블
+
+        cy_status_history(sql/create_status_history_partitioned.sql, MOVE_DATE 월 파티션)가 있으면
+        그 테이블을, 없으면 원천 tr_cylinder_status_histories를 쓴다. 컬럼은 같다.
+        기간 조건은 반드시 MOVE_DATE >= %s AND MOVE_DATE < %s 형태로 써야 파티션이 걸러진다.
+        """
+        if cls._partitioned_history_available is None:
+            if connection.vendor != "postgresql":
+                cls._partitioned_history_available = False
+            else:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT to_regclass('cy_status_history') IS NOT NULL")
+                    cls._partitioned_history_available = bool(cursor.fetchone()[0])
+        if cls._partitioned_history_available:
+            return "cy_status_history"
+        return '"fcms_cdc"."tr_cylinder_status_histories"'
+
+    @classmethod
+    def has_cylinder_timeline(cls) -> bool:
+        """cy_cylinder_timeline 적용 여부 (sql/create_cylinder_timeline.sql, 프로세스당 1회 확인)"""
+        if cls._timeline_available is None:
+            if connection.vendor != "postgresql":
+                cls._timeline_available = False
+            else:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT to_regclass('cy_cylinder_timeline') IS NOT NULL")
+                    cls._timeline_available = bool(cursor.fetchone()[0])
+        return cls._timeline_available
+
+    @classmethod
+    def cylinder_history_sql(cls, cylinder_expr: str, columns: List[str], conditions: Optional[List[str]] = None) -> str:
+        """
+        한 용기의 이력을 최신순(MOVE_DATE, HISTORY_SEQ DESC)으로 읽는 SELECT
+
+        cy_cylinder_timeline이 있으면 커버링 인덱스만 읽고, 없으면 원천 이력 테이블을 읽는다.
+        두 경우 모두 컬럼 별칭/값 형식(RTRIM, 빈 이동서번호는 NULL, LOT 조합)이 같다.
+        호출 측은 LATERAL/서브쿼리로 감싸고 LIMIT을 붙여 쓴다.
+
+        Args:
+            cylinder_expr: RTRIM된 용기번호 식 (예: 'c.cylinder_no', '%s')
+            columns: _TIMELINE_COLUMNS의 키 목록
+            conditions: 추가 조건. {move_code} 처럼 컬럼 키를 중괄호로 쓰면 실제 식으로 바뀐다.
+        """
+        if cls.has_cylinder_timeline():
+            cols, table = cls._TIMELINE_COLUMNS, "cy_cylinder_timeline t"
+        else:
+            cols, table = cls._HISTORY_SOURCE_COLUMNS, '"fcms_cdc"."tr_cylinder_status_histories" h'
+
+        select_sql = ", ".join(f"{cols[name]} AS {name}" for name in columns)
+        where = [f"{cols['cylinder_no']} = {cylinder_expr}"]
+        where.extend(condition.format(**cols) for condition in (conditions or []))
+        return f"""
+            SELECT {select_sql}
+            FROM {table}
+            WHERE {' AND '.join(where)}
+            ORDER BY {cols['move_date']} DESC NULLS LAST, {cols['history_seq']} DESC NULLS LAST
+        """
+
     @classmethod
     def _ensure_datetime(cls, value: date) -> datetime:
         if isinstance(value, datetime):
@@ -67,7 +161,22 @@ class HistoryRepository:
     def get_cylinder_type_options(cls) -> List[Dict]:
         """
         이력과 연결 가능한 용기종류 옵션 (dashboard 기준 키)
+
+        스냅샷 전체 GROUP BY + 속성 그룹화 결과를 스냅샷 버전 기준 공유 캐시에 둔다.
+        숨김 용기종류는 스냅샷과 별개로 바뀌므로 숨김 키 목록을 캐시 키에 포함한다.
         """
+        from core.models import HiddenCylinderType
+
+        hidden_keys = sorted(HiddenCylinderType.objects.values_list("cylinder_type_key", flat=True))
+        return snapshot_cache.cached(
+            "history_cylinder_type_options",
+            {"hidden": hidden_keys},
+            cls._build_cylinder_type_options,
+        )
+
+    @classmethod
+    def _build_cylinder_type_options(cls) -> List[Dict]:
+        """get_cylinder_type_options()의 DB 조회 + 속성 그룹화"""
         with connection.cursor() as cursor:
             cursor.execute(
                 """
@@ -185,6 +294,15 @@ class HistoryRepository:
         if not codes:
             return {}
 
+        return snapshot_cache.cached(
+            "history_move_code_options",
+            sorted(codes),
+            lambda: cls._query_move_code_options(codes),
+        )
+
+    @classmethod
+    def _query_move_code_options(cls, codes: List[str]) -> Dict[str, str]:
+        """get_move_code_options()의 DB 조회"""
         with connection.cursor() as cursor:
             cursor.execute(
                 """
@@ -321,7 +439,7 @@ class HistoryRepository:
                 c.dashboard_location AS dashboard_location,
                 d."CYLINDER_WEIGHT" AS cylinder_weight,
                 d."FILLING_WEIGHT" AS filling_weight_detail
-            FROM "fcms_cdc"."tr_cylinder_status_histories" h
+            FROM {cls.history_table_sql()} h
             LEFT JOIN cy_cylinder_current c
                 ON RTRIM(h."CYLINDER_NO") = RTRIM(c.cylinder_no)
             LEFT JOIN "fcms_cdc"."tr_move_report_details" d
@@ -451,7 +569,7 @@ class HistoryRepository:
             cursor.execute(
                 f"""
                 SELECT COUNT(DISTINCT RTRIM(h."CYLINDER_NO")) AS cnt
-                FROM "fcms_cdc"."tr_cylinder_status_histories" h
+                FROM {cls.history_table_sql()} h
                 LEFT JOIN cy_cylinder_current c
                     ON RTRIM(h."CYLINDER_NO") = RTRIM(c.cylinder_no)
                 WHERE {where}
@@ -552,7 +670,7 @@ class HistoryRepository:
                     h."FILLING_LOT_BRANCH" AS filling_lot_branch,
                     h."FILLING_WEIGHT" AS filling_weight_hist,
                     d."FILLING_WEIGHT" AS filling_weight_detail
-                FROM "fcms_cdc"."tr_cylinder_status_histories" h
+                FROM {cls.history_table_sql()} h
                 LEFT JOIN cy_cylinder_current c
                     ON RTRIM(h."CYLINDER_NO") = RTRIM(c.cylinder_no)
                 LEFT JOIN "fcms_cdc"."tr_move_report_details" d
@@ -620,7 +738,20 @@ class HistoryRepository:
     ) -> List[Dict]:
         """
         기간별(week/month) 이동유형 집계
+
+        cy_history_daily_movement(sql/create_history_daily_movement.sql)가 있으면
+        일별 집계를 기간 단위로 다시 묶기만 한다. 결과 형식은 원천 이력 집계와 같다.
         """
+        if cls._has_daily_movement():
+            return cls._get_period_summary_from_daily_movement(
+                period=period,
+                start_date=start_date,
+                end_date=end_date,
+                code_sets=code_sets,
+                cylinder_type_key=cylinder_type_key,
+                cylinder_type_keys=cylinder_type_keys,
+            )
+
         params = [
             period,
             code_sets.get("ship") or ["__none__"],
@@ -663,7 +794,7 @@ class HistoryRepository:
                 COUNT(DISTINCT (h."CYLINDER_NO", h."HISTORY_SEQ")) FILTER (WHERE h."MOVE_CODE" = ANY(%s)) AS charge_cnt,
                 COUNT(DISTINCT (h."CYLINDER_NO", h."HISTORY_SEQ")) FILTER (WHERE h."MOVE_CODE" = ANY(%s)) AS maint_out_cnt,
                 COUNT(DISTINCT (h."CYLINDER_NO", h."HISTORY_SEQ")) FILTER (WHERE h."MOVE_CODE" = ANY(%s)) AS maint_in_cnt
-            FROM "fcms_cdc"."tr_cylinder_status_histories" h
+            FROM {cls.history_table_sql()} h
             LEFT JOIN cy_cylinder_current c
                 ON RTRIM(h."CYLINDER_NO") = RTRIM(c.cylinder_no)
             WHERE h."MOVE_DATE" >= %s
@@ -680,6 +811,162 @@ class HistoryRepository:
 
         return [dict(zip(columns, row)) for row in rows]
 
+    # get_period_summary 결과의 건수 컬럼
+    _SUMMARY_COUNT_COLUMNS = ("ship_cnt", "inbound_cnt", "charge_cnt", "maint_out_cnt", "maint_in_cnt")
+
+    @classmethod
+    def get_period_summaries(
+        cls,
+        periods: Tuple[str, ...],
+        start_date,
+        end_date,
+        code_sets: Dict[str, List[str]],
+        cylinder_type_key: Optional[str] = None,
+        cylinder_type_keys: Optional[List[str]] = None,
+    ) -> Dict[str, List[Dict]]:
+        """
+        여러 기간 단위(week/month)의 이동유형 집계를 한 번의 조회로 구한다.
+
+        기간을 일 단위로 한 번만 집계한 뒤 Python에서 주/월 버킷으로 다시 묶는다.
+        (한 이력 행은 하루에만 속하므로 일별 건수의 합은 주/월 직접 집계와 같다.)
+
+        Returns:
+            {period: get_period_summary(period=...)와 같은 형식의 행 목록}
+        """
+        daily_rows = cls.get_period_summary(
+            period="day",
+            start_date=start_date,
+            end_date=end_date,
+            code_sets=code_sets,
+            cylinder_type_key=cylinder_type_key,
+            cylinder_type_keys=cylinder_type_keys,
+        )
+        merge_types = bool([k for k in (cylinder_type_keys or []) if k])
+        return {p: cls._rollup_period_summary(daily_rows, p, merge_types) for p in periods}
+
+    @classmethod
+    def _rollup_period_summary(cls, daily_rows: List[Dict], period: str, merge_types: bool) -> List[Dict]:
+        """
+        일별 집계 행을 week(월요일 시작, date_trunc('week')와 동일)/month 버킷으로 합산
+
+        merge_types면 여러 키를 합산한 결과이므로 버킷 단위로만 묶고 키는 MIN 값을 유지한다.
+        """
+
+        def _truncate(bucket):
+            if bucket is None or period == "day":
+                return bucket
+            if period == "week":
+                return bucket - timedelta(days=bucket.weekday())
+            if period == "month":
+                return bucket.replace(day=1)
+            raise ValueError(f"Unsupported period: {period}")
+
+        grouped: Dict[tuple, Dict] = {}
+        for row in daily_rows:
+            bucket = _truncate(row.get("bucket"))
+            type_key = row.get("cylinder_type_key")
+            group_key = (bucket,) if merge_types else (bucket, type_key)
+
+            target = grouped.get(group_key)
+            if target is None:
+                target = {"bucket": bucket, "cylinder_type_key": type_key}
+                for col in cls._SUMMARY_COUNT_COLUMNS:
+                    target[col] = 0
+                grouped[group_key] = target
+            elif merge_types and type_key is not None:
+                current = target.get("cylinder_type_key")
+                if current is None or type_key < current:
+                    target["cylinder_type_key"] = type_key
+
+            for col in cls._SUMMARY_COUNT_COLUMNS:
+                target[col] += row.get(col) or 0
+
+        # SQL 집계와 같은 정렬: bucket DESC, cylinder_type_key ASC NULLS LAST
+        results = sorted(
+            grouped.values(),
+            key=lambda r: (r["cylinder_type_key"] is None, r["cylinder_type_key"] or ""),
+        )
+        results.sort(key=lambda r: r["bucket"], reverse=True)
+        return results
+
+    @classmethod
+    def _has_daily_movement(cls) -> bool:
+        """cy_history_daily_movement 적용 여부 (프로세스당 1회 확인)"""
+        if cls._daily_movement_available is None:
+            if connection.vendor != "postgresql":
+                cls._daily_movement_available = False
+            else:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT to_regclass('cy_history_daily_movement') IS NOT NULL")
+                    cls._daily_movement_available = bool(cursor.fetchone()[0])
+        return cls._daily_movement_available
+
+    @classmethod
+    def _get_period_summary_from_daily_movement(
+        cls,
+        period: str,
+        start_date,
+        end_date,
+        code_sets: Dict[str, List[str]],
+        cylinder_type_key: Optional[str] = None,
+        cylinder_type_keys: Optional[List[str]] = None,
+    ) -> List[Dict]:
+        """get_period_summary의 일별 집계 테이블 버전 (이동코드는 TRIM 값으로 저장됨)"""
+
+        def _codes(key: str) -> List[str]:
+            return [str(c).strip() for c in (code_sets.get(key) or [])] or ["__none__"]
+
+        params: List = [
+            period,
+            _codes("ship"),
+            _codes("inbound"),
+            _codes("charge"),
+            _codes("maintenance_out"),
+            _codes("maintenance_in"),
+            start_date.date() if isinstance(start_date, datetime) else start_date,
+            (end_date.date() if isinstance(end_date, datetime) else end_date) + timedelta(days=1),
+        ]
+        type_where = ""
+        # 스냅샷에 없는 용기는 ''로 저장되어 있으므로 원천 집계(LEFT JOIN → NULL)와 맞춘다.
+        type_key_select = "NULLIF(m.cylinder_type_key, '') AS cylinder_type_key"
+        group_by = "GROUP BY bucket, m.cylinder_type_key"
+        order_by = "ORDER BY bucket DESC, NULLIF(m.cylinder_type_key, '')"
+
+        keys = [k for k in (cylinder_type_keys or []) if k]
+        if keys:
+            # 여러 키를 한 용기종류(카드)로 묶어서 조회하는 경우: 버킷 단위로 합산
+            type_where = " AND m.cylinder_type_key = ANY(%s)"
+            params.append(keys)
+            type_key_select = "MIN(m.cylinder_type_key) AS cylinder_type_key"
+            group_by = "GROUP BY bucket"
+            order_by = "ORDER BY bucket DESC"
+        elif cylinder_type_key:
+            type_where = " AND m.cylinder_type_key = %s"
+            params.append(cylinder_type_key)
+
+        query = f"""
+            SELECT
+                date_trunc(%s, m.move_day::timestamp) AS bucket,
+                {type_key_select},
+                COALESCE(SUM(m.cnt) FILTER (WHERE m.move_code = ANY(%s)), 0) AS ship_cnt,
+                COALESCE(SUM(m.cnt) FILTER (WHERE m.move_code = ANY(%s)), 0) AS inbound_cnt,
+                COALESCE(SUM(m.cnt) FILTER (WHERE m.move_code = ANY(%s)), 0) AS charge_cnt,
+                COALESCE(SUM(m.cnt) FILTER (WHERE m.move_code = ANY(%s)), 0) AS maint_out_cnt,
+                COALESCE(SUM(m.cnt) FILTER (WHERE m.move_code = ANY(%s)), 0) AS maint_in_cnt
+            FROM cy_history_daily_movement m
+            WHERE m.move_day >= %s
+              AND m.move_day < %s
+              {type_where}
+            {group_by}
+            {order_by}
+        """
+
+        with connection.cursor() as cursor:
+            cursor.execute(query, params)
+            columns = [col[0] for col in cursor.description]
+            rows = cursor.fetchall()
+
+        return [dict(zip(columns, row)) for row in rows]
 
     @classmethod
     def get_period_end_occupancy_summary(
@@ -716,6 +1003,21 @@ class HistoryRepository:
         ship_statuses = ["출하", "출하중"]
         unavailable_statuses = ["이상", "정비대상", "폐기"]
 
+        if snapshot_type == "DAILY" and cls.has_snapshot_columnar():
+            return cls._get_period_end_occupancy_from_columnar(
+                period=period,
+                keys=keys or [cylinder_type_key],
+                start_date=start_date.date() if isinstance(start_date, datetime) else start_date,
+                end_date=end_date.date() if isinstance(end_date, datetime) else end_date,
+                status_groups=[
+                    ("available_qty", available_statuses),
+                    ("process_qty", process_statuses),
+                    ("product_qty", product_statuses),
+                    ("ship_qty", ship_statuses),
+                    ("unavailable_qty", unavailable_statuses),
+                ],
+            )
+
         with connection.cursor() as cursor:
             if keys:
                 # 여러 키를 합산할 때는 "키별 마지막 스냅샷"을 잡아 합산해야 누락이 없다.
@@ -815,6 +1117,96 @@ class HistoryRepository:
         return [dict(zip(cols, r)) for r in rows]
 
 
+    @classmethod
+    def has_snapshot_columnar(cls) -> bool:
+        """hist_snapshot_day_vector 적용 여부 (sql/create_hist_snapshot_columnar.sql, 프로세스당 1회 확인)"""
+        if cls._snapshot_columnar_available is None:
+            if connection.vendor != "postgresql":
+                cls._snapshot_columnar_available = False
+            else:
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT to_regclass('hist_snapshot_day_vector') IS NOT NULL")
+                    cls._snapshot_columnar_available = bool(cursor.fetchone()[0])
+        return cls._snapshot_columnar_available
+
+    @classmethod
+    def get_snapshot_status_slots(cls) -> Dict[str, int]:
+        """상태 → hist_snapshot_day_vector.qty 배열 위치"""
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT status, slot FROM hist_snapshot_status_dim")
+            return {status: slot for status, slot in cursor.fetchall()}
+
+    @classmethod
+    def _get_period_end_occupancy_from_columnar(
+        cls,
+        *,
+        period: str,
+        keys: List[str],
+        start_date: date,
+        end_date: date,
+        status_groups: List[Tuple[str, List[str]]],
+    ) -> List[Dict]:
+        """
+        get_period_end_occupancy_summary의 컬럼형 스냅샷 버전
+
+        (날짜, 용기종류) 한 행에 상태별 수량 배열이 있으므로 키별 버킷 마지막 날짜 행만 읽어
+        상태 그룹의 slot 값을 더한다. 버킷은 KST 날짜(snapshot_date) 기준이다.
+        기존 경로(timestamptz date_trunc, 연결 시간대 UTC)와 같은 타입을 돌려주도록
+        버킷 시작 날짜의 UTC 자정(timestamptz)으로 반환한다. (라벨의 연/월/주가 KST 버킷과 같음)
+        """
+        slots = cls.get_snapshot_status_slots()
+        group_selects = []
+        params: List = [keys, period, start_date, end_date + timedelta(days=1)]
+        for alias, statuses in status_groups:
+            group_selects.append(
+                f"(SELECT COALESCE(SUM(v.qty[i]), 0) FROM unnest(%s::int[]) AS i) AS {alias}"
+            )
+            params.append([slots[s] for s in statuses if s in slots])
+        group_select_sql = ",\n                    ".join(group_selects)
+        group_sums = ",\n                ".join(
+            f"COALESCE(SUM(x.{alias}), 0) AS {alias}" for alias, _ in status_groups
+        )
+
+        query = f"""
+            WITH dims AS (
+                SELECT type_id FROM hist_snapshot_type_dim WHERE cylinder_type_key = ANY(%s)
+            ),
+            last_day AS (
+                SELECT
+                    v.type_id,
+                    date_trunc(%s, v.snapshot_date::timestamp) AT TIME ZONE 'UTC' AS bucket,
+                    MAX(v.snapshot_date) AS last_date
+                FROM hist_snapshot_day_vector v
+                JOIN dims d ON d.type_id = v.type_id
+                WHERE v.snapshot_date >= %s
+                  AND v.snapshot_date < %s
+                GROUP BY 1, 2
+            )
+            SELECT
+                x.bucket AS bucket,
+                {group_sums},
+                COALESCE(SUM(x.total_qty), 0) AS total_qty
+            FROM (
+                SELECT
+                    l.bucket,
+                    {group_select_sql},
+                    v.total_qty
+                FROM last_day l
+                JOIN hist_snapshot_day_vector v
+                    ON v.type_id = l.type_id
+                   AND v.snapshot_date = l.last_date
+            ) x
+            GROUP BY x.bucket
+            ORDER BY x.bucket ASC
+        """
+
+        with connection.cursor() as cursor:
+            cursor.execute(query, params)
+            cols = [c[0] for c in cursor.description]
+            rows = cursor.fetchall()
+
+        return [dict(zip(cols, r)) for r in rows]
+
     @classmethod
     def get_clf3_ship_counts(
         cls,
@@ -827,11 +1219,11 @@ class HistoryRepository:
             return {}
 
         params = [ship_codes]
-        query = """
+        query = f"""
             SELECT 
                 h."CYLINDER_NO" AS cylinder_no,
                 COUNT(*) AS ship_count
-            FROM "fcms_cdc"."tr_cylinder_status_histories" h
+            FROM {cls.history_table_sql()} h
             LEFT JOIN cy_cylinder_current c
                 ON RTRIM(h."CYLINDER_NO") = RTRIM(c.cylinder_no)
             WHERE h."MOVE_CODE" = ANY(%s)
@@ -869,7 +1261,7 @@ class HistoryRepository:
             cls._ensure_datetime(start_date),
             cls._ensure_datetime(end_date) + timedelta(days=1),
         ]
-        query = """
+        query = f"""
             SELECT 
                 c.cylinder_type_key,
                 MIN(c.dashboard_gas_name) AS gas_name,
@@ -877,7 +1269,7 @@ class HistoryRepository:
                 MIN(COALESCE(c.dashboard_valve_group_name, c.dashboard_valve_spec_name)) AS valve_spec,
                 MIN(c.dashboard_enduser) AS enduser,
                 COUNT(DISTINCT (h."CYLINDER_NO", h."HISTORY_SEQ")) AS cnt
-            FROM "fcms_cdc"."tr_cylinder_status_histories" h
+            FROM {cls.history_table_sql()} h
             LEFT JOIN cy_cylinder_current c
                 ON RTRIM(h."CYLINDER_NO") = RTRIM(c.cylinder_no)
             WHERE h."MOVE_CODE" = ANY(%s)
@@ -0,0 +1,373 @@
+"""
+보고서(일일/주간/월간/입하) 공통 조회 엔진
+
+- 기간 이동 내역은 fetch_movements()가 쿼리 한 번으로 가져온다.
+  스펙 문자열 정리, 제품명 조합, 내압만료 판정은 SQL에서 끝내므로 Python은 행마다 문자열을 다듬지 않는다.
+- 상세 행이 필요 없는 보고서(월간)는 fetch_movement_groups()로 (일, 이동코드, 제품) 단위로 묶은 행만 받는다.
+- summarize()는 상세 행/묶음 행 어느 쪽이든 한 번 훑어 보고서의 모든 집계
+  (이동유형, 제품, 이동유형+제품, 이동유형별 상세, 일별, EndUser)를 함께 만든다.
+"""
+import re
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from django.db import connection
+
+from core.repositories.history_repository import HistoryRepository
+
+
+# MOVE_CODE 라벨 매핑
+MOVE_CODE_LABELS = {
+    '00': '신규구매', '01': '신규등록', '10': '입하', '14': '회수완료',
+    '16': '회수없음', '17': '재보관', '19': '이상처리', '21': '충전선택', '22': '충전완료',
+    '30': '창고출고', '31': '외부충전', '41': '분석중', '42': '분석완료',
+    '50': '창고입고', '51': '수주연결', '52': '연결해제', '60': '출하',
+    '65': '영업외출하', '70': '반품', '85': '전출', '86': '전입', '99': '폐기',
+}
+
+# 스펙에서 제거할 문자열들
+REMOVE_SPEC_PATTERNS = ['general Y', 'HAMAI', 'NERIKI', 'SHOT-Y In-screw']
+
+# 내압 만료 임박 기준 (일)
+EXPIRING_SOON_DAYS = 90
+
+
+def clean_spec(spec: Optional[str]) -> str:
+    """스펙에서 불필요한 문자열 제거 (SQL의 _clean_spec_sql과 같은 규칙)"""
+    if not spec:
+        return ''
+    result = spec.strip()
+    for pattern in REMOVE_SPEC_PATTERNS:
+        result = result.replace(pattern, '')
+    return ' '.join(result.split())
+
+
+def _clean_spec_sql(expr: str) -> str:
+    """clean_spec()과 같은 정리를 하는 SQL 식"""
+    pattern = '|'.join(re.escape(p) for p in REMOVE_SPEC_PATTERNS).replace("'", "''")
+    return (
+        f"BTRIM(regexp_replace(regexp_replace(BTRIM(COALESCE({expr}, '')), '{pattern}', '', 'g'), "
+        r"'\s+', ' ', 'g'))"
+    )
+
+
+class ReportRepository:
+    """
+    tr_cylinder_status_histories(또는 월 파티션 복제본) + 용기/제품/스펙 마스터 + cy_cylinder_current 조합 조회
+    """
+
+    # 기간 이동 내역의 FROM/WHERE (파라미터: 기준일, 시작 일시, 종료 일시(미포함))
+    # - MOVE_DATE는 반열린 구간으로만 비교해 파티션 프루닝/인덱스를 탄다.
+    # - cy_cylinder_current.cylinder_no는 RTRIM된 PK라 원천 쪽만 RTRIM 한다.
+    _MOVEMENT_FROM_SQL = """
+        FROM {history} h
+        CROSS JOIN (SELECT %s::date AS ref_date) p
+        LEFT JOIN "fcms_cdc"."ma_cylinders" c ON RTRIM(c."CYLINDER_NO") = RTRIM(h."CYLINDER_NO")
+        LEFT JOIN "fcms_cdc"."ma_items" i ON TRIM(i."ITEM_CODE") = TRIM(c."ITEM_CODE")
+        LEFT JOIN "fcms_cdc"."ma_valve_specs" vs ON vs."VALVE_SPEC_CODE" = c."VALVE_SPEC_CODE"
+        LEFT JOIN "fcms_cdc"."ma_cylinder_specs" cs ON cs."CYLINDER_SPEC_CODE" = c."CYLINDER_SPEC_CODE"
+        LEFT JOIN cy_cylinder_current cc ON cc.cylinder_no = RTRIM(h."CYLINDER_NO")
+        CROSS JOIN LATERAL (
+            SELECT
+                COALESCE(NULLIF(BTRIM(COALESCE(i."DISPLAY_NAME", i."FORMAL_NAME", c."ITEM_CODE")), ''), '미분류') AS gas_name,
+                COALESCE(c."CAPACITY", 0) AS capacity,
+                {valve_spec} AS valve_spec,
+                {cylinder_spec} AS cylinder_spec,
+                COALESCE(BTRIM(cc.dashboard_enduser), '') AS enduser,
+                c."WITHSTAND_PRESSURE_MAINTE_DATE"
+                    + (NULLIF(c."WITHSTAND_PRESSURE_TEST_TERM", 0) * INTERVAL '1 year') AS expiry_date
+        ) x
+        CROSS JOIN LATERAL (
+            SELECT
+                -- 제품명: 가스명/용량/밸브/용기/EndUser 형식
+                concat_ws(
+                    ' / ',
+                    x.gas_name,
+                    CASE WHEN x.capacity <> 0 THEN TRUNC(x.capacity)::BIGINT || 'L' END,
+                    NULLIF(x.valve_spec, ''),
+                    NULLIF(x.cylinder_spec, ''),
+                    NULLIF(x.enduser, '')
+                ) AS item_name,
+                COALESCE(x.expiry_date::date < p.ref_date, FALSE) AS is_expired,
+                COALESCE(
+                    x.expiry_date::date >= p.ref_date
+                    AND x.expiry_date::date < p.ref_date + {expiring_days},
+                    FALSE
+                ) AS is_expiring_soon
+        ) y
+        WHERE h."MOVE_DATE" >= %s AND h."MOVE_DATE" < %s
+    """
+
+    _ORDER_BY = {
+        'date_desc': 'h."MOVE_DATE" DESC, move_code, x.gas_name, cylinder_no',
+        'date': 'h."MOVE_DATE", x.gas_name, cylinder_no',
+        'code': 'move_code, x.gas_name, cylinder_no',
+        'item': 'x.gas_name, cylinder_no',
+    }
+
+    @classmethod
+    def _from_sql(cls) -> str:
+        return cls._MOVEMENT_FROM_SQL.format(
+            history=HistoryRepository.history_table_sql(),
+            valve_spec=_clean_spec_sql('vs."NAME"'),
+            cylinder_spec=_clean_spec_sql('cs."NAME"'),
+            expiring_days=EXPIRING_SOON_DAYS,
+        )
+
+    @staticmethod
+    def _period_params(start_date: date, end_date: date, reference_date: Optional[date]) -> List:
+        """[기준일, 시작 일시, 종료 일시(미포함)] - 종료일은 그날 전체를 포함한다."""
+        return [reference_date or end_date, start_date, end_date + timedelta(days=1)]
+
+    @classmethod
+    def fetch_movements(
+        cls,
+        start_date: date,
+        end_date: date,
+        reference_date: Optional[date] = None,
+        move_code: Optional[str] = None,
+        order: str = 'date_desc',
+    ) -> List[Dict]:
+        """
+        기간 이동 내역 상세
+
+        Args:
+            start_date, end_date: 조회 기간 (양 끝 포함)
+            reference_date: 내압만료/만료임박 판정 기준일 (기본: end_date)
+            move_code: 특정 이동코드만 조회 (예: '10' 입하)
+            order: 'date_desc' | 'date' | 'code' | 'item'
+
+        Returns:
+            List[Dict]: 보고서 템플릿이 쓰는 키(cylinder_no, move_label, item_name, is_expired 등)를 가진 행
+        """
+        params = cls._period_params(start_date, end_date, reference_date)
+        code_where = ''
+        if move_code:
+            code_where = ' AND h."MOVE_CODE" = %s'
+            params.append(move_code)
+
+        query = f"""
+            SELECT
+                RTRIM(h."CYLINDER_NO") AS cylinder_no,
+                TRIM(h."MOVE_CODE") AS move_code,
+                h."MOVE_DATE" AS move_date,
+                COALESCE(BTRIM(h."MOVE_REPORT_NO"), '') AS move_report_no,
+                COALESCE(BTRIM(h."SUPPLIER_USER_NAME"), '') AS supplier,
+                COALESCE(BTRIM(h."CUSTOMER_USER_NAME"), '') AS customer,
+                COALESCE(BTRIM(h."POSITION_USER_NAME"), '') AS position,
+                COALESCE(BTRIM(h."REMARKS"), '') AS remarks,
+                BTRIM(CONCAT(
+                    COALESCE(h."FILLING_LOT_HEADER", ''),
+                    COALESCE(h."FILLING_LOT_NO", ''),
+                    CASE WHEN h."FILLING_LOT_BRANCH" IS NOT NULL AND h."FILLING_LOT_BRANCH" != ''
+                         THEN '-' || h."FILLING_LOT_BRANCH"
+                         ELSE ''
+                    END
+                )) AS filling_lot,
+                x.gas_name,
+                x.capacity,
+                x.valve_spec,
+                x.cylinder_spec,
+                x.enduser,
+                y.item_name,
+                c."WITHSTAND_PRESSURE_MAINTE_DATE" AS pressure_test_date,
+                COALESCE(c."WITHSTAND_PRESSURE_TEST_TERM", 0) AS pressure_test_term,
+                x.expiry_date AS pressure_expiry_date,
+                y.is_expired,
+                y.is_expiring_soon,
+                COALESCE(c."WEIGHT", 0) AS cylinder_weight
+            {cls._from_sql()}
+            {code_where}
+            ORDER BY {cls._ORDER_BY[order]}
+        """
+
+        with connection.cursor() as cursor:
+            cursor.execute(query, params)
+            columns = [col[0] for col in cursor.description]
+            rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+        for row in rows:
+            row['move_label'] = MOVE_CODE_LABELS.get(row['move_code'], row['move_code'])
+            if row['is_expired']:
+                row['pressure_status'] = '내압만료'
+            elif row['is_expiring_soon']:
+                row['pressure_status'] = '만료임박'
+            else:
+                row['pressure_status'] = '정상'
+        return rows
+
+    @classmethod
+    def fetch_movement_groups(
+        cls,
+        start_date: date,
+        end_date: date,
+        reference_date: Optional[date] = None,
+        move_code: Optional[str] = None,
+    ) -> List[Dict]:
+        """
+        기간 이동 내역을 (일, 이동코드, 제품) 단위로 묶은 건수 - 상세 목록 없이 집계만 필요한 보고서용
+
+        Returns:
+            List[Dict]: move_day, move_code, gas_name, capacity, enduser, item_name,
+                        count, expired_count, expiring_soon_count
+        """
+        params = cls._period_params(start_date, end_date, reference_date)
+        code_where = ''
+        if move_code:
+            code_where = ' AND h."MOVE_CODE" = %s'
+            params.append(move_code)
+
+        query = f"""
+            SELECT
+                h."MOVE_DATE"::date AS move_day,
+                TRIM(h."MOVE_CODE") AS move_code,
+                x.gas_name,
+                x.capacity,
+                x.enduser,
+                y.item_name,
+                COUNT(*) AS count,
+                COUNT(*) FILTER (WHERE y.is_expired) AS expired_count,
+                COUNT(*) FILTER (WHERE y.is_expiring_soon) AS expiring_soon_count
+            {cls._from_sql()}
+            {code_where}
+            GROUP BY 1, 2, 3, 4, 5, 6
+        """
+
+        with connection.cursor() as cursor:
+            cursor.execute(query, params)
+            columns = [col[0] for col in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    @staticmethod
+    def summarize(rows: List[Dict]) -> Dict:
+        """
+        fetch_movements() / fetch_movement_groups() 결과를 한 번 훑어 보고서 집계를 모두 만든다.
+
+        Returns:
+            Dict:
+                total, expired, expiring_soon, normal
+                move_summary: [{'label', 'code', 'count'}] 건수 내림차순
+                item_summary: [{'item_name', 'count', 'capacity', 'expired', 'normal'}] 건수 내림차순
+                gas_summary: [{'item_name'(가스명), 'count'}] 건수 내림차순
+                move_by_item: [{'move_code', 'move_label', 'item_name', 'count', 'expired', 'expiring_soon'}]
+                move_detail_stats: [{'code', 'label', 'total', 'expired', 'expiring_soon', 'by_item'}]
+                daily_summary: [{'date', 'total', 'by_move_code'}] 최근 날짜부터
+                by_enduser: [{'enduser', 'count'}] 건수 내림차순
+        """
+        totals = {'total': 0, 'expired': 0, 'expiring_soon': 0}
+        move_summary: Dict[str, Dict] = {}
+        item_summary: Dict[str, Dict] = {}
+        gas_summary: Dict[str, int] = {}
+        move_by_item: Dict[tuple, Dict] = {}
+        move_detail_stats: Dict[str, Dict] = {}
+        daily_summary: Dict[date, Dict] = {}
+        by_enduser: Dict[str, int] = {}
+
+        for row in rows:
+            grouped = 'count' in row
+            count = row['count'] if grouped else 1
+            if grouped:
+                expired = row['expired_count']
+                expiring_soon = row['expiring_soon_count']
+            else:
+                expired = 1 if row['is_expired'] else 0
+                expiring_soon = 1 if row['is_expiring_soon'] else 0
+
+            move_code = row['move_code'] or ''
+            move_label = MOVE_CODE_LABELS.get(move_code, move_code)
+            item_name = row['item_name']
+
+            totals['total'] += count
+            totals['expired'] += expired
+            totals['expiring_soon'] += expiring_soon
+
+            # 이동유형별 요약 집계
+            summary = move_summary.setdefault(move_label, {'code': move_code, 'count': 0})
+            summary['count'] += count
+
+            # 제품명별 / 가스명별 집계
+            item = item_summary.setdefault(item_name, {'count': 0, 'capacity': row['capacity'], 'expired': 0})
+            item['count'] += count
+            item['expired'] += expired
+            gas_summary[row['gas_name']] = gas_summary.get(row['gas_name'], 0) + count
+
+            # 이동유형+제품명별 집계
+            pair = move_by_item.setdefault((move_code, item_name), {
+                'move_code': move_code, 'move_label': move_label, 'item_name': item_name,
+                'count': 0, 'expired': 0, 'expiring_soon': 0,
+            })
+            pair['count'] += count
+            pair['expired'] += expired
+            pair['expiring_soon'] += expiring_soon
+
+            # 이동유형별 상세 통계
+            stats = move_detail_stats.setdefault(move_code, {
+                'label': move_label, 'total': 0, 'expired': 0, 'expiring_soon': 0, 'by_item': {},
+            })
+            stats['total'] += count
+            stats['expired'] += expired
+            stats['expiring_soon'] += expiring_soon
+            stats_item = stats['by_item'].setdefault(item_name, {'count': 0, 'expired': 0})
+            stats_item['count'] += count
+            stats_item['expired'] += expired
+
+            # 일별 집계
+            day = row['move_day'] if grouped else row['move_date']
+            if isinstance(day, datetime):
+                day = day.date()
+            if day:
+                daily = daily_summary.setdefault(day, {'total': 0, 'by_move_code': {}})
+                daily['total'] += count
+                daily['by_move_code'][move_label] = daily['by_move_code'].get(move_label, 0) + count
+
+            # EndUser별 집계
+            if row['enduser']:
+                by_enduser[row['enduser']] = by_enduser.get(row['enduser'], 0) + count
+
+        move_detail_stats_list = []
+        for code, stats in sorted(move_detail_stats.items()):
+            move_detail_stats_list.append({
+                'code': code,
+                'label': stats['label'],
+                'total': stats['total'],
+                'expired': stats['expired'],
+                'expiring_soon': stats['expiring_soon'],
+                'by_item': [
+                    {'item_name': k, 'count': v['count'], 'expired': v['expired']}
+                    for k, v in sorted(stats['by_item'].items(), key=lambda x: -x[1]['count'])
+                ],
+            })
+
+        return {
+            **totals,
+            'normal': totals['total'] - totals['expired'] - totals['expiring_soon'],
+            'move_summary': [
+                {'label': k, 'code': v['code'], 'count': v['count']}
+                for k, v in sorted(move_summary.items(), key=lambda x: -x[1]['count'])
+            ],
+            'item_summary': [
+                {
+                    'item_name': k,
+                    'count': v['count'],
+                    'capacity': v['capacity'],
+                    'expired': v['expired'],
+                    'normal': v['count'] - v['expired'],
+                }
+                for k, v in sorted(item_summary.items(), key=lambda x: -x[1]['count'])
+            ],
+            'gas_summary': [
+                {'item_name': k, 'count': v}
+                for k, v in sorted(gas_summary.items(), key=lambda x: -x[1])
+            ],
+            # 이동코드순, 건수 내림차순
+            'move_by_item': sorted(move_by_item.values(), key=lambda x: (x['move_code'], -x['count'])),
+            'move_detail_stats': move_detail_stats_list,
+            'daily_summary': [
+                {'date': k, 'total': v['total'], 'by_move_code': v['by_move_code']}
+                for k, v in sorted(daily_summary.items(), reverse=True)
+            ],
+            'by_enduser': [
+                {'enduser': k, 'count': v}
+                for k, v in sorted(by_enduser.items(), key=lambda x: -x[1])
+            ],
+        }
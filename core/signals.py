@@ -0,0 +1,13 @@
+"""core 앱 시그널 핸들러"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.models import Translation
+from core.utils.translation import invalidate_translations
+
+
+@receiver(post_save, sender=Translation)
+@receiver(post_delete, sender=Translation)
+def translation_changed(sender, **kwargs):
+    """번역 저장/삭제 시 번역 사전 무효화"""
+    invalidate_translations()
@@ -41,4 +41,9 @@ urlpatterns = [
     
     # 용기 스펙 검색 (AJAX)
     path('api/cylinder-spec-search/', views.cylinder_spec_search, name='cylinder_spec_search'),
+    
+    # 백그라운드 작업 (Excel/PDF/DOCX 생성)
+    path('jobs/<uuid:token>/', views.job_status, name='job_status'),
+    path('jobs/<uuid:token>/status/', views.job_status_json, name='job_status_json'),
+    path('jobs/<uuid:token>/download/', views.job_download, name='job_download'),
 ]
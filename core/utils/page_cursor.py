@@ -0,0 +1,85 @@
+"""
+Keyset(seek) 페이지네이션 커서 토큰
+
+마지막으로 본 행의 (정렬 컬럼 값, 용기번호)를 URL-safe base64 JSON으로 감싼 불투명 토큰.
+정렬 값이 날짜/시각/Decimal일 수 있어 타입 태그와 함께 저장했다가 복원한다.
+토큰이 깨졌거나 정렬 조건이 바뀐 경우 decode_cursor()는 None을 반환하고 호출 측은 첫 페이지로 처리한다.
+"""
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+
+def _pack_value(value: Any) -> List:
+    if value is None:
+        return ['z', None]
+    if isinstance(value, datetime):
+        return ['t', value.isoformat()]
+    if isinstance(value, date):
+        return ['d', value.isoformat()]
+    if isinstance(value, Decimal):
+        return ['n', str(value)]
+    if isinstance(value, (int, float)):
+        return ['n', str(value)]
+    return ['s', str(value)]
+
+
+def _unpack_value(packed: List) -> Any:
+    tag, raw = packed
+    if tag == 'z':
+        return None
+    if tag == 't':
+        return datetime.fromisoformat(raw)
+    if tag == 'd':
+        return date.fromisoformat(raw)
+    if tag == 'n':
+        return Decimal(raw)
+    return raw
+
+
+def encode_cursor(sort_by: str, sort_order: str, direction: str, value: Any, cylinder_no: str) -> str:
+    """
+    커서 토큰 생성
+
+    Args:
+        sort_by / sort_order: 토큰을 만든 목록의 정렬 조건
+        direction: 'next'(이 행 이후) 또는 'prev'(이 행 이전)
+        value: 기준 행의 정렬 컬럼 값 (번역 전 원본)
+        cylinder_no: 기준 행의 용기번호 (동일 값 정렬 시 보조 키)
+    """
+    payload = {
+        's': sort_by,
+        'o': sort_order,
+        'd': direction,
+        'v': _pack_value(value),
+        'k': cylinder_no,
+    }
+    raw = json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: Optional[str], sort_by: str, sort_order: str) -> Optional[Dict]:
+    """
+    커서 토큰 해석
+
+    Returns:
+        {'direction', 'value', 'cylinder_no'} 또는 None (잘못된 토큰 / 정렬 조건 불일치)
+    """
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+        if payload.get('s') != sort_by or payload.get('o') != sort_order:
+            return None
+        if payload.get('d') not in ('next', 'prev') or not payload.get('k'):
+            return None
+        return {
+            'direction': payload['d'],
+            'value': _unpack_value(payload['v']),
+            'cylinder_no': payload['k'],
+        }
+    except (ValueError, TypeError, KeyError, IndexError):
+        return None
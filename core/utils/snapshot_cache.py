@@ -0,0 +1,130 @@
+"""
+스냅샷 버전 기반 공유 캐시
+
+cy_cylinder_current에서 파생되는 집계(재고 요약, 용기종류 그룹)를 snapshot 캐시
+(settings.CACHES['snapshot'], 파일 기반)에 저장해 gunicorn 워커 간에 공유한다.
+
+캐시 키에는 스냅샷 버전이 들어가므로 별도 삭제 없이, 스냅샷이 바뀌면 새 키로 다시 계산된다.
+- cy_snapshot_generation_seq 시퀀스가 있으면 last_value 사용 (sql/create_snapshot_generation.sql)
+  세대는 커밋 후에만 올린다: 리스너가 cy_snapshot_changed NOTIFY를 받아 bump_generation()을 호출하고,
+  Python writer는 bump_generation_on_commit()으로 커밋 시점에 올린다.
+- 없으면 MAX(snapshot_updated_at) + 행 수로 대체
+"""
+import hashlib
+import json
+import time
+from typing import Any, Callable, Optional
+
+from django.core.cache import caches
+from django.core.cache.backends.base import InvalidCacheBackendError
+from django.db import connection, transaction
+
+SNAPSHOT_CACHE_ALIAS = 'snapshot'
+
+# cy_cylinder_current 변경 Trigger가 보내는 NOTIFY 채널 (커밋 후 전달)
+GENERATION_CHANNEL = 'cy_snapshot_changed'
+
+# 같은 워커에서 연속 요청 시 버전 조회를 생략하는 시간 (초)
+VERSION_TTL = 2.0
+
+_generation_available: Optional[bool] = None
+_version_memo: Optional[str] = None
+_version_checked_at = 0.0
+
+
+def get_cache():
+    """snapshot 캐시 (미설정 시 default 캐시)"""
+    try:
+        return caches[SNAPSHOT_CACHE_ALIAS]
+    except InvalidCacheBackendError:
+        return caches['default']
+
+
+def _has_generation_table(cursor) -> bool:
+    """cy_snapshot_generation_seq 적용 여부 (프로세스당 1회 확인)"""
+    global _generation_available
+    if _generation_available is None:
+        if connection.vendor != 'postgresql':
+            _generation_available = False
+        else:
+            cursor.execute("SELECT to_regclass('cy_snapshot_generation_seq') IS NOT NULL")
+            _generation_available = bool(cursor.fetchone()[0])
+    return _generation_available
+
+
+def get_snapshot_version() -> str:
+    """
+    현재 스냅샷 버전 문자열
+
+    VERSION_TTL 동안은 프로세스 메모리 값을 재사용하므로 스냅샷 변경이
+    최대 VERSION_TTL초 늦게 반영될 수 있다.
+    """
+    global _version_memo, _version_checked_at
+
+    now = time.monotonic()
+    if _version_memo is not None and now - _version_checked_at < VERSION_TTL:
+        return _version_memo
+
+    with connection.cursor() as cursor:
+        if _has_generation_table(cursor):
+            cursor.execute("SELECT last_value, is_called FROM cy_snapshot_generation_seq")
+            last_value, is_called = cursor.fetchone()
+            version = f"g{last_value if is_called else 0}"
+        else:
+            cursor.execute("SELECT MAX(snapshot_updated_at), COUNT(*) FROM cy_cylinder_current")
+            max_updated, total = cursor.fetchone()
+            stamp = max_updated.isoformat() if max_updated else '-'
+            version = f"t{stamp}:{total}"
+
+    _version_memo = version
+    _version_checked_at = now
+    return version
+
+
+def bump_generation():
+    """
+    스냅샷 세대 +1
+
+    커밋된 변경에 대해서만 호출한다. (커밋 전에 올리면 새 세대 키에 이전 데이터가 캐시될 수 있음)
+    """
+    global _version_memo
+    with connection.cursor() as cursor:
+        if not _has_generation_table(cursor):
+            return
+        cursor.execute("SELECT nextval('cy_snapshot_generation_seq')")
+    _version_memo = None
+
+
+def bump_generation_on_commit():
+    """현재 트랜잭션이 커밋되면 세대 +1 (트랜잭션 밖이면 즉시, 롤백되면 생략)"""
+    transaction.on_commit(bump_generation)
+
+
+def make_key(namespace: str, version: str, params: Any = None) -> str:
+    """namespace:version:파라미터 해시 형태의 캐시 키"""
+    raw = json.dumps(params, sort_keys=True, default=str, ensure_ascii=False)
+    digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+    return f"{namespace}:{version}:{digest}"
+
+
+def cached(namespace: str, params: Any, builder: Callable[[], Any], timeout: Optional[int] = None) -> Any:
+    """
+    스냅샷 버전 기준 캐시 조회, 없으면 builder() 결과를 저장 후 반환
+
+    Args:
+        namespace: 캐시 구분자 (예: 'inventory_summary')
+        params: 결과에 영향을 주는 인자 (JSON 직렬화 가능한 값)
+        builder: 캐시 미스 시 호출할 함수
+        timeout: 캐시 유지 시간 (None이면 캐시 설정의 TIMEOUT)
+    """
+    cache = get_cache()
+    key = make_key(namespace, get_snapshot_version(), params)
+
+    value = cache.get(key)
+    if value is None:
+        value = builder()
+        if timeout is None:
+            cache.set(key, value)
+        else:
+            cache.set(key, value, timeout)
+    return value
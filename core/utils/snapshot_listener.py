@@ -0,0 +1,181 @@
+"""
+cy_cylinder_current LISTEN/NOTIFY 리스너
+
+fcms_cdc 테이블의 경량 Trigger(sql/create_snapshot_notify_triggers.sql)가 보내는
+용기번호 NOTIFY를 받아, 짧은 debounce 구간 동안 중복을 합친 뒤 배치로 스냅샷을 갱신한다.
+
+- Debezium sink 트랜잭션은 NOTIFY만 하므로 sink 처리량과 스냅샷 재계산이 분리된다.
+- 시작/재연결 시에는 cy_sync_cursor 워터마크 기준으로 놓친 변경분을 먼저 따라잡는다.
+- cy_cylinder_current 변경 NOTIFY(cy_snapshot_changed, 커밋 후 전달)를 받으면 캐시 세대를 올린다.
+  (sql/create_snapshot_generation.sql)
+"""
+import logging
+import select
+import time
+from typing import Optional, Set
+
+from django.db import connection, transaction
+from django.db.utils import InterfaceError, OperationalError
+
+from core.utils import snapshot_cache, sync_cursor
+from core.utils.snapshot_sync import refresh_cylinders
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = 'cy_cylinder_changed'
+
+# sync_cylinder_snapshot / sync_cylinder_current 명령과 같은 커서를 공유한다.
+SYNC_CONSUMER = 'cy_cylinder_current'
+
+
+class SnapshotListener:
+    """
+    NOTIFY 기반 스냅샷 갱신 루프
+
+    - debounce 초 동안 들어온 용기번호를 set으로 모아 한 번에 갱신
+    - 대기 중 용기가 max_batch에 도달하면 debounce를 기다리지 않고 즉시 갱신
+    - DB 연결 오류 시 재연결 후 워터마크 기준으로 따라잡기
+    """
+
+    def __init__(self, debounce: float = 1.0, max_batch: int = 500, reconnect_delay: float = 5.0):
+        """
+        Args:
+            debounce: 첫 NOTIFY 수신 후 배치를 모으는 시간 (초)
+            max_batch: 한 번에 갱신할 최대 용기 수
+            reconnect_delay: 연결 오류 시 재시도 대기 (초)
+        """
+        self.debounce = debounce
+        self.max_batch = max_batch
+        self.reconnect_delay = reconnect_delay
+
+        self.running = False
+        self.pending: Set[str] = set()
+        self.first_pending_at: Optional[float] = None
+
+    def start(self):
+        """리스너 시작 (stop() 호출 또는 Ctrl+C까지 실행)"""
+        self.running = True
+        logger.info(f"[Snapshot Listener] 시작: channel={NOTIFY_CHANNEL}, debounce={self.debounce}s")
+
+        while self.running:
+            try:
+                self._listen()
+                self.catch_up()
+                self._loop()
+            except (OperationalError, InterfaceError) as e:
+                if not self.running:
+                    break
+                logger.error(f"[Snapshot Listener] DB 연결 오류, {self.reconnect_delay}s 후 재연결: {e}")
+                connection.close()
+                time.sleep(self.reconnect_delay)
+
+        # 종료 전 남은 대기열 반영
+        if self.pending:
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"[Snapshot Listener] 종료 시 갱신 실패: {e}")
+        logger.info("[Snapshot Listener] 종료")
+
+    def stop(self):
+        """리스너 종료"""
+        self.running = False
+
+    def _listen(self):
+        connection.ensure_connection()
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+            cursor.execute(f"LISTEN {snapshot_cache.GENERATION_CHANNEL}")
+
+    def _loop(self):
+        pg_conn = connection.connection
+        while self.running:
+            timeout = self._wait_timeout()
+            readable, _, _ = select.select([pg_conn], [], [], timeout)
+            if readable:
+                pg_conn.poll()
+                snapshot_changed = False
+                while pg_conn.notifies:
+                    notify = pg_conn.notifies.pop(0)
+                    if notify.channel == snapshot_cache.GENERATION_CHANNEL:
+                        snapshot_changed = True
+                    else:
+                        self._enqueue(notify.payload)
+                if snapshot_changed:
+                    snapshot_cache.bump_generation()
+
+            if self._should_flush():
+                self.flush()
+
+    def _wait_timeout(self) -> float:
+        if self.first_pending_at is None:
+            return 5.0
+        remaining = self.debounce - (time.monotonic() - self.first_pending_at)
+        return max(remaining, 0.0)
+
+    def _enqueue(self, payload: str):
+        no = (payload or '').rstrip()
+        if not no:
+            return
+        if not self.pending:
+            self.first_pending_at = time.monotonic()
+        self.pending.add(no)
+
+    def _should_flush(self) -> bool:
+        if not self.pending:
+            return False
+        if len(self.pending) >= self.max_batch:
+            return True
+        return time.monotonic() - self.first_pending_at >= self.debounce
+
+    def flush(self):
+        """
+        대기 중인 용기번호를 배치로 갱신
+
+        갱신 전에 잡은 소스 MAX 값으로 cy_sync_cursor를 마지막 청크와 같은 트랜잭션에서 전진시켜
+        재시작 시 catch-up이 마지막 배치 이후만 다시 읽게 한다. 실패한 용기가 있으면 커서는 그대로 둔다.
+        그 사이 커밋되어 아직 받지 못한 NOTIFY는 다음 루프에서 처리되고, 재시작 시에는 겹쳐 읽기로 보정된다.
+        """
+        batch = sorted(self.pending)
+        self.pending.clear()
+        self.first_pending_at = None
+
+        started = time.monotonic()
+        total_errors = 0
+        with connection.cursor() as cursor:
+            until = sync_cursor.capture_high_marks(cursor)
+            chunks = [batch[i:i + self.max_batch] for i in range(0, len(batch), self.max_batch)]
+            for index, chunk in enumerate(chunks):
+                with transaction.atomic():
+                    updated, errors = refresh_cylinders(cursor, chunk)
+                    total_errors += errors
+                    if index == len(chunks) - 1 and total_errors == 0:
+                        sync_cursor.save_watermarks(SYNC_CONSUMER, until)
+                logger.info(
+                    f"[Snapshot Listener] 갱신 {updated}건, 실패 {errors}건 "
+                    f"({(time.monotonic() - started) * 1000:.0f}ms)"
+                )
+        if total_errors:
+            logger.warning("[Snapshot Listener] 실패한 용기가 있어 커서를 전진시키지 않음 (다음 catch-up에서 재시도)")
+
+    def catch_up(self):
+        """
+        워터마크 이후 변경분 갱신 (리스너가 내려가 있던 동안 놓친 NOTIFY 보정)
+
+        flush()와 같이 실패한 용기가 있으면 커서를 그대로 두어 다음 catch-up에서 다시 시도한다.
+        """
+        with connection.cursor() as cursor:
+            since = sync_cursor.read_watermarks(SYNC_CONSUMER)
+            until = sync_cursor.capture_high_marks(cursor)
+            if not any(since.values()):
+                # 커서가 한 번도 저장되지 않았다면 전체 재생성(--full)이 먼저 필요하다.
+                logger.warning("[Snapshot Listener] 저장된 커서 없음 - catch-up 생략 (sync_cylinder_snapshot --full 권장)")
+                return
+            cylinder_nos = sync_cursor.changed_cylinder_nos(cursor, since, until)
+            with transaction.atomic():
+                updated, errors = refresh_cylinders(cursor, cylinder_nos)
+                if errors == 0:
+                    sync_cursor.save_watermarks(SYNC_CONSUMER, until)
+        logger.info(f"[Snapshot Listener] catch-up 완료: {updated}건 갱신, {errors}건 실패")
+        if errors:
+            logger.warning("[Snapshot Listener] 실패한 용기가 있어 커서를 전진시키지 않음 (다음 catch-up에서 재시도)")
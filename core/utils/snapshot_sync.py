@@ -0,0 +1,145 @@
+"""
+cy_cylinder_current 스냅샷 갱신 헬퍼
+
+- 여러 용기번호를 청크로 나눠 sync_cylinder_current_batch()로 갱신한다.
+  (sql/create_sync_batch_function.sql, 청크가 실패하면 그 청크만 건별 함수로 재시도)
+- 원천(ma_cylinders)에서 사라진 용기는 스냅샷에서도 삭제한다. (refresh_cylinders, delete_orphaned_cylinders)
+- 트랜잭션 경계는 호출 측에서 정한다. (행 단위 savepoint로 한 용기 실패가 전체를 깨뜨리지 않게 함)
+- 스냅샷을 바꾸면 커밋 시점에 캐시 세대를 올린다. (snapshot_cache.bump_generation_on_commit)
+"""
+import logging
+from typing import Callable, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+
+from core.utils import snapshot_cache
+
+logger = logging.getLogger(__name__)
+
+# sync_cylinder_current_batch() 1회 호출당 용기 수
+BATCH_SIZE = 1000
+
+
+def normalize_cylinder_nos(cylinder_nos: Iterable[str]) -> List[str]:
+    """용기번호 RTRIM + 중복 제거 (입력 순서 유지)"""
+    seen = set()
+    result = []
+    for no in cylinder_nos:
+        if not no:
+            continue
+        key = str(no).rstrip()
+        if key and key not in seen:
+            seen.add(key)
+            result.append(key)
+    return result
+
+
+def refresh_cylinders(cursor, cylinder_nos: Iterable[str]) -> Tuple[int, int]:
+    """
+    용기 스냅샷 갱신
+
+    Returns:
+        (갱신 건수, 실패 건수)
+    """
+    nos = normalize_cylinder_nos(cylinder_nos)
+    if not nos:
+        return 0, 0
+
+    # 원천에서 삭제된 용기 정리
+    cursor.execute(
+        """
+        DELETE FROM cy_cylinder_current cc
+        WHERE RTRIM(cc.cylinder_no) = ANY(%s)
+          AND NOT EXISTS (
+              SELECT 1 FROM "fcms_cdc"."ma_cylinders" c
+              WHERE RTRIM(c."CYLINDER_NO") = RTRIM(cc.cylinder_no)
+          )
+        """,
+        [nos],
+    )
+    if cursor.rowcount:
+        snapshot_cache.bump_generation_on_commit()
+
+    return sync_cylinders(cursor, nos)
+
+
+def delete_orphaned_cylinders(cursor) -> int:
+    """
+    원천(ma_cylinders)에 없는 스냅샷 행 전체 삭제 (삭제 건수)
+
+    워터마크 증분 갱신은 원천 DELETE를 볼 수 없으므로 증분 실행마다 호출한다.
+    cy_inventory_rollup이 ma_cylinders 조인 없이 스냅샷만 집계하므로 고아 행을 남기면 안 된다.
+    """
+    cursor.execute(
+        """
+        DELETE FROM cy_cylinder_current cc
+        WHERE NOT EXISTS (
+            SELECT 1 FROM "fcms_cdc"."ma_cylinders" c
+            WHERE RTRIM(c."CYLINDER_NO") = cc.cylinder_no
+        )
+        """
+    )
+    deleted = cursor.rowcount
+    if deleted:
+        snapshot_cache.bump_generation_on_commit()
+    return deleted
+
+
+def sync_cylinders(
+    cursor,
+    cylinder_nos: Iterable[str],
+    batch_size: int = BATCH_SIZE,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> Tuple[int, int]:
+    """
+    sync_cylinder_current_batch() 청크 호출
+
+    청크마다 savepoint를 두고, 청크가 실패하면 해당 청크만
+    sync_cylinder_current_single()로 건별 재시도해 실패 용기를 격리한다.
+
+    Args:
+        progress: 청크 처리 후 호출되는 콜백 (처리 건수, 전체 건수)
+
+    Returns:
+        (갱신 건수, 실패 건수) - 원천에 없는 용기는 어느 쪽에도 세지 않음
+    """
+    nos = normalize_cylinder_nos(cylinder_nos)
+    total = len(nos)
+    updated = 0
+    errors = 0
+
+    for start in range(0, total, batch_size):
+        chunk = nos[start:start + batch_size]
+        try:
+            with transaction.atomic():
+                cursor.execute(
+                    "SELECT synced_cylinder_no FROM sync_cylinder_current_batch(%s::text[])",
+                    [chunk],
+                )
+                updated += len(cursor.fetchall())
+        except Exception as e:
+            logger.warning(f"[Snapshot] 배치 갱신 실패, 건별 재시도 ({len(chunk)}건): {e}")
+            chunk_updated, chunk_errors = _sync_one_by_one(cursor, chunk)
+            updated += chunk_updated
+            errors += chunk_errors
+
+        if progress:
+            progress(min(start + batch_size, total), total)
+
+    if updated:
+        snapshot_cache.bump_generation_on_commit()
+    return updated, errors
+
+
+def _sync_one_by_one(cursor, nos: List[str]) -> Tuple[int, int]:
+    updated = 0
+    errors = 0
+    for no in nos:
+        try:
+            with transaction.atomic():
+                cursor.execute("SELECT sync_cylinder_current_single(%s)", [no])
+            updated += 1
+        except Exception as e:
+            errors += 1
+            logger.error(f"[Snapshot] 용기 갱신 실패 ({no}): {e}")
+    return updated, errors
@@ -0,0 +1,106 @@
+"""
+CDC 증분 동기화 커서 (high-water mark) 유틸리티
+
+- 소스 테이블별 워터마크 컬럼의 MAX 값을 텍스트로 cy_sync_cursor에 저장한다.
+- 다음 실행에서는 (저장된 값, 이번 실행 시작 시점의 MAX] 구간에서 변경된 용기만 조회한다.
+- 커서 저장(save_watermarks)은 반드시 스냅샷 쓰기와 같은 transaction.atomic() 안에서 호출해야
+  실패 시 커서만 앞서 나가는 일이 없다.
+"""
+from typing import Dict, List, Optional
+
+from core.models import SyncCursor
+
+
+# 소스 테이블 → (워터마크 SQL 식, FROM 절, 용기번호 SQL 식, 타임스탬프 여부)
+WATERMARK_SOURCES = {
+    'ma_cylinders': (
+        'COALESCE(c."UPDATE_DATETIME", c."ADD_DATETIME")',
+        '"fcms_cdc"."ma_cylinders" c',
+        'RTRIM(c."CYLINDER_NO")',
+        True,
+    ),
+    'tr_latest_cylinder_statuses': (
+        'ls."MOVE_DATE"',
+        '"fcms_cdc"."tr_latest_cylinder_statuses" ls',
+        'RTRIM(ls."CYLINDER_NO")',
+        True,
+    ),
+    # 이력 PK는 (CYLINDER_NO, HISTORY_SEQ)이고 HISTORY_SEQ는 용기별 순번일 수 있어 용기 간 비교가 안 된다.
+    # 그래서 MOVE_DATE를 워터마크로 쓴다. 같은 시각 행(동률)은 겹쳐 읽기(overlap)로 다시 읽히며,
+    # 용기 단위 재계산이라 같은 용기를 두 번 갱신해도 결과는 같다.
+    'tr_cylinder_status_histories': (
+        'h."MOVE_DATE"',
+        '"fcms_cdc"."tr_cylinder_status_histories" h',
+        'RTRIM(h."CYLINDER_NO")',
+        True,
+    ),
+}
+
+# 타임스탬프 워터마크는 CDC 지연 적재(늦게 들어온 과거 시각 행)를 흡수하도록 약간 겹쳐서 읽는다.
+DEFAULT_OVERLAP_MINUTES = 10
+
+
+def read_watermarks(consumer: str) -> Dict[str, Optional[str]]:
+    """저장된 워터마크 조회 (없으면 None)"""
+    marks: Dict[str, Optional[str]] = {source: None for source in WATERMARK_SOURCES}
+    for row in SyncCursor.objects.filter(consumer=consumer, source__in=list(WATERMARK_SOURCES)):
+        marks[row.source] = row.last_value
+    return marks
+
+
+def capture_high_marks(cursor) -> Dict[str, Optional[str]]:
+    """현재 소스 테이블의 워터마크 MAX 값 (이번 실행의 상한)"""
+    marks: Dict[str, Optional[str]] = {}
+    for source, (expr, from_sql, _no_expr, _is_ts) in WATERMARK_SOURCES.items():
+        cursor.execute(f"SELECT MAX({expr})::text FROM {from_sql}")
+        row = cursor.fetchone()
+        marks[source] = row[0] if row else None
+    return marks
+
+
+def changed_cylinder_nos(
+    cursor,
+    since: Dict[str, Optional[str]],
+    until: Dict[str, Optional[str]],
+    overlap_minutes: int = DEFAULT_OVERLAP_MINUTES,
+) -> List[str]:
+    """
+    since < 워터마크 <= until 구간에서 변경된 용기번호 (RTRIM, 중복 제거)
+    since 값이 없는 소스는 상한 이하 전체를 대상으로 한다.
+    """
+    parts = []
+    params: List = []
+    for source, (expr, from_sql, no_expr, is_ts) in WATERMARK_SOURCES.items():
+        upper = until.get(source)
+        if upper is None:
+            continue
+        conditions = [f"{expr} <= %s"]
+        source_params: List = [upper]
+        lower = since.get(source)
+        if lower is not None:
+            if is_ts and overlap_minutes:
+                conditions.append(f"{expr} > %s::timestamp - make_interval(mins => %s)")
+                source_params.extend([lower, overlap_minutes])
+            else:
+                conditions.append(f"{expr} > %s")
+                source_params.append(lower)
+        parts.append(f"SELECT {no_expr} FROM {from_sql} WHERE {' AND '.join(conditions)}")
+        params.extend(source_params)
+
+    if not parts:
+        return []
+
+    cursor.execute(" UNION ".join(parts), params)
+    return [row[0] for row in cursor.fetchall() if row and row[0]]
+
+
+def save_watermarks(consumer: str, marks: Dict[str, Optional[str]]) -> None:
+    """워터마크 저장 (호출 측 트랜잭션 안에서 실행)"""
+    for source, value in marks.items():
+        if value is None:
+            continue
+        SyncCursor.objects.update_or_create(
+            consumer=consumer,
+            source=source,
+            defaults={'last_value': value},
+        )
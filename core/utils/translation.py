@@ -1,11 +1,34 @@
-"""다국어 번역 유틸리티"""
-from typing import Optional
+"""
+다국어 번역 유틸리티
+
+활성 번역 전체를 프로세스 메모리의 사전({(field_type, 원본 casefold): 표시명})으로 한 번 읽어
+행/필드마다 Translation 쿼리를 보내지 않고 번역한다.
+
+- Translation 저장/삭제 시그널(core.apps)에서 invalidate_translations() 호출
+- 다른 gunicorn 워커는 snapshot 캐시의 번역 세대 값이 바뀐 것을 보고 다시 읽는다
+  (TRANSLATION_CHECK_INTERVAL 초마다 확인)
+"""
+import time
+import uuid
+from typing import Dict, Optional, Tuple
+
 from core.models import Translation
 
 
 # 현재 언어 설정 (기본: 한국어)
 _current_language = 'ko'
 
+# 워커 간 번역 세대 공유 키 (snapshot 캐시)
+TRANSLATION_GENERATION_KEY = 'translation:generation'
+
+# 다른 워커의 번역 변경 확인 주기 (초)
+TRANSLATION_CHECK_INTERVAL = 2.0
+
+# {(field_type, casefold 원본): (display_ko, display_ja, display_en)}
+_translation_map: Optional[Dict[Tuple[str, str], Tuple[str, Optional[str], Optional[str]]]] = None
+_loaded_generation: Optional[str] = None
+_generation_checked_at = 0.0
+
 
 def set_language(lang: str):
     """현재 언어 설정"""
@@ -18,6 +41,83 @@ def get_language() -> str:
     return _current_language
 
 
+def _shared_generation() -> str:
+    """snapshot 캐시에 저장된 번역 세대 값 (없으면 새로 만든다)"""
+    from core.utils.snapshot_cache import get_cache
+
+    cache = get_cache()
+    generation = cache.get(TRANSLATION_GENERATION_KEY)
+    if generation is None:
+        cache.add(TRANSLATION_GENERATION_KEY, uuid.uuid4().hex, None)
+        generation = cache.get(TRANSLATION_GENERATION_KEY)
+    return generation
+
+
+def invalidate_translations():
+    """번역 사전 무효화 (현재 프로세스 즉시, 다른 워커는 세대 값 변경으로 감지)"""
+    global _translation_map, _loaded_generation
+    from core.utils.snapshot_cache import get_cache
+
+    _translation_map = None
+    _loaded_generation = None
+    get_cache().set(TRANSLATION_GENERATION_KEY, uuid.uuid4().hex, None)
+
+
+def _load_translation_map() -> Dict[Tuple[str, str], Tuple[str, Optional[str], Optional[str]]]:
+    mapping = {}
+    rows = Translation.objects.filter(is_active=True).order_by('id').values_list(
+        'field_type', 'source_text', 'display_ko', 'display_ja', 'display_en'
+    )
+    for field_type, source_text, display_ko, display_ja, display_en in rows:
+        key = (field_type, (source_text or '').strip().casefold())
+        # 대소문자만 다른 중복은 먼저 등록된 번역 우선
+        mapping.setdefault(key, (display_ko, display_ja, display_en))
+    return mapping
+
+
+def _get_translation_map() -> Dict[Tuple[str, str], Tuple[str, Optional[str], Optional[str]]]:
+    """번역 사전 반환 (최초 1회 로드, 다른 워커의 변경은 주기적으로 확인)"""
+    global _translation_map, _loaded_generation, _generation_checked_at
+
+    now = time.monotonic()
+    if _translation_map is not None and now - _generation_checked_at < TRANSLATION_CHECK_INTERVAL:
+        return _translation_map
+
+    try:
+        generation = _shared_generation()
+        if _translation_map is None or generation != _loaded_generation:
+            _translation_map = _load_translation_map()
+            _loaded_generation = generation
+        _generation_checked_at = now
+    except Exception:
+        # DB/캐시 에러 시 원문 반환 (기존 사전이 있으면 유지)
+        if _translation_map is None:
+            return {}
+    return _translation_map
+
+
+def get_translation_stamp() -> str:
+    """
+    번역 변경 감지용 값 (번역 세대)
+
+    번역된 결과를 캐시할 때 키에 넣어 번역 수정/삭제 시 새로 계산되도록 한다.
+    """
+    try:
+        return _shared_generation()
+    except Exception:
+        return '-'
+
+
+def _display(entry: Tuple[str, Optional[str], Optional[str]], lang: str) -> str:
+    """Translation.get_display()와 같은 언어 선택 규칙"""
+    display_ko, display_ja, display_en = entry
+    if lang == 'ja' and display_ja:
+        return display_ja
+    elif lang == 'en' and display_en:
+        return display_en
+    return display_ko  # 기본값: 한국어
+
+
 def translate_text(field_type: str, source_text: Optional[str], lang: Optional[str] = None, default: Optional[str] = None) -> Optional[str]:
     """
     원본 텍스트를 지정 언어로 번역
@@ -34,27 +134,15 @@ def translate_text(field_type: str, source_text: Optional[str], lang: Optional[s
     if not source_text:
         return default or source_text
     
-    # 언어 결정
-    target_lang = lang or _current_language
-    
     # 공백 제거 및 정규화
     normalized_text = str(source_text).strip()
     if not normalized_text:
         return default or source_text
     
-    # 번역 테이블에서 조회
-    try:
-        translation = Translation.objects.filter(
-            field_type=field_type,
-            source_text__iexact=normalized_text,  # 대소문자 구분 없음
-            is_active=True
-        ).first()
-        
-        if translation:
-            return translation.get_display(target_lang)
-    except Exception:
-        # DB 에러 시 원문 반환
-        pass
+    # 번역 사전에서 조회 (대소문자 구분 없음)
+    entry = _get_translation_map().get((field_type, normalized_text.casefold()))
+    if entry:
+        return _display(entry, lang or _current_language)
     
     # 번역이 없으면 기본값 또는 원문 반환
     return default if default is not None else source_text
@@ -72,47 +160,51 @@ def translate_dict(data: dict, field_types: Optional[list] = None, lang: Optiona
     Returns:
         dict: 번역된 딕셔너리 (원본 수정 없이 새 딕셔너리 반환)
     """
-    if field_types is None:
-        field_types = ['gas_name', 'valve_spec', 'cylinder_spec', 'usage_place', 'location']
-    
-    translated = data.copy()
-    
-    # 필드 타입별 매핑
-    field_mapping = {
-        'gas_name': 'gas_name',
-        'valve_spec': 'valve_spec',
-        'cylinder_spec': 'cylinder_spec',
-        'usage_place': 'usage_place',
-        'location': 'location',
-    }
-    
-    for field_type in field_types:
-        if field_type in field_mapping:
-            field_name = field_mapping[field_type]
-            if field_name in translated:
-                translated[field_name] = translate_text(
-                    field_type,
-                    translated[field_name],
-                    lang=lang,
-                    default=translated[field_name]  # 번역 없으면 원문 유지
-                )
-    
-    return translated
+    return translate_list([data], field_types, lang)[0]
 
 
 def translate_list(data_list: list, field_types: Optional[list] = None, lang: Optional[str] = None) -> list:
     """
     딕셔너리 리스트의 모든 항목을 번역
     
+    번역 사전을 한 번만 가져오고, 같은 (필드, 원본) 값은 한 번만 변환해 재사용한다.
+    
     Args:
         data_list: 번역할 딕셔너리 리스트
         field_types: 번역할 필드 타입 리스트
         lang: 대상 언어
     
     Returns:
-        list: 번역된 딕셔너리 리스트
+        list: 번역된 딕셔너리 리스트 (원본 수정 없이 새 딕셔너리 반환)
     """
-    return [translate_dict(item, field_types, lang) for item in data_list]
+    if field_types is None:
+        field_types = ['gas_name', 'valve_spec', 'cylinder_spec', 'usage_place', 'location']
+    
+    if not data_list:
+        return []
+    
+    mapping = _get_translation_map()
+    target_lang = lang or _current_language
+    memo = {}
+    
+    translated_list = []
+    for item in data_list:
+        translated = item.copy()
+        for field_type in field_types:
+            if field_type not in translated:
+                continue
+            value = translated[field_type]
+            if not value:
+                continue
+            memo_key = (field_type, value)
+            if memo_key not in memo:
+                normalized_text = str(value).strip()
+                entry = mapping.get((field_type, normalized_text.casefold())) if normalized_text else None
+                memo[memo_key] = _display(entry, target_lang) if entry else value
+            translated[field_type] = memo[memo_key]
+        translated_list.append(translated)
+    
+    return translated_list
 
 
 def get_or_create_translation(field_type: str, source_text: str, display_ko: str = None, 
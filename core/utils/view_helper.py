@@ -303,6 +303,30 @@ def group_cylinder_types(inventory_data: List[Dict]) -> Dict[str, Dict]:
     return cylinder_types
 
 
+def get_cylinder_type_groups(filters: Optional[Dict] = None) -> Dict[str, Dict]:
+    """
+    get_inventory_summary() + group_cylinder_types() 결과를 스냅샷 버전 기준으로 캐시
+
+    대시보드/현황/알림/보고서가 같은 그룹 결과를 매 요청마다 다시 만들지 않도록
+    snapshot 캐시(워커 간 공유)에 둔다. 번역 결과가 그룹 키에 들어가므로
+    현재 언어와 번역 테이블 변경값도 캐시 키에 포함한다.
+    """
+    from core.repositories.cylinder_repository import CylinderRepository
+    from core.utils import snapshot_cache
+    from core.utils.translation import get_language, get_translation_stamp
+
+    params = {
+        'filters': filters or {},
+        'lang': get_language(),
+        'translation': get_translation_stamp(),
+    }
+    return snapshot_cache.cached(
+        'cylinder_type_groups',
+        params,
+        lambda: group_cylinder_types(CylinderRepository.get_inventory_summary(filters)),
+    )
+
+
 def calculate_risk_level(available_qty: int, total_qty: int, abnormal_qty: int = 0, disposal_qty: int = 0) -> str:
     """
     위험도 레벨 계산
@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+"""
+스트리밍 XLSX 작성기
+
+openpyxl Workbook은 전체 셀을 메모리에 올린 뒤 save() 시점에 한 번에 zip을 만든다.
+이 작성기는 시트 XML을 행 단위로 zip 스트림에 바로 쓰고, 쌓인 바이트를 즉시 내보내므로
+StreamingHttpResponse와 함께 쓰면 건수와 무관하게 메모리가 일정하고 다운로드가 바로 시작된다.
+
+- 셀 스타일은 styles.xml의 공유 스타일(STYLE_*) 번호만 참조한다. (excel_style.py와 같은 모양)
+- 문자열은 inline string으로 써서 sharedStrings 테이블을 메모리에 모으지 않는다.
+- zip은 data descriptor 방식으로 써서 seek 없이 순차 출력한다.
+"""
+import re
+import zipfile
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+from xml.sax.saxutils import escape
+
+from openpyxl.utils import get_column_letter
+
+
+# styles.xml cellXfs 순서와 일치해야 함
+STYLE_DEFAULT = 0
+STYLE_HEADER = 1
+STYLE_DATA = 2
+STYLE_DATA_CENTER = 3
+STYLE_DATA_ALT = 4
+STYLE_DATA_CENTER_ALT = 5
+STYLE_INFO_LABEL = 6
+STYLE_INFO_VALUE = 7
+
+# XML 1.0에서 허용되지 않는 제어 문자 (openpyxl IllegalCharacterError 대상)
+_ILLEGAL_XML_CHARS = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+_STYLES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<fonts count="5">'
+    '<font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="10"/><color rgb="FFFFFFFF"/><name val="Calibri"/></font>'
+    '<font><sz val="9"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="10"/><name val="Calibri"/></font>'
+    '<font><sz val="10"/><name val="Calibri"/></font>'
+    '</fonts>'
+    '<fills count="4">'
+    '<fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="FF2F5496"/><bgColor rgb="FF2F5496"/></patternFill></fill>'
+    '<fill><patternFill patternType="solid"><fgColor rgb="FFF2F2F2"/><bgColor rgb="FFF2F2F2"/></patternFill></fill>'
+    '</fills>'
+    '<borders count="2">'
+    '<border><left/><right/><top/><bottom/><diagonal/></border>'
+    '<border>'
+    '<left style="thin"><color rgb="FFB0B0B0"/></left>'
+    '<right style="thin"><color rgb="FFB0B0B0"/></right>'
+    '<top style="thin"><color rgb="FFB0B0B0"/></top>'
+    '<bottom style="thin"><color rgb="FFB0B0B0"/></bottom>'
+    '<diagonal/>'
+    '</border>'
+    '</borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="8">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="2" borderId="1" xfId="0" applyFont="1" applyFill="1" applyBorder="1" applyAlignment="1">'
+    '<alignment horizontal="center" vertical="center" wrapText="1"/></xf>'
+    '<xf numFmtId="0" fontId="2" fillId="0" borderId="1" xfId="0" applyFont="1" applyBorder="1" applyAlignment="1">'
+    '<alignment vertical="center"/></xf>'
+    '<xf numFmtId="0" fontId="2" fillId="0" borderId="1" xfId="0" applyFont="1" applyBorder="1" applyAlignment="1">'
+    '<alignment horizontal="center" vertical="center"/></xf>'
+    '<xf numFmtId="0" fontId="2" fillId="3" borderId="1" xfId="0" applyFont="1" applyFill="1" applyBorder="1" applyAlignment="1">'
+    '<alignment vertical="center"/></xf>'
+    '<xf numFmtId="0" fontId="2" fillId="3" borderId="1" xfId="0" applyFont="1" applyFill="1" applyBorder="1" applyAlignment="1">'
+    '<alignment horizontal="center" vertical="center"/></xf>'
+    '<xf numFmtId="0" fontId="3" fillId="0" borderId="0" xfId="0" applyFont="1" applyAlignment="1">'
+    '<alignment horizontal="right" vertical="center"/></xf>'
+    '<xf numFmtId="0" fontId="4" fillId="0" borderId="0" xfId="0" applyFont="1" applyAlignment="1">'
+    '<alignment vertical="center"/></xf>'
+    '</cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+
+class _ChunkBuffer:
+    """zipfile이 쓰는 바이트를 모아 두었다가 drain()으로 꺼내는 순차 출력 버퍼 (seek 불가)"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        if data:
+            self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class XlsxSheet:
+    """
+    스트리밍 시트 정의
+
+    Args:
+        title: 시트 이름
+        rows: (값 리스트, 스타일 번호 리스트 또는 단일 스타일 번호) 반복자
+        widths: 열 너비 리스트
+        row_height: 데이터 행 높이 (None이면 기본값)
+        header_height: 첫 행 높이 (None이면 row_height)
+        print_landscape: A4 인쇄 설정 (None이면 인쇄 설정 없음, True 가로 / False 세로)
+        repeat_header: 인쇄 시 첫 행 반복 여부
+    """
+
+    def __init__(
+        self,
+        title: str,
+        rows: Iterable[Tuple[Sequence, object]],
+        widths: Optional[Sequence[float]] = None,
+        row_height: Optional[float] = None,
+        header_height: Optional[float] = None,
+        print_landscape: Optional[bool] = None,
+        repeat_header: bool = False,
+    ):
+        self.title = title
+        self.rows = rows
+        self.widths = list(widths or [])
+        self.row_height = row_height
+        self.header_height = header_height if header_height is not None else row_height
+        self.print_landscape = print_landscape
+        self.repeat_header = repeat_header
+
+        # 작성 후 채워짐 (인쇄 영역 계산용)
+        self.row_count = 0
+        self.col_count = len(self.widths)
+
+
+def _cell_xml(ref: str, value, style: int) -> str:
+    if value is None:
+        return f'<c r="{ref}" s="{style}"/>'
+    if isinstance(value, bool):
+        return f'<c r="{ref}" s="{style}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float, Decimal)):
+        return f'<c r="{ref}" s="{style}"><v>{value}</v></c>'
+    if isinstance(value, datetime):
+        value = value.strftime('%Y-%m-%d %H:%M:%S')
+    elif isinstance(value, date):
+        value = value.strftime('%Y-%m-%d')
+    text = escape(_ILLEGAL_XML_CHARS.sub('', str(value)))
+    return f'<c r="{ref}" s="{style}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _sheet_head_xml(sheet: XlsxSheet) -> str:
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n',
+        '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">',
+    ]
+    if sheet.print_landscape is not None:
+        parts.append('<sheetPr><pageSetUpPr fitToPage="1"/></sheetPr>')
+    parts.append('<sheetFormatPr defaultRowHeight="15"/>')
+    if sheet.widths:
+        parts.append('<cols>')
+        for idx, width in enumerate(sheet.widths, 1):
+            parts.append(f'<col min="{idx}" max="{idx}" width="{width}" customWidth="1"/>')
+        parts.append('</cols>')
+    parts.append('<sheetData>')
+    return ''.join(parts)
+
+
+def _sheet_tail_xml(sheet: XlsxSheet) -> str:
+    parts = ['</sheetData>']
+    if sheet.print_landscape is not None:
+        parts.append('<printOptions horizontalCentered="1"/>')
+        # 여백 (인치 단위, excel_style.setup_print_area와 동일)
+        parts.append('<pageMargins left="0.4" right="0.4" top="0.5" bottom="0.5" header="0.2" footer="0.2"/>')
+        orientation = 'landscape' if sheet.print_landscape else 'portrait'
+        parts.append(f'<pageSetup paperSize="9" orientation="{orientation}" fitToWidth="1" fitToHeight="0"/>')
+    parts.append('</worksheet>')
+    return ''.join(parts)
+
+
+def _workbook_xml(sheets: List[XlsxSheet]) -> str:
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n',
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">',
+        '<sheets>',
+    ]
+    for idx, sheet in enumerate(sheets, 1):
+        parts.append(f'<sheet name="{escape(sheet.title)}" sheetId="{idx}" r:id="rId{idx}"/>')
+    parts.append('</sheets>')
+
+    defined = []
+    for idx, sheet in enumerate(sheets):
+        if sheet.print_landscape is None or sheet.row_count == 0:
+            continue
+        quoted = "'" + sheet.title.replace("'", "''") + "'"
+        last_col = get_column_letter(max(sheet.col_count, 1))
+        defined.append(
+            f'<definedName name="_xlnm.Print_Area" localSheetId="{idx}">'
+            f'{escape(quoted)}!$A$1:${last_col}${sheet.row_count}</definedName>'
+        )
+        if sheet.repeat_header:
+            defined.append(
+                f'<definedName name="_xlnm.Print_Titles" localSheetId="{idx}">{escape(quoted)}!$1:$1</definedName>'
+            )
+    if defined:
+        parts.append('<definedNames>' + ''.join(defined) + '</definedNames>')
+    parts.append('</workbook>')
+    return ''.join(parts)
+
+
+def _content_types_xml(sheet_count: int) -> str:
+    overrides = ''.join(
+        f'<Override PartName="/xl/worksheets/sheet{idx}.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        for idx in range(1, sheet_count + 1)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        f'{overrides}'
+        '</Types>'
+    )
+
+
+def _workbook_rels_xml(sheet_count: int) -> str:
+    rels = ''.join(
+        f'<Relationship Id="rId{idx}" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        f'Target="worksheets/sheet{idx}.xml"/>'
+        for idx in range(1, sheet_count + 1)
+    )
+    styles_id = sheet_count + 1
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        f'{rels}'
+        f'<Relationship Id="rId{styles_id}" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+        'Target="styles.xml"/>'
+        '</Relationships>'
+    )
+
+
+_ROOT_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+
+def stream_xlsx(sheets: List[XlsxSheet], flush_rows: int = 500) -> Iterator[bytes]:
+    """
+    시트 목록을 XLSX 바이트 조각으로 순차 생성 (StreamingHttpResponse 본문용)
+
+    시트의 rows 반복자는 여기서 처음 소비되므로 DB 서버 측 커서를 그대로 넘겨도 된다.
+    앞 시트를 다 쓴 뒤 다음 시트의 rows를 읽으므로, 뒤 시트에서 앞 시트의 row_count를 참조할 수 있다.
+
+    Args:
+        sheets: XlsxSheet 목록
+        flush_rows: 이 행 수마다 쌓인 바이트를 내보냄
+    """
+    buffer = _ChunkBuffer()
+    zf = zipfile.ZipFile(buffer, mode='w', compression=zipfile.ZIP_DEFLATED)
+
+    zf.writestr('[Content_Types].xml', _content_types_xml(len(sheets)))
+    zf.writestr('_rels/.rels', _ROOT_RELS_XML)
+    zf.writestr('xl/_rels/workbook.xml.rels', _workbook_rels_xml(len(sheets)))
+    zf.writestr('xl/styles.xml', _STYLES_XML)
+    yield buffer.drain()
+
+    for sheet_idx, sheet in enumerate(sheets, 1):
+        with zf.open(f'xl/worksheets/sheet{sheet_idx}.xml', mode='w') as part:
+            part.write(_sheet_head_xml(sheet).encode('utf-8'))
+
+            row_num = 0
+            for values, styles in sheet.rows:
+                row_num += 1
+                sheet.col_count = max(sheet.col_count, len(values))
+                height = sheet.header_height if row_num == 1 else sheet.row_height
+                row_attr = f' ht="{height}" customHeight="1"' if height else ''
+                cells = []
+                for col_idx, value in enumerate(values, 1):
+                    style = styles[col_idx - 1] if isinstance(styles, (list, tuple)) else styles
+                    cells.append(_cell_xml(f'{get_column_letter(col_idx)}{row_num}', value, style))
+                part.write(f'<row r="{row_num}"{row_attr}>{"".join(cells)}</row>'.encode('utf-8'))
+
+                if row_num % flush_rows == 0:
+                    data = buffer.drain()
+                    if data:
+                        yield data
+
+            sheet.row_count = row_num
+            part.write(_sheet_tail_xml(sheet).encode('utf-8'))
+        yield buffer.drain()
+
+    # 인쇄 영역은 행 수를 알아야 하므로 workbook.xml을 마지막에 쓴다.
+    zf.writestr('xl/workbook.xml', _workbook_xml(sheets))
+    zf.close()
+    yield buffer.drain()
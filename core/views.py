@@ -2,15 +2,20 @@
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required, user_passes_test
 from django.contrib import messages
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, FileResponse, Http404
 from django.views.decorators.http import require_POST, require_http_methods
 from django.db import connection
 from django.core.paginator import Paginator
+from django.urls import reverse
 import csv
 import io
 from openpyxl import Workbook, load_workbook
 from openpyxl.styles import Font, Alignment, PatternFill
 
+from core import jobs
+from core.models import BackgroundJob, JobStatus
+from core.utils.snapshot_sync import sync_cylinders
+
 
 def is_staff(user):
     """스태프 권한 확인"""
@@ -148,8 +153,7 @@ def enduser_default_add(request):
                       AND (%s IS NULL OR raw_cylinder_spec_code = %s)
                 """, [gas_name, capacity, capacity, valve_spec_code, valve_spec_code, 
                       cylinder_spec_code, cylinder_spec_code])
-                for row in cursor.fetchall():
-                    cursor.execute("SELECT sync_cylinder_current_single(%s)", [row[0]])
+                sync_cylinders(cursor, [row[0] for row in cursor.fetchall()])
                 
                 return redirect('core:enduser_default_list')
             except Exception as e:
@@ -303,8 +307,7 @@ def enduser_default_edit(request, default_id):
                           AND (%s IS NULL OR raw_valve_spec_code = %s)
                           AND (%s IS NULL OR raw_cylinder_spec_code = %s)
                     """, [gas, cap, cap, valve, valve, cyl, cyl])
-                    for row in cursor.fetchall():
-                        cursor.execute("SELECT sync_cylinder_current_single(%s)", [row[0]])
+                    sync_cylinders(cursor, [row[0] for row in cursor.fetchall()])
                 
                 return redirect('core:enduser_default_list')
             except Exception as e:
@@ -377,8 +380,7 @@ def enduser_default_toggle(request, default_id):
                   AND (%s IS NULL OR raw_cylinder_spec_code = %s)
             """, [gas_name, capacity, capacity, valve_spec_code, valve_spec_code, 
                   cylinder_spec_code, cylinder_spec_code])
-            for row in cursor.fetchall():
-                cursor.execute("SELECT sync_cylinder_current_single(%s)", [row[0]])
+            sync_cylinders(cursor, [row[0] for row in cursor.fetchall()])
     
     return redirect('core:enduser_default_list')
 
@@ -421,8 +423,7 @@ def enduser_default_delete(request, default_id):
               AND (%s IS NULL OR raw_cylinder_spec_code = %s)
         """, [gas_name, capacity, capacity, valve_spec_code, valve_spec_code, 
               cylinder_spec_code, cylinder_spec_code])
-        for row in cursor.fetchall():
-            cursor.execute("SELECT sync_cylinder_current_single(%s)", [row[0]])
+        sync_cylinders(cursor, [row[0] for row in cursor.fetchall()])
     
     return redirect('core:enduser_default_list')
 
@@ -489,7 +490,7 @@ def enduser_exception_add(request):
                 messages.success(request, f'예외가 추가되었습니다: {cylinder_no_trimmed} → {enduser}')
                 
                 # 스냅샷 갱신 (TRIM된 용기번호로)
-                cursor.execute("SELECT sync_cylinder_current_single(%s)", [cylinder_no_trimmed])
+                sync_cylinders(cursor, [cylinder_no_trimmed])
                 
                 return redirect('core:enduser_exception_list')
             except Exception as e:
@@ -528,6 +529,7 @@ def enduser_exception_upload(request):
     
     count = 0
     errors = []
+    uploaded_nos = []
     
     try:
         with connection.cursor() as cursor:
@@ -580,9 +582,7 @@ def enduser_exception_upload(request):
                                     updated_at = NOW()
                             """, [cylinder_no_trimmed, enduser, reason])
                             count += 1
-                            
-                            # 스냅샷 갱신 (TRIM된 용기번호로)
-                            cursor.execute("SELECT sync_cylinder_current_single(%s)", [cylinder_no_trimmed])
+                            uploaded_nos.append(cylinder_no_trimmed)
                         except Exception as e:
                             errors.append(f'{row_num}행 ({cylinder_no}): {str(e)}')
                             
@@ -620,14 +620,15 @@ def enduser_exception_upload(request):
                                 updated_at = NOW()
                         """, [cylinder_no_trimmed, enduser, reason])
                         count += 1
-                        
-                        # 스냅샷 갱신 (TRIM된 용기번호로)
-                        cursor.execute("SELECT sync_cylinder_current_single(%s)", [cylinder_no_trimmed])
+                        uploaded_nos.append(cylinder_no_trimmed)
                     except Exception as e:
                         errors.append(f'{i}행 ({cylinder_no}): {str(e)}')
             else:
                 messages.error(request, '지원하지 않는 파일 형식입니다. Excel(.xlsx) 또는 CSV(.csv) 파일을 사용하세요.')
                 return redirect('core:enduser_exception_list')
+            
+            # 스냅샷 갱신 (업로드된 용기를 모아서 배치로)
+            sync_cylinders(cursor, uploaded_nos)
         
         if count > 0:
             messages.success(request, f'{count}개 예외가 추가되었습니다.')
@@ -707,7 +708,7 @@ def enduser_exception_toggle(request, exception_id):
             messages.success(request, f'{cylinder_no}가 {status}되었습니다.')
             
             # 스냅샷 갱신
-            cursor.execute("SELECT sync_cylinder_current_single(%s)", [cylinder_no])
+            sync_cylinders(cursor, [cylinder_no])
     
     return redirect('core:enduser_exception_list')
 
@@ -878,8 +879,7 @@ def valve_group_mapping_add(request, group_id):
                 FROM cy_cylinder_current
                 WHERE raw_valve_spec_code = %s
             """, [valve_spec_code])
-            for row in cursor.fetchall():
-                cursor.execute("SELECT sync_cylinder_current_single(%s)", [row[0]])
+            sync_cylinders(cursor, [row[0] for row in cursor.fetchall()])
             
         except Exception as e:
             messages.error(request, f'오류: {str(e)}')
@@ -926,8 +926,7 @@ def valve_group_mapping_toggle_primary(request, mapping_id):
                 SELECT valve_spec_code FROM cy_valve_group_mapping WHERE id = %s
             )
         """, [mapping_id])
-        for row in cursor.fetchall():
-            cursor.execute("SELECT sync_cylinder_current_single(%s)", [row[0]])
+        sync_cylinders(cursor, [row[0] for row in cursor.fetchall()])
     
     return redirect('core:valve_group_detail', group_id=group_id)
 
@@ -956,8 +955,7 @@ def valve_group_mapping_toggle_active(request, mapping_id):
                 FROM cy_cylinder_current
                 WHERE raw_valve_spec_code = %s
             """, [valve_spec_code])
-            for row in cursor.fetchall():
-                cursor.execute("SELECT sync_cylinder_current_single(%s)", [row[0]])
+            sync_cylinders(cursor, [row[0] for row in cursor.fetchall()])
             
             return redirect('core:valve_group_detail', group_id=group_id)
     
@@ -1184,3 +1182,64 @@ def enduser_master_delete(request, enduser_id):
             messages.error(request, 'EndUser를 찾을 수 없습니다.')
     
     return redirect('core:enduser_master_list')
+
+
+# ============================================
+# 백그라운드 작업 (core/jobs.py)
+# ============================================
+
+def _get_job_for_request(request, token):
+    """요청자 본인(또는 스태프)의 작업만 조회. 비로그인 요청 작업은 토큰으로만 접근한다."""
+    job = BackgroundJob.objects.filter(token=token).first()
+    if job is None:
+        raise Http404('작업을 찾을 수 없습니다.')
+    if job.created_by_id and job.created_by_id != request.user.id and not request.user.is_staff:
+        raise Http404('작업을 찾을 수 없습니다.')
+    return job
+
+
+def _job_state(job):
+    state = {
+        'token': str(job.token),
+        'label': job.label,
+        'status': job.status,
+        'status_display': job.get_status_display(),
+        'created_at': job.created_at.isoformat() if job.created_at else None,
+        'started_at': job.started_at.isoformat() if job.started_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None,
+        'error': job.error,
+        'download_url': None,
+    }
+    if job.status == JobStatus.QUEUED:
+        state['queue_position'] = BackgroundJob.objects.filter(
+            status=JobStatus.QUEUED, created_at__lt=job.created_at
+        ).count() + 1
+    if jobs.result_file(job) is not None:
+        state['download_url'] = reverse('core:job_download', kwargs={'token': job.token})
+    return state
+
+
+def job_status(request, token):
+    """작업 상태 페이지 (완료되면 자동 다운로드)"""
+    job = _get_job_for_request(request, token)
+    return render(request, 'core/job_status.html', {'job': job, 'state': _job_state(job)})
+
+
+def job_status_json(request, token):
+    """작업 상태 폴링 API"""
+    job = _get_job_for_request(request, token)
+    return JsonResponse(_job_state(job))
+
+
+def job_download(request, token):
+    """완료된 작업 결과 파일 다운로드"""
+    job = _get_job_for_request(request, token)
+    path = jobs.result_file(job)
+    if path is None:
+        raise Http404('결과 파일이 없습니다.')
+    return FileResponse(
+        open(path, 'rb'),
+        as_attachment=True,
+        filename=job.result_filename or path.name,
+        content_type=job.content_type or 'application/octet-stream',
+    )
@@ -0,0 +1,37 @@
+"""용기 백그라운드 작업 핸들러 (core/jobs.py)"""
+import os
+import tempfile
+
+from django.http import QueryDict
+
+from core.jobs import register
+
+from .views import XLSX_CONTENT_TYPE, build_cylinder_excel, build_cylinder_qr_pdf
+
+
+def _iter_file_and_remove(path, chunk_size=1024 * 1024):
+    """임시 파일을 청크로 읽어 넘기고 다 읽으면 삭제"""
+    try:
+        with open(path, 'rb') as f:
+            yield from iter(lambda: f.read(chunk_size), b'')
+    finally:
+        os.unlink(path)
+
+
+@register('cylinders.export_excel')
+def export_excel(params):
+    chunks, filename, _ = build_cylinder_excel(QueryDict(params.get('query', '')))
+    return chunks, filename, XLSX_CONTENT_TYPE
+
+
+@register('cylinders.export_qr_pdf')
+def export_qr_pdf(params):
+    # PDF를 bytes로 한 번 더 들고 있지 않도록 임시 파일에 바로 저장
+    fd, path = tempfile.mkstemp(suffix='.pdf')
+    os.close(fd)
+    try:
+        _, filename, _ = build_cylinder_qr_pdf(QueryDict(params.get('query', '')), output=path)
+    except Exception:
+        os.unlink(path)
+        raise
+    return _iter_file_and_remove(path), filename, 'application/pdf'
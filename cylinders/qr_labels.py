@@ -0,0 +1,305 @@
+"""
+용기 QR 라벨 PDF 생성
+
+- QR코드는 PNG로 그려 다시 읽지 않고, 모듈(검은 칸)을 행 단위 사각형 경로로 캔버스에 직접 그린다.
+- 용기번호별 QR 모듈 행렬은 프로세스 메모리 캐시(LRU)에 두어 같은 용기를 다시 출력할 때 재계산하지 않는다.
+- 백그라운드 작업 워커(run_jobs)는 enable_process_pool()로 작은 공유 프로세스 풀을 켜 두고,
+  캐시에 없는 용기가 많으면 QR 계산(순수 Python, CPU 부담이 큼)을 풀에서 청크 단위로 나눠 계산한다.
+  gunicorn 요청 안에서는 풀을 만들지 않고 같은 프로세스에서 계산한다.
+- 풀이 켜져 있고 라벨이 여러 청크(PAGES_PER_CHUNK 페이지 단위)로 나뉘면 페이지 묶음을 풀에서 각각 PDF로
+  그린 뒤 pypdf로 순서대로 이어 붙인다. 풀이 없거나 pypdf가 없으면 한 캔버스에 순서대로 그린다.
+  (라벨 수 상한 없음)
+- 한글 폰트는 프로세스당 한 번만 등록한다.
+"""
+import atexit
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from multiprocessing import get_context
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# (모듈 수, 검은 칸 가로 구간 목록[(행, 시작 열, 길이)])
+QrModules = Tuple[int, Tuple[Tuple[int, int, int], ...]]
+
+# 용기번호 → QR 모듈 캐시 크기
+QR_CACHE_SIZE = 20000
+
+# 캐시 미스가 이 개수 이상일 때만 병렬 계산 (풀이 켜진 경우에만, 소량은 직접 계산)
+PARALLEL_MIN = 400
+PARALLEL_CHUNK = 200
+
+# 공유 프로세스 풀 기본 크기 (작업 워커가 웹 서버 CPU를 다 쓰지 않도록 작게 둔다)
+POOL_MAX_WORKERS = 2
+
+# 병렬 생성 시 한 번에 그릴 페이지 수 (A4 한 장 180개 → 청크당 1800개)
+PAGES_PER_CHUNK = 10
+
+# 한글 폰트 후보 (첫 번째로 존재하는 파일 사용)
+FONT_CANDIDATES = [
+    ('MalgunGothic', 'C:/Windows/Fonts/malgun.ttf'),
+    ('NanumGothic', '/usr/share/fonts/truetype/nanum/NanumGothic.ttf'),
+]
+
+_qr_cache: "OrderedDict[str, QrModules]" = OrderedDict()
+_qr_cache_lock = threading.Lock()
+
+_font_name: Optional[str] = None
+_font_lock = threading.Lock()
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def compute_qr_modules(data: str) -> QrModules:
+    """QR 모듈 행렬을 행별 검은 칸 구간으로 변환 (기존 PNG 출력과 같은 version=1, L, border=1)"""
+    import qrcode
+
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        border=1,
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+    matrix = qr.get_matrix()
+
+    runs = []
+    for row_idx, row in enumerate(matrix):
+        col_idx = 0
+        size = len(row)
+        while col_idx < size:
+            if row[col_idx]:
+                start = col_idx
+                while col_idx < size and row[col_idx]:
+                    col_idx += 1
+                runs.append((row_idx, start, col_idx - start))
+            else:
+                col_idx += 1
+    return len(matrix), tuple(runs)
+
+
+def _compute_chunk(values: List[str]) -> List[Tuple[str, QrModules]]:
+    return [(value, compute_qr_modules(value)) for value in values]
+
+
+def enable_process_pool(max_workers: int = POOL_MAX_WORKERS):
+    """이 프로세스에서 QR 병렬 계산 허용 (run_jobs 워커 전용, 풀은 처음 필요할 때 만든다)"""
+    global _pool_workers
+    _pool_workers = max(1, min(max_workers, os.cpu_count() or 1))
+
+
+def shutdown_process_pool():
+    """공유 프로세스 풀 종료"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True)
+            _pool = None
+
+
+def _get_pool() -> Optional[ProcessPoolExecutor]:
+    """공유 프로세스 풀 (enable_process_pool()을 호출하지 않았으면 None)"""
+    global _pool
+    if not _pool_workers:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # spawn: 워커의 DB 연결/스레드를 자식 프로세스로 복제하지 않는다.
+            _pool = ProcessPoolExecutor(max_workers=_pool_workers, mp_context=get_context('spawn'))
+            atexit.register(shutdown_process_pool)
+        return _pool
+
+
+def get_qr_modules(values: Iterable[str]) -> Dict[str, QrModules]:
+    """용기번호 목록의 QR 모듈 (캐시 우선, 미스는 풀이 켜져 있으면 병렬 계산)"""
+    unique = list(dict.fromkeys(values))
+    found: Dict[str, QrModules] = {}
+    missing: List[str] = []
+
+    with _qr_cache_lock:
+        for value in unique:
+            modules = _qr_cache.get(value)
+            if modules is None:
+                missing.append(value)
+            else:
+                _qr_cache.move_to_end(value)
+                found[value] = modules
+
+    if missing:
+        chunks = [missing[i:i + PARALLEL_CHUNK] for i in range(0, len(missing), PARALLEL_CHUNK)]
+        pool = _get_pool() if len(missing) >= PARALLEL_MIN else None
+        if pool is not None:
+            computed = [pair for chunk in pool.map(_compute_chunk, chunks) for pair in chunk]
+        else:
+            computed = [pair for chunk in chunks for pair in _compute_chunk(chunk)]
+
+        with _qr_cache_lock:
+            for value, modules in computed:
+                found[value] = modules
+                _qr_cache[value] = modules
+                _qr_cache.move_to_end(value)
+            while len(_qr_cache) > QR_CACHE_SIZE:
+                _qr_cache.popitem(last=False)
+
+    return found
+
+
+def get_label_font() -> str:
+    """라벨용 폰트 이름 (프로세스당 1회 등록, 한글 폰트가 없으면 Helvetica)"""
+    global _font_name
+    if _font_name is not None:
+        return _font_name
+
+    with _font_lock:
+        if _font_name is None:
+            from reportlab.pdfbase import pdfmetrics
+            from reportlab.pdfbase.ttfonts import TTFont
+
+            name = 'Helvetica'
+            for font_name, font_path in FONT_CANDIDATES:
+                try:
+                    if os.path.exists(font_path):
+                        pdfmetrics.registerFont(TTFont(font_name, font_path))
+                        name = font_name
+                        break
+                except Exception:
+                    continue
+            _font_name = name
+    return _font_name
+
+
+def _draw_qr(c, modules: QrModules, x: float, y: float, size: float):
+    """QR 모듈을 (x, y)를 왼쪽 아래로 하는 size 크기 정사각형에 벡터로 그림"""
+    count, runs = modules
+    module = size / count
+    path = c.beginPath()
+    for row_idx, start, length in runs:
+        # PDF 좌표는 아래에서 위로 증가하므로 행 번호를 뒤집는다.
+        path.rect(x + start * module, y + (count - 1 - row_idx) * module, length * module, module)
+    c.drawPath(path, stroke=0, fill=1)
+
+
+def _page_layout():
+    """A4 라벨 배치 (한 줄 10개, QR 1cm + 용기번호)"""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import mm
+
+    # A4 사이즈 설정
+    page_width, page_height = A4  # 595.27 x 841.89 points
+
+    # 레이아웃 설정
+    margin_x = 10 * mm  # 좌우 여백
+    margin_y = 10 * mm  # 상하 여백
+    cols = 10  # 한 줄에 10개
+    cell_height = 15 * mm  # QR코드 + 텍스트 높이 (약 1.5cm)
+
+    # 한 페이지당 행 수 계산
+    usable_height = page_height - 2 * margin_y
+    rows_per_page = int(usable_height / cell_height)
+
+    return {
+        'page_width': page_width,
+        'page_height': page_height,
+        'margin_x': margin_x,
+        'margin_y': margin_y,
+        'cols': cols,
+        'qr_size': 10 * mm,  # QR코드 크기 1cm
+        'cell_width': (page_width - 2 * margin_x) / cols,
+        'cell_height': cell_height,
+        'items_per_page': cols * rows_per_page,
+    }
+
+
+def _render_labels(cylinder_nos: List[str], modules_by_no: Dict[str, QrModules], output):
+    """라벨을 한 캔버스에 순서대로 그려 output(파일 경로 또는 파일 객체)에 저장"""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import mm
+    from reportlab.pdfgen import canvas
+
+    layout = _page_layout()
+    cols = layout['cols']
+    items_per_page = layout['items_per_page']
+    cell_width = layout['cell_width']
+    cell_height = layout['cell_height']
+    qr_size = layout['qr_size']
+    font_name = get_label_font()
+
+    c = canvas.Canvas(output, pagesize=A4)
+    c.setFillColorRGB(0, 0, 0)
+
+    for idx, cylinder_no in enumerate(cylinder_nos):
+        # 페이지 내 위치 계산
+        page_idx = idx % items_per_page
+        row = page_idx // cols
+        col = page_idx % cols
+
+        # 새 페이지 시작 (showPage 후 그래픽 상태가 초기화되므로 폰트를 다시 지정)
+        if idx > 0 and page_idx == 0:
+            c.showPage()
+        if page_idx == 0:
+            c.setFont(font_name, 5)  # 작은 폰트
+
+        # 셀 위치 계산 (왼쪽 위 기준)
+        x = layout['margin_x'] + col * cell_width
+        y = layout['page_height'] - layout['margin_y'] - (row + 1) * cell_height
+
+        # QR코드 그리기 (셀 중앙에, 아래쪽은 텍스트 공간)
+        modules = modules_by_no.get(cylinder_no)
+        if modules:
+            _draw_qr(c, modules, x + (cell_width - qr_size) / 2, y + 4 * mm, qr_size)
+
+        # 용기번호 텍스트
+        c.drawCentredString(x + cell_width / 2, y + 1 * mm, cylinder_no[:12])
+
+    c.save()
+
+
+def _render_chunk(args: Tuple[List[str], Dict[str, QrModules]]) -> bytes:
+    """풀 작업: 페이지 묶음 하나를 PDF bytes로 (자식 프로세스에서 폰트는 한 번만 등록)"""
+    cylinder_nos, modules_by_no = args
+    buffer = BytesIO()
+    _render_labels(cylinder_nos, modules_by_no, buffer)
+    return buffer.getvalue()
+
+
+def build_qr_label_pdf(cylinder_nos: List[str], output=None) -> Optional[bytes]:
+    """
+    용기번호 QR 라벨 PDF (A4, 한 줄 10개, QR 1cm + 용기번호)
+
+    Args:
+        cylinder_nos: 출력 순서대로의 용기번호 목록 (상한 없음)
+        output: 저장할 파일 경로 또는 파일 객체 (None이면 bytes 반환)
+
+    Returns:
+        bytes: PDF 내용 (output을 지정하면 None)
+    """
+    modules_by_no = get_qr_modules(no for no in cylinder_nos if no)
+
+    buffer = BytesIO() if output is None else None
+    target = buffer if output is None else output
+
+    # 페이지 경계에 맞춰 자른 묶음 (각 묶음이 새 페이지에서 시작하므로 이어 붙여도 배치가 같다)
+    chunk_size = _page_layout()['items_per_page'] * PAGES_PER_CHUNK
+    chunks = [cylinder_nos[i:i + chunk_size] for i in range(0, len(cylinder_nos), chunk_size)]
+    pool = _get_pool() if len(chunks) > 1 else None
+    try:
+        from pypdf import PdfReader, PdfWriter
+    except ImportError:
+        pool = None
+
+    if pool is None:
+        _render_labels(cylinder_nos, modules_by_no, target)
+    else:
+        jobs = [
+            (chunk, {no: modules_by_no[no] for no in chunk if no in modules_by_no})
+            for chunk in chunks
+        ]
+        writer = PdfWriter()
+        for part in pool.map(_render_chunk, jobs):
+            writer.append(PdfReader(BytesIO(part)))
+        writer.write(target)
+
+    return buffer.getvalue() if buffer is not None else None
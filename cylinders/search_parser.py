@@ -1,9 +1,16 @@
 """
 자연어 검색 파서 - 키워드 기반으로 필터 조건 변환
+
+키워드 표(상태/위치/내압/기간)는 import 시 하나의 정규식으로 컴파일하고,
+가스명은 스냅샷의 실제 dashboard_gas_name 목록(CylinderRepository.get_gas_names)으로 만든다.
+검색어는 이 정규식으로 한 번만 훑으며(finditer), 같은 위치에서는 긴 키워드가 우선한다.
 """
+import logging
 import re
-from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional
+import time
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
 
 
 # 상태 키워드 매핑
@@ -18,10 +25,10 @@ STATUS_KEYWORDS = {
     '폐기': ['폐기', '폐기됨', '스크랩'],
 }
 
-# 위치 키워드 매핑
+# 위치 키워드 매핑 (대소문자 구분 없음)
 LOCATION_KEYWORDS = {
-    'FPK': ['fpk', 'FPK', '천안', '천안공장'],
-    'KDKK': ['kdkk', 'KDKK', '한국'],
+    'FPK': ['fpk', '천안', '천안공장'],
+    'KDKK': ['kdkk', '한국'],
 }
 
 # 내압/기간 관련 키워드
@@ -31,20 +38,104 @@ PRESSURE_KEYWORDS = {
     'within_days': ['이내', '내', '안에'],
 }
 
-# 일반 검색어 → 가스명 패턴
-GAS_PATTERNS = [
-    r'\b(cos|COS|Cos)\b',
-    r'\b(n2|N2|질소)\b',
-    r'\b(o2|O2|산소)\b',
-    r'\b(ar|Ar|AR|아르곤)\b',
-    r'\b(he|He|HE|헬륨)\b',
-    r'\b(h2|H2|수소)\b',
-    r'\b(co2|CO2|이산화탄소|탄산)\b',
-    r'\b(sf6|SF6)\b',
-    r'\b(cf4|CF4)\b',
-    r'\b(nf3|NF3)\b',
-    r'\b(c4f8|C4F8)\b',
-]
+# 기간 표현("30일 이내")을 필터로 쓰게 하는 추가 키워드
+DAYS_CONTEXT_KEYWORDS = ['전']
+
+# 내압 키워드가 내압 필터로 해석되기 위한 문맥 키워드
+PRESSURE_CONTEXT_KEYWORDS = ['내압']
+
+# 데이터의 가스명과 다르게 부르는 별칭 → 가스명
+GAS_ALIASES = {
+    '질소': 'N2',
+    '산소': 'O2',
+    '아르곤': 'AR',
+    '헬륨': 'HE',
+    '수소': 'H2',
+    '이산화탄소': 'CO2',
+    '탄산': 'CO2',
+}
+
+# 가스명 목록 재확인 주기 (초) - 실제 조회는 스냅샷 버전 기준 캐시를 탄다.
+GAS_REFRESH_INTERVAL = 300.0
+
+
+def _build_keyword_table() -> Dict[str, Tuple[str, str]]:
+    """casefold 키워드 → (종류, 값)"""
+    table: Dict[str, Tuple[str, str]] = {}
+    for status, keywords in STATUS_KEYWORDS.items():
+        for keyword in keywords:
+            table.setdefault(keyword.casefold(), ('status', status))
+    for location, keywords in LOCATION_KEYWORDS.items():
+        for keyword in keywords:
+            table.setdefault(keyword.casefold(), ('location', location))
+    for kind, keywords in PRESSURE_KEYWORDS.items():
+        for keyword in keywords:
+            table.setdefault(keyword.casefold(), (kind, kind))
+    for keyword in DAYS_CONTEXT_KEYWORDS:
+        table.setdefault(keyword.casefold(), ('within_days', 'within_days'))
+    for keyword in PRESSURE_CONTEXT_KEYWORDS:
+        table.setdefault(keyword.casefold(), ('pressure_context', keyword))
+    return table
+
+
+def _alternation(words) -> str:
+    # 같은 위치에서 긴 키워드가 먼저 맞도록 길이 역순 정렬
+    return '|'.join(re.escape(w) for w in sorted(set(words), key=len, reverse=True))
+
+
+_KEYWORD_TABLE = _build_keyword_table()
+_KEYWORD_PATTERN = _alternation(_KEYWORD_TABLE)
+_KEYWORD_RE = re.compile(_KEYWORD_PATTERN, re.IGNORECASE)
+_DAYS_PATTERN = r'(?P<days>\d+)\s*일'
+
+_gas_matcher: Optional[Tuple[Tuple[str, ...], re.Pattern, Dict[str, str]]] = None
+_gas_checked_at = 0.0
+
+
+def _load_gas_names() -> List[str]:
+    from core.repositories.cylinder_repository import CylinderRepository
+    try:
+        return CylinderRepository.get_gas_names()
+    except Exception as e:
+        logger.warning(f"[search_parser] 가스명 목록 조회 실패: {e}")
+        return []
+
+
+def _get_matcher() -> Tuple[re.Pattern, Dict[str, str]]:
+    """
+    (통합 정규식, casefold 가스 표기 → 가스명) 반환
+    
+    가스명 목록이 바뀐 경우에만 정규식을 다시 컴파일한다.
+    """
+    global _gas_matcher, _gas_checked_at
+
+    now = time.monotonic()
+    if _gas_matcher is not None and now - _gas_checked_at < GAS_REFRESH_INTERVAL:
+        return _gas_matcher[1], _gas_matcher[2]
+
+    gas_names = tuple(_load_gas_names())
+    _gas_checked_at = now
+    if _gas_matcher is not None and _gas_matcher[0] == gas_names:
+        return _gas_matcher[1], _gas_matcher[2]
+
+    gas_table: Dict[str, str] = {}
+    for name in gas_names:
+        gas_table.setdefault(name.casefold(), name)
+    for alias, canonical in GAS_ALIASES.items():
+        # 데이터에 있는 표기(대소문자)를 우선 사용
+        gas_table.setdefault(alias.casefold(), gas_table.get(canonical.casefold(), canonical))
+
+    parts = [_DAYS_PATTERN]
+    if gas_table:
+        # 영문/숫자 가스명은 다른 단어 안에서 맞지 않도록 앞뒤가 영숫자가 아니어야 한다.
+        parts.append(
+            r'(?<![0-9A-Za-z])(?P<gas>' + _alternation(gas_table) + r')(?![0-9A-Za-z])'
+        )
+    parts.append(r'(?P<kw>' + _KEYWORD_PATTERN + r')')
+    pattern = re.compile('|'.join(parts), re.IGNORECASE)
+
+    _gas_matcher = (gas_names, pattern, gas_table)
+    return pattern, gas_table
 
 
 def parse_natural_query(query: str) -> Dict:
@@ -57,7 +148,6 @@ def parse_natural_query(query: str) -> Dict:
     Returns:
         Dict: 파싱된 필터 조건과 메타데이터
     """
-    query_lower = query.lower()
     result = {
         'filters': {},
         'parsed_keywords': [],
@@ -65,49 +155,74 @@ def parse_natural_query(query: str) -> Dict:
         'original_query': query,
     }
     
-    # 1. 상태 파싱
-    parsed_statuses = []
-    for status, keywords in STATUS_KEYWORDS.items():
-        for keyword in keywords:
-            if keyword in query_lower or keyword in query:
-                if status not in parsed_statuses:
-                    parsed_statuses.append(status)
-                    result['parsed_keywords'].append({
-                        'type': 'status',
-                        'value': status,
-                        'matched': keyword
-                    })
-    
-    if parsed_statuses:
-        result['filters']['statuses'] = parsed_statuses
-    
-    # 2. 위치 파싱
-    for location, keywords in LOCATION_KEYWORDS.items():
-        for keyword in keywords:
-            if keyword.lower() in query_lower:
-                result['filters']['location'] = location
-                result['parsed_keywords'].append({
-                    'type': 'location',
-                    'value': location,
-                    'matched': keyword
-                })
-                break
-    
-    # 3. 가스명 파싱
-    for pattern in GAS_PATTERNS:
-        match = re.search(pattern, query, re.IGNORECASE)
-        if match:
-            gas_keyword = match.group(1).upper()
-            result['filters']['gas_keyword'] = gas_keyword
+    pattern, gas_table = _get_matcher()
+    
+    statuses: List[Tuple[str, str]] = []
+    location: Optional[Tuple[str, str]] = None
+    gas: Optional[Tuple[str, str]] = None
+    days: Optional[Tuple[int, str]] = None
+    pressure_kinds = set()
+    has_pressure_context = False
+    has_days_context = False
+    
+    # 검색어 1회 스캔
+    for match in pattern.finditer(query):
+        text = match.group(0)
+        if match.group('days') is not None:
+            if days is None:
+                days = (int(match.group('days')), text)
+            continue
+        if 'gas' in pattern.groupindex and match.group('gas') is not None:
+            if gas is None:
+                gas = (gas_table[text.casefold()], text)
+            continue
+        
+        kind, value = _KEYWORD_TABLE[text.casefold()]
+        if kind == 'status':
+            if value not in [s for s, _ in statuses]:
+                statuses.append((value, text))
+        elif kind == 'location':
+            if location is None:
+                location = (value, text)
+        elif kind == 'pressure_context':
+            has_pressure_context = True
+        elif kind == 'within_days':
+            has_days_context = True
+        else:
+            pressure_kinds.add(kind)
+        if '만료' in text:
+            has_pressure_context = True
+    
+    # 1. 상태
+    if statuses:
+        result['filters']['statuses'] = [s for s, _ in statuses]
+        for status, matched in statuses:
             result['parsed_keywords'].append({
-                'type': 'gas_name',
-                'value': gas_keyword,
-                'matched': match.group(0)
+                'type': 'status',
+                'value': status,
+                'matched': matched
             })
-            break
     
-    # 4. 내압만료 관련 파싱
-    pressure_filter = parse_pressure_keywords(query_lower)
+    # 2. 위치
+    if location:
+        result['filters']['location'] = location[0]
+        result['parsed_keywords'].append({
+            'type': 'location',
+            'value': location[0],
+            'matched': location[1]
+        })
+    
+    # 3. 가스명
+    if gas:
+        result['filters']['gas_keyword'] = gas[0]
+        result['parsed_keywords'].append({
+            'type': 'gas_name',
+            'value': gas[0],
+            'matched': gas[1]
+        })
+    
+    # 4. 내압만료 관련
+    pressure_filter = _pressure_filter(pressure_kinds, has_pressure_context)
     if pressure_filter:
         result['filters'].update(pressure_filter)
         result['parsed_keywords'].append({
@@ -117,16 +232,13 @@ def parse_natural_query(query: str) -> Dict:
         })
     
     # 5. 숫자 + 일 패턴 (예: "30일 이내")
-    days_match = re.search(r'(\d+)\s*일', query)
-    if days_match:
-        days = int(days_match.group(1))
-        if any(kw in query_lower for kw in ['이내', '내', '안에', '전']):
-            result['filters']['days'] = days
-            result['parsed_keywords'].append({
-                'type': 'days',
-                'value': days,
-                'matched': days_match.group(0)
-            })
+    if days and has_days_context:
+        result['filters']['days'] = days[0]
+        result['parsed_keywords'].append({
+            'type': 'days',
+            'value': days[0],
+            'matched': days[1]
+        })
     
     # 6. 추천 필터 생성
     result['suggestions'] = generate_suggestions(result['filters'], result['parsed_keywords'])
@@ -134,22 +246,31 @@ def parse_natural_query(query: str) -> Dict:
     return result
 
 
+def _pressure_filter(kinds: set, has_context: bool) -> Optional[Dict]:
+    """스캔된 내압 키워드 종류 → 필터 ('내압' 또는 '만료'가 함께 있어야 적용)"""
+    if not has_context:
+        return None
+    if 'expired' in kinds:
+        return {'pressure_expired': True}
+    if 'expiring_soon' in kinds:
+        return {'pressure_expiring_soon': True, 'pressure_days': 30}  # 기본 30일
+    return None
+
+
 def parse_pressure_keywords(query: str) -> Optional[Dict]:
-    """내압 관련 키워드 파싱"""
-    result = {}
-    
-    if any(kw in query for kw in PRESSURE_KEYWORDS['expired']):
-        if '내압' in query or '만료' in query:
-            result['pressure_expired'] = True
-            return result
-    
-    if any(kw in query for kw in PRESSURE_KEYWORDS['expiring_soon']):
-        if '내압' in query or '만료' in query:
-            result['pressure_expiring_soon'] = True
-            result['pressure_days'] = 30  # 기본 30일
-            return result
-    
-    return result if result else None
+    """내압 관련 키워드 파싱 (단독 호출용, parse_natural_query와 같은 규칙)"""
+    kinds = set()
+    has_context = False
+    for match in _KEYWORD_RE.finditer(query):
+        text = match.group(0)
+        kind, _ = _KEYWORD_TABLE[text.casefold()]
+        if kind in ('expired', 'expiring_soon'):
+            kinds.add(kind)
+        elif kind == 'pressure_context':
+            has_context = True
+        if '만료' in text:
+            has_context = True
+    return _pressure_filter(kinds, has_context)
 
 
 def generate_suggestions(filters: Dict, parsed_keywords: List) -> List[Dict]:
@@ -1,76 +1,22 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-from django.http import HttpResponse, JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.views.decorators.http import require_POST
 from django.contrib import messages
 from django.db import connection
 from core.repositories.cylinder_repository import CylinderRepository
+from core.repositories.history_repository import HistoryRepository
 from core.utils.view_helper import parse_cylinder_spec, parse_valve_spec, parse_usage_place
 from core.utils.translation import translate_text
-from openpyxl import Workbook
+from core import jobs
+from core.utils import page_cursor
 from datetime import datetime
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from core.utils.status_mapper import map_condition_code_to_status
 from .models import CylinderMemo
 
 
-_TCS_SHIP_DATE_COL: str | None = None
-_TCS_SHIP_DATE_COL_READY: bool = False
-
-
-def _detect_tcs_ship_date_column(cursor) -> str | None:
-    """
-    fcms_cdc.tr_latest_cylinder_statuses 에서 출하일자(Shipping Date)로 보이는 컬럼을 탐지한다.
-    - 환경/버전별로 컬럼명이 다를 수 있어 런타임에 한 번만 탐지 후 캐시한다.
-    """
-    global _TCS_SHIP_DATE_COL, _TCS_SHIP_DATE_COL_READY
-    if _TCS_SHIP_DATE_COL_READY:
-        return _TCS_SHIP_DATE_COL
-
-    try:
-        cursor.execute(
-            """
-            SELECT LOWER(column_name) AS col
-            FROM information_schema.columns
-            WHERE table_schema = %s
-              AND table_name = %s
-            """,
-            ["fcms_cdc", "tr_latest_cylinder_statuses"],
-        )
-        cols = [r[0] for r in cursor.fetchall() if r and r[0]]
-    except Exception:
-        cols = []
-
-    # 우선순위: 흔한 컬럼명들
-    priority = [
-        "shipping_date",
-        "ship_date",
-        "shipping_dt",
-        "ship_dt",
-        "shipped_date",
-        "out_date",
-        "out_dt",
-        "delivery_date",
-        "deliver_date",
-    ]
-
-    col = None
-    for p in priority:
-        if p in cols:
-            col = p
-            break
-
-    # 다음 후보: ship + date 같은 패턴
-    if col is None:
-        for c in cols:
-            if "ship" in c and ("date" in c or "dt" in c):
-                col = c
-                break
-
-    _TCS_SHIP_DATE_COL = col
-    _TCS_SHIP_DATE_COL_READY = True
-    return _TCS_SHIP_DATE_COL
-
-
 def _coerce_to_dateish(value):
     """DB에서 가져온 출하일자를 date/datetime로 최대한 변환 (템플릿 date 필터가 먹도록)."""
     if value is None:
@@ -98,31 +44,33 @@ def _coerce_to_dateish(value):
     return value
 
 
-def _parse_cylinders_list_request(request):
+def _parse_cylinders_list_params(params):
     """
     리스트/엑셀/QR 출력이 동일한 필터 규칙을 사용하도록 공통 파서로 통합.
+    
+    params는 request.GET 같은 QueryDict (백그라운드 작업은 저장한 쿼리 문자열로 다시 만든다).
     """
     # 검색어 파라미터
-    search_query = request.GET.get('search', '').strip()
+    search_query = params.get('search', '').strip()
     
     # 다중 선택 필터 파라미터
-    selected_gases = request.GET.getlist('gases')
-    selected_locations = request.GET.getlist('locations')
-    selected_statuses = request.GET.getlist('statuses')
+    selected_gases = params.getlist('gases')
+    selected_locations = params.getlist('locations')
+    selected_statuses = params.getlist('statuses')
     
     # 단일 선택(하위 호환)
-    gas_name = request.GET.get('gas_name', '')
-    status = request.GET.get('status', '')
-    location = request.GET.get('location', '')
-    valve_spec = request.GET.get('valve_spec', '')
-    cylinder_spec = request.GET.get('cylinder_spec', '')
-    usage_place = request.GET.get('usage_place', '')
-    cylinder_type_key = request.GET.get('cylinder_type_key', '')
-    cylinder_type_keys_param = request.GET.get('cylinder_type_keys', '').strip()
-    days = request.GET.get('days', '')
-    
-    sort_by = request.GET.get('sort', 'cylinder_no')
-    sort_order = request.GET.get('order', 'asc')
+    gas_name = params.get('gas_name', '')
+    status = params.get('status', '')
+    location = params.get('location', '')
+    valve_spec = params.get('valve_spec', '')
+    cylinder_spec = params.get('cylinder_spec', '')
+    usage_place = params.get('usage_place', '')
+    cylinder_type_key = params.get('cylinder_type_key', '')
+    cylinder_type_keys_param = params.get('cylinder_type_keys', '').strip()
+    days = params.get('days', '')
+    
+    sort_by = params.get('sort', 'cylinder_no')
+    sort_order = params.get('order', 'asc')
     
     if gas_name and gas_name not in selected_gases:
         selected_gases.append(gas_name)
@@ -211,6 +159,10 @@ def _parse_cylinders_list_request(request):
     }
 
 
+def _parse_cylinders_list_request(request):
+    return _parse_cylinders_list_params(request.GET)
+
+
 def _normalize_status_for_ui(raw_status: str) -> str:
     """리스트/엑셀/QR 출력에서 동일한 상태 표기를 보장한다."""
     s = (raw_status or "").strip()
@@ -247,26 +199,43 @@ def cylinder_list(request):
     # 페이지네이션
     page = request.GET.get('page', 1)
     try:
-        page = int(page)
+        page = max(int(page), 1)
     except:
         page = 1
     
     per_page = 50
-    offset = (page - 1) * per_page
     
-    # 전체 개수 조회 (페이지네이션용)
-    total_count = CylinderRepository.get_cylinder_count(filters=filters, days=days_int, search_query=search_query)
+    # 전체 개수 조회 (페이지네이션용, 검색어가 없으면 필터별 캐시)
+    total_count = CylinderRepository.get_cylinder_count_fast(filters=filters, days=days_int, search_query=search_query)
     
-    # 현재 페이지 데이터만 조회 (SQL LIMIT/OFFSET 사용)
-    cylinders_list = CylinderRepository.get_cylinder_list(
-        filters=filters, 
-        limit=per_page, 
-        offset=offset,
+    import math
+    total_pages = math.ceil(total_count / per_page) if total_count > 0 else 1
+    page = min(page, total_pages)
+    
+    # 현재 페이지 데이터만 조회 (Keyset 페이지네이션)
+    # - 이전/다음: 커서 토큰으로 "마지막으로 본 행 이후/이전"을 읽음 (페이지 깊이와 무관)
+    # - 처음/마지막: 정렬 양 끝에서 읽음
+    # - 번호 직접 이동만 OFFSET 사용, 이후 이전/다음은 다시 커서로 이동
+    cursor_token = (request.GET.get('cursor') or '').strip()
+    if cursor_token and page_cursor.decode_cursor(cursor_token, sort_by, sort_order) is None:
+        cursor_token = ''  # 정렬이 바뀌었거나 손상된 토큰
+    
+    page_kwargs = dict(
+        filters=filters,
         days=days_int,
         sort_by=sort_by,
         sort_order=sort_order,
-        search_query=search_query
+        search_query=search_query,
+        page_size=per_page,
     )
+    if cursor_token:
+        page_data = CylinderRepository.get_cylinder_page(cursor_token=cursor_token, **page_kwargs)
+    elif page > 1 and page == total_pages:
+        last_page_size = total_count - (total_pages - 1) * per_page
+        page_data = CylinderRepository.get_cylinder_page(last_page_size=last_page_size, **page_kwargs)
+    else:
+        page_data = CylinderRepository.get_cylinder_page(offset=(page - 1) * per_page, **page_kwargs)
+    cylinders_list = page_data['rows']
 
     # 상태 표시 정규화 (레거시 상태를 사용자 표시용 상태로 변환)
     # - DB에는 '분석'이 남아있을 수 있으나 UI에서는 '분석중'으로 보이게 한다.
@@ -276,10 +245,6 @@ def cylinder_list(request):
         except Exception:
             pass
     
-    # 페이지네이션 계산
-    import math
-    total_pages = math.ceil(total_count / per_page) if total_count > 0 else 1
-    
     # 커스텀 페이지네이션 객체 생성
     class CustomPaginator:
         def __init__(self, count, per_page):
@@ -295,11 +260,13 @@ def cylinder_list(request):
             return math.ceil(self._count / self.per_page) if self._count > 0 else 1
     
     class CustomPage:
-        def __init__(self, object_list, number, paginator, total_count):
+        def __init__(self, object_list, number, paginator, total_count, page_data):
             self.object_list = object_list
             self.number = number
             self.paginator = paginator
             self._total_count = total_count
+            self.next_cursor = page_data['next_cursor']
+            self.prev_cursor = page_data['prev_cursor']
         
         def __iter__(self):
             return iter(self.object_list)
@@ -309,11 +276,11 @@ def cylinder_list(request):
         
         @property
         def has_previous(self):
-            return self.number > 1
+            return self.number > 1 and self.prev_cursor is not None
         
         @property
         def has_next(self):
-            return self.number < self.paginator.num_pages
+            return self.number < self.paginator.num_pages and self.next_cursor is not None
         
         @property
         def previous_page_number(self):
@@ -336,7 +303,7 @@ def cylinder_list(request):
             return min(self.number * self.paginator.per_page, self._total_count)
     
     paginator = CustomPaginator(total_count, per_page)
-    cylinders = CustomPage(cylinders_list, page, paginator, total_count)
+    cylinders = CustomPage(cylinders_list, page, paginator, total_count, page_data)
     current_page = page
     page_range = []
     
@@ -477,57 +444,58 @@ def cylinder_detail(request, cylinder_no):
     # URL에서 받은 용기번호의 앞뒤 공백 제거
     cylinder_no = cylinder_no.strip()
     
-    filters = {'cylinder_no': cylinder_no}
-    cylinders = CylinderRepository.get_cylinder_list(filters=filters, limit=1)
+    # 현재 상태 + 출하일자 + 최근 이력 + 메모 + 정비 로그를 한 번에 조회
+    detail = CylinderRepository.get_cylinder_detail(cylinder_no)
     
-    if not cylinders:
+    if not detail:
         from django.http import Http404
         raise Http404("용기를 찾을 수 없습니다.")
     
-    cylinder = cylinders[0]
+    cylinder = detail['cylinder']
 
     # FCMS 출하일자: tr_latest_cylinder_statuses의 shipping date 컬럼을 그대로 사용 (가장 최신/정합)
-    try:
-        ship_dt = None
-        with connection.cursor() as cursor:
-            col = _detect_tcs_ship_date_column(cursor)
-            if col:
-                # 식별자 안전성 체크(동적 컬럼 사용)
-                import re
-
-                if re.match(r"^[a-z0-9_]+$", col):
-                    cursor.execute(
-                        f"""
-                        SELECT tcs."{col.upper()}" AS ship_date
-                        FROM "fcms_cdc"."tr_latest_cylinder_statuses" tcs
-                        WHERE RTRIM(tcs."CYLINDER_NO") = RTRIM(%s)
-                        LIMIT 1
-                        """,
-                        [cylinder_no],
-                    )
-                    row = cursor.fetchone()
-                    ship_dt = row[0] if row else None
-
-        cylinder["ship_date"] = _coerce_to_dateish(ship_dt)
-    except Exception:
-        cylinder["ship_date"] = None
+    cylinder["ship_date"] = _coerce_to_dateish(cylinder.get("ship_date"))
+    
+    # 메모 목록 (최상위 메모는 최신순, 활성화된 답글은 작성순)
+    memos = []
+    replies_by_parent = {}
+    for row in detail['memos']:
+        memo = CylinderMemo(
+            id=row['id'],
+            cylinder_no=cylinder_no,
+            parent_id=row['parent_id'],
+            author_name=row['author_name'],
+            content=row['content'],
+            created_at=parse_datetime(row['created_at']) if row['created_at'] else None,
+            updated_at=parse_datetime(row['updated_at']) if row['updated_at'] else None,
+        )
+        if memo.parent_id is None:
+            memo.active_replies = []
+            memos.append(memo)
+        else:
+            replies_by_parent.setdefault(memo.parent_id, []).append(memo)
+    memos.reverse()
+    for memo in memos:
+        memo.active_replies = replies_by_parent.get(memo.id, [])
     
-    # 메모 목록 조회 (최상위 메모만, 답글은 prefetch)
-    memos = CylinderMemo.objects.filter(
-        cylinder_no=cylinder_no,
-        parent__isnull=True,
-        is_active=True
-    ).prefetch_related(
-        'replies'
-    ).order_by('-created_at')
+    # 최근 상태 이력 (JSON 집계라 날짜가 문자열로 온다)
+    history = []
+    for row in detail['history']:
+        row['move_date'] = _coerce_to_dateish((row.get('move_date') or '').replace('T', ' ')[:19])
+        row['status'] = map_condition_code_to_status(row.get('condition_code'))
+        history.append(row)
     
-    # 활성화된 답글만 필터링
-    for memo in memos:
-        memo.active_replies = memo.replies.filter(is_active=True).order_by('created_at')
+    maintenance_logs = []
+    for row in detail['maintenance']:
+        row['event_date'] = _coerce_to_dateish(row.get('event_date'))
+        row['event_label'] = '정비출고' if row.get('event_type') == 'OUT' else '정비입고'
+        maintenance_logs.append(row)
     
     context = {
         'cylinder': cylinder,
         'memos': memos,
+        'history': history,
+        'maintenance_logs': maintenance_logs,
     }
     return render(request, 'cylinders/detail.html', context)
 
@@ -545,8 +513,6 @@ def cylinder_ship_history(request, cylinder_no):
         limit_n = 50
 
     try:
-        from core.repositories.history_repository import HistoryRepository
-
         ship_codes = (HistoryRepository.get_move_code_sets() or {}).get("ship") or []
         if not ship_codes:
             # 라벨 기반으로 출하 코드 후보 탐색
@@ -582,28 +548,22 @@ def cylinder_ship_history(request, cylinder_no):
         rows = []
         with connection.cursor() as cursor:
             if connection.vendor == "postgresql":
-                cursor.execute(
-                    """
-                    SELECT
-                        RTRIM(h."MOVE_REPORT_NO") AS move_report_no,
-                        h."MOVE_DATE" AS ship_date
-                    FROM "fcms_cdc"."tr_cylinder_status_histories" h
-                    WHERE RTRIM(h."CYLINDER_NO") = RTRIM(%s)
-                      AND NULLIF(regexp_replace(TRIM(h."MOVE_CODE"::text), '^0+', ''), '') = ANY(%s)
-                    ORDER BY h."MOVE_DATE" DESC NULLS LAST, h."HISTORY_SEQ" DESC NULLS LAST
-                    LIMIT %s
-                    """,
-                    [cylinder_no, ship_codes_norm, limit_n],
+                # cy_cylinder_timeline이 있으면 커버링 인덱스만 읽는다.
+                history_sql = HistoryRepository.cylinder_history_sql(
+                    "RTRIM(%s)",
+                    ["move_report_no", "move_date"],
+                    ["NULLIF(regexp_replace({move_code}::text, '^0+', ''), '') = ANY(%s)"],
                 )
+                cursor.execute(history_sql + " LIMIT %s", [cylinder_no, ship_codes_norm, limit_n])
             else:
                 placeholders = ", ".join(["%s"] * len(ship_codes_norm))
                 cursor.execute(
                     f"""
                     SELECT
-                        TRIM(h."MOVE_REPORT_NO") AS move_report_no,
+                        RTRIM(h."MOVE_REPORT_NO") AS move_report_no,
                         h."MOVE_DATE" AS ship_date
                     FROM "fcms_cdc"."tr_cylinder_status_histories" h
-                    WHERE TRIM(h."CYLINDER_NO") = TRIM(%s)
+                    WHERE RTRIM(h."CYLINDER_NO") = RTRIM(%s)
                       AND TRIM(h."MOVE_CODE") IN ({placeholders})
                     ORDER BY h."MOVE_DATE" DESC
                     """,
@@ -726,14 +686,29 @@ def memo_delete(request, cylinder_no, memo_id):
     return redirect('cylinders:detail', cylinder_no=cylinder_no)
 
 
-def cylinder_export_excel(request):
-    """용기 리스트 엑셀 다운로드 - A4 인쇄 최적화"""
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+def _attachment_header(filename, filename_ascii):
+    """Content-Disposition (RFC 5987 형식으로 한글 파일명 인코딩)"""
     from urllib.parse import quote
-    from core.utils.excel_style import (
-        apply_header_style, apply_data_style, setup_print_area, style_info_sheet
+    return f"attachment; filename=\"{filename_ascii}\"; filename*=UTF-8''{quote(filename)}"
+
+
+def build_cylinder_excel(params):
+    """
+    용기 리스트 엑셀 생성 - A4 인쇄 최적화
+    
+    서버 측 커서로 읽은 행을 바로 XLSX 스트림(core.utils.xlsx_stream)으로 쓴다.
+    (XLSX 청크 iterator, 파일명, ASCII 파일명)을 반환하며, 화면 다운로드와 백그라운드 작업이 함께 사용한다.
+    """
+    from core.utils.xlsx_stream import (
+        XlsxSheet, stream_xlsx,
+        STYLE_HEADER, STYLE_DATA, STYLE_DATA_CENTER, STYLE_DATA_ALT, STYLE_DATA_CENTER_ALT,
+        STYLE_INFO_LABEL, STYLE_INFO_VALUE,
     )
     
-    parsed = _parse_cylinders_list_request(request)
+    parsed = _parse_cylinders_list_params(params)
     search_query = parsed["search_query"]
     filters = parsed["filters"]
     days_int = parsed["days_int"]
@@ -746,28 +721,6 @@ def cylinder_export_excel(request):
     cylinder_spec = parsed["cylinder_spec"]
     days = parsed["days"]
     
-    # 전체 데이터 조회 (엑셀용 - 최대 10,000건 제한)
-    cylinders = CylinderRepository.get_cylinder_list(
-        filters=filters, 
-        limit=10000,
-        days=days_int,
-        sort_by=sort_by,
-        sort_order=sort_order,
-        search_query=search_query
-    )
-
-    # 상태 표시 정규화 (리스트와 동일)
-    for c in cylinders:
-        try:
-            c["status"] = _normalize_status_for_ui(c.get("status", ""))
-        except Exception:
-            pass
-    
-    # 엑셀 워크북 생성
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "용기리스트"
-    
     # 헤더 정의 (헤더명, 너비) - A4 가로 인쇄 기준 최적화
     headers = [
         ('용기번호', 13),
@@ -784,216 +737,167 @@ def cylinder_export_excel(request):
         ('비고', 10),
     ]
     
-    # 헤더 스타일 적용
-    apply_header_style(ws, headers, row=1)
+    # 용기중량, 상태, 제조일, 내압시험일, 검사주기, 내압만료일은 가운데 정렬
+    center_cols = {3, 6, 8, 9, 10, 11}
+    row_styles = [
+        [STYLE_DATA_CENTER if col in center_cols else STYLE_DATA for col in range(1, len(headers) + 1)],
+        # 짝수 행 배경 (얼룩말 무늬)
+        [STYLE_DATA_CENTER_ALT if col in center_cols else STYLE_DATA_ALT for col in range(1, len(headers) + 1)],
+    ]
     
-    # 데이터 작성
-    for row_num, cylinder in enumerate(cylinders, 2):
-        # 밸브규격 파싱
-        valve_parsed = parse_valve_spec(cylinder.get('valve_spec', '') or '')
-        valve_display = f"{valve_parsed.get('format', '-')}/{valve_parsed.get('material', '-')}"
-        
-        # 용기규격 파싱
-        cylinder_parsed = parse_cylinder_spec(cylinder.get('cylinder_spec', '') or '')
-        cylinder_display = f"{cylinder_parsed.get('format', '-')}/{cylinder_parsed.get('material', '-')}"
-        
-        # 날짜 포맷팅
-        manufacture_date = cylinder.get('manufacture_date')
-        pressure_test_date = cylinder.get('pressure_test_date')
-        pressure_expire_date = cylinder.get('pressure_expire_date')
-        
-        # 용기중량
-        cylinder_weight = cylinder.get('cylinder_weight')
-        weight_display = str(cylinder_weight) if cylinder_weight is not None else '-'
+    def cylinder_rows():
+        yield [h for h, _ in headers], STYLE_HEADER
         
-        row_data = [
-            cylinder.get('cylinder_no', ''),
-            translate_text('gas_name', cylinder.get('gas_name', '')),
-            weight_display,
-            valve_display,
-            cylinder_display,
-            cylinder.get('status', ''),
-            translate_text('location', cylinder.get('location', '')),
-            manufacture_date.strftime('%Y-%m-%d') if manufacture_date else '-',
-            pressure_test_date.strftime('%Y-%m-%d') if pressure_test_date else '-',
-            f"{cylinder.get('pressure_test_term', '-')}년" if cylinder.get('pressure_test_term') else '-',
-            pressure_expire_date.strftime('%Y-%m-%d') if pressure_expire_date else '-',
-            'FCMS 수정필요' if cylinder.get('needs_fcms_fix') else '',
-        ]
-        
-        for col, value in enumerate(row_data, 1):
-            ws.cell(row=row_num, column=col, value=value)
-    
-    # 데이터 스타일 적용 (상태 컬럼 가운데 정렬, 날짜 컬럼 가운데 정렬)
-    if len(cylinders) > 0:
-        apply_data_style(
-            ws, 
-            start_row=2, 
-            end_row=len(cylinders) + 1, 
-            num_cols=len(headers),
-            center_cols=[3, 6, 8, 9, 10, 11]  # 용기중량, 상태, 제조일, 내압시험일, 검사주기, 내압만료일
+        cylinders = CylinderRepository.iter_cylinder_list(
+            filters=filters,
+            days=days_int,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            search_query=search_query
         )
+        for idx, cylinder in enumerate(cylinders):
+            # 상태 표시 정규화 (리스트와 동일)
+            try:
+                cylinder["status"] = _normalize_status_for_ui(cylinder.get("status", ""))
+            except Exception:
+                pass
+            
+            # 밸브규격 파싱
+            valve_parsed = parse_valve_spec(cylinder.get('valve_spec', '') or '')
+            valve_display = f"{valve_parsed.get('format', '-')}/{valve_parsed.get('material', '-')}"
+            
+            # 용기규격 파싱
+            cylinder_parsed = parse_cylinder_spec(cylinder.get('cylinder_spec', '') or '')
+            cylinder_display = f"{cylinder_parsed.get('format', '-')}/{cylinder_parsed.get('material', '-')}"
+            
+            # 날짜 포맷팅
+            manufacture_date = cylinder.get('manufacture_date')
+            pressure_test_date = cylinder.get('pressure_test_date')
+            pressure_expire_date = cylinder.get('pressure_expire_date')
+            
+            # 용기중량
+            cylinder_weight = cylinder.get('cylinder_weight')
+            weight_display = str(cylinder_weight) if cylinder_weight is not None else '-'
+            
+            row_data = [
+                cylinder.get('cylinder_no', ''),
+                translate_text('gas_name', cylinder.get('gas_name', '')),
+                weight_display,
+                valve_display,
+                cylinder_display,
+                cylinder.get('status', ''),
+                translate_text('location', cylinder.get('location', '')),
+                manufacture_date.strftime('%Y-%m-%d') if manufacture_date else '-',
+                pressure_test_date.strftime('%Y-%m-%d') if pressure_test_date else '-',
+                f"{cylinder.get('pressure_test_term', '-')}년" if cylinder.get('pressure_test_term') else '-',
+                pressure_expire_date.strftime('%Y-%m-%d') if pressure_expire_date else '-',
+                'FCMS 수정필요' if cylinder.get('needs_fcms_fix') else '',
+            ]
+            yield row_data, row_styles[idx % 2]
+    
+    list_sheet = XlsxSheet(
+        "용기리스트",
+        cylinder_rows(),
+        widths=[w for _, w in headers],
+        row_height=18,
+        header_height=22,
+        print_landscape=True,  # A4 가로, 용지 너비에 맞춤
+        repeat_header=True,
+    )
     
-    # A4 인쇄 설정 (가로 방향, 용지 너비에 맞춤)
-    setup_print_area(ws, num_rows=len(cylinders) + 1, num_cols=len(headers), landscape=True)
-    
-    # 필터 정보 시트 추가
-    ws_info = wb.create_sheet(title="필터정보")
-    ws_info['A1'] = "다운로드 일시"
-    ws_info['B1'] = timezone.localtime(timezone.now()).strftime("%Y-%m-%d %H:%M:%S")
-    ws_info['A2'] = "총 건수"
-    ws_info['B2'] = len(cylinders)
-    ws_info['A3'] = "적용된 필터"
-    
-    filter_info = []
-    if gas_name:
-        filter_info.append(f"가스명: {gas_name}")
-    if status:
-        filter_info.append(f"상태: {status}")
-    if location:
-        filter_info.append(f"위치: {location}")
-    if valve_spec:
-        filter_info.append(f"밸브규격: {valve_spec}")
-    if cylinder_spec:
-        filter_info.append(f"용기규격: {cylinder_spec}")
-    if days:
-        filter_info.append(f"기간: 최근 {days}일")
-    
-    ws_info['B3'] = ", ".join(filter_info) if filter_info else "없음"
-    style_info_sheet(ws_info)
+    # 필터 정보 시트 (용기리스트 시트를 다 쓴 뒤 생성되므로 총 건수를 알 수 있음)
+    def info_rows():
+        filter_info = []
+        if gas_name:
+            filter_info.append(f"가스명: {gas_name}")
+        if status:
+            filter_info.append(f"상태: {status}")
+        if location:
+            filter_info.append(f"위치: {location}")
+        if valve_spec:
+            filter_info.append(f"밸브규격: {valve_spec}")
+        if cylinder_spec:
+            filter_info.append(f"용기규격: {cylinder_spec}")
+        if days:
+            filter_info.append(f"기간: 최근 {days}일")
+        
+        info_styles = [STYLE_INFO_LABEL, STYLE_INFO_VALUE]
+        yield ["다운로드 일시", timezone.localtime(timezone.now()).strftime("%Y-%m-%d %H:%M:%S")], info_styles
+        yield ["총 건수", max(list_sheet.row_count - 1, 0)], info_styles
+        yield ["적용된 필터", ", ".join(filter_info) if filter_info else "없음"], info_styles
     
-    # HTTP Response 생성
-    response = HttpResponse(
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    )
+    info_sheet = XlsxSheet("필터정보", info_rows(), widths=[15, 50])
     
-    # 파일명 생성 (날짜 포함) - RFC 5987 형식으로 인코딩
+    # 파일명 생성 (날짜 포함)
     _now_str = timezone.localtime(timezone.now()).strftime("%Y%m%d_%H%M%S")
-    filename = f"용기리스트_{_now_str}.xlsx"
-    filename_ascii = f"cylinders_{_now_str}.xlsx"
-    filename_encoded = quote(filename)
-    response['Content-Disposition'] = f"attachment; filename=\"{filename_ascii}\"; filename*=UTF-8''{filename_encoded}"
+    return stream_xlsx([list_sheet, info_sheet]), f"용기리스트_{_now_str}.xlsx", f"cylinders_{_now_str}.xlsx"
+
+
+def cylinder_export_excel(request):
+    """
+    용기 리스트 엑셀 다운로드
     
-    wb.save(response)
+    백그라운드 작업(core/jobs.py)이 켜져 있으면 run_jobs 워커가 만들고 상태 페이지로 이동한다.
+    꺼져 있으면 StreamingHttpResponse로 바로 내보낸다. 전체 건수를 받아도 메모리가 일정하다.
+    """
+    if jobs.is_enabled():
+        return jobs.enqueue_response(
+            request, 'cylinders.export_excel', {'query': request.GET.urlencode()}, label='용기리스트 Excel'
+        )
+    
+    chunks, filename, filename_ascii = build_cylinder_excel(request.GET)
+    response = StreamingHttpResponse(chunks, content_type=XLSX_CONTENT_TYPE)
+    # nginx 프록시 버퍼링 없이 바로 전달
+    response['X-Accel-Buffering'] = 'no'
+    response['Content-Disposition'] = _attachment_header(filename, filename_ascii)
     return response
 
 
-def cylinder_export_qr_pdf(request):
-    """용기 QR코드 PDF 출력 - A4 용지에 다중열로 출력"""
-    from urllib.parse import quote
-    from io import BytesIO
-    import qrcode
-    from reportlab.lib.pagesizes import A4
-    from reportlab.lib.units import mm
-    from reportlab.pdfgen import canvas
-    from reportlab.pdfbase import pdfmetrics
-    from reportlab.pdfbase.ttfonts import TTFont
-    from reportlab.lib.utils import ImageReader
-    import os
+def build_cylinder_qr_pdf(params, output=None):
+    """
+    용기 QR코드 PDF 생성 - A4 용지에 다중열로 출력 (cylinders/qr_labels.py)
+
+    필터에 맞는 용기 전체를 출력한다. (라벨 수 상한 없음)
+
+    Args:
+        output: 저장할 파일 경로 (None이면 내용을 bytes로 반환)
+    """
+    from .qr_labels import build_qr_label_pdf
     
-    parsed = _parse_cylinders_list_request(request)
+    parsed = _parse_cylinders_list_params(params)
     search_query = parsed["search_query"]
     filters = parsed["filters"]
     days_int = parsed["days_int"]
     sort_by = parsed["sort_by"]
     sort_order = parsed["sort_order"]
     
-    # 전체 데이터 조회 (최대 1000건 제한 - PDF 크기 고려)
-    cylinders = CylinderRepository.get_cylinder_list(
-        filters=filters, 
-        limit=1000,
-        days=days_int,
-        sort_by=sort_by,
-        sort_order=sort_order,
-        search_query=search_query
-    )
-    
-    # A4 사이즈 설정
-    page_width, page_height = A4  # 595.27 x 841.89 points
-    
-    # 레이아웃 설정
-    margin_x = 10 * mm  # 좌우 여백
-    margin_y = 10 * mm  # 상하 여백
-    cols = 10  # 한 줄에 10개
-    qr_size = 10 * mm  # QR코드 크기 1cm
-    cell_width = (page_width - 2 * margin_x) / cols
-    cell_height = 15 * mm  # QR코드 + 텍스트 높이 (약 1.5cm)
-    
-    # 한 페이지당 행 수 계산
-    usable_height = page_height - 2 * margin_y
-    rows_per_page = int(usable_height / cell_height)
-    items_per_page = cols * rows_per_page
-    
-    # PDF 생성
-    buffer = BytesIO()
-    c = canvas.Canvas(buffer, pagesize=A4)
-    
-    # 한글 폰트 등록 시도
-    font_name = 'Helvetica'
-    try:
-        # Windows 맑은 고딕
-        font_path = 'C:/Windows/Fonts/malgun.ttf'
-        if os.path.exists(font_path):
-            pdfmetrics.registerFont(TTFont('MalgunGothic', font_path))
-            font_name = 'MalgunGothic'
-    except:
-        pass
-    
-    for idx, cylinder in enumerate(cylinders):
-        # 페이지 내 위치 계산
-        page_idx = idx % items_per_page
-        row = page_idx // cols
-        col = page_idx % cols
-        
-        # 새 페이지 시작
-        if idx > 0 and page_idx == 0:
-            c.showPage()
-        
-        # 셀 위치 계산 (왼쪽 위 기준)
-        x = margin_x + col * cell_width
-        y = page_height - margin_y - (row + 1) * cell_height
-        
-        cylinder_no = cylinder.get('cylinder_no', '')
-        
-        # QR코드 생성
-        qr = qrcode.QRCode(
-            version=1,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=1,
+    # 용기번호만 목록으로 (행 dict는 청크 단위로 읽고 버린다)
+    cylinder_nos = [
+        cylinder.get('cylinder_no', '') or ''
+        for cylinder in CylinderRepository.iter_cylinder_list(
+            filters=filters,
+            days=days_int,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            search_query=search_query
         )
-        qr.add_data(cylinder_no)
-        qr.make(fit=True)
-        qr_img = qr.make_image(fill_color="black", back_color="white")
-        
-        # QR코드를 BytesIO에 저장
-        qr_buffer = BytesIO()
-        qr_img.save(qr_buffer, format='PNG')
-        qr_buffer.seek(0)
-        
-        # QR코드 그리기 (셀 중앙에)
-        qr_x = x + (cell_width - qr_size) / 2
-        qr_y = y + 4 * mm  # 텍스트 공간 확보
-        c.drawImage(ImageReader(qr_buffer), qr_x, qr_y, width=qr_size, height=qr_size)
-        
-        # 용기번호 텍스트
-        c.setFont(font_name, 5)  # 작은 폰트
-        text_x = x + cell_width / 2
-        text_y = y + 1 * mm
-        c.drawCentredString(text_x, text_y, cylinder_no[:12] if len(cylinder_no) > 12 else cylinder_no)
-    
-    c.save()
-    
-    # HTTP Response 생성
-    buffer.seek(0)
-    response = HttpResponse(buffer.getvalue(), content_type='application/pdf')
+    ]
     
-    # 파일명 생성 (RFC 5987 형식)
-    filename = f"QR코드_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-    filename_ascii = f"qrcodes_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-    filename_encoded = quote(filename)
-    response['Content-Disposition'] = f"attachment; filename=\"{filename_ascii}\"; filename*=UTF-8''{filename_encoded}"
+    # 파일명 생성
+    _now_str = datetime.now().strftime('%Y%m%d_%H%M%S')
+    return build_qr_label_pdf(cylinder_nos, output), f"QR코드_{_now_str}.pdf", f"qrcodes_{_now_str}.pdf"
+
+
+def cylinder_export_qr_pdf(request):
+    """용기 QR코드 PDF 출력 (백그라운드 작업이 켜져 있으면 워커가 생성)"""
+    if jobs.is_enabled():
+        return jobs.enqueue_response(
+            request, 'cylinders.export_qr_pdf', {'query': request.GET.urlencode()}, label='용기 QR코드 PDF'
+        )
     
+    content, filename, filename_ascii = build_cylinder_qr_pdf(request.GET)
+    response = HttpResponse(content, content_type='application/pdf')
+    response['Content-Disposition'] = _attachment_header(filename, filename_ascii)
     return response
 
 
@@ -1021,11 +925,10 @@ def smart_search(request):
     # 검색 결과 미리보기 (개수만)
     filters = build_filters_from_parsed(parsed['filters'])
     
-    # 전체 개수 조회
-    total_count = CylinderRepository.get_cylinder_count(filters=filters)
-    
-    # 결과 기반 추천 필터 (상위 옵션)
-    recommendations = get_search_recommendations(filters)
+    # 전체 개수 + 결과 기반 추천 필터 (패싯 집계 1회)
+    facets = CylinderRepository.get_facet_counts(filters=filters)
+    total_count = facets['total']
+    recommendations = get_search_recommendations(filters, facets=facets)
     
     return JsonResponse({
         'success': True,
@@ -1057,38 +960,38 @@ def build_filters_from_parsed(parsed_filters: dict) -> dict:
     return filters
 
 
-def get_search_recommendations(filters: dict) -> dict:
-    """현재 필터 기반 추천 옵션"""
+def get_search_recommendations(filters: dict, facets: dict = None) -> dict:
+    """현재 필터 기반 추천 옵션 (상태/위치 상위 5개)"""
     recommendations = {
         'by_status': {},
         'by_location': {},
     }
     
     try:
-        # 상태별 개수
-        all_data = CylinderRepository.get_cylinder_list(filters=filters, limit=5000)
-        
-        status_counts = {}
-        location_counts = {}
-        
-        for item in all_data:
-            status = item.get('status', '')
-            location = item.get('location', '')
-            
-            if status:
-                status_counts[status] = status_counts.get(status, 0) + 1
-            if location:
-                location_counts[location] = location_counts.get(location, 0) + 1
+        if facets is None:
+            facets = CylinderRepository.get_facet_counts(filters=filters)
         
         # 상위 5개만
-        recommendations['by_status'] = dict(sorted(status_counts.items(), key=lambda x: -x[1])[:5])
-        recommendations['by_location'] = dict(sorted(location_counts.items(), key=lambda x: -x[1])[:5])
+        recommendations['by_status'] = dict(sorted(facets['status'].items(), key=lambda x: -x[1])[:5])
+        recommendations['by_location'] = dict(sorted(facets['location'].items(), key=lambda x: -x[1])[:5])
     except Exception:
         pass
     
     return recommendations
 
 
+def _facet_status_count(facets: dict, status: str) -> int:
+    """
+    패싯에서 상태 개수 조회
+
+    목록 필터(status/statuses)는 '보관:미회수'/'보관:회수'만 condition_code로 나누고 그 외 상태는
+    dashboard_status 원값으로 거르므로, 클릭 결과와 맞도록 분리 전 원값(status_raw) 개수를 쓴다.
+    """
+    if status in ('보관:미회수', '보관:회수'):
+        return facets['status'].get(status, 0)
+    return facets['status_raw'].get(status, 0)
+
+
 def search_autocomplete(request):
     """검색 자동완성 API"""
     from .search_parser import parse_natural_query
@@ -1103,10 +1006,20 @@ def search_autocomplete(request):
     
     suggestions = []
     
+    # 파싱된 필터에서 상태만 뺀 조건으로 패싯을 한 번 집계하고,
+    # 기본 결과/가스+상태 추천 개수는 모두 상태 패싯에서 꺼낸다. (키 입력당 쿼리 1회)
+    filters = build_filters_from_parsed(parsed['filters'])
+    base_filters = {k: v for k, v in filters.items() if k != 'status'}
+    facets = None
+    if parsed['filters']:
+        facets = CylinderRepository.get_facet_counts(filters=base_filters)
+    
     # 파싱된 키워드 기반 추천
     if parsed['filters']:
-        filters = build_filters_from_parsed(parsed['filters'])
-        count = CylinderRepository.get_cylinder_count(filters=filters)
+        if 'status' in filters:
+            count = _facet_status_count(facets, filters['status'])
+        else:
+            count = facets['total']
         
         # 기본 검색 결과
         description_parts = []
@@ -1131,17 +1044,22 @@ def search_autocomplete(request):
     # 추가 추천
     if 'gas_keyword' in parsed['filters']:
         gas = parsed['filters']['gas_keyword']
+        location = parsed['filters'].get('location')
         
-        # 가스 + 각 상태
+        # 가스 + 각 상태 (위치를 입력했다면 같은 위치 안에서)
         for status in ['보관', '충전', '출하', '이상']:
-            test_filters = {'gas_name': gas, 'status': status}
-            count = CylinderRepository.get_cylinder_count(filters=test_filters)
+            count = _facet_status_count(facets, status)
             if count > 0:
+                suggestion_filters = {'gas_keyword': gas, 'statuses': [status]}
+                description = f"{gas} 가스 중 {status} 상태"
+                if location:
+                    suggestion_filters['location'] = location
+                    description = f"{location} 위치 {description}"
                 suggestions.append({
                     'text': f"{gas} {status}",
-                    'description': f"{gas} 가스 중 {status} 상태",
+                    'description': description,
                     'count': count,
-                    'filters': {'gas_keyword': gas, 'statuses': [status]},
+                    'filters': suggestion_filters,
                 })
     
     return JsonResponse({'suggestions': suggestions[:5]})
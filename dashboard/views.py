@@ -4,18 +4,16 @@ from django.views.decorators.http import require_POST, require_GET
 from django.contrib.auth.decorators import login_required
 from django.db import connection
 from core.repositories.cylinder_repository import CylinderRepository
-from core.utils.view_helper import extract_valve_type, group_cylinder_types
+from core.repositories.history_repository import HistoryRepository
+from core.utils.view_helper import extract_valve_type, get_cylinder_type_groups
 from core.models import HiddenCylinderType
 from collections import defaultdict
 
 
 def dashboard(request):
     """대시보드 - 모든 용기종류 한눈에"""
-    # 스냅샷 테이블에서 데이터 조회
-    inventory_data = CylinderRepository.get_inventory_summary()
-    
-    # 용기종류별 집계 (헬퍼 함수 사용)
-    cylinder_types_dict = group_cylinder_types(inventory_data)
+    # 용기종류별 집계 (스냅샷 버전 기준 캐시)
+    cylinder_types_dict = get_cylinder_type_groups()
     
     # 숨김 여부 확인을 위한 파라미터
     show_hidden = request.GET.get('show_hidden', '') == '1'
@@ -128,8 +126,7 @@ def detail(request):
     selected_type = request.GET.get('type', '')
     
     # 모든 용기종류 목록 (드롭다운용) - 대시보드와 동일한 그룹화 로직
-    all_inventory = CylinderRepository.get_inventory_summary()
-    cylinder_types_dict = group_cylinder_types(all_inventory)
+    cylinder_types_dict = get_cylinder_type_groups()
     
     # cylinder_type_key를 키로 하는 딕셔너리 생성 (가용 수량이 0이어도 포함)
     cylinder_type_options = {}
@@ -195,33 +192,16 @@ def detail(request):
             cylinders_by_status[status].append(cyl)
     
     # 최근 추이 (History가 있을 경우)
-    from history.models import HistInventorySnapshot
+    from history import snapshot_series
     from django.utils import timezone
     from datetime import timedelta
     
     trend_data = []
     if selected_type:
-        # 최근 7일간의 스냅샷 데이터
+        # 최근 7일간의 일별 상태별 수량 (일별 스냅샷 집계)
         end_date = timezone.now().date()
         start_date = end_date - timedelta(days=7)
-        
-        snapshots = HistInventorySnapshot.objects.filter(
-            cylinder_type_key=selected_type,
-            snapshot_datetime__date__gte=start_date,
-            snapshot_datetime__date__lte=end_date,
-            snapshot_type='DAILY'
-        ).order_by('snapshot_datetime')
-        
-        # 일별 집계
-        daily_trend = {}
-        for snapshot in snapshots:
-            date_key = snapshot.snapshot_datetime.date()
-            if date_key not in daily_trend:
-                daily_trend[date_key] = {}
-            status = snapshot.status
-            daily_trend[date_key][status] = daily_trend[date_key].get(status, 0) + snapshot.qty
-        
-        trend_data = sorted(daily_trend.items())
+        trend_data = snapshot_series.type_status_series(selected_type, start_date, end_date)
     
     context = {
         'type_info': type_info,
@@ -273,36 +253,18 @@ def summary(request):
     # Top 10 가스명
     top_gases = sorted(gas_stats.items(), key=lambda x: x[1], reverse=True)[:10]
     
-    # 변동 랭킹 (History 기반)
-    from history.models import HistInventorySnapshot
+    # 변동 랭킹 (일별 스냅샷 집계 기준, history/snapshot_series.py)
+    from history import snapshot_series
     from django.utils import timezone
     from datetime import timedelta
     
     end_date = timezone.now().date()
     start_date = end_date - timedelta(days=days)
     
-    # 기간 첫날과 마지막날 스냅샷 비교
-    first_snapshots = HistInventorySnapshot.objects.filter(
-        snapshot_datetime__date=start_date,
-        snapshot_type='DAILY'
-    )
-    
-    last_snapshots = HistInventorySnapshot.objects.filter(
-        snapshot_datetime__date=end_date,
-        snapshot_type='DAILY'
-    )
-    
-    # 변동량 계산 - 가스명별 집계
-    first_summary = {}
-    last_summary = {}
-    
-    for snapshot in first_snapshots:
-        key = snapshot.gas_name
-        first_summary[key] = first_summary.get(key, 0) + snapshot.qty
-    
-    for snapshot in last_snapshots:
-        key = snapshot.gas_name
-        last_summary[key] = last_summary.get(key, 0) + snapshot.qty
+    # 기간 첫날과 마지막날 가스명별 총수량 비교
+    totals = snapshot_series.gas_totals([start_date, end_date])
+    first_summary = totals[start_date]
+    last_summary = totals[end_date]
     
     # 변동량 계산
     top_changes = []
@@ -364,11 +326,17 @@ def api_move_report_cylinders(request):
             
             # tr_move_report_details에서 용기-이동서 연결 조회 (가장 정확한 소스)
             # 없으면 tr_cylinder_status_histories에서 최신 이동서 조회
+            # (cy_cylinder_timeline이 있으면 커버링 인덱스만 읽는다)
+            history_sql = HistoryRepository.cylinder_history_sql(
+                'cc.cylinder_no',
+                ['move_report_no', 'move_date', 'move_code', 'manufacture_lot', 'filling_lot'],
+                ['{move_report_no} IS NOT NULL'],
+            )
             query = f'''
                 WITH current_cylinders AS (
                     -- 현재 해당 상태인 용기들
                     SELECT 
-                        cc.cylinder_no,
+                        RTRIM(cc.cylinder_no) as cylinder_no,
                         cc.cylinder_type_key,
                         cc.dashboard_gas_name as gas_name,
                         cc.dashboard_capacity as capacity,
@@ -379,62 +347,37 @@ def api_move_report_cylinders(request):
                     WHERE cc.cylinder_type_key IN ({placeholders_keys})
                       AND cc.dashboard_status = %s
                 ),
-                -- tr_move_report_details에서 연결된 이동서 조회 (최신 것) + ROW_NO(헤더번호)
-                detail_links AS (
-                    SELECT DISTINCT ON (TRIM(d."CYLINDER_NO"))
-                        TRIM(d."CYLINDER_NO") as cylinder_no,
-                        TRIM(d."MOVE_REPORT_NO") as move_report_no,
-                        d."ROW_NO" as row_no,
-                        d."CYLINDER_WEIGHT" as detail_cylinder_weight,
-                        d."FILLING_WEIGHT" as filling_weight
-                    FROM fcms_cdc.tr_move_report_details d
-                    WHERE TRIM(d."CYLINDER_NO") IN (SELECT cylinder_no FROM current_cylinders)
-                    ORDER BY TRIM(d."CYLINDER_NO"), d."ADD_DATETIME" DESC NULLS LAST
-                ),
-                -- tr_cylinder_status_histories에서 최신 이동서 조회 (detail에 없는 경우 백업용) + LOT 정보
-                history_links AS (
-                    SELECT DISTINCT ON (TRIM(h."CYLINDER_NO"))
-                        TRIM(h."CYLINDER_NO") as cylinder_no,
-                        TRIM(h."MOVE_REPORT_NO") as move_report_no,
-                        h."MOVE_DATE" as move_date,
-                        h."MOVE_CODE" as move_code,
-                        CONCAT(
-                            COALESCE(h."MANUFACTURE_LOT_HEADER", ''),
-                            COALESCE(h."MANUFACTURE_LOT_NO", ''),
-                            CASE WHEN h."MANUFACTURE_LOT_BRANCH" IS NOT NULL AND h."MANUFACTURE_LOT_BRANCH" != '' 
-                                 THEN '-' || h."MANUFACTURE_LOT_BRANCH" 
-                                 ELSE '' 
-                            END
-                        ) as manufacture_lot,
-                        CONCAT(
-                            COALESCE(h."FILLING_LOT_HEADER", ''),
-                            COALESCE(h."FILLING_LOT_NO", ''),
-                            CASE WHEN h."FILLING_LOT_BRANCH" IS NOT NULL AND h."FILLING_LOT_BRANCH" != '' 
-                                 THEN '-' || h."FILLING_LOT_BRANCH" 
-                                 ELSE '' 
-                            END
-                        ) as filling_lot
-                    FROM fcms_cdc.tr_cylinder_status_histories h
-                    WHERE TRIM(h."CYLINDER_NO") IN (SELECT cylinder_no FROM current_cylinders)
-                      AND h."MOVE_REPORT_NO" IS NOT NULL 
-                      AND TRIM(h."MOVE_REPORT_NO") != ''
-                    ORDER BY TRIM(h."CYLINDER_NO"), h."MOVE_DATE" DESC NULLS LAST, h."HISTORY_SEQ" DESC NULLS LAST
-                ),
                 -- 이동서 연결 통합 (detail 우선, 없으면 history)
+                -- 용기별 LATERAL + RTRIM 키 인덱스로 선택된 용기 수만큼만 조회한다.
                 combined_links AS (
                     SELECT 
-                        COALESCE(dl.cylinder_no, hl.cylinder_no) as cylinder_no,
+                        cc.cylinder_no,
                         COALESCE(dl.move_report_no, hl.move_report_no) as move_report_no,
                         dl.row_no,
                         dl.detail_cylinder_weight,
                         dl.filling_weight,
                         hl.move_date,
                         hl.move_code,
-                        hl.manufacture_lot,
-                        hl.filling_lot
+                        COALESCE(hl.manufacture_lot, '') as manufacture_lot,
+                        COALESCE(hl.filling_lot, '') as filling_lot
                     FROM current_cylinders cc
-                    LEFT JOIN detail_links dl ON cc.cylinder_no = dl.cylinder_no
-                    LEFT JOIN history_links hl ON cc.cylinder_no = hl.cylinder_no
+                    -- tr_move_report_details에서 연결된 이동서 조회 (최신 것) + ROW_NO(헤더번호)
+                    LEFT JOIN LATERAL (
+                        SELECT
+                            RTRIM(d."MOVE_REPORT_NO") as move_report_no,
+                            d."ROW_NO" as row_no,
+                            d."CYLINDER_WEIGHT" as detail_cylinder_weight,
+                            d."FILLING_WEIGHT" as filling_weight
+                        FROM fcms_cdc.tr_move_report_details d
+                        WHERE RTRIM(d."CYLINDER_NO") = cc.cylinder_no
+                        ORDER BY d."ADD_DATETIME" DESC NULLS LAST
+                        LIMIT 1
+                    ) dl ON TRUE
+                    -- tr_cylinder_status_histories에서 최신 이동서 조회 (detail에 없는 경우 백업용) + LOT 정보
+                    LEFT JOIN LATERAL (
+                        {history_sql}
+                        LIMIT 1
+                    ) hl ON TRUE
                 )
                 SELECT 
                     cc.cylinder_no,
@@ -475,10 +418,10 @@ def api_move_report_cylinders(request):
                     ) as move_report_filling_lot
                 FROM current_cylinders cc
                 LEFT JOIN combined_links cl ON cc.cylinder_no = cl.cylinder_no
-                LEFT JOIN fcms_cdc.ma_cylinders mc ON TRIM(cc.cylinder_no) = TRIM(mc."CYLINDER_NO")
-                LEFT JOIN fcms_cdc.tr_orders o ON TRIM(cl.move_report_no) = TRIM(o."ARRIVAL_SHIPPING_NO")
-                LEFT JOIN fcms_cdc.tr_order_informations oi ON TRIM(cl.move_report_no) = TRIM(oi."MOVE_REPORT_NO")
-                LEFT JOIN fcms_cdc.tr_move_reports m ON TRIM(cl.move_report_no) = TRIM(m."MOVE_REPORT_NO")
+                LEFT JOIN fcms_cdc.ma_cylinders mc ON RTRIM(mc."CYLINDER_NO") = cc.cylinder_no
+                LEFT JOIN fcms_cdc.tr_orders o ON RTRIM(o."ARRIVAL_SHIPPING_NO") = cl.move_report_no
+                LEFT JOIN fcms_cdc.tr_order_informations oi ON RTRIM(oi."MOVE_REPORT_NO") = cl.move_report_no
+                LEFT JOIN fcms_cdc.tr_move_reports m ON RTRIM(m."MOVE_REPORT_NO") = cl.move_report_no
                 ORDER BY cl.move_report_no NULLS LAST, cl.row_no NULLS LAST, cc.cylinder_no
             '''
             
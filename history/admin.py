@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import HistInventorySnapshot, HistSnapshotRequest
+from .models import HistInventorySnapshot, HistSnapshotDailyTotal, HistSnapshotRequest
 
 
 @admin.register(HistInventorySnapshot)
@@ -18,3 +18,11 @@ class HistSnapshotRequestAdmin(admin.ModelAdmin):
     search_fields = ['reason', 'message']
     date_hierarchy = 'requested_at'
     readonly_fields = ['requested_at']
+
+
+@admin.register(HistSnapshotDailyTotal)
+class HistSnapshotDailyTotalAdmin(admin.ModelAdmin):
+    list_display = ['snapshot_date', 'gas_name', 'cylinder_type_key', 'status', 'qty', 'snapshot_datetime']
+    list_filter = ['status', 'snapshot_date', 'gas_name']
+    search_fields = ['gas_name', 'cylinder_type_key', 'status']
+    date_hierarchy = 'snapshot_date'
@@ -0,0 +1,17 @@
+"""이력 백그라운드 작업 핸들러 (core/jobs.py)"""
+from datetime import date
+
+from core.jobs import register
+
+from .views import build_charge_export
+
+
+@register('history.charge_export')
+def charge_export(params):
+    content, filename, _ = build_charge_export(
+        date.fromisoformat(params['start_date']),
+        date.fromisoformat(params['end_date']),
+        params.get('search', ''),
+        params.get('cylinder_type_key', ''),
+    )
+    return content, filename, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
@@ -0,0 +1,30 @@
+"""hist_snapshot_daily_total(일별 스냅샷 집계) 채우기 (컬럼형 저장 적용 시 hist_snapshot_day_vector 포함)"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.repositories.history_repository import HistoryRepository
+from history import snapshot_series
+
+
+class Command(BaseCommand):
+    help = '기존 DAILY 스냅샷으로 일별 스냅샷 집계(hist_snapshot_daily_total) 재계산 - 정합성 복구용 (최초 적재는 migrate history)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None, help='최근 N일만 재계산 (기본: 전체)')
+
+    def handle(self, *args, **options):
+        start_date = None
+        if options['days'] is not None:
+            start_date = timezone.localdate() - timedelta(days=options['days'])
+
+        days = snapshot_series.snapshot_days(start_date)
+        total_rows = 0
+        for day in days:
+            total_rows += snapshot_series.refresh_day(day)
+
+        self.stdout.write(f"  날짜: {len(days):,}일, 집계 행: {total_rows:,}건\n")
+        if HistoryRepository.has_snapshot_columnar():
+            self.stdout.write("  컬럼형 저장(hist_snapshot_day_vector)도 함께 갱신했습니다.\n")
+        self.stdout.write(self.style.SUCCESS("[완료] 일별 스냅샷 집계 재계산 완료"))
@@ -3,6 +3,7 @@ from django.core.management.base import BaseCommand
 from django.utils import timezone
 from datetime import datetime
 from history.models import HistInventorySnapshot, HistSnapshotRequest, SnapshotType, SnapshotRequestStatus
+from history import snapshot_series
 from core.repositories.view_repository import ViewRepository
 from core.utils.cylinder_type import generate_cylinder_type_key
 
@@ -57,13 +58,16 @@ class Command(BaseCommand):
                     if inserted_count + skipped_count <= 5:
                         self.stdout.write(self.style.WARNING(f'Skipped: {e}'))
             
+            # 일별 스냅샷 집계 갱신 (요약 화면 변동 랭킹/추이)
+            total_rows = snapshot_series.refresh_for_snapshot(snapshot_datetime)
+            
             # 성공 기록
             HistSnapshotRequest.objects.create(
                 requested_at=snapshot_datetime,
                 requested_by=None,
                 reason='정기 스냅샷 (DAILY)',
                 status=SnapshotRequestStatus.SUCCESS,
-                message=f'{inserted_count} records inserted, {skipped_count} skipped'
+                message=f'{inserted_count} records inserted, {skipped_count} skipped, {total_rows} daily totals'
             )
             
             self.stdout.write(self.style.SUCCESS(
@@ -11,6 +11,7 @@ from django.utils import timezone
 
 from core.repositories.view_repository import ViewRepository
 from history.models import HistInventorySnapshot, HistSnapshotRequest, SnapshotRequestStatus, SnapshotType
+from history import snapshot_series
 
 
 class Command(BaseCommand):
@@ -75,12 +76,15 @@ class Command(BaseCommand):
             except Exception:
                 skipped_count += 1
 
+        # 일별 스냅샷 집계 갱신 (target_date의 마지막 스냅샷이 월말 스냅샷이 됨)
+        total_rows = snapshot_series.refresh_day(target_date)
+
         HistSnapshotRequest.objects.create(
             requested_at=timezone.now(),
             requested_by=None,
             reason=f"월말 스냅샷 (target={target_date})",
             status=SnapshotRequestStatus.SUCCESS,
-            message=f"inserted={inserted_count} skipped={skipped_count}",
+            message=f"inserted={inserted_count} skipped={skipped_count} daily_totals={total_rows}",
         )
 
         self.stdout.write(self.style.SUCCESS(f"Done. inserted={inserted_count}, skipped={skipped_count}"))
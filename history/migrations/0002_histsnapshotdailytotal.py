@@ -0,0 +1,32 @@
+# Generated by Django 5.2.9 on 2026-10-17 09:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('history', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HistSnapshotDailyTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('snapshot_date', models.DateField(help_text='KST 기준 날짜')),
+                ('snapshot_datetime', models.DateTimeField(help_text='집계에 사용한 그 날의 마지막 DAILY 스냅샷 시각')),
+                ('gas_name', models.CharField(max_length=100)),
+                ('cylinder_type_key', models.CharField(max_length=32)),
+                ('status', models.CharField(max_length=20)),
+                ('qty', models.IntegerField(help_text='수량 (위치 합산)')),
+            ],
+            options={
+                'verbose_name': '일별 스냅샷 집계',
+                'verbose_name_plural': '일별 스냅샷 집계',
+                'db_table': 'hist_snapshot_daily_total',
+                'unique_together': {('snapshot_date', 'gas_name', 'cylinder_type_key', 'status')},
+                'indexes': [models.Index(fields=['cylinder_type_key', 'snapshot_date'], name='idx_snap_daily_type')],
+            },
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.9 on 2026-10-18 09:00
+
+from django.db import migrations
+from django.db.models import Sum
+from django.utils import timezone
+
+
+def backfill_snapshot_daily_total(apps, schema_editor):
+    """
+    기존 DAILY 스냅샷으로 hist_snapshot_daily_total 채우기
+    (history/snapshot_series.refresh_day와 같은 규칙: KST 날짜별 마지막 스냅샷만 합산)
+    """
+    HistInventorySnapshot = apps.get_model('history', 'HistInventorySnapshot')
+    HistSnapshotDailyTotal = apps.get_model('history', 'HistSnapshotDailyTotal')
+
+    latest_by_day = {}
+    snapshot_datetimes = (
+        HistInventorySnapshot.objects
+        .filter(snapshot_type='DAILY')
+        .values_list('snapshot_datetime', flat=True)
+        .distinct()
+    )
+    for snapshot_datetime in snapshot_datetimes:
+        day = timezone.localdate(snapshot_datetime)
+        if day not in latest_by_day or snapshot_datetime > latest_by_day[day]:
+            latest_by_day[day] = snapshot_datetime
+
+    filled_days = set(
+        HistSnapshotDailyTotal.objects.values_list('snapshot_date', flat=True).distinct()
+    )
+    for day, snapshot_datetime in sorted(latest_by_day.items()):
+        if day in filled_days:
+            continue
+        grouped = (
+            HistInventorySnapshot.objects
+            .filter(snapshot_type='DAILY', snapshot_datetime=snapshot_datetime)
+            .values('gas_name', 'cylinder_type_key', 'status')
+            .annotate(total=Sum('qty'))
+        )
+        HistSnapshotDailyTotal.objects.bulk_create(
+            [
+                HistSnapshotDailyTotal(
+                    snapshot_date=day,
+                    snapshot_datetime=snapshot_datetime,
+                    gas_name=g['gas_name'] or '',
+                    cylinder_type_key=g['cylinder_type_key'] or '',
+                    status=g['status'] or '',
+                    qty=g['total'] or 0,
+                )
+                for g in grouped
+            ],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('history', '0002_histsnapshotdailytotal'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_snapshot_daily_total, migrations.RunPython.noop),
+    ]
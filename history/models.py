@@ -60,6 +60,35 @@ class HistInventorySnapshot(models.Model):
         return f"{self.snapshot_datetime} - {self.gas_name} ({self.status}) - {self.qty}"
 
 
+class HistSnapshotDailyTotal(models.Model):
+    """
+    일별 스냅샷 집계 (날짜 x 가스명 x 용기종류 x 상태)
+
+    DAILY 스냅샷을 적재할 때 history/snapshot_series.py가 그 날짜의 마지막 스냅샷을 위치 없이 합산해 둔다.
+    요약 화면의 변동 랭킹/추이는 원본 스냅샷 대신 이 테이블에서 날짜 두 개만 읽는다.
+    """
+    snapshot_date = models.DateField(help_text="KST 기준 날짜")
+    snapshot_datetime = models.DateTimeField(help_text="집계에 사용한 그 날의 마지막 DAILY 스냅샷 시각")
+    gas_name = models.CharField(max_length=100)
+    cylinder_type_key = models.CharField(max_length=32)
+    status = models.CharField(max_length=20)
+    qty = models.IntegerField(help_text="수량 (위치 합산)")
+
+    class Meta:
+        db_table = 'hist_snapshot_daily_total'
+        unique_together = [
+            ['snapshot_date', 'gas_name', 'cylinder_type_key', 'status']
+        ]
+        indexes = [
+            models.Index(fields=['cylinder_type_key', 'snapshot_date'], name='idx_snap_daily_type'),
+        ]
+        verbose_name = '일별 스냅샷 집계'
+        verbose_name_plural = '일별 스냅샷 집계'
+
+    def __str__(self):
+        return f"{self.snapshot_date} - {self.gas_name} ({self.status}) - {self.qty}"
+
+
 class SnapshotRequestStatus(models.TextChoices):
     SUCCESS = 'SUCCESS', '성공'
     FAILED = 'FAILED', '실패'
@@ -0,0 +1,162 @@
+"""
+일별 스냅샷 집계 (hist_snapshot_daily_total)
+
+DAILY 스냅샷 적재(take_daily_snapshot, take_month_end_snapshot) 직후 refresh_day()로
+그 날짜의 마지막 스냅샷을 (가스명, 용기종류, 상태)별로 합산해 저장한다.
+하루에 DAILY 스냅샷이 여러 번 있으면(정기 + 월말) 마지막 것만 쓴다.
+기존 스냅샷은 마이그레이션(history 0003)이 같은 규칙으로 채운다.
+
+조회 쪽은 원본 스냅샷(위치별 행)을 ORM 객체로 읽지 않고 날짜 몇 개의 집계 행만 읽는다.
+원본을 읽어야 할 때도 snapshot_datetime__date 대신 day_bounds() 범위 조건으로 인덱스를 탄다.
+
+PostgreSQL에 컬럼형 저장(sql/create_hist_snapshot_columnar.sql)이 적용되어 있으면
+refresh_day()가 hist_snapshot_day_vector도 함께 갱신하고, 용기종류별 추이는 그 테이블에서 읽는다.
+"""
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import connection, transaction
+from django.db.models import Max, Sum
+from django.utils import timezone
+
+from core.repositories.history_repository import HistoryRepository
+from history.models import HistInventorySnapshot, HistSnapshotDailyTotal, SnapshotType
+
+
+def day_bounds(day: date) -> Tuple[datetime, datetime]:
+    """KST 날짜 하루의 [시작, 다음 날 시작) aware datetime"""
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min))
+
+
+def latest_snapshot_datetime(day: date) -> Optional[datetime]:
+    """해당 날짜의 마지막 DAILY 스냅샷 시각"""
+    start, end = day_bounds(day)
+    return HistInventorySnapshot.objects.filter(
+        snapshot_type=SnapshotType.DAILY,
+        snapshot_datetime__gte=start,
+        snapshot_datetime__lt=end,
+    ).aggregate(last=Max('snapshot_datetime'))['last']
+
+
+def refresh_day(day: date) -> int:
+    """해당 날짜 집계를 다시 계산해 저장 (저장한 행 수)"""
+    snapshot_datetime = latest_snapshot_datetime(day)
+    rows = []
+    if snapshot_datetime is not None:
+        grouped = (
+            HistInventorySnapshot.objects
+            .filter(snapshot_type=SnapshotType.DAILY, snapshot_datetime=snapshot_datetime)
+            .values('gas_name', 'cylinder_type_key', 'status')
+            .annotate(total=Sum('qty'))
+        )
+        rows = [
+            HistSnapshotDailyTotal(
+                snapshot_date=day,
+                snapshot_datetime=snapshot_datetime,
+                gas_name=g['gas_name'] or '',
+                cylinder_type_key=g['cylinder_type_key'] or '',
+                status=g['status'] or '',
+                qty=g['total'] or 0,
+            )
+            for g in grouped
+        ]
+
+    with transaction.atomic():
+        HistSnapshotDailyTotal.objects.filter(snapshot_date=day).delete()
+        HistSnapshotDailyTotal.objects.bulk_create(rows, batch_size=1000)
+        if HistoryRepository.has_snapshot_columnar():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT hist_snapshot_columnar_refresh(%s, %s, %s)",
+                    [day, *day_bounds(day)],
+                )
+    return len(rows)
+
+
+def refresh_for_snapshot(snapshot_datetime: datetime) -> int:
+    """스냅샷 적재 직후 호출 - 스냅샷 시각의 KST 날짜 집계 갱신"""
+    return refresh_day(timezone.localdate(snapshot_datetime))
+
+
+def snapshot_days(start_date: Optional[date] = None) -> List[date]:
+    """DAILY 스냅샷이 있는 KST 날짜 목록 (백필용)"""
+    qs = HistInventorySnapshot.objects.filter(snapshot_type=SnapshotType.DAILY)
+    if start_date is not None:
+        qs = qs.filter(snapshot_datetime__gte=day_bounds(start_date)[0])
+    days = {
+        timezone.localdate(dt)
+        for dt in qs.values_list('snapshot_datetime', flat=True).distinct()
+    }
+    return sorted(days)
+
+
+def gas_totals(days: Iterable[date]) -> Dict[date, Dict[str, int]]:
+    """날짜별 가스명 총수량 {날짜: {가스명: 수량}}"""
+    days = list(days)
+    result: Dict[date, Dict[str, int]] = {d: {} for d in days}
+    rows = (
+        HistSnapshotDailyTotal.objects
+        .filter(snapshot_date__in=days)
+        .values('snapshot_date', 'gas_name')
+        .annotate(total=Sum('qty'))
+    )
+    for row in rows:
+        result[row['snapshot_date']][row['gas_name']] = row['total'] or 0
+    return result
+
+
+def gas_status_totals(day: date) -> Dict[Tuple[str, str], int]:
+    """해당 날짜 (가스명, 상태)별 수량"""
+    rows = (
+        HistSnapshotDailyTotal.objects
+        .filter(snapshot_date=day)
+        .values('gas_name', 'status')
+        .annotate(total=Sum('qty'))
+    )
+    return {(row['gas_name'], row['status']): row['total'] or 0 for row in rows}
+
+
+def type_status_series(cylinder_type_key: str, start_date: date, end_date: date) -> List[Tuple[date, Dict[str, int]]]:
+    """용기종류 하나의 일별 상태별 수량 [(날짜, {상태: 수량}), ...] (날짜 오름차순)"""
+    if HistoryRepository.has_snapshot_columnar():
+        return _type_status_series_columnar(cylinder_type_key, start_date, end_date)
+
+    rows = (
+        HistSnapshotDailyTotal.objects
+        .filter(
+            cylinder_type_key=cylinder_type_key,
+            snapshot_date__gte=start_date,
+            snapshot_date__lte=end_date,
+        )
+        .values('snapshot_date', 'status')
+        .annotate(total=Sum('qty'))
+    )
+    series: Dict[date, Dict[str, int]] = {}
+    for row in rows:
+        series.setdefault(row['snapshot_date'], {})[row['status']] = row['total'] or 0
+    return sorted(series.items())
+
+
+def _type_status_series_columnar(cylinder_type_key: str, start_date: date, end_date: date) -> List[Tuple[date, Dict[str, int]]]:
+    """type_status_series의 hist_snapshot_day_vector 버전 (날짜당 한 행, 배열을 상태로 풀어 반환)"""
+    statuses = {slot: status for status, slot in HistoryRepository.get_snapshot_status_slots().items()}
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT v.snapshot_date, v.qty
+            FROM hist_snapshot_day_vector v
+            JOIN hist_snapshot_type_dim t ON t.type_id = v.type_id
+            WHERE t.cylinder_type_key = %s
+              AND v.snapshot_date >= %s
+              AND v.snapshot_date <= %s
+            ORDER BY v.snapshot_date
+            """,
+            [cylinder_type_key, start_date, end_date],
+        )
+        rows = cursor.fetchall()
+
+    return [
+        (snapshot_date, {statuses[slot]: qty for slot, qty in enumerate(vector, start=1) if qty and slot in statuses})
+        for snapshot_date, vector in rows
+    ]
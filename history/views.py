@@ -93,22 +93,17 @@ def history(request):
     # 집계 (주/월)
     cylinder_type_key = filters.get("cylinder_type_key")
     cylinder_type_keys = filters.get("cylinder_type_keys")
-    weekly_summary = HistoryRepository.get_period_summary(
-        period="week",
-        start_date=start_date,
-        end_date=end_date,
-        code_sets=move_code_sets,
-        cylinder_type_key=cylinder_type_key,
-        cylinder_type_keys=cylinder_type_keys,
-    )
-    monthly_summary = HistoryRepository.get_period_summary(
-        period="month",
+    # 일 단위로 한 번 집계해 주/월 버킷을 함께 만든다.
+    summaries = HistoryRepository.get_period_summaries(
+        periods=("week", "month"),
         start_date=start_date,
         end_date=end_date,
         code_sets=move_code_sets,
         cylinder_type_key=cylinder_type_key,
         cylinder_type_keys=cylinder_type_keys,
     )
+    weekly_summary = summaries["week"]
+    monthly_summary = summaries["month"]
 
     def _aggregate_latest(summary_rows):
         if not summary_rows:
@@ -364,19 +359,51 @@ def history_charge(request):
 
 
 def history_charge_export(request):
-    """용기별 LOT정보 조회 - 엑셀 다운로드 (A4 인쇄 최적화)"""
+    """
+    용기별 LOT정보 조회 - 엑셀 다운로드
+
+    기간은 세션 기준으로 여기서 확정하고, 백그라운드 작업(core/jobs.py)이 켜져 있으면 워커가 생성한다.
+    """
+    from urllib.parse import quote
+    from core import jobs
+
+    start_date, end_date = _get_date_range(request, default_days=60)
+    search_query = request.GET.get("search", "").strip()
+    cylinder_type_key = request.GET.get("cylinder_type_key", "").strip()
+
+    if jobs.is_enabled():
+        return jobs.enqueue_response(
+            request,
+            "history.charge_export",
+            {
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat(),
+                "search": search_query,
+                "cylinder_type_key": cylinder_type_key,
+            },
+            label=f"LOT조회 Excel ({start_date} ~ {end_date})",
+        )
+
+    content, filename, filename_ascii = build_charge_export(start_date, end_date, search_query, cylinder_type_key)
+    response = HttpResponse(
+        content,
+        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
+    response["Content-Disposition"] = f"attachment; filename=\"{filename_ascii}\"; filename*=UTF-8''{quote(filename)}"
+    return response
+
+
+def build_charge_export(start_date, end_date, search_query="", cylinder_type_key=""):
+    """용기별 LOT정보 엑셀 생성 (A4 인쇄 최적화) - (내용, 파일명, ASCII 파일명)"""
+    from io import BytesIO
     from openpyxl import Workbook
     from core.utils.excel_style import (
         apply_header_style, apply_data_style, setup_print_area
     )
-    from urllib.parse import quote
 
-    start_date, end_date = _get_date_range(request, default_days=60)
     move_code_sets = HistoryRepository.get_move_code_sets()
     charge_codes = move_code_sets.get("charge", [])
 
-    search_query = request.GET.get("search", "").strip()
-    cylinder_type_key = request.GET.get("cylinder_type_key", "").strip()
     cylinder_type_options = HistoryRepository.get_cylinder_type_options()
     filters = {"cylinder_type_key": cylinder_type_key} if cylinder_type_key else {}
     filters = _expand_cylinder_type_keys(filters, cylinder_type_options)
@@ -453,18 +480,14 @@ def history_charge_export(request):
     # A4 인쇄 설정 (가로 방향)
     setup_print_area(ws, num_rows=len(rows) + 1, num_cols=len(headers), landscape=True)
 
-    # 파일명 (한글 인코딩)
+    # 파일명 (한글 인코딩은 응답 쪽에서)
     _now_str = timezone.localtime(timezone.now()).strftime("%Y%m%d_%H%M%S")
     filename = f"LOT조회_{start_date}_{end_date}_{_now_str}.xlsx"
     filename_ascii = f"lot_inquiry_{start_date}_{end_date}.xlsx"
-    filename_encoded = quote(filename)
-    
-    response = HttpResponse(
-        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    )
-    response["Content-Disposition"] = f"attachment; filename=\"{filename_ascii}\"; filename*=UTF-8''{filename_encoded}"
-    wb.save(response)
-    return response
+
+    buffer = BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue(), filename, filename_ascii
 
 
 def history_clf3(request):
@@ -537,22 +560,17 @@ def history_trend(request):
     filters = _expand_cylinder_type_keys({"cylinder_type_key": cylinder_type_key}, cylinder_type_options)
     cylinder_type_keys = filters.get("cylinder_type_keys")
 
-    weekly_summary = HistoryRepository.get_period_summary(
-        period="week",
-        start_date=start_date,
-        end_date=end_date,
-        code_sets=move_code_sets,
-        cylinder_type_key=cylinder_type_key,
-        cylinder_type_keys=cylinder_type_keys,
-    )
-    monthly_summary = HistoryRepository.get_period_summary(
-        period="month",
+    # 일 단위로 한 번 집계해 주/월 버킷을 함께 만든다.
+    summaries = HistoryRepository.get_period_summaries(
+        periods=("week", "month"),
         start_date=start_date,
         end_date=end_date,
         code_sets=move_code_sets,
         cylinder_type_key=cylinder_type_key,
         cylinder_type_keys=cylinder_type_keys,
     )
+    weekly_summary = summaries["week"]
+    monthly_summary = summaries["month"]
 
     # 월간 점유율(%) 추이: 월별 마지막 스냅샷 기준 상태 그룹 총량
     occupancy_rows = HistoryRepository.get_period_end_occupancy_summary(
@@ -653,22 +671,17 @@ def history_trend_export(request):
     filters = _expand_cylinder_type_keys({"cylinder_type_key": cylinder_type_key}, cylinder_type_options)
     cylinder_type_keys = filters.get("cylinder_type_keys")
 
-    weekly_summary = HistoryRepository.get_period_summary(
-        period="week",
-        start_date=start_date,
-        end_date=end_date,
-        code_sets=move_code_sets,
-        cylinder_type_key=cylinder_type_key,
-        cylinder_type_keys=cylinder_type_keys,
-    )
-    monthly_summary = HistoryRepository.get_period_summary(
-        period="month",
+    # 일 단위로 한 번 집계해 주/월 버킷을 함께 만든다.
+    summaries = HistoryRepository.get_period_summaries(
+        periods=("week", "month"),
         start_date=start_date,
         end_date=end_date,
         code_sets=move_code_sets,
         cylinder_type_key=cylinder_type_key,
         cylinder_type_keys=cylinder_type_keys,
     )
+    weekly_summary = summaries["week"]
+    monthly_summary = summaries["month"]
     def _format_label(period: str, bucket):
         if not bucket:
             return ""
@@ -342,20 +342,20 @@ class InventoryService:
         # 용기별 최신 상태이력 1건(DISTINCT ON) → 창고입고('50')만 제품코드별 집계
         query = '''
             WITH latest AS (
-                SELECT DISTINCT ON (TRIM(h."CYLINDER_NO"))
-                    TRIM(h."CYLINDER_NO") AS cylinder_no,
+                SELECT DISTINCT ON (RTRIM(h."CYLINDER_NO"))
+                    RTRIM(h."CYLINDER_NO") AS cylinder_no,
                     TRIM(h."MOVE_CODE") AS move_code,
-                    TRIM(h."MOVE_REPORT_NO") AS move_report_no
+                    RTRIM(h."MOVE_REPORT_NO") AS move_report_no
                 FROM fcms_cdc.tr_cylinder_status_histories h
                 WHERE h."CYLINDER_NO" IS NOT NULL
-                ORDER BY TRIM(h."CYLINDER_NO"), h."HISTORY_SEQ" DESC
+                ORDER BY RTRIM(h."CYLINDER_NO"), h."HISTORY_SEQ" DESC
             )
             SELECT
                 COALESCE(NULLIF(TRIM(o."TRADE_CONDITION_CODE"), ''), 'UNKNOWN') AS trade_condition_code,
                 COUNT(*) AS cnt
             FROM latest l
             LEFT JOIN fcms_cdc.tr_orders o
-                ON TRIM(o."ARRIVAL_SHIPPING_NO") = l.move_report_no
+                ON RTRIM(o."ARRIVAL_SHIPPING_NO") = l.move_report_no
             WHERE l.move_code = '50'
             GROUP BY COALESCE(NULLIF(TRIM(o."TRADE_CONDITION_CODE"), ''), 'UNKNOWN')
             ORDER BY trade_condition_code
@@ -247,7 +247,7 @@ def _maintenance_context(request):
             cc.dashboard_cylinder_spec_name
         FROM latest lt
         LEFT JOIN cy_cylinder_current cc
-            ON TRIM(cc.cylinder_no) = TRIM(lt.cylinder_no)
+            ON RTRIM(cc.cylinder_no) = RTRIM(lt.cylinder_no)
         WHERE 1=1
     """
     params = []
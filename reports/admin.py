@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import ReportExportLog
+from .models import ReportArtifact, ReportExportLog
 
 
 @admin.register(ReportExportLog)
@@ -9,3 +9,12 @@ class ReportExportLogAdmin(admin.ModelAdmin):
     search_fields = ['file_path']
     date_hierarchy = 'exported_at'
     readonly_fields = ['exported_at']
+
+
+@admin.register(ReportArtifact)
+class ReportArtifactAdmin(admin.ModelAdmin):
+    list_display = ['report_type', 'period_start', 'period_end', 'generated_at', 'invalidation_count', 'invalidated_at']
+    list_filter = ['report_type']
+    date_hierarchy = 'period_start'
+    readonly_fields = ['generated_at', 'invalidated_at', 'invalidation_count']
+    exclude = ['payload_json']
@@ -0,0 +1,241 @@
+"""
+마감된 기간의 보고서 저장본 (ReportArtifact)
+
+지난 주/지난 달/지난 날짜의 보고서는 거의 바뀌지 않으므로, 처음 조회할 때 계산한
+화면 payload(JSON)와 Excel 파일을 저장해 두고 이후에는 그대로 읽는다.
+
+- 무효화: 기간 안의 MOVE_DATE를 가진 CDC 이력이 늦게 들어오거나 바뀌면
+  DB Trigger(sql/create_report_artifact_invalidation.sql)가 payload/파일 경로를 비우고
+  invalidation_count를 올린다. 다음 조회 때 다시 계산한다.
+  주간/월간 Excel은 일별 스냅샷 합계(hist_snapshot_daily_total)를 비교하므로 그 테이블 변경 시에도
+  같은 Trigger 파일의 스냅샷 Trigger가 xlsx_path를 비운다.
+- 계산 중 무효화가 일어나면 저장하지 않는다. (계산 전에 읽은 invalidation_count와 같을 때만 저장)
+- 저장본 행은 조회 시 만들지 않고 기간이 열려 있을 때 미리 만든다. (ensure_rows, build_report_artifacts)
+  행이 없을 때 커밋 전이던 CDC 이력은 Trigger가 무효화할 대상이 없어, 조회 시 행을 만들고 저장하면
+  그 이력이 빠진 결과가 남을 수 있기 때문이다. 행이 없는 기간은 저장 없이 계산만 한다.
+- 마감 후에 행을 만드는 채우기(build)는 계산 전후로 기간 이력의 건수/최대 HISTORY_SEQ를 다시 확인해
+  계산 중 커밋된 이력이 있으면 저장하지 않는다.
+- Trigger가 설치되지 않았거나 PostgreSQL이 아니면 저장본을 쓰지 않고 항상 계산한다.
+- 채우기: python manage.py build_report_artifacts
+"""
+import logging
+import os
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Optional, Tuple
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from reports.models import ReportArtifact
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_TRIGGER = 'trigger_report_artifact_invalidate_insert'
+
+_enabled: Optional[bool] = None
+
+
+def is_enabled() -> bool:
+    """무효화 Trigger 설치 여부 (프로세스당 1회 확인)"""
+    global _enabled
+    if _enabled is None:
+        if connection.vendor != 'postgresql':
+            _enabled = False
+        else:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT EXISTS (SELECT 1 FROM pg_trigger WHERE tgname = %s)", [INVALIDATION_TRIGGER])
+                _enabled = bool(cursor.fetchone()[0])
+    return _enabled
+
+
+def is_closed_period(end_date: date) -> bool:
+    """기간 마지막 날이 오늘 이전이면 마감된 기간"""
+    return end_date < timezone.localdate()
+
+
+def _encode(value: Any) -> Any:
+    """payload → JSON (날짜/시각/Decimal은 형식을 표시해 두고 읽을 때 되살린다)"""
+    if isinstance(value, dict):
+        return {k: _encode(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(v) for v in value]
+    if isinstance(value, datetime):
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, date):
+        return {'__date__': value.isoformat()}
+    if isinstance(value, Decimal):
+        return {'__decimal__': str(value)}
+    return value
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    if isinstance(value, dict):
+        if len(value) == 1:
+            if '__datetime__' in value:
+                return datetime.fromisoformat(value['__datetime__'])
+            if '__date__' in value:
+                return date.fromisoformat(value['__date__'])
+            if '__decimal__' in value:
+                return Decimal(value['__decimal__'])
+        return {k: _decode(v) for k, v in value.items()}
+    return value
+
+
+def _get_artifact(report_type: str, start_date: date, end_date: date) -> Optional[ReportArtifact]:
+    """미리 만들어 둔 저장본 행 (없으면 None - 조회 경로에서는 만들지 않는다)"""
+    return ReportArtifact.objects.filter(
+        report_type=report_type,
+        period_start=start_date,
+        period_end=end_date,
+    ).first()
+
+
+def ensure_rows(periods) -> int:
+    """
+    저장본 행 미리 만들기 (만든 행 수)
+
+    열린 기간(오늘/이번 주/이번 달 등)의 행을 미리 만들어 두면, 그 기간에 들어오는 CDC 이력마다
+    무효화 Trigger가 행을 잠그고 invalidation_count를 올리므로 마감 후 저장이 이력과 어긋나지 않는다.
+
+    Args:
+        periods: (report_type, 시작일, 종료일) 목록
+    """
+    created_count = 0
+    for report_type, start_date, end_date in periods:
+        _, created = ReportArtifact.objects.get_or_create(
+            report_type=report_type,
+            period_start=start_date,
+            period_end=end_date,
+        )
+        created_count += int(created)
+    return created_count
+
+
+def _period_fingerprint(start_date: date, end_date: date) -> Tuple[int, Any]:
+    """기간 안 MOVE_DATE 이력의 (건수, 최대 HISTORY_SEQ) - 계산 전후 비교용"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT COUNT(*), MAX("HISTORY_SEQ")
+            FROM "fcms_cdc"."tr_cylinder_status_histories"
+            WHERE "MOVE_DATE" >= %s AND "MOVE_DATE" < %s
+            """,
+            [start_date, end_date + timedelta(days=1)],
+        )
+        return tuple(cursor.fetchone())
+
+
+def _save_if_unchanged(artifact: ReportArtifact, **fields) -> bool:
+    """계산 중 무효화가 없었을 때만 저장"""
+    fields['generated_at'] = timezone.now()
+    updated = ReportArtifact.objects.filter(
+        pk=artifact.pk,
+        invalidation_count=artifact.invalidation_count,
+    ).update(**fields)
+    return updated == 1
+
+
+def get_payload(report_type: str, start_date: date, end_date: date, builder: Callable[[], dict]) -> dict:
+    """
+    마감된 기간이면 저장된 payload를 돌려주고, 없으면 builder() 결과를 저장 후 반환
+
+    열린 기간(오늘 포함)이거나 저장본을 쓸 수 없으면 항상 builder()를 호출한다.
+    builder()의 예외는 그대로 전달된다. (오류 결과를 저장하지 않음)
+    """
+    if not is_closed_period(end_date) or not is_enabled():
+        return builder()
+
+    artifact = _get_artifact(report_type, start_date, end_date)
+    if artifact is None:
+        return builder()
+    if artifact.payload_json is not None:
+        return _decode(artifact.payload_json)
+
+    payload = builder()
+    try:
+        _save_if_unchanged(artifact, payload_json=_encode(payload))
+    except Exception as e:
+        logger.warning(f"보고서 저장본 저장 실패 ({report_type} {start_date}~{end_date}): {e}")
+    return payload
+
+
+def _xlsx_file_path(report_type: str, start_date: date, end_date: date) -> str:
+    directory = getattr(settings, 'REPORT_ARTIFACT_DIR', os.path.join(str(settings.BASE_DIR), '.cache', 'reports'))
+    return os.path.join(str(directory), f"{report_type.lower()}_{start_date:%Y%m%d}_{end_date:%Y%m%d}.xlsx")
+
+
+def _write_file(path: str, content: bytes):
+    """다른 워커가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def get_xlsx(report_type: str, start_date: date, end_date: date, builder: Callable[[], bytes]) -> bytes:
+    """get_payload()의 Excel 버전 - 마감된 기간이면 저장된 파일을 읽는다."""
+    if not is_closed_period(end_date) or not is_enabled():
+        return builder()
+
+    artifact = _get_artifact(report_type, start_date, end_date)
+    if artifact is None:
+        return builder()
+    if artifact.xlsx_path:
+        try:
+            with open(artifact.xlsx_path, 'rb') as f:
+                return f.read()
+        except OSError:
+            # 파일이 지워졌으면 다시 만든다.
+            pass
+
+    content = builder()
+    try:
+        path = _xlsx_file_path(report_type, start_date, end_date)
+        _write_file(path, content)
+        _save_if_unchanged(artifact, xlsx_path=path)
+    except Exception as e:
+        logger.warning(f"보고서 Excel 저장 실패 ({report_type} {start_date}~{end_date}): {e}")
+    return content
+
+
+def build(report_type: str, start_date: date, end_date: date,
+          payload_builder: Optional[Callable[[], dict]] = None,
+          xlsx_builder: Optional[Callable[[], bytes]] = None,
+          force: bool = False) -> Tuple[bool, bool]:
+    """
+    저장본 채우기 (build_report_artifacts 명령용)
+
+    행이 없으면 만든 뒤 계산한다. 행을 만들기 전에 시작된 CDC 트랜잭션은 무효화 대상이 없었을 수 있으므로
+    계산 전후 기간 이력 지문(_period_fingerprint)이 다르면 저장하지 않는다. (다음 실행에서 다시 계산)
+
+    Args:
+        force: 저장본이 있어도 다시 계산
+
+    Returns:
+        (payload를 새로 저장했는지, Excel을 새로 저장했는지)
+    """
+    ensure_rows([(report_type, start_date, end_date)])
+    artifact = _get_artifact(report_type, start_date, end_date)
+    payload_built = False
+    xlsx_built = False
+
+    if payload_builder and (force or artifact.payload_json is None):
+        before = _period_fingerprint(start_date, end_date)
+        payload = _encode(payload_builder())
+        if _period_fingerprint(start_date, end_date) == before:
+            payload_built = _save_if_unchanged(artifact, payload_json=payload)
+
+    if xlsx_builder and (force or not artifact.xlsx_path or not os.path.exists(artifact.xlsx_path)):
+        before = _period_fingerprint(start_date, end_date)
+        content = xlsx_builder()
+        if _period_fingerprint(start_date, end_date) == before:
+            path = _xlsx_file_path(report_type, start_date, end_date)
+            _write_file(path, content)
+            xlsx_built = _save_if_unchanged(artifact, xlsx_path=path)
+
+    return payload_built, xlsx_built
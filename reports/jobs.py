@@ -0,0 +1,29 @@
+"""보고서 백그라운드 작업 핸들러 (core/jobs.py)"""
+from datetime import date
+
+from core.jobs import register
+from reports import payloads
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+
+@register('reports.weekly_excel')
+def weekly_excel(params):
+    start_date = date.fromisoformat(params['start_date'])
+    end_date = date.fromisoformat(params['end_date'])
+    return (
+        payloads.weekly_export_xlsx(start_date, end_date),
+        payloads.weekly_export_filename(start_date, end_date),
+        XLSX_CONTENT_TYPE,
+    )
+
+
+@register('reports.monthly_excel')
+def monthly_excel(params):
+    start_date = date.fromisoformat(params['start_date'])
+    end_date = date.fromisoformat(params['end_date'])
+    return (
+        payloads.monthly_export_xlsx(start_date, end_date),
+        payloads.monthly_export_filename(start_date),
+        XLSX_CONTENT_TYPE,
+    )
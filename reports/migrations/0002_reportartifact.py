@@ -0,0 +1,46 @@
+# Generated by Django 4.2.27 on 2026-10-17 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='reportexportlog',
+            name='report_type',
+            field=models.CharField(choices=[('DAILY', '일일'), ('WEEKLY', '주간'), ('MONTHLY', '월간'), ('HISTORY_EXPORT', '이력 내보내기')], db_index=True, max_length=20),
+        ),
+        migrations.CreateModel(
+            name='ReportArtifact',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('report_type', models.CharField(choices=[('DAILY', '일일'), ('WEEKLY', '주간'), ('MONTHLY', '월간'), ('HISTORY_EXPORT', '이력 내보내기')], max_length=20)),
+                ('period_start', models.DateField()),
+                ('period_end', models.DateField()),
+                ('payload_json', models.JSONField(blank=True, help_text='보고서 화면 데이터 (NULL이면 다시 계산)', null=True)),
+                ('xlsx_path', models.CharField(blank=True, help_text='Excel 파일 경로 (NULL이면 다시 생성)', max_length=500, null=True)),
+                ('invalidation_count', models.IntegerField(default=0)),
+                ('generated_at', models.DateTimeField(blank=True, null=True)),
+                ('invalidated_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': '보고서 저장본',
+                'verbose_name_plural': '보고서 저장본',
+                'db_table': 'report_artifact',
+                'ordering': ['-period_start', 'report_type'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='reportartifact',
+            constraint=models.UniqueConstraint(fields=('report_type', 'period_start', 'period_end'), name='uq_report_artifact_period'),
+        ),
+        migrations.AddIndex(
+            model_name='reportartifact',
+            index=models.Index(fields=['period_start', 'period_end'], name='idx_report_artifact_period'),
+        ),
+    ]
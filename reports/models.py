@@ -5,6 +5,7 @@ import json
 
 
 class ReportType(models.TextChoices):
+    DAILY = 'DAILY', '일일'
     WEEKLY = 'WEEKLY', '주간'
     MONTHLY = 'MONTHLY', '월간'
     HISTORY_EXPORT = 'HISTORY_EXPORT', '이력 내보내기'
@@ -38,3 +39,48 @@ class ReportExportLog(models.Model):
     
     def __str__(self):
         return f"{self.report_type} - {self.exported_at}"
+
+
+class ReportArtifact(models.Model):
+    """
+    마감된 기간의 보고서 계산 결과 (reports/artifacts.py)
+
+    화면 payload(JSON)와 Excel 파일 경로를 기간별로 저장한다.
+    기간 안에 늦게 들어온 CDC 이력이 있으면 DB Trigger가 두 값을 비우고 invalidation_count를 올린다.
+    (sql/create_report_artifact_invalidation.sql)
+    """
+    report_type = models.CharField(max_length=20, choices=ReportType.choices)
+    period_start = models.DateField()
+    period_end = models.DateField()
+    payload_json = models.JSONField(
+        null=True,
+        blank=True,
+        help_text="보고서 화면 데이터 (NULL이면 다시 계산)"
+    )
+    xlsx_path = models.CharField(
+        max_length=500,
+        blank=True,
+        null=True,
+        help_text="Excel 파일 경로 (NULL이면 다시 생성)"
+    )
+    invalidation_count = models.IntegerField(default=0)
+    generated_at = models.DateTimeField(null=True, blank=True)
+    invalidated_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'report_artifact'
+        verbose_name = '보고서 저장본'
+        verbose_name_plural = '보고서 저장본'
+        ordering = ['-period_start', 'report_type']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['report_type', 'period_start', 'period_end'],
+                name='uq_report_artifact_period',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['period_start', 'period_end'], name='idx_report_artifact_period'),
+        ]
+
+    def __str__(self):
+        return f"{self.report_type} {self.period_start} ~ {self.period_end}"
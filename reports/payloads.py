@@ -0,0 +1,223 @@
+"""
+보고서 화면 데이터/Excel 생성
+
+화면(reports/views.py)과 저장본 채우기(build_report_artifacts 명령)가 같은 결과를 만들도록
+기간별 payload와 Excel 내용을 여기서 만든다. 현재 재고처럼 기간과 무관한 값은 넣지 않는다.
+"""
+from datetime import date, timedelta
+from io import BytesIO
+from typing import Dict, List
+
+from openpyxl import Workbook
+from openpyxl.styles import Alignment, Font
+
+from core.repositories.cylinder_repository import CylinderRepository
+from core.repositories.report_repository import ReportRepository
+from history import snapshot_series
+from reports import artifacts
+from reports.models import ReportType
+
+
+def arrival_rows(movements: List[Dict], order_by_date: bool = True):
+    """이동 내역 중 입하(10) 행과 입하 요약 (기존 입하 쿼리와 같은 정렬)"""
+    arrivals = sorted(
+        (dict(m, item_code=m['item_name']) for m in movements if m['move_code'] == '10'),
+        key=lambda m: m['cylinder_no'],
+    )
+    if order_by_date:
+        arrivals.sort(key=lambda m: m['move_date'], reverse=True)
+    arrival_summary = {
+        'total': len(arrivals),
+        'expired': sum(1 for a in arrivals if a['is_expired']),
+        'expiring_soon': sum(1 for a in arrivals if a['is_expiring_soon']),
+    }
+    return arrivals, arrival_summary
+
+
+def weekly_payload(movements: List[Dict]) -> Dict:
+    """주간 보고서 화면 데이터 (ReportRepository.fetch_movements 결과 기준)"""
+    report = ReportRepository.summarize(movements)
+    arrival_details, arrival_summary = arrival_rows(movements)
+    total_movements = report['total']
+    return {
+        'movements': movements[:500],  # 최대 500건 표시
+        'move_summary': report['move_summary'],
+        'item_summary': report['item_summary'][:30],  # Top 30
+        'move_by_item': report['move_by_item'],
+        'move_detail_stats': report['move_detail_stats'],
+        'daily_summary': report['daily_summary'],
+        'total_movements': total_movements,
+        # 일평균 계산
+        'daily_avg': round(total_movements / 7, 1) if total_movements > 0 else 0,
+        'arrival_details': arrival_details,
+        'arrival_summary': arrival_summary,
+    }
+
+
+def build_weekly_payload(start_date: date, end_date: date) -> Dict:
+    return weekly_payload(ReportRepository.fetch_movements(start_date, end_date, order='date_desc'))
+
+
+def monthly_payload(groups: List[Dict]) -> Dict:
+    """월간 보고서 화면 데이터 (ReportRepository.fetch_movement_groups 결과 기준)"""
+    report = ReportRepository.summarize(groups)
+    arrival_total = sum(g['count'] for g in groups if g['move_code'] == '10')
+    return {
+        'move_summary': report['move_summary'],
+        'item_summary': report['gas_summary'][:20],
+        'total_movements': report['total'],
+        'arrival_summary': {'total': arrival_total, 'expired': 0, 'expiring_soon': 0},
+    }
+
+
+def build_monthly_payload(start_date: date, end_date: date) -> Dict:
+    # 상세 목록이 없으므로 DB에서 (일, 이동코드, 제품) 단위로 묶은 건수만 받는다.
+    return monthly_payload(ReportRepository.fetch_movement_groups(start_date, end_date))
+
+
+def daily_payload(movements: List[Dict]) -> Dict:
+    """일일 보고서 화면 데이터"""
+    report = ReportRepository.summarize(movements)
+    arrival_details, arrival_summary = arrival_rows(movements, order_by_date=False)
+    return {
+        'movements': movements,
+        'move_summary': report['move_summary'],
+        'total_movements': len(movements),
+        'arrival_details': arrival_details,
+        'arrival_summary': arrival_summary,
+        'item_summary': report['item_summary'],
+        'move_by_item': report['move_by_item'],
+        'move_detail_stats': report['move_detail_stats'],
+    }
+
+
+def build_daily_payload(report_date: date) -> Dict:
+    return daily_payload(ReportRepository.fetch_movements(report_date, report_date, order='code'))
+
+
+def snapshot_summary(snapshot_date: date) -> Dict[str, int]:
+    """해당 날짜 DAILY 스냅샷의 가스명_상태별 수량 (일별 스냅샷 집계 기준)"""
+    return {
+        f"{gas_name}_{status}": qty
+        for (gas_name, status), qty in snapshot_series.gas_status_totals(snapshot_date).items()
+    }
+
+
+def current_summary() -> Dict[str, int]:
+    """현재 인벤토리의 가스명_상태별 수량"""
+    summary: Dict[str, int] = {}
+    for row in CylinderRepository.get_inventory_summary():
+        key = f"{row.get('gas_name')}_{row.get('status')}"
+        summary[key] = row.get('qty', 0)
+    return summary
+
+
+def comparison_xlsx(sheet_title: str, headers: List[str], before: Dict[str, int], after: Dict[str, int]) -> bytes:
+    """두 시점의 가스명/상태별 수량 비교 Excel (변동 큰 순)"""
+    # 비교 데이터 생성
+    comparison_data = []
+    for key in set(before.keys()) | set(after.keys()):
+        gas_name, status = key.rsplit('_', 1)
+        before_qty = before.get(key, 0)
+        after_qty = after.get(key, 0)
+        comparison_data.append({
+            'gas_name': gas_name,
+            'status': status,
+            'before_qty': before_qty,
+            'after_qty': after_qty,
+            'delta': after_qty - before_qty,
+        })
+
+    comparison_data.sort(key=lambda x: abs(x['delta']), reverse=True)
+
+    # 엑셀 생성
+    wb = Workbook()
+    ws = wb.active
+    ws.title = sheet_title
+    ws.append(headers)
+
+    # 헤더 스타일
+    for cell in ws[1]:
+        cell.font = Font(bold=True)
+        cell.alignment = Alignment(horizontal='center')
+
+    # 데이터
+    for item in comparison_data:
+        ws.append([
+            item['gas_name'],
+            item['status'],
+            item['before_qty'],
+            item['after_qty'],
+            item['delta'],
+        ])
+
+    buffer = BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+def build_weekly_xlsx(start_date: date, end_date: date) -> bytes:
+    """마감된 주: 주 시작일 스냅샷 대비 주 마지막 날 스냅샷"""
+    return comparison_xlsx(
+        "주간 보고서",
+        ['가스명', '상태', '주 시작', '주 말', '변동'],
+        snapshot_summary(start_date),
+        snapshot_summary(end_date),
+    )
+
+
+def build_monthly_xlsx(start_date: date, end_date: date) -> bytes:
+    """마감된 달: 지난 달 말일 스냅샷 대비 그 달 말일 스냅샷"""
+    return comparison_xlsx(
+        "월간 보고서",
+        ['가스명', '상태', '지난 달 말', '이번 달 말', '변동'],
+        snapshot_summary(start_date - timedelta(days=1)),
+        snapshot_summary(end_date),
+    )
+
+
+def weekly_export_xlsx(start_date: date, end_date: date) -> bytes:
+    """
+    주간 보고서 다운로드 Excel
+
+    마감된 주는 주 시작/말 스냅샷 비교(저장본 사용), 그 외에는 start_date 스냅샷 대비 현재.
+    (export_weekly_excel은 진행 중인 주를 최근 7일 = 7일 전 스냅샷 대비 현재로 넘긴다.)
+    """
+    if artifacts.is_closed_period(end_date):
+        return artifacts.get_xlsx(
+            ReportType.WEEKLY, start_date, end_date,
+            lambda: build_weekly_xlsx(start_date, end_date),
+        )
+    return comparison_xlsx(
+        "주간 보고서",
+        ['가스명', '상태', '1주 전', '현재', '변동'],
+        snapshot_summary(start_date),
+        current_summary(),
+    )
+
+
+def monthly_export_xlsx(start_date: date, end_date: date) -> bytes:
+    """
+    월간 보고서 다운로드 Excel
+
+    마감된 달은 지난 달 말일 대비 그 달 말일 스냅샷(저장본 사용), 이번 달은 지난 달 말일 대비 현재.
+    """
+    if artifacts.is_closed_period(end_date):
+        return artifacts.get_xlsx(
+            ReportType.MONTHLY, start_date, end_date,
+            lambda: build_monthly_xlsx(start_date, end_date),
+        )
+    return comparison_xlsx(
+        "월간 보고서",
+        ['가스명', '상태', '지난 달 말', '현재', '변동'],
+        snapshot_summary(start_date - timedelta(days=1)),
+        current_summary(),
+    )
+
+
+def weekly_export_filename(start_date: date, end_date: date) -> str:
+    return f"cynow_weekly_report_{start_date}_{end_date}.xlsx"
+
+
+def monthly_export_filename(start_date: date) -> str:
+    return f"cynow_monthly_report_{start_date.strftime('%Y%m')}.xlsx"
@@ -1,19 +1,31 @@
 from django.shortcuts import render
 from django.http import HttpResponse
 from django.utils import timezone
-from django.db import connection
 from datetime import timedelta, datetime
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment
 from core.repositories.cylinder_repository import CylinderRepository
-from history.models import HistInventorySnapshot
+from core.repositories.report_repository import ReportRepository, clean_spec
+from core import jobs
+from reports import artifacts, payloads
+from reports.models import ReportType
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-def weekly_report(request):
-    """주간 보고서 - 일일보고서 수준의 상세 정보"""
+def _status_summary():
+    """현재 인벤토리 상태별 수량과 전체 수량"""
+    status_summary = {}
+    total_cylinders = 0
+    for row in CylinderRepository.get_inventory_summary():
+        status = row.get('status', '기타')
+        qty = row.get('qty', 0)
+        status_summary[status] = status_summary.get(status, 0) + qty
+        total_cylinders += qty
+    return status_summary, total_cylinders
+
+
+def _get_week_range(request):
+    """weeks_ago/date 파라미터로 주(월~일) 범위 계산 → (start_date, end_date, weeks_ago)"""
     # 주차 파라미터 (0=이번주, 1=지난주, 2=지지난주...)
     weeks_ago = request.GET.get('weeks_ago', '0')
     try:
@@ -43,319 +55,56 @@ def weekly_report(request):
         # weeks_ago 만큼 이전 주로 이동
         end_date = this_week_end - timedelta(weeks=weeks_ago)
         start_date = end_date - timedelta(days=6)
+    return start_date, end_date, weeks_ago
+
+
+def _get_month_range(request):
+    """month=YYYY-MM 파라미터로 월 범위 계산 (기본: 이번 달 1일 ~ 오늘)"""
+    today = timezone.now().date()
+    month_str = request.GET.get('month')
+    if month_str:
+        try:
+            start_date = datetime.strptime(month_str, '%Y-%m').date()
+        except ValueError:
+            start_date = today.replace(day=1)
+    else:
+        start_date = today.replace(day=1)  # 이번 달 1일
+    next_month = (start_date + timedelta(days=32)).replace(day=1)
+    end_date = min(today, next_month - timedelta(days=1))
+    return start_date, end_date
+
+
+def _xlsx_response(content, filename):
+    response = HttpResponse(
+        content,
+        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def weekly_report(request):
+    """주간 보고서 - 일일보고서 수준의 상세 정보 (지난 주는 저장본 사용)"""
+    start_date, end_date, weeks_ago = _get_week_range(request)
     
-    # MOVE_CODE 라벨 매핑
-    move_code_labels = {
-        '00': '신규구매', '01': '신규등록', '10': '입하', '14': '회수완료',
-        '16': '회수없음', '17': '재보관', '19': '이상처리', '21': '충전선택', '22': '충전완료',
-        '30': '창고출고', '31': '외부충전', '41': '분석중', '42': '분석완료',
-        '50': '창고입고', '51': '수주연결', '52': '연결해제', '60': '출하',
-        '65': '영업외출하', '70': '반품', '85': '전출', '86': '전입', '99': '폐기',
-    }
-    
-    movements = []
-    move_summary = {}
-    item_summary = {}
-    move_by_item = {}  # 이동유형+제품명별 집계
-    move_detail_stats = {}  # 이동유형별 상세 통계
-    arrival_details = []
-    arrival_summary = {'total': 0, 'expired': 0, 'expiring_soon': 0}
-    daily_summary = {}  # 일별 집계
-    
-    # 스펙에서 제거할 문자열들
-    remove_patterns = ['general Y', 'HAMAI', 'NERIKI', 'SHOT-Y In-screw']
-    
-    def clean_spec(spec):
-        """스펙에서 불필요한 문자열 제거"""
-        if not spec:
-            return ''
-        result = spec
-        for pattern in remove_patterns:
-            result = result.replace(pattern, '')
-        result = ' '.join(result.split())
-        return result.strip()
-    
+    # 주간 이동 내역 (입하 상세도 같은 행에서 추린다)
     try:
-        with connection.cursor() as cursor:
-            # 주간 이동 내역 상세 조회 (일일보고서와 동일한 쿼리)
-            cursor.execute('''
-                SELECT 
-                    h."CYLINDER_NO",
-                    h."MOVE_CODE",
-                    h."MOVE_DATE",
-                    h."MOVE_REPORT_NO",
-                    h."SUPPLIER_USER_NAME",
-                    h."CUSTOMER_USER_NAME",
-                    h."POSITION_USER_NAME",
-                    h."REMARKS",
-                    CONCAT(
-                        COALESCE(h."FILLING_LOT_HEADER", ''),
-                        COALESCE(h."FILLING_LOT_NO", ''),
-                        CASE WHEN h."FILLING_LOT_BRANCH" IS NOT NULL AND h."FILLING_LOT_BRANCH" != '' 
-                             THEN '-' || h."FILLING_LOT_BRANCH" 
-                             ELSE '' 
-                        END
-                    ) as filling_lot,
-                    COALESCE(i."DISPLAY_NAME", i."FORMAL_NAME", c."ITEM_CODE", '미분류') as gas_name,
-                    COALESCE(c."CAPACITY", 0) as capacity,
-                    COALESCE(vs."NAME", '') as valve_spec,
-                    COALESCE(cs."NAME", '') as cylinder_spec,
-                    COALESCE(cc.dashboard_enduser, '') as enduser,
-                    c."WITHSTAND_PRESSURE_MAINTE_DATE",
-                    c."WITHSTAND_PRESSURE_TEST_TERM"
-                FROM fcms_cdc.tr_cylinder_status_histories h
-                LEFT JOIN fcms_cdc.ma_cylinders c ON TRIM(h."CYLINDER_NO") = TRIM(c."CYLINDER_NO")
-                LEFT JOIN fcms_cdc.ma_items i ON TRIM(c."ITEM_CODE") = TRIM(i."ITEM_CODE")
-                LEFT JOIN fcms_cdc.ma_valve_specs vs ON c."VALVE_SPEC_CODE" = vs."VALVE_SPEC_CODE"
-                LEFT JOIN fcms_cdc.ma_cylinder_specs cs ON c."CYLINDER_SPEC_CODE" = cs."CYLINDER_SPEC_CODE"
-                LEFT JOIN public.cy_cylinder_current cc ON TRIM(h."CYLINDER_NO") = TRIM(cc.cylinder_no)
-                WHERE DATE(h."MOVE_DATE") BETWEEN %s AND %s
-                ORDER BY h."MOVE_DATE" DESC, h."MOVE_CODE", i."DISPLAY_NAME", h."CYLINDER_NO"
-            ''', [start_date, end_date])
-            
-            today = end_date
-            
-            for row in cursor.fetchall():
-                move_code = row[1].strip() if row[1] else ''
-                move_label = move_code_labels.get(move_code, move_code)
-                move_date = row[2]
-                gas_name = row[9].strip() if row[9] else '미분류'
-                capacity = row[10] or 0
-                valve_spec = clean_spec(row[11].strip() if row[11] else '')
-                cylinder_spec = clean_spec(row[12].strip() if row[12] else '')
-                enduser = row[13].strip() if row[13] else ''
-                pressure_test_date = row[14]
-                pressure_test_term = row[15] or 0
-                
-                # 제품명: 가스명/용량/밸브/용기/EndUser 형식
-                item_name_parts = [gas_name]
-                if capacity:
-                    item_name_parts.append(f"{int(capacity)}L")
-                if valve_spec:
-                    item_name_parts.append(valve_spec)
-                if cylinder_spec:
-                    item_name_parts.append(cylinder_spec)
-                if enduser:
-                    item_name_parts.append(enduser)
-                item_name = ' / '.join(item_name_parts)
-                
-                # 내압만료 계산
-                is_expired = False
-                is_expiring_soon = False
-                if pressure_test_date and pressure_test_term:
-                    expiry_date = pressure_test_date + timedelta(days=pressure_test_term * 365)
-                    expiry_date_only = expiry_date.date() if hasattr(expiry_date, 'date') else expiry_date
-                    if expiry_date_only < today:
-                        is_expired = True
-                    elif expiry_date_only < today + timedelta(days=90):
-                        is_expiring_soon = True
-                
-                movements.append({
-                    'cylinder_no': row[0].strip() if row[0] else '',
-                    'move_code': move_code,
-                    'move_label': move_label,
-                    'move_date': move_date,
-                    'move_report_no': row[3].strip() if row[3] else '',
-                    'supplier': row[4].strip() if row[4] else '',
-                    'customer': row[5].strip() if row[5] else '',
-                    'item_code': gas_name,
-                    'capacity': capacity,
-                    'item_name': item_name,
-                    'is_expired': is_expired,
-                    'is_expiring_soon': is_expiring_soon,
-                })
-                
-                # 이동유형별 요약 집계
-                if move_label not in move_summary:
-                    move_summary[move_label] = {'code': move_code, 'count': 0}
-                move_summary[move_label]['count'] += 1
-                
-                # 제품명별 집계
-                if item_name not in item_summary:
-                    item_summary[item_name] = {'count': 0, 'capacity': capacity}
-                item_summary[item_name]['count'] += 1
-                
-                # 이동유형+제품명별 집계
-                key = f"{move_code}_{item_name}"
-                if key not in move_by_item:
-                    move_by_item[key] = {'move_code': move_code, 'move_label': move_label, 'item_name': item_name, 'count': 0, 'expired': 0, 'expiring_soon': 0}
-                move_by_item[key]['count'] += 1
-                if is_expired:
-                    move_by_item[key]['expired'] += 1
-                if is_expiring_soon:
-                    move_by_item[key]['expiring_soon'] += 1
-                
-                # 이동유형별 상세 통계
-                if move_code not in move_detail_stats:
-                    move_detail_stats[move_code] = {'label': move_label, 'total': 0, 'expired': 0, 'expiring_soon': 0, 'by_item': {}}
-                move_detail_stats[move_code]['total'] += 1
-                if is_expired:
-                    move_detail_stats[move_code]['expired'] += 1
-                if is_expiring_soon:
-                    move_detail_stats[move_code]['expiring_soon'] += 1
-                if item_name not in move_detail_stats[move_code]['by_item']:
-                    move_detail_stats[move_code]['by_item'][item_name] = {'count': 0, 'expired': 0}
-                move_detail_stats[move_code]['by_item'][item_name]['count'] += 1
-                if is_expired:
-                    move_detail_stats[move_code]['by_item'][item_name]['expired'] += 1
-                
-                # 일별 집계
-                if move_date:
-                    date_key = move_date.date() if hasattr(move_date, 'date') else move_date
-                    if date_key not in daily_summary:
-                        daily_summary[date_key] = {'total': 0, 'by_move_code': {}}
-                    daily_summary[date_key]['total'] += 1
-                    if move_label not in daily_summary[date_key]['by_move_code']:
-                        daily_summary[date_key]['by_move_code'][move_label] = 0
-                    daily_summary[date_key]['by_move_code'][move_label] += 1
-            
-            # 입하(10) 용기 상세 정보 조회
-            cursor.execute('''
-                SELECT 
-                    h."CYLINDER_NO",
-                    h."MOVE_DATE",
-                    h."SUPPLIER_USER_NAME",
-                    h."CUSTOMER_USER_NAME",
-                    COALESCE(i."DISPLAY_NAME", i."FORMAL_NAME", c."ITEM_CODE", '미분류') as gas_name,
-                    c."CAPACITY",
-                    COALESCE(vs."NAME", '') as valve_spec,
-                    COALESCE(cs."NAME", '') as cylinder_spec,
-                    COALESCE(cc.dashboard_enduser, '') as enduser,
-                    c."WITHSTAND_PRESSURE_MAINTE_DATE",
-                    c."WITHSTAND_PRESSURE_TEST_TERM",
-                    CASE 
-                        WHEN c."WITHSTAND_PRESSURE_MAINTE_DATE" IS NULL THEN NULL
-                        WHEN c."WITHSTAND_PRESSURE_TEST_TERM" IS NULL THEN NULL
-                        ELSE c."WITHSTAND_PRESSURE_MAINTE_DATE" + (c."WITHSTAND_PRESSURE_TEST_TERM" * INTERVAL '1 year')
-                    END as pressure_expiry_date
-                FROM fcms_cdc.tr_cylinder_status_histories h
-                LEFT JOIN fcms_cdc.ma_cylinders c ON TRIM(h."CYLINDER_NO") = TRIM(c."CYLINDER_NO")
-                LEFT JOIN fcms_cdc.ma_items i ON TRIM(c."ITEM_CODE") = TRIM(i."ITEM_CODE")
-                LEFT JOIN fcms_cdc.ma_valve_specs vs ON c."VALVE_SPEC_CODE" = vs."VALVE_SPEC_CODE"
-                LEFT JOIN fcms_cdc.ma_cylinder_specs cs ON c."CYLINDER_SPEC_CODE" = cs."CYLINDER_SPEC_CODE"
-                LEFT JOIN public.cy_cylinder_current cc ON TRIM(h."CYLINDER_NO") = TRIM(cc.cylinder_no)
-                WHERE DATE(h."MOVE_DATE") BETWEEN %s AND %s
-                  AND h."MOVE_CODE" = '10'
-                ORDER BY h."MOVE_DATE" DESC, h."CYLINDER_NO"
-            ''', [start_date, end_date])
-            
-            for row in cursor.fetchall():
-                expiry_date = row[11]
-                is_expired = False
-                is_expiring_soon = False
-                
-                if expiry_date:
-                    expiry_date_only = expiry_date.date() if hasattr(expiry_date, 'date') else expiry_date
-                    if expiry_date_only < today:
-                        is_expired = True
-                        arrival_summary['expired'] += 1
-                    elif expiry_date_only < today + timedelta(days=90):
-                        is_expiring_soon = True
-                        arrival_summary['expiring_soon'] += 1
-                
-                gas_name = row[4].strip() if row[4] else '미분류'
-                capacity = row[5] or 0
-                valve_spec = clean_spec(row[6].strip() if row[6] else '')
-                cylinder_spec = clean_spec(row[7].strip() if row[7] else '')
-                enduser = row[8].strip() if row[8] else ''
-                
-                item_name_parts = [gas_name]
-                if capacity:
-                    item_name_parts.append(f"{int(capacity)}L")
-                if valve_spec:
-                    item_name_parts.append(valve_spec)
-                if cylinder_spec:
-                    item_name_parts.append(cylinder_spec)
-                if enduser:
-                    item_name_parts.append(enduser)
-                item_name = ' / '.join(item_name_parts)
-                
-                arrival_summary['total'] += 1
-                arrival_details.append({
-                    'cylinder_no': row[0].strip() if row[0] else '',
-                    'move_date': row[1],
-                    'supplier': row[2].strip() if row[2] else '',
-                    'customer': row[3].strip() if row[3] else '',
-                    'item_code': item_name,
-                    'capacity': capacity,
-                    'pressure_expiry_date': expiry_date,
-                    'is_expired': is_expired,
-                    'is_expiring_soon': is_expiring_soon,
-                })
-    
+        report = artifacts.get_payload(
+            ReportType.WEEKLY, start_date, end_date,
+            lambda: payloads.build_weekly_payload(start_date, end_date),
+        )
     except Exception as e:
         logger.error(f"주간 보고서 조회 오류: {e}")
-    
-    # 정렬
-    summary_list = [
-        {'label': k, 'code': v['code'], 'count': v['count']}
-        for k, v in sorted(move_summary.items(), key=lambda x: -x[1]['count'])
-    ]
-    
-    item_summary_list = [
-        {'item_name': k, 'count': v['count'], 'capacity': v['capacity']}
-        for k, v in sorted(item_summary.items(), key=lambda x: -x[1]['count'])
-    ][:30]  # Top 30
-    
-    # 이동유형+제품명별 집계 정렬
-    move_by_item_list = sorted(
-        move_by_item.values(),
-        key=lambda x: (x['move_code'], -x['count'])
-    )
-    
-    # 이동유형별 상세 통계 정렬
-    move_detail_stats_list = []
-    for code, stats in sorted(move_detail_stats.items()):
-        by_item_list = [
-            {'item_name': k, 'count': v['count'], 'expired': v['expired']}
-            for k, v in sorted(stats['by_item'].items(), key=lambda x: -x[1]['count'])
-        ]
-        move_detail_stats_list.append({
-            'code': code,
-            'label': stats['label'],
-            'total': stats['total'],
-            'expired': stats['expired'],
-            'expiring_soon': stats['expiring_soon'],
-            'by_item': by_item_list,
-        })
-    
-    # 일별 집계 정렬
-    daily_summary_list = [
-        {'date': k, 'total': v['total'], 'by_move_code': v['by_move_code']}
-        for k, v in sorted(daily_summary.items(), reverse=True)
-    ]
-    
-    total_movements = len(movements)
+        report = payloads.weekly_payload([])
     
     # 현재 인벤토리 상태
-    current_inventory = CylinderRepository.get_inventory_summary()
-    status_summary = {}
-    total_cylinders = 0
-    for row in current_inventory:
-        status = row.get('status', '기타')
-        qty = row.get('qty', 0)
-        if status not in status_summary:
-            status_summary[status] = 0
-        status_summary[status] += qty
-        total_cylinders += qty
-    
-    # 일평균 계산
-    daily_avg = round(total_movements / 7, 1) if total_movements > 0 else 0
+    status_summary, total_cylinders = _status_summary()
     
     context = {
+        **report,
         'start_date': start_date,
         'end_date': end_date,
         'report_type': '주간',
-        'movements': movements[:500],  # 최대 500건 표시
-        'move_summary': summary_list,
-        'item_summary': item_summary_list,
-        'move_by_item': move_by_item_list,
-        'move_detail_stats': move_detail_stats_list,
-        'daily_summary': daily_summary_list,
-        'total_movements': total_movements,
-        'daily_avg': daily_avg,
-        'arrival_details': arrival_details,
-        'arrival_summary': arrival_summary,
         'status_summary': status_summary,
         'total_cylinders': total_cylinders,
         'generated_at': timezone.now(),
@@ -369,256 +118,87 @@ def weekly_report(request):
 
 
 def monthly_report(request):
-    """월간 보고서 - 일일보고서 스타일"""
-    # 이번 달 데이터
-    today = timezone.now().date()
-    start_date = today.replace(day=1)  # 이번 달 1일
-    end_date = today
-    
-    # MOVE_CODE 라벨 매핑
-    move_code_labels = {
-        '00': '신규구매', '01': '신규등록', '10': '입하', '14': '회수완료',
-        '16': '회수없음', '17': '재보관', '19': '이상처리', '21': '충전선택', '22': '충전완료',
-        '30': '창고출고', '31': '외부충전', '41': '분석중', '42': '분석완료',
-        '50': '창고입고', '51': '수주연결', '52': '연결해제', '60': '출하',
-        '65': '영업외출하', '70': '반품', '85': '전출', '86': '전입', '99': '폐기',
-    }
-    
-    move_summary = {}
-    item_summary = {}
-    arrival_summary = {'total': 0, 'expired': 0, 'expiring_soon': 0}
+    """월간 보고서 - 일일보고서 스타일 (month=YYYY-MM, 지난 달은 저장본 사용)"""
+    start_date, end_date = _get_month_range(request)
     
     try:
-        with connection.cursor() as cursor:
-            # 월간 이동 내역 집계
-            cursor.execute('''
-                SELECT 
-                    h."MOVE_CODE",
-                    COALESCE(i."DISPLAY_NAME", i."FORMAL_NAME", c."ITEM_CODE", '미분류') as gas_name,
-                    COUNT(*) as cnt
-                FROM fcms_cdc.tr_cylinder_status_histories h
-                LEFT JOIN fcms_cdc.ma_cylinders c ON TRIM(h."CYLINDER_NO") = TRIM(c."CYLINDER_NO")
-                LEFT JOIN fcms_cdc.ma_items i ON TRIM(c."ITEM_CODE") = TRIM(i."ITEM_CODE")
-                WHERE DATE(h."MOVE_DATE") BETWEEN %s AND %s
-                GROUP BY h."MOVE_CODE", gas_name
-                ORDER BY h."MOVE_CODE", cnt DESC
-            ''', [start_date, end_date])
-            
-            for row in cursor.fetchall():
-                move_code = row[0].strip() if row[0] else ''
-                gas_name = row[1].strip() if row[1] else '미분류'
-                count = row[2]
-                move_label = move_code_labels.get(move_code, move_code)
-                
-                # 이동유형별 집계
-                if move_label not in move_summary:
-                    move_summary[move_label] = {'code': move_code, 'count': 0}
-                move_summary[move_label]['count'] += count
-                
-                # 제품명별 집계
-                if gas_name not in item_summary:
-                    item_summary[gas_name] = 0
-                item_summary[gas_name] += count
-            
-            # 입하 통계
-            cursor.execute('''
-                SELECT COUNT(*) FROM fcms_cdc.tr_cylinder_status_histories
-                WHERE DATE("MOVE_DATE") BETWEEN %s AND %s AND "MOVE_CODE" = '10'
-            ''', [start_date, end_date])
-            arrival_summary['total'] = cursor.fetchone()[0] or 0
-    
+        report = artifacts.get_payload(
+            ReportType.MONTHLY, start_date, end_date,
+            lambda: payloads.build_monthly_payload(start_date, end_date),
+        )
     except Exception as e:
         logger.error(f"월간 보고서 조회 오류: {e}")
+        report = payloads.monthly_payload([])
     
-    # 정렬
-    summary_list = [
-        {'label': k, 'code': v['code'], 'count': v['count']}
-        for k, v in sorted(move_summary.items(), key=lambda x: -x[1]['count'])
-    ]
-    
-    item_summary_list = [
-        {'item_name': k, 'count': v}
-        for k, v in sorted(item_summary.items(), key=lambda x: -x[1])
-    ][:20]
-    
-    total_movements = sum(v['count'] for v in move_summary.values())
+    prev_month = (start_date - timedelta(days=1)).replace(day=1)
+    next_month = (start_date + timedelta(days=32)).replace(day=1)
+    is_current_month = next_month > timezone.now().date()
     
     context = {
+        **report,
         'start_date': start_date,
         'end_date': end_date,
         'report_type': '월간',
         'report_month': start_date.strftime('%Y년 %m월'),
-        'move_summary': summary_list,
-        'item_summary': item_summary_list,
-        'total_movements': total_movements,
-        'arrival_summary': arrival_summary,
+        'month': start_date.strftime('%Y-%m'),
+        'prev_month': prev_month.strftime('%Y-%m'),
+        'next_month': None if is_current_month else next_month.strftime('%Y-%m'),
+        'is_current_month': is_current_month,
         'generated_at': timezone.now(),
     }
     return render(request, 'reports/monthly.html', context)
 
 
 def export_weekly_excel(request):
-    """주간 보고서 Excel 다운로드"""
-    # 최근 7일 데이터
-    end_date = timezone.now().date()
-    start_date = end_date - timedelta(days=7)
-    
-    # 현재 인벤토리
-    current_inventory = CylinderRepository.get_inventory_summary()
-    
-    # 일주일 전 스냅샷
-    week_ago_snapshots = HistInventorySnapshot.objects.filter(
-        snapshot_datetime__date=start_date,
-        snapshot_type='DAILY'
-    )
-    
-    # 현재와 비교를 위한 집계
-    current_summary = {}
-    week_ago_summary = {}
-    
-    for row in current_inventory:
-        key = f"{row.get('gas_name')}_{row.get('status')}"
-        current_summary[key] = row.get('qty', 0)
-    
-    for snapshot in week_ago_snapshots:
-        key = f"{snapshot.gas_name}_{snapshot.status}"
-        week_ago_summary[key] = week_ago_summary.get(key, 0) + snapshot.qty
-    
-    # 비교 데이터 생성
-    comparison_data = []
-    all_keys = set(current_summary.keys()) | set(week_ago_summary.keys())
-    for key in all_keys:
-        gas_name, status = key.rsplit('_', 1)
-        current_qty = current_summary.get(key, 0)
-        week_ago_qty = week_ago_summary.get(key, 0)
-        delta = current_qty - week_ago_qty
-        comparison_data.append({
-            'gas_name': gas_name,
-            'status': status,
-            'current_qty': current_qty,
-            'week_ago_qty': week_ago_qty,
-            'delta': delta,
-        })
-    
-    comparison_data.sort(key=lambda x: abs(x['delta']), reverse=True)
-    
-    # 엑셀 생성
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "주간 보고서"
-    
-    # 헤더
-    headers = ['가스명', '상태', '1주 전', '현재', '변동']
-    ws.append(headers)
-    
-    # 헤더 스타일
-    for cell in ws[1]:
-        cell.font = Font(bold=True)
-        cell.alignment = Alignment(horizontal='center')
-    
-    # 데이터
-    for item in comparison_data:
-        ws.append([
-            item['gas_name'],
-            item['status'],
-            item['week_ago_qty'],
-            item['current_qty'],
-            item['delta'],
-        ])
-    
-    # 응답 생성
-    response = HttpResponse(
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    )
-    response['Content-Disposition'] = f'attachment; filename="cynow_weekly_report_{start_date}_{end_date}.xlsx"'
-    wb.save(response)
-    
-    return response
+    """
+    주간 보고서 Excel 다운로드
+    
+    - 파라미터 없음 / 진행 중인 주: 기존과 같이 최근 7일 (7일 전 스냅샷 대비 현재)
+    - weeks_ago/date가 마감된 주: 주 시작/말 스냅샷을 비교하며 저장된 파일을 사용한다.
+    - 백그라운드 작업이 켜져 있으면 run_jobs 워커가 생성한다.
+    """
+    start_date = end_date = None
+    if 'weeks_ago' in request.GET or 'date' in request.GET:
+        start_date, end_date, _ = _get_week_range(request)
+    if end_date is None or not artifacts.is_closed_period(end_date):
+        # 최근 7일 데이터
+        end_date = timezone.now().date()
+        start_date = end_date - timedelta(days=7)
+    
+    if jobs.is_enabled():
+        return jobs.enqueue_response(
+            request, 'reports.weekly_excel',
+            {'start_date': start_date.isoformat(), 'end_date': end_date.isoformat()},
+            label=f"주간 보고서 Excel ({start_date} ~ {end_date})",
+        )
+    
+    content = payloads.weekly_export_xlsx(start_date, end_date)
+    return _xlsx_response(content, payloads.weekly_export_filename(start_date, end_date))
 
 
 def export_monthly_excel(request):
-    """월간 보고서 Excel 다운로드"""
-    # 이번 달 데이터
-    today = timezone.now().date()
-    start_date = today.replace(day=1)  # 이번 달 1일
-    end_date = today
-    
-    # 현재 인벤토리
-    current_inventory = CylinderRepository.get_inventory_summary()
-    
-    # 지난 달 말일 스냅샷
-    last_month_end = (start_date - timedelta(days=1))
-    last_month_snapshots = HistInventorySnapshot.objects.filter(
-        snapshot_datetime__date=last_month_end,
-        snapshot_type='DAILY'
-    )
-    
-    # 현재와 비교를 위한 집계
-    current_summary = {}
-    last_month_summary = {}
-    
-    for row in current_inventory:
-        key = f"{row.get('gas_name')}_{row.get('status')}"
-        current_summary[key] = row.get('qty', 0)
-    
-    for snapshot in last_month_snapshots:
-        key = f"{snapshot.gas_name}_{snapshot.status}"
-        last_month_summary[key] = last_month_summary.get(key, 0) + snapshot.qty
-    
-    # 비교 데이터 생성
-    comparison_data = []
-    all_keys = set(current_summary.keys()) | set(last_month_summary.keys())
-    for key in all_keys:
-        gas_name, status = key.rsplit('_', 1)
-        current_qty = current_summary.get(key, 0)
-        last_month_qty = last_month_summary.get(key, 0)
-        delta = current_qty - last_month_qty
-        comparison_data.append({
-            'gas_name': gas_name,
-            'status': status,
-            'current_qty': current_qty,
-            'last_month_qty': last_month_qty,
-            'delta': delta,
-        })
-    
-    comparison_data.sort(key=lambda x: abs(x['delta']), reverse=True)
-    
-    # 엑셀 생성
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "월간 보고서"
-    
-    # 헤더
-    headers = ['가스명', '상태', '지난 달 말', '현재', '변동']
-    ws.append(headers)
-    
-    # 헤더 스타일
-    for cell in ws[1]:
-        cell.font = Font(bold=True)
-        cell.alignment = Alignment(horizontal='center')
-    
-    # 데이터
-    for item in comparison_data:
-        ws.append([
-            item['gas_name'],
-            item['status'],
-            item['last_month_qty'],
-            item['current_qty'],
-            item['delta'],
-        ])
-    
-    # 응답 생성
-    response = HttpResponse(
-        content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-    )
-    response['Content-Disposition'] = f'attachment; filename="cynow_monthly_report_{start_date.strftime("%Y%m")}.xlsx"'
-    wb.save(response)
-    
-    return response
+    """
+    월간 보고서 Excel 다운로드 (month=YYYY-MM)
+    
+    - 이번 달: 지난 달 말일 스냅샷 대비 현재
+    - 마감된 달: 지난 달 말일 대비 그 달 말일 스냅샷, 저장된 파일을 사용한다.
+    - 백그라운드 작업이 켜져 있으면 run_jobs 워커가 생성한다.
+    """
+    start_date, end_date = _get_month_range(request)
+    
+    if jobs.is_enabled():
+        return jobs.enqueue_response(
+            request, 'reports.monthly_excel',
+            {'start_date': start_date.isoformat(), 'end_date': end_date.isoformat()},
+            label=f"월간 보고서 Excel ({start_date.strftime('%Y-%m')})",
+        )
+    
+    content = payloads.monthly_export_xlsx(start_date, end_date)
+    return _xlsx_response(content, payloads.monthly_export_filename(start_date))
 
 
 def daily_report(request):
-    """일일 보고서 - 오늘 하루 용기 이동 현황"""
+    """일일 보고서 - 오늘 하루 용기 이동 현황 (지난 날짜는 저장본 사용)"""
     # 날짜 파라미터 (기본: 오늘)
     date_str = request.GET.get('date')
     if date_str:
@@ -629,310 +209,24 @@ def daily_report(request):
     else:
         report_date = timezone.now().date()
     
-    # MOVE_CODE 라벨 매핑
-    move_code_labels = {
-        '00': '신규구매', '01': '신규등록', '10': '입하', '14': '회수완료',
-        '16': '회수없음', '17': '재보관', '19': '이상처리', '21': '충전선택', '22': '충전완료',
-        '30': '창고출고', '31': '외부충전', '41': '분석중', '42': '분석완료',
-        '50': '창고입고', '51': '수주연결', '52': '연결해제', '60': '출하',
-        '65': '영업외출하', '70': '반품', '85': '전출', '86': '전입', '99': '폐기',
-    }
-    
-    # 오늘 이동된 용기 조회
-    movements = []
-    move_summary = {}
-    arrival_details = []  # 입하 용기 상세
-    arrival_summary = {'total': 0, 'expired': 0, 'expiring_soon': 0}
-    
+    # 이동 내역 (제품명은 대시보드와 같은 마스터 조인, EndUser는 dashboard_enduser)
     try:
-        with connection.cursor() as cursor:
-            # 오늘 이동 내역 조회 (MOVE_DATE는 datetime이므로 DATE 비교) - 용기/제품 마스터 조인
-            # 대시보드와 동일하게 ma_items, ma_valve_specs, ma_cylinder_specs 조인
-            # EndUser는 cy_cylinder_current의 정책이 적용된 dashboard_enduser 사용
-            cursor.execute('''
-                SELECT 
-                    h."CYLINDER_NO",
-                    h."MOVE_CODE",
-                    h."MOVE_DATE",
-                    h."MOVE_REPORT_NO",
-                    h."SUPPLIER_USER_NAME",
-                    h."CUSTOMER_USER_NAME",
-                    h."POSITION_USER_NAME",
-                    h."REMARKS",
-                    CONCAT(
-                        COALESCE(h."FILLING_LOT_HEADER", ''),
-                        COALESCE(h."FILLING_LOT_NO", ''),
-                        CASE WHEN h."FILLING_LOT_BRANCH" IS NOT NULL AND h."FILLING_LOT_BRANCH" != '' 
-                             THEN '-' || h."FILLING_LOT_BRANCH" 
-                             ELSE '' 
-                        END
-                    ) as filling_lot,
-                    COALESCE(i."DISPLAY_NAME", i."FORMAL_NAME", c."ITEM_CODE", '미분류') as gas_name,
-                    COALESCE(c."CAPACITY", 0) as capacity,
-                    COALESCE(vs."NAME", '') as valve_spec,
-                    COALESCE(cs."NAME", '') as cylinder_spec,
-                    COALESCE(cc.dashboard_enduser, '') as enduser,
-                    c."WITHSTAND_PRESSURE_MAINTE_DATE",
-                    c."WITHSTAND_PRESSURE_TEST_TERM"
-                FROM fcms_cdc.tr_cylinder_status_histories h
-                LEFT JOIN fcms_cdc.ma_cylinders c ON TRIM(h."CYLINDER_NO") = TRIM(c."CYLINDER_NO")
-                LEFT JOIN fcms_cdc.ma_items i ON TRIM(c."ITEM_CODE") = TRIM(i."ITEM_CODE")
-                LEFT JOIN fcms_cdc.ma_valve_specs vs ON c."VALVE_SPEC_CODE" = vs."VALVE_SPEC_CODE"
-                LEFT JOIN fcms_cdc.ma_cylinder_specs cs ON c."CYLINDER_SPEC_CODE" = cs."CYLINDER_SPEC_CODE"
-                LEFT JOIN public.cy_cylinder_current cc ON TRIM(h."CYLINDER_NO") = TRIM(cc.cylinder_no)
-                WHERE DATE(h."MOVE_DATE") = %s
-                ORDER BY h."MOVE_CODE", i."DISPLAY_NAME", h."CYLINDER_NO"
-            ''', [report_date])
-            
-            item_summary = {}  # 제품명별 집계
-            move_by_item = {}  # 이동유형+제품명별 집계
-            move_detail_stats = {}  # 이동유형별 상세 통계
-            today = report_date
-            
-            # 스펙에서 제거할 문자열들
-            remove_patterns = ['general Y', 'HAMAI', 'NERIKI', 'SHOT-Y In-screw']
-            
-            def clean_spec(spec):
-                """스펙에서 불필요한 문자열 제거"""
-                if not spec:
-                    return ''
-                result = spec
-                for pattern in remove_patterns:
-                    result = result.replace(pattern, '')
-                # 연속 공백 정리
-                result = ' '.join(result.split())
-                return result.strip()
-            
-            for row in cursor.fetchall():
-                move_code = row[1].strip() if row[1] else ''
-                move_label = move_code_labels.get(move_code, move_code)
-                gas_name = row[9].strip() if row[9] else '미분류'
-                capacity = row[10] or 0
-                valve_spec = clean_spec(row[11].strip() if row[11] else '')
-                cylinder_spec = clean_spec(row[12].strip() if row[12] else '')
-                enduser = row[13].strip() if row[13] else ''
-                pressure_test_date = row[14]
-                pressure_test_term = row[15] or 0
-                
-                # 제품명: 가스명/용량/밸브/용기/EndUser 형식
-                item_name_parts = [gas_name]
-                if capacity:
-                    item_name_parts.append(f"{int(capacity)}L")
-                if valve_spec:
-                    item_name_parts.append(valve_spec)
-                if cylinder_spec:
-                    item_name_parts.append(cylinder_spec)
-                if enduser:
-                    item_name_parts.append(enduser)
-                item_name = ' / '.join(item_name_parts)
-                
-                # 내압만료 계산
-                is_expired = False
-                is_expiring_soon = False
-                if pressure_test_date and pressure_test_term:
-                    expiry_date = pressure_test_date + timedelta(days=pressure_test_term * 365)
-                    expiry_date_only = expiry_date.date() if hasattr(expiry_date, 'date') else expiry_date
-                    if expiry_date_only < today:
-                        is_expired = True
-                    elif expiry_date_only < today + timedelta(days=90):
-                        is_expiring_soon = True
-                
-                movements.append({
-                    'cylinder_no': row[0].strip() if row[0] else '',
-                    'move_code': move_code,
-                    'move_label': move_label,
-                    'move_date': row[2],
-                    'move_report_no': row[3].strip() if row[3] else '',
-                    'supplier': row[4].strip() if row[4] else '',
-                    'customer': row[5].strip() if row[5] else '',
-                    'position': row[6].strip() if row[6] else '',
-                    'remarks': row[7].strip() if row[7] else '',
-                    'filling_lot': row[8].strip() if row[8] else '',
-                    'item_code': gas_name,
-                    'capacity': capacity,
-                    'item_name': item_name,
-                    'is_expired': is_expired,
-                    'is_expiring_soon': is_expiring_soon,
-                })
-                
-                # 이동유형별 요약 집계
-                if move_label not in move_summary:
-                    move_summary[move_label] = {'code': move_code, 'count': 0}
-                move_summary[move_label]['count'] += 1
-                
-                # 제품명별 집계
-                if item_name not in item_summary:
-                    item_summary[item_name] = {'count': 0, 'capacity': capacity}
-                item_summary[item_name]['count'] += 1
-                
-                # 이동유형+제품명별 집계
-                key = f"{move_code}_{item_name}"
-                if key not in move_by_item:
-                    move_by_item[key] = {'move_code': move_code, 'move_label': move_label, 'item_name': item_name, 'count': 0, 'expired': 0, 'expiring_soon': 0}
-                move_by_item[key]['count'] += 1
-                if is_expired:
-                    move_by_item[key]['expired'] += 1
-                if is_expiring_soon:
-                    move_by_item[key]['expiring_soon'] += 1
-                
-                # 이동유형별 상세 통계
-                if move_code not in move_detail_stats:
-                    move_detail_stats[move_code] = {'label': move_label, 'total': 0, 'expired': 0, 'expiring_soon': 0, 'by_item': {}}
-                move_detail_stats[move_code]['total'] += 1
-                if is_expired:
-                    move_detail_stats[move_code]['expired'] += 1
-                if is_expiring_soon:
-                    move_detail_stats[move_code]['expiring_soon'] += 1
-                if item_name not in move_detail_stats[move_code]['by_item']:
-                    move_detail_stats[move_code]['by_item'][item_name] = {'count': 0, 'expired': 0}
-                move_detail_stats[move_code]['by_item'][item_name]['count'] += 1
-                if is_expired:
-                    move_detail_stats[move_code]['by_item'][item_name]['expired'] += 1
-            
-            # 입하(10) 용기 상세 정보 조회 (내압검사 만료일 포함) - 대시보드와 동일하게 조인
-            cursor.execute('''
-                SELECT 
-                    h."CYLINDER_NO",
-                    h."MOVE_DATE",
-                    h."SUPPLIER_USER_NAME",
-                    h."CUSTOMER_USER_NAME",
-                    COALESCE(i."DISPLAY_NAME", i."FORMAL_NAME", c."ITEM_CODE", '미분류') as gas_name,
-                    c."CAPACITY",
-                    COALESCE(vs."NAME", '') as valve_spec,
-                    COALESCE(cs."NAME", '') as cylinder_spec,
-                    COALESCE(cc.dashboard_enduser, '') as enduser,
-                    c."WITHSTAND_PRESSURE_MAINTE_DATE",
-                    c."WITHSTAND_PRESSURE_TEST_TERM",
-                    CASE 
-                        WHEN c."WITHSTAND_PRESSURE_MAINTE_DATE" IS NULL THEN NULL
-                        WHEN c."WITHSTAND_PRESSURE_TEST_TERM" IS NULL THEN NULL
-                        ELSE c."WITHSTAND_PRESSURE_MAINTE_DATE" + (c."WITHSTAND_PRESSURE_TEST_TERM" * INTERVAL '1 year')
-                    END as pressure_expiry_date
-                FROM fcms_cdc.tr_cylinder_status_histories h
-                LEFT JOIN fcms_cdc.ma_cylinders c ON TRIM(h."CYLINDER_NO") = TRIM(c."CYLINDER_NO")
-                LEFT JOIN fcms_cdc.ma_items i ON TRIM(c."ITEM_CODE") = TRIM(i."ITEM_CODE")
-                LEFT JOIN fcms_cdc.ma_valve_specs vs ON c."VALVE_SPEC_CODE" = vs."VALVE_SPEC_CODE"
-                LEFT JOIN fcms_cdc.ma_cylinder_specs cs ON c."CYLINDER_SPEC_CODE" = cs."CYLINDER_SPEC_CODE"
-                LEFT JOIN public.cy_cylinder_current cc ON TRIM(h."CYLINDER_NO") = TRIM(cc.cylinder_no)
-                WHERE DATE(h."MOVE_DATE") = %s
-                  AND h."MOVE_CODE" = '10'
-                ORDER BY h."CYLINDER_NO"
-            ''', [report_date])
-            
-            today = report_date
-            for row in cursor.fetchall():
-                # 인덱스: 0=CYLINDER_NO, 1=MOVE_DATE, 2=SUPPLIER, 3=CUSTOMER, 4=gas_name, 
-                # 5=CAPACITY, 6=valve_spec, 7=cylinder_spec, 8=enduser,
-                # 9=WITHSTAND_PRESSURE_MAINTE_DATE, 10=WITHSTAND_PRESSURE_TEST_TERM, 11=pressure_expiry_date
-                expiry_date = row[11]
-                is_expired = False
-                is_expiring_soon = False
-                
-                if expiry_date:
-                    expiry_date_only = expiry_date.date() if hasattr(expiry_date, 'date') else expiry_date
-                    if expiry_date_only < today:
-                        is_expired = True
-                        arrival_summary['expired'] += 1
-                    elif expiry_date_only < today + timedelta(days=90):
-                        is_expiring_soon = True
-                        arrival_summary['expiring_soon'] += 1
-                
-                # 제품명: 가스명/용량/밸브/용기/EndUser 형식
-                gas_name = row[4].strip() if row[4] else '미분류'
-                capacity = row[5] or 0
-                valve_spec = clean_spec(row[6].strip() if row[6] else '')
-                cylinder_spec = clean_spec(row[7].strip() if row[7] else '')
-                enduser = row[8].strip() if row[8] else ''
-                
-                item_name_parts = [gas_name]
-                if capacity:
-                    item_name_parts.append(f"{int(capacity)}L")
-                if valve_spec:
-                    item_name_parts.append(valve_spec)
-                if cylinder_spec:
-                    item_name_parts.append(cylinder_spec)
-                if enduser:
-                    item_name_parts.append(enduser)
-                item_name = ' / '.join(item_name_parts)
-                
-                arrival_summary['total'] += 1
-                arrival_details.append({
-                    'cylinder_no': row[0].strip() if row[0] else '',
-                    'move_date': row[1],
-                    'supplier': row[2].strip() if row[2] else '',
-                    'customer': row[3].strip() if row[3] else '',
-                    'item_code': item_name,
-                    'capacity': capacity,
-                    'pressure_test_date': row[9],
-                    'pressure_test_term': row[10] or 0,
-                    'pressure_expiry_date': expiry_date,
-                    'is_expired': is_expired,
-                    'is_expiring_soon': is_expiring_soon,
-                })
-    
+        report = artifacts.get_payload(
+            ReportType.DAILY, report_date, report_date,
+            lambda: payloads.build_daily_payload(report_date),
+        )
     except Exception as e:
         logger.error(f"일일 보고서 조회 오류: {e}")
+        report = payloads.daily_payload([])
     
-    # 요약 정렬 (건수 많은 순)
-    summary_list = [
-        {'label': k, 'code': v['code'], 'count': v['count']}
-        for k, v in sorted(move_summary.items(), key=lambda x: -x[1]['count'])
-    ]
-    
-    # 현재 인벤토리
-    current_inventory = CylinderRepository.get_inventory_summary()
-    
-    # 상태별 집계
-    status_summary = {}
-    total_cylinders = 0
-    for row in current_inventory:
-        status = row.get('status', '기타')
-        qty = row.get('qty', 0)
-        if status not in status_summary:
-            status_summary[status] = 0
-        status_summary[status] += qty
-        total_cylinders += qty
-    
-    # 제품명별 집계 정렬
-    item_summary_list = [
-        {'item_name': k, 'count': v['count'], 'capacity': v['capacity']}
-        for k, v in sorted(item_summary.items(), key=lambda x: -x[1]['count'])
-    ]
-    
-    # 이동유형+제품명별 집계 정렬 (이동코드순, 건수 내림차순)
-    move_by_item_list = sorted(
-        move_by_item.values(),
-        key=lambda x: (x['move_code'], -x['count'])
-    )
-    
-    # 이동유형별 상세 통계 정렬
-    move_detail_stats_list = []
-    for code, stats in sorted(move_detail_stats.items()):
-        by_item_list = [
-            {'item_name': k, 'count': v['count'], 'expired': v['expired']}
-            for k, v in sorted(stats['by_item'].items(), key=lambda x: -x[1]['count'])
-        ]
-        move_detail_stats_list.append({
-            'code': code,
-            'label': stats['label'],
-            'total': stats['total'],
-            'expired': stats['expired'],
-            'expiring_soon': stats['expiring_soon'],
-            'by_item': by_item_list,
-        })
+    # 현재 인벤토리 상태별 집계
+    status_summary, total_cylinders = _status_summary()
     
     context = {
+        **report,
         'report_date': report_date,
-        'movements': movements,
-        'move_summary': summary_list,
-        'total_movements': len(movements),
         'status_summary': status_summary,
         'total_cylinders': total_cylinders,
-        'arrival_details': arrival_details,
-        'arrival_summary': arrival_summary,
-        'item_summary': item_summary_list,
-        'move_by_item': move_by_item_list,
-        'move_detail_stats': move_detail_stats_list,
         'generated_at': timezone.now(),
     }
     return render(request, 'reports/daily.html', context)
@@ -949,154 +243,17 @@ def arrival_report(request):
     else:
         report_date = timezone.now().date()
     
-    # 스펙에서 제거할 문자열들
-    remove_patterns = ['general Y', 'HAMAI', 'NERIKI', 'SHOT-Y In-screw']
-    
-    def clean_spec(spec):
-        if not spec:
-            return ''
-        result = spec
-        for pattern in remove_patterns:
-            result = result.replace(pattern, '')
-        result = ' '.join(result.split())
-        return result.strip()
-    
     arrivals = []
-    summary = {
-        'total': 0,
-        'expired': 0,
-        'expiring_soon': 0,
-        'normal': 0,
-        'by_item': {},
-        'by_enduser': {},
-    }
-    
     try:
-        with connection.cursor() as cursor:
-            # 입하(10) 용기 상세 조회
-            cursor.execute('''
-                SELECT 
-                    h."CYLINDER_NO",
-                    h."MOVE_DATE",
-                    h."SUPPLIER_USER_NAME",
-                    h."CUSTOMER_USER_NAME",
-                    h."MOVE_REPORT_NO",
-                    COALESCE(i."DISPLAY_NAME", i."FORMAL_NAME", c."ITEM_CODE", '미분류') as gas_name,
-                    c."CAPACITY",
-                    COALESCE(vs."NAME", '') as valve_spec,
-                    COALESCE(cs."NAME", '') as cylinder_spec,
-                    COALESCE(cc.dashboard_enduser, '') as enduser,
-                    c."WITHSTAND_PRESSURE_MAINTE_DATE",
-                    c."WITHSTAND_PRESSURE_TEST_TERM",
-                    CASE 
-                        WHEN c."WITHSTAND_PRESSURE_MAINTE_DATE" IS NULL THEN NULL
-                        WHEN c."WITHSTAND_PRESSURE_TEST_TERM" IS NULL THEN NULL
-                        ELSE c."WITHSTAND_PRESSURE_MAINTE_DATE" + (c."WITHSTAND_PRESSURE_TEST_TERM" * INTERVAL '1 year')
-                    END as pressure_expiry_date,
-                    c."WEIGHT" as cylinder_weight
-                FROM fcms_cdc.tr_cylinder_status_histories h
-                LEFT JOIN fcms_cdc.ma_cylinders c ON TRIM(h."CYLINDER_NO") = TRIM(c."CYLINDER_NO")
-                LEFT JOIN fcms_cdc.ma_items i ON TRIM(c."ITEM_CODE") = TRIM(i."ITEM_CODE")
-                LEFT JOIN fcms_cdc.ma_valve_specs vs ON c."VALVE_SPEC_CODE" = vs."VALVE_SPEC_CODE"
-                LEFT JOIN fcms_cdc.ma_cylinder_specs cs ON c."CYLINDER_SPEC_CODE" = cs."CYLINDER_SPEC_CODE"
-                LEFT JOIN public.cy_cylinder_current cc ON TRIM(h."CYLINDER_NO") = TRIM(cc.cylinder_no)
-                WHERE DATE(h."MOVE_DATE") = %s
-                  AND h."MOVE_CODE" = '10'
-                ORDER BY i."DISPLAY_NAME", h."CYLINDER_NO"
-            ''', [report_date])
-            
-            today = report_date
-            for row in cursor.fetchall():
-                expiry_date = row[12]
-                is_expired = False
-                is_expiring_soon = False
-                pressure_status = '정상'
-                
-                if expiry_date:
-                    expiry_date_only = expiry_date.date() if hasattr(expiry_date, 'date') else expiry_date
-                    if expiry_date_only < today:
-                        is_expired = True
-                        summary['expired'] += 1
-                        pressure_status = '내압만료'
-                    elif expiry_date_only < today + timedelta(days=90):
-                        is_expiring_soon = True
-                        summary['expiring_soon'] += 1
-                        pressure_status = '만료임박'
-                    else:
-                        summary['normal'] += 1
-                else:
-                    summary['normal'] += 1
-                
-                gas_name = row[5].strip() if row[5] else '미분류'
-                capacity = row[6] or 0
-                valve_spec = clean_spec(row[7].strip() if row[7] else '')
-                cylinder_spec = clean_spec(row[8].strip() if row[8] else '')
-                enduser = row[9].strip() if row[9] else ''
-                supplier = row[2].strip() if row[2] else ''
-                
-                # 제품명 조합
-                item_name_parts = [gas_name]
-                if capacity:
-                    item_name_parts.append(f"{int(capacity)}L")
-                if valve_spec:
-                    item_name_parts.append(valve_spec)
-                if cylinder_spec:
-                    item_name_parts.append(cylinder_spec)
-                if enduser:
-                    item_name_parts.append(enduser)
-                item_name = ' / '.join(item_name_parts)
-                
-                # 집계
-                summary['total'] += 1
-                if item_name not in summary['by_item']:
-                    summary['by_item'][item_name] = {'count': 0, 'expired': 0, 'normal': 0}
-                summary['by_item'][item_name]['count'] += 1
-                if is_expired:
-                    summary['by_item'][item_name]['expired'] += 1
-                else:
-                    summary['by_item'][item_name]['normal'] += 1
-                
-                if enduser:
-                    if enduser not in summary['by_enduser']:
-                        summary['by_enduser'][enduser] = 0
-                    summary['by_enduser'][enduser] += 1
-                
-                arrivals.append({
-                    'cylinder_no': row[0].strip() if row[0] else '',
-                    'move_date': row[1],
-                    'supplier': supplier,
-                    'customer': row[3].strip() if row[3] else '',
-                    'move_report_no': row[4].strip() if row[4] else '',
-                    'gas_name': gas_name,
-                    'capacity': capacity,
-                    'item_name': item_name,
-                    'pressure_test_date': row[10],
-                    'pressure_expiry_date': expiry_date,
-                    'pressure_status': pressure_status,
-                    'is_expired': is_expired,
-                    'is_expiring_soon': is_expiring_soon,
-                    'cylinder_weight': row[13] or 0,
-                })
-    
+        arrivals = ReportRepository.fetch_movements(report_date, report_date, move_code='10', order='item')
     except Exception as e:
         logger.error(f"입하 보고서 조회 오류: {e}")
     
-    # 제품별 집계 정렬
-    by_item_list = [
-        {'item_name': k, 'count': v['count'], 'expired': v['expired'], 'normal': v['normal']}
-        for k, v in sorted(summary['by_item'].items(), key=lambda x: -x[1]['count'])
-    ]
-    
-    # 엔드유저별 집계 정렬
-    by_enduser_list = [
-        {'enduser': k, 'count': v}
-        for k, v in sorted(summary['by_enduser'].items(), key=lambda x: -x[1])
-    ]
+    summary = ReportRepository.summarize(arrivals)
     
     # 현재 보유 가용 용기 현황 (대시보드와 동일)
-    from core.utils.view_helper import group_cylinder_types
-    current_inventory = CylinderRepository.get_inventory_summary()
-    cylinder_types_dict = group_cylinder_types(current_inventory)
+    from core.utils.view_helper import get_cylinder_type_groups
+    cylinder_types_dict = get_cylinder_type_groups()
     
     # 제품명 조합 함수 (스펙 정리 포함)
     def build_item_name(v):
@@ -1137,8 +294,8 @@ def arrival_report(request):
         'report_date': report_date,
         'arrivals': arrivals,
         'summary': summary,
-        'by_item': by_item_list,
-        'by_enduser': by_enduser_list,
+        'by_item': summary['item_summary'],
+        'by_enduser': summary['by_enduser'],
         'inventory_list': inventory_list,
         'total_available': total_available,
         'total_inventory': total_inventory,
@@ -1166,155 +323,18 @@ def monthly_arrival_report(request):
 
 def _period_arrival_report(request, start_date, end_date, report_type):
     """기간별 입하 보고서 공통 로직"""
-    
-    remove_patterns = ['general Y', 'HAMAI', 'NERIKI', 'SHOT-Y In-screw']
-    
-    def clean_spec(spec):
-        if not spec:
-            return ''
-        result = spec
-        for pattern in remove_patterns:
-            result = result.replace(pattern, '')
-        result = ' '.join(result.split())
-        return result.strip()
-    
     arrivals = []
-    summary = {
-        'total': 0,
-        'expired': 0,
-        'expiring_soon': 0,
-        'normal': 0,
-        'by_item': {},
-        'by_enduser': {},
-        'by_date': {},
-    }
-    
     try:
-        with connection.cursor() as cursor:
-            cursor.execute('''
-                SELECT 
-                    h."CYLINDER_NO",
-                    h."MOVE_DATE",
-                    h."SUPPLIER_USER_NAME",
-                    h."CUSTOMER_USER_NAME",
-                    h."MOVE_REPORT_NO",
-                    COALESCE(i."DISPLAY_NAME", i."FORMAL_NAME", c."ITEM_CODE", '미분류') as gas_name,
-                    c."CAPACITY",
-                    COALESCE(vs."NAME", '') as valve_spec,
-                    COALESCE(cs."NAME", '') as cylinder_spec,
-                    COALESCE(cc.dashboard_enduser, '') as enduser,
-                    c."WITHSTAND_PRESSURE_MAINTE_DATE",
-                    c."WITHSTAND_PRESSURE_TEST_TERM",
-                    CASE 
-                        WHEN c."WITHSTAND_PRESSURE_MAINTE_DATE" IS NULL THEN NULL
-                        WHEN c."WITHSTAND_PRESSURE_TEST_TERM" IS NULL THEN NULL
-                        ELSE c."WITHSTAND_PRESSURE_MAINTE_DATE" + (c."WITHSTAND_PRESSURE_TEST_TERM" * INTERVAL '1 year')
-                    END as pressure_expiry_date
-                FROM fcms_cdc.tr_cylinder_status_histories h
-                LEFT JOIN fcms_cdc.ma_cylinders c ON TRIM(h."CYLINDER_NO") = TRIM(c."CYLINDER_NO")
-                LEFT JOIN fcms_cdc.ma_items i ON TRIM(c."ITEM_CODE") = TRIM(i."ITEM_CODE")
-                LEFT JOIN fcms_cdc.ma_valve_specs vs ON c."VALVE_SPEC_CODE" = vs."VALVE_SPEC_CODE"
-                LEFT JOIN fcms_cdc.ma_cylinder_specs cs ON c."CYLINDER_SPEC_CODE" = cs."CYLINDER_SPEC_CODE"
-                LEFT JOIN public.cy_cylinder_current cc ON TRIM(h."CYLINDER_NO") = TRIM(cc.cylinder_no)
-                WHERE DATE(h."MOVE_DATE") BETWEEN %s AND %s
-                  AND h."MOVE_CODE" = '10'
-                ORDER BY h."MOVE_DATE", i."DISPLAY_NAME", h."CYLINDER_NO"
-            ''', [start_date, end_date])
-            
-            today = end_date
-            for row in cursor.fetchall():
-                expiry_date = row[12]
-                is_expired = False
-                is_expiring_soon = False
-                pressure_status = '정상'
-                
-                if expiry_date:
-                    expiry_date_only = expiry_date.date() if hasattr(expiry_date, 'date') else expiry_date
-                    if expiry_date_only < today:
-                        is_expired = True
-                        summary['expired'] += 1
-                        pressure_status = '내압만료'
-                    elif expiry_date_only < today + timedelta(days=90):
-                        is_expiring_soon = True
-                        summary['expiring_soon'] += 1
-                        pressure_status = '만료임박'
-                    else:
-                        summary['normal'] += 1
-                else:
-                    summary['normal'] += 1
-                
-                gas_name = row[5].strip() if row[5] else '미분류'
-                capacity = row[6] or 0
-                valve_spec = clean_spec(row[7].strip() if row[7] else '')
-                cylinder_spec = clean_spec(row[8].strip() if row[8] else '')
-                enduser = row[9].strip() if row[9] else ''
-                move_date = row[1]
-                
-                item_name_parts = [gas_name]
-                if capacity:
-                    item_name_parts.append(f"{int(capacity)}L")
-                if valve_spec:
-                    item_name_parts.append(valve_spec)
-                if cylinder_spec:
-                    item_name_parts.append(cylinder_spec)
-                if enduser:
-                    item_name_parts.append(enduser)
-                item_name = ' / '.join(item_name_parts)
-                
-                summary['total'] += 1
-                
-                # 날짜별 집계
-                date_key = move_date.date() if hasattr(move_date, 'date') else move_date
-                if date_key not in summary['by_date']:
-                    summary['by_date'][date_key] = 0
-                summary['by_date'][date_key] += 1
-                
-                # 제품별 집계
-                if item_name not in summary['by_item']:
-                    summary['by_item'][item_name] = {'count': 0, 'expired': 0, 'normal': 0}
-                summary['by_item'][item_name]['count'] += 1
-                if is_expired:
-                    summary['by_item'][item_name]['expired'] += 1
-                else:
-                    summary['by_item'][item_name]['normal'] += 1
-                
-                # EndUser별 집계
-                if enduser:
-                    if enduser not in summary['by_enduser']:
-                        summary['by_enduser'][enduser] = 0
-                    summary['by_enduser'][enduser] += 1
-                
-                arrivals.append({
-                    'cylinder_no': row[0].strip() if row[0] else '',
-                    'move_date': move_date,
-                    'supplier': row[2].strip() if row[2] else '',
-                    'customer': row[3].strip() if row[3] else '',
-                    'move_report_no': row[4].strip() if row[4] else '',
-                    'gas_name': gas_name,
-                    'capacity': capacity,
-                    'item_name': item_name,
-                    'pressure_expiry_date': expiry_date,
-                    'pressure_status': pressure_status,
-                    'is_expired': is_expired,
-                    'is_expiring_soon': is_expiring_soon,
-                })
-    
+        arrivals = ReportRepository.fetch_movements(start_date, end_date, move_code='10', order='date')
     except Exception as e:
         logger.error(f"{report_type} 입하 보고서 조회 오류: {e}")
     
-    by_item_list = [
-        {'item_name': k, 'count': v['count'], 'expired': v['expired'], 'normal': v['normal']}
-        for k, v in sorted(summary['by_item'].items(), key=lambda x: -x[1]['count'])
-    ]
-    
-    by_enduser_list = [
-        {'enduser': k, 'count': v}
-        for k, v in sorted(summary['by_enduser'].items(), key=lambda x: -x[1])
-    ]
+    summary = ReportRepository.summarize(arrivals)
     
+    # 날짜별 집계 (과거 → 최근)
     by_date_list = [
-        {'date': k, 'count': v}
-        for k, v in sorted(summary['by_date'].items())
+        {'date': d['date'], 'count': d['total']}
+        for d in reversed(summary['daily_summary'])
     ]
     
     context = {
@@ -1323,8 +343,8 @@ def _period_arrival_report(request, start_date, end_date, report_type):
         'report_type': report_type,
         'arrivals': arrivals,
         'summary': summary,
-        'by_item': by_item_list,
-        'by_enduser': by_enduser_list,
+        'by_item': summary['item_summary'],
+        'by_enduser': summary['by_enduser'],
         'by_date': by_date_list,
         'generated_at': timezone.now(),
     }
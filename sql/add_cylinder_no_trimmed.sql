@@ -1,5 +1,9 @@
 -- cy_cylinder_current 테이블에 cylinder_no_trimmed 컬럼 추가
 -- 이 컬럼을 UNIQUE KEY로 사용하여 중복 방지
+--
+-- [폐기됨] 실행하지 마세요. 정규화 키는 compact_cylinder_current(PK + RTRIM CHECK)가 적용하며
+-- 그 명령이 이 컬럼을 제거한다. 동기화 경로는 cylinder_no_trimmed를 채우지 않으므로
+-- 아래 NOT NULL 제약을 다시 걸면 스냅샷 쓰기가 실패한다.
 
 -- 1. 기존 UNIQUE 제약조건 제거
 ALTER TABLE cy_cylinder_current DROP CONSTRAINT IF EXISTS cy_cylinder_current_pkey;
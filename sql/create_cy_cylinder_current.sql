@@ -1,8 +1,9 @@
 -- cy_cylinder_current 스냅샷 테이블 생성 DDL
 
 CREATE TABLE IF NOT EXISTS cy_cylinder_current (
-    -- 식별자
-    cylinder_no VARCHAR(20) PRIMARY KEY,
+    -- 식별자 (RTRIM된 값만 저장: 공백 유무에 따른 중복 방지)
+    cylinder_no VARCHAR(20) PRIMARY KEY
+        CONSTRAINT cy_cylinder_current_no_trimmed_chk CHECK (cylinder_no = RTRIM(cylinder_no)),
     
     -- FCMS Raw 값 (원천 데이터, 감사용)
     raw_gas_name VARCHAR(100),
@@ -45,7 +46,10 @@ CREATE TABLE IF NOT EXISTS cy_cylinder_current (
     
     -- 인덱스용 컬럼
     status_category VARCHAR(20),
-    is_available BOOLEAN
+    is_available BOOLEAN,
+    
+    -- 자유 검색 문서 (Trigger가 채움, sql/create_cylinder_search_doc.sql)
+    search_doc TEXT
 );
 
 -- 인덱스 생성
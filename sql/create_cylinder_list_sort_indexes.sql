@@ -0,0 +1,38 @@
+-- 용기 리스트 Keyset 페이지네이션용 정렬 인덱스
+-- 실행: python manage.py execute_sql_file sql/create_cylinder_list_sort_indexes.sql
+--
+-- CylinderRepository.get_cylinder_page()는 (정렬 컬럼, cylinder_no) 순서로
+-- "마지막으로 본 행 이후" 조건 + LIMIT으로 읽는다. 같은 순서의 인덱스가 있으면
+-- 몇 번째 페이지든 인덱스에서 페이지 크기만큼만 읽고 멈춘다.
+-- 목록은 항상 dashboard_enduser IS NOT NULL 조건이 붙으므로 부분 인덱스로 둔다.
+-- (btree는 역방향 스캔이 가능하므로 ASC 인덱스 하나로 ASC/DESC 정렬 모두 사용)
+
+CREATE INDEX IF NOT EXISTS idx_cy_cylinder_current_list_gas
+    ON cy_cylinder_current (dashboard_gas_name, cylinder_no)
+    WHERE dashboard_enduser IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_cy_cylinder_current_list_status
+    ON cy_cylinder_current (dashboard_status, cylinder_no)
+    WHERE dashboard_enduser IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_cy_cylinder_current_list_location
+    ON cy_cylinder_current (dashboard_location, cylinder_no)
+    WHERE dashboard_enduser IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_cy_cylinder_current_list_capacity
+    ON cy_cylinder_current (dashboard_capacity, cylinder_no)
+    WHERE dashboard_enduser IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_cy_cylinder_current_list_last_event
+    ON cy_cylinder_current (last_event_at, cylinder_no)
+    WHERE dashboard_enduser IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_cy_cylinder_current_list_pressure_expire
+    ON cy_cylinder_current (pressure_expire_date, cylinder_no)
+    WHERE dashboard_enduser IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_cy_cylinder_current_list_manufacture
+    ON cy_cylinder_current (manufacture_date, cylinder_no)
+    WHERE dashboard_enduser IS NOT NULL;
+
+ANALYZE cy_cylinder_current;
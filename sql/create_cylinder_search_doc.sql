@@ -0,0 +1,194 @@
+-- 용기 자유 검색용 검색 문서(search_doc) + pg_trgm GIN 인덱스
+-- 실행: python manage.py execute_sql_file sql/create_cylinder_search_doc.sql
+--
+-- 용기 리스트 검색은 단어마다 6개 필드(용기번호, 밸브형식, 용기재질, 제조lot, 충전lot, 최근이동서)
+-- 중 하나라도 ILIKE '%단어%'에 맞아야 한다. 예전에는 매 검색마다 tr_latest_cylinder_statuses의
+-- lot CONCAT을 행마다 만들며 전체를 읽었다.
+-- 이제 스냅샷 행이 저장될 때 BEFORE Trigger가 6개 값을 공백으로 이어 붙여 search_doc에 넣고,
+-- CylinderRepository는 단어마다 c.search_doc ILIKE '%단어%' 하나만 조건으로 건다.
+-- (검색 단어는 공백으로 나뉘므로 공백 구분자를 넘어 두 필드에 걸쳐 매칭되지 않는다.)
+--
+-- lot/이동서 값의 원천은 tr_latest_cylinder_statuses라서, 스냅샷 Upsert(리스너/동기화)를 기다리지 않고
+-- 그 테이블의 문장 단위 Trigger가 lot/이동서 값이 바뀐 용기의 search_doc만 바로 다시 만든다.
+-- (값이 같은 행은 건드리지 않음, 실패해도 CDC sink 트랜잭션은 깨뜨리지 않고 WARNING만 남김)
+-- 주의: pg_trgm 인덱스는 3글자 이상 단어에서 효과가 크다. (1~2글자는 인덱스 전체 스캔)
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+ALTER TABLE cy_cylinder_current ADD COLUMN IF NOT EXISTS search_doc TEXT;
+
+
+CREATE OR REPLACE FUNCTION cy_cylinder_search_doc_build(
+    p_cylinder_no VARCHAR,
+    p_valve_group_name VARCHAR,
+    p_valve_spec_name VARCHAR,
+    p_cylinder_spec_name VARCHAR
+) RETURNS TEXT AS $$
+DECLARE
+    v_manufacture_lot TEXT := '';
+    v_filling_lot TEXT := '';
+    v_move_report_no TEXT := '';
+BEGIN
+    -- CylinderRepository._LIST_SELECT_SQL의 manufacture_lot / filling_lot / move_report_no와 같은 식
+    SELECT
+        CONCAT(
+            COALESCE(tcs."MANUFACTURE_LOT_NO", ''),
+            CASE WHEN tcs."MANUFACTURE_LOT_BRANCH" IS NOT NULL AND tcs."MANUFACTURE_LOT_BRANCH" != ''
+                 THEN CONCAT('-', tcs."MANUFACTURE_LOT_BRANCH")
+                 ELSE ''
+            END
+        ),
+        CONCAT(
+            COALESCE(tcs."FILLING_LOT_HEADER", ''),
+            COALESCE(tcs."FILLING_LOT_NO", ''),
+            CASE WHEN tcs."FILLING_LOT_BRANCH" IS NOT NULL AND tcs."FILLING_LOT_BRANCH" != ''
+                 THEN CONCAT('-', tcs."FILLING_LOT_BRANCH")
+                 ELSE ''
+            END
+        ),
+        COALESCE(tcs."MOVE_REPORT_NO", '')
+    INTO v_manufacture_lot, v_filling_lot, v_move_report_no
+    FROM "fcms_cdc"."tr_latest_cylinder_statuses" tcs
+    WHERE RTRIM(tcs."CYLINDER_NO") = p_cylinder_no
+    LIMIT 1;
+
+    RETURN CONCAT_WS(' ',
+        p_cylinder_no,
+        COALESCE(NULLIF(RTRIM(p_valve_group_name), ''), NULLIF(RTRIM(p_valve_spec_name), ''), ''),
+        COALESCE(p_cylinder_spec_name, ''),
+        COALESCE(v_manufacture_lot, ''),
+        COALESCE(v_filling_lot, ''),
+        COALESCE(v_move_report_no, '')
+    );
+END;
+$$ LANGUAGE plpgsql STABLE;
+
+
+CREATE OR REPLACE FUNCTION cy_cylinder_search_doc_trigger()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.search_doc := cy_cylinder_search_doc_build(
+        NEW.cylinder_no,
+        NEW.dashboard_valve_group_name,
+        NEW.dashboard_valve_spec_name,
+        NEW.dashboard_cylinder_spec_name
+    );
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_cy_cylinder_search_doc ON cy_cylinder_current;
+CREATE TRIGGER trigger_cy_cylinder_search_doc
+BEFORE INSERT OR UPDATE ON cy_cylinder_current
+FOR EACH ROW EXECUTE FUNCTION cy_cylinder_search_doc_trigger();
+
+
+-- 지정한 용기의 search_doc 재계산 (값이 바뀐 행만 UPDATE, 갱신 건수 반환)
+CREATE OR REPLACE FUNCTION cy_cylinder_search_doc_refresh(p_cylinder_nos TEXT[])
+RETURNS INTEGER AS $$
+DECLARE
+    v_count INTEGER;
+BEGIN
+    UPDATE cy_cylinder_current c
+    SET search_doc = d.doc
+    FROM (
+        SELECT cc.cylinder_no,
+               cy_cylinder_search_doc_build(
+                   cc.cylinder_no, cc.dashboard_valve_group_name,
+                   cc.dashboard_valve_spec_name, cc.dashboard_cylinder_spec_name
+               ) AS doc
+        FROM cy_cylinder_current cc
+        WHERE cc.cylinder_no = ANY(p_cylinder_nos)
+    ) d
+    WHERE c.cylinder_no = d.cylinder_no
+      AND c.search_doc IS DISTINCT FROM d.doc;
+    GET DIAGNOSTICS v_count = ROW_COUNT;
+    RETURN v_count;
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- Trigger 함수: lot 원천 (전이 테이블은 이벤트별로만 존재하므로 TG_OP로 분기)
+-- 검색 문서에 들어가는 컬럼 값이 바뀐 용기만 고른다. (old EXCEPT new / new EXCEPT old)
+CREATE OR REPLACE FUNCTION cy_cylinder_search_doc_source_trigger()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_nos TEXT[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(DISTINCT RTRIM(n."CYLINDER_NO")) INTO v_nos FROM search_doc_new n;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(DISTINCT RTRIM(o."CYLINDER_NO")) INTO v_nos FROM search_doc_old o;
+    ELSIF TG_OP = 'UPDATE' THEN
+        SELECT array_agg(DISTINCT RTRIM(x."CYLINDER_NO")) INTO v_nos
+        FROM (
+            (
+                SELECT "CYLINDER_NO", "MANUFACTURE_LOT_NO", "MANUFACTURE_LOT_BRANCH",
+                       "FILLING_LOT_HEADER", "FILLING_LOT_NO", "FILLING_LOT_BRANCH", "MOVE_REPORT_NO"
+                FROM search_doc_new
+                EXCEPT
+                SELECT "CYLINDER_NO", "MANUFACTURE_LOT_NO", "MANUFACTURE_LOT_BRANCH",
+                       "FILLING_LOT_HEADER", "FILLING_LOT_NO", "FILLING_LOT_BRANCH", "MOVE_REPORT_NO"
+                FROM search_doc_old
+            )
+            UNION
+            (
+                SELECT "CYLINDER_NO", "MANUFACTURE_LOT_NO", "MANUFACTURE_LOT_BRANCH",
+                       "FILLING_LOT_HEADER", "FILLING_LOT_NO", "FILLING_LOT_BRANCH", "MOVE_REPORT_NO"
+                FROM search_doc_old
+                EXCEPT
+                SELECT "CYLINDER_NO", "MANUFACTURE_LOT_NO", "MANUFACTURE_LOT_BRANCH",
+                       "FILLING_LOT_HEADER", "FILLING_LOT_NO", "FILLING_LOT_BRANCH", "MOVE_REPORT_NO"
+                FROM search_doc_new
+            )
+        ) x;
+    ELSIF TG_OP = 'TRUNCATE' THEN
+        SELECT array_agg(cylinder_no) INTO v_nos FROM cy_cylinder_current;
+    END IF;
+
+    IF v_nos IS NOT NULL THEN
+        PERFORM cy_cylinder_search_doc_refresh(v_nos);
+    END IF;
+    RETURN NULL;
+EXCEPTION WHEN OTHERS THEN
+    -- 검색 문서는 다음 스냅샷 Upsert 때 다시 만들어지므로 sink 트랜잭션을 실패시키지 않는다.
+    RAISE WARNING 'cy_cylinder_search_doc 갱신 실패 (%): %', TG_OP, SQLERRM;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_cy_cylinder_search_doc_source_insert ON "fcms_cdc"."tr_latest_cylinder_statuses";
+CREATE TRIGGER trigger_cy_cylinder_search_doc_source_insert
+AFTER INSERT ON "fcms_cdc"."tr_latest_cylinder_statuses"
+REFERENCING NEW TABLE AS search_doc_new
+FOR EACH STATEMENT EXECUTE FUNCTION cy_cylinder_search_doc_source_trigger();
+
+DROP TRIGGER IF EXISTS trigger_cy_cylinder_search_doc_source_update ON "fcms_cdc"."tr_latest_cylinder_statuses";
+CREATE TRIGGER trigger_cy_cylinder_search_doc_source_update
+AFTER UPDATE ON "fcms_cdc"."tr_latest_cylinder_statuses"
+REFERENCING OLD TABLE AS search_doc_old NEW TABLE AS search_doc_new
+FOR EACH STATEMENT EXECUTE FUNCTION cy_cylinder_search_doc_source_trigger();
+
+DROP TRIGGER IF EXISTS trigger_cy_cylinder_search_doc_source_delete ON "fcms_cdc"."tr_latest_cylinder_statuses";
+CREATE TRIGGER trigger_cy_cylinder_search_doc_source_delete
+AFTER DELETE ON "fcms_cdc"."tr_latest_cylinder_statuses"
+REFERENCING OLD TABLE AS search_doc_old
+FOR EACH STATEMENT EXECUTE FUNCTION cy_cylinder_search_doc_source_trigger();
+
+DROP TRIGGER IF EXISTS trigger_cy_cylinder_search_doc_source_truncate ON "fcms_cdc"."tr_latest_cylinder_statuses";
+CREATE TRIGGER trigger_cy_cylinder_search_doc_source_truncate
+AFTER TRUNCATE ON "fcms_cdc"."tr_latest_cylinder_statuses"
+FOR EACH STATEMENT EXECUTE FUNCTION cy_cylinder_search_doc_source_trigger();
+
+
+-- 기존 행 채우기 (비어 있는 행만, 재실행 시에는 건너뜀)
+UPDATE cy_cylinder_current
+SET search_doc = cy_cylinder_search_doc_build(
+    cylinder_no, dashboard_valve_group_name, dashboard_valve_spec_name, dashboard_cylinder_spec_name
+)
+WHERE search_doc IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_cy_cylinder_current_search_doc_trgm
+    ON cy_cylinder_current USING GIN (search_doc gin_trgm_ops);
+
+ANALYZE cy_cylinder_current;
@@ -0,0 +1,191 @@
+-- 용기별 이력 타임라인 (cy_cylinder_timeline) + 커버링 인덱스
+-- 실행: python manage.py execute_sql_file sql/create_cylinder_timeline.sql
+--
+-- 용기 상세/출하 이력/이동서 용기 목록은 "이 용기들의 최근 N건 이력"을 읽는다.
+-- 원천 tr_cylinder_status_histories는 컬럼이 많고(비고, 담당자, 중량 등) 용기번호가 CHAR라
+-- RTRIM 표현식 인덱스로 찾은 뒤에도 행마다 힙 페이지를 읽어야 하고, 이력이 쌓일수록 흩어진다.
+--
+-- cy_cylinder_timeline은 필요한 컬럼만 RTRIM된 키로 담은 좁은 테이블이다.
+-- (cylinder_no, move_date DESC, history_seq DESC) INCLUDE (...) 인덱스가 조회 컬럼을 모두 담고 있어
+-- 용기별 최근 N건은 인덱스만 읽고(Index Only Scan) 끝난다. 이력 연수와 무관하게 N건만 읽는다.
+--
+-- 원천 테이블 Trigger가 CDC 적재(INSERT/UPDATE/DELETE)를 그대로 반영한다.
+-- 파생 테이블 오류가 CDC sink 트랜잭션을 실패시키지 않도록 문자열 컬럼은 길이 제한 없는 TEXT로 두고,
+-- Trigger 안의 오류는 잡아서 cy_cylinder_timeline_repair에 남긴다. (원천 적재는 그대로 진행)
+-- 남은 행은 이 파일을 다시 실행하면 아래 채우기 INSERT가 빠진 이력을 메운다.
+-- 이력은 사실상 추가만 되므로, Index Only Scan에 필요한 visibility map이 늦지 않도록
+-- INSERT 기준 autovacuum 임계값을 낮춰 둔다. (PostgreSQL 13+)
+-- 기존 이력 채우기는 아래 INSERT ... SELECT 가 한 번 수행한다. (재실행 시 이미 있는 행은 건너뜀)
+-- 채운 직후 바로 Index Only Scan이 되도록 한 번 실행 권장 (트랜잭션 밖에서만 가능해 파일에 넣지 않음):
+--   VACUUM ANALYZE cy_cylinder_timeline;
+
+CREATE TABLE IF NOT EXISTS cy_cylinder_timeline (
+    cylinder_no TEXT NOT NULL,            -- RTRIM된 용기번호 (cy_cylinder_current.cylinder_no와 같은 키)
+    history_seq NUMERIC NOT NULL,
+    move_date TIMESTAMP,
+    move_code TEXT,                       -- TRIM
+    condition_code TEXT,                  -- TRIM
+    location_code TEXT,                   -- RTRIM
+    move_report_no TEXT,                  -- RTRIM, 빈 값은 NULL
+    manufacture_lot TEXT,                 -- HEADER + NO + '-' + BRANCH
+    filling_lot TEXT,                     -- HEADER + NO + '-' + BRANCH
+    PRIMARY KEY (cylinder_no, history_seq)
+);
+
+-- 이전 버전(VARCHAR 길이 제한)으로 만든 테이블 변환 (VARCHAR → TEXT는 테이블 재작성 없음)
+ALTER TABLE cy_cylinder_timeline
+    ALTER COLUMN cylinder_no TYPE TEXT,
+    ALTER COLUMN move_code TYPE TEXT,
+    ALTER COLUMN condition_code TYPE TEXT,
+    ALTER COLUMN location_code TYPE TEXT,
+    ALTER COLUMN move_report_no TYPE TEXT,
+    ALTER COLUMN manufacture_lot TYPE TEXT,
+    ALTER COLUMN filling_lot TYPE TEXT;
+
+-- Trigger에서 반영하지 못한 이력 (확인 후 이 파일 재실행으로 보정)
+CREATE TABLE IF NOT EXISTS cy_cylinder_timeline_repair (
+    id BIGSERIAL PRIMARY KEY,
+    cylinder_no TEXT,
+    history_seq NUMERIC,
+    op TEXT NOT NULL,                     -- INSERT / UPDATE / DELETE
+    error TEXT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- 용기별 최신순 조회용 커버링 인덱스 (쿼리의 ORDER BY ... DESC NULLS LAST와 같은 순서)
+CREATE INDEX IF NOT EXISTS idx_cy_cylinder_timeline_latest
+    ON cy_cylinder_timeline (cylinder_no, move_date DESC NULLS LAST, history_seq DESC NULLS LAST)
+    INCLUDE (move_code, condition_code, location_code, move_report_no, manufacture_lot, filling_lot);
+
+ALTER TABLE cy_cylinder_timeline SET (
+    autovacuum_vacuum_insert_scale_factor = 0.01,
+    autovacuum_analyze_scale_factor = 0.02
+);
+
+
+-- 원천 이력 1행 → 타임라인 Upsert
+CREATE OR REPLACE FUNCTION cy_cylinder_timeline_upsert(h "fcms_cdc"."tr_cylinder_status_histories")
+RETURNS VOID AS $$
+BEGIN
+    IF h."CYLINDER_NO" IS NULL OR h."HISTORY_SEQ" IS NULL THEN
+        RETURN;
+    END IF;
+
+    INSERT INTO cy_cylinder_timeline (
+        cylinder_no, history_seq, move_date, move_code, condition_code,
+        location_code, move_report_no, manufacture_lot, filling_lot
+    ) VALUES (
+        RTRIM(h."CYLINDER_NO"),
+        h."HISTORY_SEQ",
+        h."MOVE_DATE",
+        TRIM(h."MOVE_CODE"),
+        TRIM(h."CONDITION_CODE"),
+        RTRIM(h."LOCATION_CODE"),
+        NULLIF(RTRIM(h."MOVE_REPORT_NO"), ''),
+        NULLIF(CONCAT(
+            COALESCE(h."MANUFACTURE_LOT_HEADER", ''),
+            COALESCE(h."MANUFACTURE_LOT_NO", ''),
+            CASE WHEN h."MANUFACTURE_LOT_BRANCH" IS NOT NULL AND h."MANUFACTURE_LOT_BRANCH" != ''
+                 THEN '-' || h."MANUFACTURE_LOT_BRANCH"
+                 ELSE ''
+            END
+        ), ''),
+        NULLIF(CONCAT(
+            COALESCE(h."FILLING_LOT_HEADER", ''),
+            COALESCE(h."FILLING_LOT_NO", ''),
+            CASE WHEN h."FILLING_LOT_BRANCH" IS NOT NULL AND h."FILLING_LOT_BRANCH" != ''
+                 THEN '-' || h."FILLING_LOT_BRANCH"
+                 ELSE ''
+            END
+        ), '')
+    )
+    ON CONFLICT (cylinder_no, history_seq) DO UPDATE SET
+        move_date = EXCLUDED.move_date,
+        move_code = EXCLUDED.move_code,
+        condition_code = EXCLUDED.condition_code,
+        location_code = EXCLUDED.location_code,
+        move_report_no = EXCLUDED.move_report_no,
+        manufacture_lot = EXCLUDED.manufacture_lot,
+        filling_lot = EXCLUDED.filling_lot;
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- Trigger 함수 (tr_cylinder_status_histories 변경 시)
+-- 파생 테이블 오류는 원천 적재를 실패시키지 않는다. (EXCEPTION 블록이 타임라인 변경만 되돌림)
+CREATE OR REPLACE FUNCTION trigger_sync_cylinder_timeline()
+RETURNS TRIGGER AS $$
+BEGIN
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            DELETE FROM cy_cylinder_timeline
+            WHERE cylinder_no = RTRIM(OLD."CYLINDER_NO")
+              AND history_seq = OLD."HISTORY_SEQ";
+            RETURN OLD;
+        END IF;
+
+        -- 키가 바뀌는 UPDATE면 이전 키 행을 먼저 지운다.
+        IF TG_OP = 'UPDATE'
+           AND (RTRIM(OLD."CYLINDER_NO") IS DISTINCT FROM RTRIM(NEW."CYLINDER_NO")
+                OR OLD."HISTORY_SEQ" IS DISTINCT FROM NEW."HISTORY_SEQ") THEN
+            DELETE FROM cy_cylinder_timeline
+            WHERE cylinder_no = RTRIM(OLD."CYLINDER_NO")
+              AND history_seq = OLD."HISTORY_SEQ";
+        END IF;
+
+        PERFORM cy_cylinder_timeline_upsert(NEW);
+    EXCEPTION WHEN OTHERS THEN
+        RAISE WARNING 'cy_cylinder_timeline 반영 실패 (%): %', TG_OP, SQLERRM;
+        IF TG_OP = 'DELETE' THEN
+            INSERT INTO cy_cylinder_timeline_repair (cylinder_no, history_seq, op, error)
+            VALUES (RTRIM(OLD."CYLINDER_NO"), OLD."HISTORY_SEQ", TG_OP, SQLERRM);
+            RETURN OLD;
+        END IF;
+        INSERT INTO cy_cylinder_timeline_repair (cylinder_no, history_seq, op, error)
+        VALUES (RTRIM(NEW."CYLINDER_NO"), NEW."HISTORY_SEQ", TG_OP, SQLERRM);
+    END;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_sync_cylinder_timeline ON "fcms_cdc"."tr_cylinder_status_histories";
+CREATE TRIGGER trigger_sync_cylinder_timeline
+AFTER INSERT OR UPDATE OR DELETE ON "fcms_cdc"."tr_cylinder_status_histories"
+FOR EACH ROW EXECUTE FUNCTION trigger_sync_cylinder_timeline();
+
+
+-- 기존 이력 채우기
+INSERT INTO cy_cylinder_timeline (
+    cylinder_no, history_seq, move_date, move_code, condition_code,
+    location_code, move_report_no, manufacture_lot, filling_lot
+)
+SELECT
+    RTRIM(h."CYLINDER_NO"),
+    h."HISTORY_SEQ",
+    h."MOVE_DATE",
+    TRIM(h."MOVE_CODE"),
+    TRIM(h."CONDITION_CODE"),
+    RTRIM(h."LOCATION_CODE"),
+    NULLIF(RTRIM(h."MOVE_REPORT_NO"), ''),
+    NULLIF(CONCAT(
+        COALESCE(h."MANUFACTURE_LOT_HEADER", ''),
+        COALESCE(h."MANUFACTURE_LOT_NO", ''),
+        CASE WHEN h."MANUFACTURE_LOT_BRANCH" IS NOT NULL AND h."MANUFACTURE_LOT_BRANCH" != ''
+             THEN '-' || h."MANUFACTURE_LOT_BRANCH"
+             ELSE ''
+        END
+    ), ''),
+    NULLIF(CONCAT(
+        COALESCE(h."FILLING_LOT_HEADER", ''),
+        COALESCE(h."FILLING_LOT_NO", ''),
+        CASE WHEN h."FILLING_LOT_BRANCH" IS NOT NULL AND h."FILLING_LOT_BRANCH" != ''
+             THEN '-' || h."FILLING_LOT_BRANCH"
+             ELSE ''
+        END
+    ), '')
+FROM "fcms_cdc"."tr_cylinder_status_histories" h
+WHERE h."CYLINDER_NO" IS NOT NULL
+  AND h."HISTORY_SEQ" IS NOT NULL
+ON CONFLICT (cylinder_no, history_seq) DO NOTHING;
+
+ANALYZE cy_cylinder_timeline;
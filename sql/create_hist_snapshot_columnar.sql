@@ -0,0 +1,173 @@
+-- 일별 스냅샷 컬럼형 저장 (hist_snapshot_day_vector)
+-- 실행: python manage.py execute_sql_file sql/create_hist_snapshot_columnar.sql
+--       (기존 DAILY 스냅샷은 이 스크립트 끝에서 채운다. 재실행 시 이미 채운 날짜는 건너뜀)
+--
+-- hist_inventory_snapshot은 (시각, 용기종류 키, 상태, 위치)마다 가스명/밸브/스펙 문자열을 반복 저장하는
+-- 넓은 행이라, 수년치 점유율 추이를 보려면 버킷마다 MAX(snapshot_datetime) CTE로 큰 테이블을 훑어야 했다.
+-- 이 스크립트는 DAILY 스냅샷을 다음과 같이 압축해 둔다.
+--   hist_snapshot_type_dim   : 용기종류 키 사전 (type_id ↔ 키, 가스명/용량/밸브/스펙/사용처 한 번만 저장)
+--   hist_snapshot_status_dim : 상태 사전 (slot 번호 = 수량 배열의 위치, 새 상태는 뒤에 추가)
+--   hist_snapshot_day_vector : (날짜, type_id) 한 행에 상태별 수량 배열 qty[slot]와 총량 (위치는 합산)
+-- 날짜별로 그 날의 마지막 DAILY 스냅샷만 쓴다. (history/snapshot_series.py, hist_snapshot_daily_total과 같은 규칙)
+-- 스냅샷 적재 명령(take_daily_snapshot/take_month_end_snapshot)이 적재 직후
+-- hist_snapshot_columnar_refresh()를 호출하므로 Trigger는 없다. 원본 스냅샷 테이블은 그대로 둔다.
+
+CREATE TABLE IF NOT EXISTS hist_snapshot_type_dim (
+    type_id SERIAL PRIMARY KEY,
+    cylinder_type_key VARCHAR(32) NOT NULL UNIQUE,
+    gas_name VARCHAR(100) NOT NULL DEFAULT '',
+    capacity VARCHAR(50),
+    valve_spec VARCHAR(200),
+    cylinder_spec VARCHAR(200),
+    usage_place VARCHAR(100),
+    last_snapshot_at TIMESTAMPTZ          -- 속성을 가져온 스냅샷 시각 (과거 날짜 재계산이 덮어쓰지 않도록)
+);
+
+ALTER TABLE hist_snapshot_type_dim ADD COLUMN IF NOT EXISTS last_snapshot_at TIMESTAMPTZ;
+
+CREATE TABLE IF NOT EXISTS hist_snapshot_status_dim (
+    slot SMALLINT PRIMARY KEY,          -- hist_snapshot_day_vector.qty 배열 위치 (1부터)
+    status VARCHAR(20) NOT NULL UNIQUE
+);
+
+-- 자주 쓰는 상태는 고정 위치로 미리 등록 (없는 상태는 refresh 시 뒤에 추가)
+INSERT INTO hist_snapshot_status_dim (slot, status) VALUES
+    (1, '보관:미회수'),
+    (2, '보관:회수'),
+    (3, '충전중'),
+    (4, '충전완료'),
+    (5, '분석중'),
+    (6, '분석완료'),
+    (7, '제품'),
+    (8, '출하'),
+    (9, '이상'),
+    (10, '정비대상'),
+    (11, '폐기')
+ON CONFLICT DO NOTHING;
+
+CREATE TABLE IF NOT EXISTS hist_snapshot_day_vector (
+    type_id INTEGER NOT NULL REFERENCES hist_snapshot_type_dim (type_id),
+    snapshot_date DATE NOT NULL,                 -- KST 날짜
+    snapshot_datetime TIMESTAMPTZ NOT NULL,      -- 사용한 그 날의 마지막 DAILY 스냅샷 시각
+    total_qty INTEGER NOT NULL DEFAULT 0,
+    qty INTEGER[] NOT NULL,                      -- qty[slot] = 상태별 수량 (배열보다 큰 slot은 0으로 본다)
+    PRIMARY KEY (type_id, snapshot_date)
+);
+
+-- 날짜 순서로만 추가되므로 BRIN이 작고 날짜 범위 조회에 충분하다.
+CREATE INDEX IF NOT EXISTS idx_hist_snapshot_day_vector_date_brin
+    ON hist_snapshot_day_vector USING brin (snapshot_date);
+
+
+-- 하루치 재계산: p_start ~ p_end(미포함)는 해당 KST 날짜의 시작/다음 날 시작 (Python에서 전달)
+CREATE OR REPLACE FUNCTION hist_snapshot_columnar_refresh(p_day DATE, p_start TIMESTAMPTZ, p_end TIMESTAMPTZ)
+RETURNS INTEGER AS $$
+DECLARE
+    v_last TIMESTAMPTZ;
+    v_slots INTEGER;
+    v_rows INTEGER;
+BEGIN
+    SELECT MAX(snapshot_datetime) INTO v_last
+    FROM hist_inventory_snapshot
+    WHERE snapshot_type = 'DAILY'
+      AND snapshot_datetime >= p_start
+      AND snapshot_datetime < p_end;
+
+    DELETE FROM hist_snapshot_day_vector WHERE snapshot_date = p_day;
+
+    IF v_last IS NULL THEN
+        RETURN 0;
+    END IF;
+
+    -- 새 상태는 사전 끝에 slot 추가 (동시 실행 시 slot 번호가 겹치지 않도록 잠금)
+    LOCK TABLE hist_snapshot_status_dim IN SHARE ROW EXCLUSIVE MODE;
+    INSERT INTO hist_snapshot_status_dim (slot, status)
+    SELECT (SELECT COALESCE(MAX(slot), 0) FROM hist_snapshot_status_dim) + ROW_NUMBER() OVER (ORDER BY s.status),
+           s.status
+    FROM (
+        SELECT DISTINCT status
+        FROM hist_inventory_snapshot
+        WHERE snapshot_type = 'DAILY' AND snapshot_datetime = v_last
+    ) s
+    WHERE NOT EXISTS (SELECT 1 FROM hist_snapshot_status_dim d WHERE d.status = s.status);
+
+    SELECT MAX(slot) INTO v_slots FROM hist_snapshot_status_dim;
+
+    -- 용기종류 사전 (속성은 가장 최근 스냅샷 기준: 이미 기록된 것보다 이전 날짜를 재계산할 때는 갱신하지 않음)
+    INSERT INTO hist_snapshot_type_dim AS t (
+        cylinder_type_key, gas_name, capacity, valve_spec, cylinder_spec, usage_place, last_snapshot_at
+    )
+    SELECT DISTINCT ON (s.cylinder_type_key)
+        s.cylinder_type_key, s.gas_name, s.capacity, s.valve_spec, s.cylinder_spec, s.usage_place, v_last
+    FROM hist_inventory_snapshot s
+    WHERE s.snapshot_type = 'DAILY' AND s.snapshot_datetime = v_last
+    ORDER BY s.cylinder_type_key, s.qty DESC
+    ON CONFLICT (cylinder_type_key) DO UPDATE
+    SET gas_name = EXCLUDED.gas_name,
+        capacity = EXCLUDED.capacity,
+        valve_spec = EXCLUDED.valve_spec,
+        cylinder_spec = EXCLUDED.cylinder_spec,
+        usage_place = EXCLUDED.usage_place,
+        last_snapshot_at = EXCLUDED.last_snapshot_at
+    WHERE t.last_snapshot_at IS NULL
+       OR t.last_snapshot_at < EXCLUDED.last_snapshot_at
+       OR (t.last_snapshot_at = EXCLUDED.last_snapshot_at AND (
+              t.gas_name IS DISTINCT FROM EXCLUDED.gas_name
+           OR t.capacity IS DISTINCT FROM EXCLUDED.capacity
+           OR t.valve_spec IS DISTINCT FROM EXCLUDED.valve_spec
+           OR t.cylinder_spec IS DISTINCT FROM EXCLUDED.cylinder_spec
+           OR t.usage_place IS DISTINCT FROM EXCLUDED.usage_place));
+
+    -- (용기종류, 상태) 합계를 slot 순서의 고정 길이 배열로
+    WITH agg AS (
+        SELECT t.type_id, d.slot, SUM(s.qty)::INTEGER AS qty
+        FROM hist_inventory_snapshot s
+        JOIN hist_snapshot_type_dim t ON t.cylinder_type_key = s.cylinder_type_key
+        JOIN hist_snapshot_status_dim d ON d.status = s.status
+        WHERE s.snapshot_type = 'DAILY' AND s.snapshot_datetime = v_last
+        GROUP BY t.type_id, d.slot
+    ),
+    types AS (
+        SELECT DISTINCT type_id FROM agg
+    )
+    INSERT INTO hist_snapshot_day_vector (type_id, snapshot_date, snapshot_datetime, total_qty, qty)
+    SELECT
+        ty.type_id,
+        p_day,
+        v_last,
+        COALESCE(SUM(a.qty), 0),
+        array_agg(COALESCE(a.qty, 0) ORDER BY g.slot)
+    FROM types ty
+    CROSS JOIN generate_series(1, v_slots) AS g(slot)
+    LEFT JOIN agg a ON a.type_id = ty.type_id AND a.slot = g.slot
+    GROUP BY ty.type_id;
+
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+    RETURN v_rows;
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- 기존 DAILY 스냅샷 채우기 (KST 날짜 오름차순, 이미 채운 날짜는 건너뜀)
+-- 날짜 경계는 history/snapshot_series.day_bounds()와 같이 settings.TIME_ZONE(Asia/Seoul) 기준이다.
+-- 채우기 전에 화면이 이 테이블로 전환되어 빈 결과가 보이지 않도록 테이블 생성과 같은 실행에서 처리한다.
+DO $$
+DECLARE
+    v_day DATE;
+BEGIN
+    FOR v_day IN
+        SELECT DISTINCT (s.snapshot_datetime AT TIME ZONE 'Asia/Seoul')::DATE
+        FROM hist_inventory_snapshot s
+        WHERE s.snapshot_type = 'DAILY'
+        ORDER BY 1
+    LOOP
+        IF NOT EXISTS (SELECT 1 FROM hist_snapshot_day_vector v WHERE v.snapshot_date = v_day) THEN
+            PERFORM hist_snapshot_columnar_refresh(
+                v_day,
+                v_day::TIMESTAMP AT TIME ZONE 'Asia/Seoul',
+                (v_day + 1)::TIMESTAMP AT TIME ZONE 'Asia/Seoul'
+            );
+        END IF;
+    END LOOP;
+END;
+$$;
@@ -0,0 +1,299 @@
+-- 일별 이동 집계 큐브 (cy_history_daily_movement)
+-- 실행: python manage.py execute_sql_file sql/create_history_daily_movement.sql
+--       python manage.py rebuild_history_daily_movement   (최초 1회 / 불일치 시 재계산)
+--
+-- HistoryRepository.get_period_summary()는 이력 추이 화면마다 원천 이력을 cy_cylinder_current와
+-- RTRIM 조인한 뒤 COUNT(DISTINCT ...) FILTER 5개를 주/월 두 번 계산했다.
+-- 이 테이블은 (일자, 용기종류 키, 이동코드) → 건수를 미리 집계해 두며,
+-- 주/월/임의 기간 요약은 이 테이블을 date_trunc로 다시 묶기만 한다. (수년 범위도 수천 행)
+--
+-- 이동코드 분류(출하/입하/충전/정비)는 Python 쪽(HistoryRepository.get_move_code_sets)에서
+-- 정하므로 분류가 아닌 이동코드 단위로 저장하고, 조회 시 분류별로 합산한다.
+-- 용기종류 키는 기존 쿼리처럼 "현재 스냅샷" 기준이다. (스냅샷에 없으면 '')
+--
+-- 건수는 기존 쿼리와 같이 (CYLINDER_NO, HISTORY_SEQ) 기준으로 중복을 제거한 이력 수다.
+-- (CDC 재전송 등으로 같은 이력 행이 원천에 두 번 들어와도 한 번만 센다.)
+--
+-- 두 Trigger가 문장(statement) 단위로 증감(delta)만 반영한다. (cy_inventory_rollup과 같은 방식)
+--   1) tr_cylinder_status_histories 변경: 바뀐 (용기, HISTORY_SEQ, 일자, 코드)마다 문장 전/후 원천 존재 여부를
+--      비교해 처음 생긴 이력만 +1, 마지막 사본이 사라진 이력만 -1
+--   2) cy_cylinder_current 변경: 용기종류 키가 바뀐(추가/삭제 포함) 용기의 이력 건수를
+--      이전 키에서 새 키로 옮긴다. TRUNCATE는 모든 건수를 ''(스냅샷 없음)로 옮긴다.
+-- 이력과 스냅샷이 서로 다른 트랜잭션에서 동시에 바뀌면 어긋날 수 있으므로 주기적으로 재계산을 권장한다.
+--
+-- 스냅샷 전체 교체(sync_cylinder_snapshot --full 의 DELETE + INSERT)에서는 2)가 모든 용기의 이력을
+-- 두 번 다시 훑게 되므로, 교체 트랜잭션이 SET LOCAL cynow.skip_daily_movement_rekey = 'on' 으로
+-- 2)를 끄고 교체 후 cy_history_daily_movement_rebuild()를 한 번 호출한다.
+
+CREATE TABLE IF NOT EXISTS cy_history_daily_movement (
+    move_day DATE NOT NULL,
+    cylinder_type_key VARCHAR(32) NOT NULL DEFAULT '',   -- '' = 스냅샷에 없는 용기
+    move_code VARCHAR(10) NOT NULL,                      -- TRIM("MOVE_CODE")
+    cnt INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (move_day, cylinder_type_key, move_code)
+);
+
+CREATE INDEX IF NOT EXISTS idx_cy_history_daily_movement_type_day
+    ON cy_history_daily_movement (cylinder_type_key, move_day);
+
+
+-- (일자, 키, 코드, 증감) 행 배열 → Upsert
+CREATE OR REPLACE FUNCTION cy_history_daily_movement_add(p_delta JSONB)
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO cy_history_daily_movement AS m (move_day, cylinder_type_key, move_code, cnt, updated_at)
+    SELECT d.move_day, d.cylinder_type_key, d.move_code, SUM(d.cnt), NOW()
+    FROM jsonb_to_recordset(p_delta) AS d(move_day DATE, cylinder_type_key TEXT, move_code TEXT, cnt INTEGER)
+    GROUP BY d.move_day, d.cylinder_type_key, d.move_code
+    HAVING SUM(d.cnt) <> 0
+    ORDER BY d.move_day, d.cylinder_type_key, d.move_code  -- 동시 갱신 시 잠금 순서를 고정해 교착 방지
+    ON CONFLICT (move_day, cylinder_type_key, move_code) DO UPDATE SET
+        cnt = m.cnt + EXCLUDED.cnt,
+        updated_at = NOW();
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- 1) 이력 행 증감 (중복 제거 기준: 용기 + HISTORY_SEQ)
+-- 문장 후 원천 건수(now)에서 새 행을 빼고 옛 행을 더하면 문장 전 건수가 된다.
+-- 전/후 존재 여부가 바뀐 이력만 ±1 (이미 있던 이력의 사본 INSERT, 사본이 남는 DELETE는 0)
+CREATE OR REPLACE FUNCTION cy_history_daily_movement_merge(
+    p_old "fcms_cdc"."tr_cylinder_status_histories"[],
+    p_new "fcms_cdc"."tr_cylinder_status_histories"[]
+) RETURNS VOID AS $$
+BEGIN
+    PERFORM cy_history_daily_movement_add((
+        WITH changed AS (
+            SELECT RTRIM(o."CYLINDER_NO") AS cylinder_no, o."HISTORY_SEQ" AS history_seq,
+                   o."MOVE_DATE"::DATE AS move_day, TRIM(o."MOVE_CODE") AS move_code,
+                   1 AS old_cnt, 0 AS new_cnt
+            FROM unnest(p_old) o
+            WHERE o."MOVE_DATE" IS NOT NULL AND o."MOVE_CODE" IS NOT NULL
+            UNION ALL
+            SELECT RTRIM(n."CYLINDER_NO"), n."HISTORY_SEQ",
+                   n."MOVE_DATE"::DATE, TRIM(n."MOVE_CODE"),
+                   0, 1
+            FROM unnest(p_new) n
+            WHERE n."MOVE_DATE" IS NOT NULL AND n."MOVE_CODE" IS NOT NULL
+        ),
+        ids AS (
+            SELECT cylinder_no, history_seq, move_day, move_code,
+                   SUM(old_cnt) AS old_cnt, SUM(new_cnt) AS new_cnt
+            FROM changed
+            GROUP BY 1, 2, 3, 4
+        ),
+        deltas AS (
+            SELECT
+                i.cylinder_no, i.move_day, i.move_code,
+                (CASE WHEN cur.cnt > 0 THEN 1 ELSE 0 END)
+                - (CASE WHEN cur.cnt - i.new_cnt + i.old_cnt > 0 THEN 1 ELSE 0 END) AS cnt
+            FROM ids i
+            CROSS JOIN LATERAL (
+                SELECT COUNT(*) AS cnt
+                FROM "fcms_cdc"."tr_cylinder_status_histories" h
+                WHERE RTRIM(h."CYLINDER_NO") = i.cylinder_no
+                  AND h."MOVE_DATE" >= i.move_day
+                  AND h."MOVE_DATE" < i.move_day + 1
+                  AND h."HISTORY_SEQ" IS NOT DISTINCT FROM i.history_seq
+                  AND TRIM(h."MOVE_CODE") = i.move_code
+            ) cur
+        )
+        SELECT COALESCE(jsonb_agg(jsonb_build_object(
+            'move_day', x.move_day, 'cylinder_type_key', x.cylinder_type_key,
+            'move_code', x.move_code, 'cnt', x.cnt
+        )), '[]'::jsonb)
+        FROM (
+            SELECT
+                d.move_day,
+                COALESCE(c.cylinder_type_key, '') AS cylinder_type_key,
+                d.move_code,
+                SUM(d.cnt) AS cnt
+            FROM deltas d
+            LEFT JOIN cy_cylinder_current c
+                ON c.cylinder_no = d.cylinder_no
+            WHERE d.cnt <> 0
+            GROUP BY 1, 2, 3
+        ) x
+    ));
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- 2) 용기종류 키 변경: 해당 용기들의 전체 이력 건수를 이전 키 → 새 키로 이동
+CREATE OR REPLACE FUNCTION cy_history_daily_movement_rekey(
+    p_old cy_cylinder_current[],
+    p_new cy_cylinder_current[]
+) RETURNS VOID AS $$
+BEGIN
+    PERFORM cy_history_daily_movement_add((
+        WITH changed AS (
+            SELECT
+                COALESCE(o.cylinder_no, n.cylinder_no) AS cylinder_no,
+                COALESCE(o.cylinder_type_key, '') AS old_key,
+                COALESCE(n.cylinder_type_key, '') AS new_key
+            FROM unnest(p_old) o
+            FULL JOIN unnest(p_new) n ON n.cylinder_no = o.cylinder_no
+        ),
+        moves AS (
+            SELECT
+                h."MOVE_DATE"::DATE AS move_day,
+                ch.old_key,
+                ch.new_key,
+                TRIM(h."MOVE_CODE") AS move_code,
+                COUNT(DISTINCT (ch.cylinder_no, h."HISTORY_SEQ")) AS cnt
+            FROM changed ch
+            JOIN "fcms_cdc"."tr_cylinder_status_histories" h
+                ON RTRIM(h."CYLINDER_NO") = ch.cylinder_no
+            WHERE ch.old_key <> ch.new_key
+              AND h."MOVE_DATE" IS NOT NULL
+              AND h."MOVE_CODE" IS NOT NULL
+            GROUP BY 1, 2, 3, 4
+        )
+        SELECT COALESCE(jsonb_agg(d), '[]'::jsonb)
+        FROM (
+            SELECT move_day, old_key AS cylinder_type_key, move_code, -cnt AS cnt FROM moves
+            UNION ALL
+            SELECT move_day, new_key AS cylinder_type_key, move_code, cnt FROM moves
+        ) d
+    ));
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- Trigger 함수: 원천 이력 (전이 테이블은 이벤트별로만 존재하므로 TG_OP로 분기)
+CREATE OR REPLACE FUNCTION cy_history_daily_movement_history_trigger()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM cy_history_daily_movement_merge(ARRAY[]::"fcms_cdc"."tr_cylinder_status_histories"[], ARRAY(SELECT n FROM movement_new n));
+    ELSIF TG_OP = 'UPDATE' THEN
+        PERFORM cy_history_daily_movement_merge(ARRAY(SELECT o FROM movement_old o), ARRAY(SELECT n FROM movement_new n));
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM cy_history_daily_movement_merge(ARRAY(SELECT o FROM movement_old o), ARRAY[]::"fcms_cdc"."tr_cylinder_status_histories"[]);
+    ELSIF TG_OP = 'TRUNCATE' THEN
+        DELETE FROM cy_history_daily_movement;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_cy_history_daily_movement_insert ON "fcms_cdc"."tr_cylinder_status_histories";
+CREATE TRIGGER trigger_cy_history_daily_movement_insert
+AFTER INSERT ON "fcms_cdc"."tr_cylinder_status_histories"
+REFERENCING NEW TABLE AS movement_new
+FOR EACH STATEMENT EXECUTE FUNCTION cy_history_daily_movement_history_trigger();
+
+DROP TRIGGER IF EXISTS trigger_cy_history_daily_movement_update ON "fcms_cdc"."tr_cylinder_status_histories";
+CREATE TRIGGER trigger_cy_history_daily_movement_update
+AFTER UPDATE ON "fcms_cdc"."tr_cylinder_status_histories"
+REFERENCING OLD TABLE AS movement_old NEW TABLE AS movement_new
+FOR EACH STATEMENT EXECUTE FUNCTION cy_history_daily_movement_history_trigger();
+
+DROP TRIGGER IF EXISTS trigger_cy_history_daily_movement_delete ON "fcms_cdc"."tr_cylinder_status_histories";
+CREATE TRIGGER trigger_cy_history_daily_movement_delete
+AFTER DELETE ON "fcms_cdc"."tr_cylinder_status_histories"
+REFERENCING OLD TABLE AS movement_old
+FOR EACH STATEMENT EXECUTE FUNCTION cy_history_daily_movement_history_trigger();
+
+DROP TRIGGER IF EXISTS trigger_cy_history_daily_movement_truncate ON "fcms_cdc"."tr_cylinder_status_histories";
+CREATE TRIGGER trigger_cy_history_daily_movement_truncate
+AFTER TRUNCATE ON "fcms_cdc"."tr_cylinder_status_histories"
+FOR EACH STATEMENT EXECUTE FUNCTION cy_history_daily_movement_history_trigger();
+
+
+-- Trigger 함수: 스냅샷 (용기종류 키 변경)
+CREATE OR REPLACE FUNCTION cy_history_daily_movement_snapshot_trigger()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- 전체 교체 중에는 건너뛴다 (교체 후 호출 측이 재계산)
+    IF current_setting('cynow.skip_daily_movement_rekey', true) = 'on' THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_OP = 'INSERT' THEN
+        PERFORM cy_history_daily_movement_rekey(ARRAY[]::cy_cylinder_current[], ARRAY(SELECT n FROM movement_snapshot_new n));
+    ELSIF TG_OP = 'UPDATE' THEN
+        -- 키가 바뀐 행만 넘긴다. (대부분의 Upsert는 키가 그대로라 아무 일도 하지 않음)
+        PERFORM cy_history_daily_movement_rekey(
+            ARRAY(
+                SELECT o FROM movement_snapshot_old o
+                JOIN movement_snapshot_new n ON n.cylinder_no = o.cylinder_no
+                WHERE n.cylinder_type_key IS DISTINCT FROM o.cylinder_type_key
+            ),
+            ARRAY(
+                SELECT n FROM movement_snapshot_new n
+                JOIN movement_snapshot_old o ON o.cylinder_no = n.cylinder_no
+                WHERE n.cylinder_type_key IS DISTINCT FROM o.cylinder_type_key
+            )
+        );
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM cy_history_daily_movement_rekey(ARRAY(SELECT o FROM movement_snapshot_old o), ARRAY[]::cy_cylinder_current[]);
+    ELSIF TG_OP = 'TRUNCATE' THEN
+        -- 스냅샷이 비면 모든 이력은 '' 키로 모인다.
+        PERFORM cy_history_daily_movement_add((
+            SELECT COALESCE(jsonb_agg(d), '[]'::jsonb)
+            FROM (
+                SELECT move_day, cylinder_type_key, move_code, -cnt AS cnt
+                FROM cy_history_daily_movement WHERE cylinder_type_key <> '' AND cnt <> 0
+                UNION ALL
+                SELECT move_day, '' AS cylinder_type_key, move_code, cnt
+                FROM cy_history_daily_movement WHERE cylinder_type_key <> '' AND cnt <> 0
+            ) d
+        ));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_cy_history_daily_movement_snapshot_insert ON cy_cylinder_current;
+CREATE TRIGGER trigger_cy_history_daily_movement_snapshot_insert
+AFTER INSERT ON cy_cylinder_current
+REFERENCING NEW TABLE AS movement_snapshot_new
+FOR EACH STATEMENT EXECUTE FUNCTION cy_history_daily_movement_snapshot_trigger();
+
+DROP TRIGGER IF EXISTS trigger_cy_history_daily_movement_snapshot_update ON cy_cylinder_current;
+CREATE TRIGGER trigger_cy_history_daily_movement_snapshot_update
+AFTER UPDATE ON cy_cylinder_current
+REFERENCING OLD TABLE AS movement_snapshot_old NEW TABLE AS movement_snapshot_new
+FOR EACH STATEMENT EXECUTE FUNCTION cy_history_daily_movement_snapshot_trigger();
+
+DROP TRIGGER IF EXISTS trigger_cy_history_daily_movement_snapshot_delete ON cy_cylinder_current;
+CREATE TRIGGER trigger_cy_history_daily_movement_snapshot_delete
+AFTER DELETE ON cy_cylinder_current
+REFERENCING OLD TABLE AS movement_snapshot_old
+FOR EACH STATEMENT EXECUTE FUNCTION cy_history_daily_movement_snapshot_trigger();
+
+DROP TRIGGER IF EXISTS trigger_cy_history_daily_movement_snapshot_truncate ON cy_cylinder_current;
+CREATE TRIGGER trigger_cy_history_daily_movement_snapshot_truncate
+AFTER TRUNCATE ON cy_cylinder_current
+FOR EACH STATEMENT EXECUTE FUNCTION cy_history_daily_movement_snapshot_trigger();
+
+
+-- 전체 재계산 (최초 적재 / 정합성 복구용)
+CREATE OR REPLACE FUNCTION cy_history_daily_movement_rebuild()
+RETURNS INTEGER AS $$
+DECLARE
+    v_rows INTEGER;
+BEGIN
+    LOCK TABLE cy_history_daily_movement IN EXCLUSIVE MODE;
+    DELETE FROM cy_history_daily_movement;
+
+    INSERT INTO cy_history_daily_movement (move_day, cylinder_type_key, move_code, cnt, updated_at)
+    SELECT
+        h."MOVE_DATE"::DATE,
+        COALESCE(c.cylinder_type_key, ''),
+        TRIM(h."MOVE_CODE"),
+        COUNT(DISTINCT (RTRIM(h."CYLINDER_NO"), h."HISTORY_SEQ")),
+        NOW()
+    FROM "fcms_cdc"."tr_cylinder_status_histories" h
+    LEFT JOIN cy_cylinder_current c
+        ON c.cylinder_no = RTRIM(h."CYLINDER_NO")
+    WHERE h."MOVE_DATE" IS NOT NULL
+      AND h."MOVE_CODE" IS NOT NULL
+    GROUP BY 1, 2, 3;
+
+    GET DIAGNOSTICS v_rows = ROW_COUNT;
+    RETURN v_rows;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,170 @@
+-- 재고 요약 롤업 테이블 (cy_inventory_rollup)
+-- 실행: python manage.py execute_sql_file sql/create_inventory_rollup.sql
+--       python manage.py rebuild_inventory_rollup   (최초 1회 / 불일치 시 재계산)
+--
+-- CylinderRepository.get_inventory_summary()가 매 요청마다 스냅샷 전체를 GROUP BY 하던 것을
+-- (용기종류 키, 정규화 밸브/재질, 정규화 상태, EndUser) 단위의 사전 집계 테이블로 대체한다.
+--
+-- cy_cylinder_current에 대한 문장(statement) 단위 Trigger가 전이 테이블(OLD/NEW TABLE)로
+-- 변경된 행의 증감(delta)만 반영한다. 배치 함수, 단일 함수, Python Upsert, --full 교체 등
+-- 어떤 경로로 스냅샷이 바뀌어도 롤업이 함께 갱신된다.
+-- 정규화 규칙은 get_inventory_summary()의 기존 SELECT/GROUP BY와 동일하다.
+-- 기존 요약은 INNER JOIN ma_cylinders로 원천에 없는 고아 용기를 뺐다. 롤업은 조인 없이 스냅샷만
+-- 집계하므로 고아 행이 스냅샷에 남지 않게 한다.
+--   - LISTEN/NOTIFY 경로: ma_cylinders DELETE 알림 → refresh_cylinders()가 해당 용기 삭제
+--   - 워터마크 증분(sync_cylinder_current, sync_cylinder_snapshot): 실행마다 delete_orphaned_cylinders()
+--   - --full 재생성: ma_cylinders 기준으로 다시 만든다
+--   - cy_inventory_rollup_rebuild(): 재계산 전에 고아 행을 먼저 삭제
+
+CREATE TABLE IF NOT EXISTS cy_inventory_rollup (
+    rollup_key VARCHAR(32) PRIMARY KEY,   -- 아래 그룹 컬럼들의 MD5
+    cylinder_type_key VARCHAR(32),
+    gas_name VARCHAR(100),
+    capacity NUMERIC,
+    valve_spec VARCHAR(200),              -- 밸브 그룹명 → 밸브명 → ''
+    cylinder_spec VARCHAR(200),
+    status VARCHAR(20),                   -- 레거시 '보관'은 보관:미회수/보관:회수로 분리
+    enduser VARCHAR(50),
+    valve_spec_raw VARCHAR(200),
+    qty INTEGER NOT NULL DEFAULT 0,
+    available_qty INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_cy_inventory_rollup_type_key ON cy_inventory_rollup(cylinder_type_key);
+CREATE INDEX IF NOT EXISTS idx_cy_inventory_rollup_gas ON cy_inventory_rollup(gas_name);
+CREATE INDEX IF NOT EXISTS idx_cy_inventory_rollup_status ON cy_inventory_rollup(status);
+
+
+-- 스냅샷 행 배열 → 롤업 그룹별 증감 반영
+-- p_old 행은 -1, p_new 행은 +1로 합산해 순증감이 0이 아닌 그룹만 Upsert 한다.
+CREATE OR REPLACE FUNCTION cy_inventory_rollup_merge(p_old cy_cylinder_current[], p_new cy_cylinder_current[])
+RETURNS VOID AS $$
+BEGIN
+    WITH changed AS (
+        SELECT -1 AS sign, o.* FROM unnest(p_old) o
+        UNION ALL
+        SELECT 1 AS sign, n.* FROM unnest(p_new) n
+    ),
+    normalized AS (
+        SELECT
+            ch.sign,
+            ch.cylinder_type_key,
+            ch.dashboard_gas_name AS gas_name,
+            ch.dashboard_capacity AS capacity,
+            COALESCE(
+                NULLIF(RTRIM(ch.dashboard_valve_group_name), ''),
+                NULLIF(RTRIM(ch.dashboard_valve_spec_name), ''),
+                ''
+            ) AS valve_spec,
+            RTRIM(ch.dashboard_cylinder_spec_name) AS cylinder_spec,
+            CASE
+                WHEN ch.dashboard_status IN ('보관:미회수', '보관:회수') THEN ch.dashboard_status
+                WHEN ch.dashboard_status = '보관' THEN
+                    CASE WHEN ch.condition_code = '102' THEN '보관:회수' ELSE '보관:미회수' END
+                ELSE ch.dashboard_status
+            END AS status,
+            RTRIM(ch.dashboard_enduser) AS enduser,
+            RTRIM(ch.dashboard_valve_spec_name) AS valve_spec_raw
+        FROM changed ch
+        WHERE ch.dashboard_enduser IS NOT NULL
+    ),
+    delta AS (
+        SELECT
+            MD5(CONCAT_WS(chr(31),
+                COALESCE(cylinder_type_key, chr(0)), COALESCE(gas_name, chr(0)),
+                COALESCE(capacity::TEXT, chr(0)), COALESCE(valve_spec, chr(0)),
+                COALESCE(cylinder_spec, chr(0)), COALESCE(status, chr(0)),
+                COALESCE(enduser, chr(0)), COALESCE(valve_spec_raw, chr(0))
+            )) AS rollup_key,
+            cylinder_type_key, gas_name, capacity, valve_spec, cylinder_spec,
+            status, enduser, valve_spec_raw,
+            SUM(sign) AS qty,
+            SUM(CASE WHEN status IN ('보관:미회수', '보관:회수') THEN sign ELSE 0 END) AS available_qty
+        FROM normalized
+        GROUP BY cylinder_type_key, gas_name, capacity, valve_spec, cylinder_spec,
+                 status, enduser, valve_spec_raw
+        HAVING SUM(sign) <> 0
+    )
+    INSERT INTO cy_inventory_rollup AS r (
+        rollup_key, cylinder_type_key, gas_name, capacity, valve_spec, cylinder_spec,
+        status, enduser, valve_spec_raw, qty, available_qty, updated_at
+    )
+    SELECT
+        rollup_key, cylinder_type_key, gas_name, capacity, valve_spec, cylinder_spec,
+        status, enduser, valve_spec_raw, qty, available_qty, NOW()
+    FROM delta
+    ORDER BY rollup_key  -- 동시 갱신 시 잠금 순서를 고정해 교착 방지
+    ON CONFLICT (rollup_key) DO UPDATE SET
+        qty = r.qty + EXCLUDED.qty,
+        available_qty = r.available_qty + EXCLUDED.available_qty,
+        updated_at = NOW();
+
+    DELETE FROM cy_inventory_rollup WHERE qty <= 0;
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- Trigger 함수 (전이 테이블은 이벤트별로만 존재하므로 TG_OP로 분기)
+CREATE OR REPLACE FUNCTION cy_inventory_rollup_trigger()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM cy_inventory_rollup_merge(ARRAY[]::cy_cylinder_current[], ARRAY(SELECT n FROM rollup_new n));
+    ELSIF TG_OP = 'UPDATE' THEN
+        PERFORM cy_inventory_rollup_merge(ARRAY(SELECT o FROM rollup_old o), ARRAY(SELECT n FROM rollup_new n));
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM cy_inventory_rollup_merge(ARRAY(SELECT o FROM rollup_old o), ARRAY[]::cy_cylinder_current[]);
+    ELSIF TG_OP = 'TRUNCATE' THEN
+        DELETE FROM cy_inventory_rollup;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_cy_inventory_rollup_insert ON cy_cylinder_current;
+CREATE TRIGGER trigger_cy_inventory_rollup_insert
+AFTER INSERT ON cy_cylinder_current
+REFERENCING NEW TABLE AS rollup_new
+FOR EACH STATEMENT EXECUTE FUNCTION cy_inventory_rollup_trigger();
+
+DROP TRIGGER IF EXISTS trigger_cy_inventory_rollup_update ON cy_cylinder_current;
+CREATE TRIGGER trigger_cy_inventory_rollup_update
+AFTER UPDATE ON cy_cylinder_current
+REFERENCING OLD TABLE AS rollup_old NEW TABLE AS rollup_new
+FOR EACH STATEMENT EXECUTE FUNCTION cy_inventory_rollup_trigger();
+
+DROP TRIGGER IF EXISTS trigger_cy_inventory_rollup_delete ON cy_cylinder_current;
+CREATE TRIGGER trigger_cy_inventory_rollup_delete
+AFTER DELETE ON cy_cylinder_current
+REFERENCING OLD TABLE AS rollup_old
+FOR EACH STATEMENT EXECUTE FUNCTION cy_inventory_rollup_trigger();
+
+DROP TRIGGER IF EXISTS trigger_cy_inventory_rollup_truncate ON cy_cylinder_current;
+CREATE TRIGGER trigger_cy_inventory_rollup_truncate
+AFTER TRUNCATE ON cy_cylinder_current
+FOR EACH STATEMENT EXECUTE FUNCTION cy_inventory_rollup_trigger();
+
+
+-- 전체 재계산 (최초 적재 / 정합성 복구용)
+CREATE OR REPLACE FUNCTION cy_inventory_rollup_rebuild()
+RETURNS INTEGER AS $$
+DECLARE
+    v_groups INTEGER;
+BEGIN
+    LOCK TABLE cy_cylinder_current IN SHARE ROW EXCLUSIVE MODE;
+    -- 원천에 없는 고아 행 정리 (DELETE Trigger가 롤업에서 빼지만 아래에서 어차피 다시 계산)
+    DELETE FROM cy_cylinder_current cc
+    WHERE NOT EXISTS (
+        SELECT 1 FROM "fcms_cdc"."ma_cylinders" c
+        WHERE RTRIM(c."CYLINDER_NO") = cc.cylinder_no
+    );
+    DELETE FROM cy_inventory_rollup;
+    PERFORM cy_inventory_rollup_merge(
+        ARRAY[]::cy_cylinder_current[],
+        ARRAY(SELECT c FROM cy_cylinder_current c)
+    );
+    SELECT COUNT(*) INTO v_groups FROM cy_inventory_rollup;
+    RETURN v_groups;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,168 @@
+-- 보고서 저장본 무효화 Trigger (report_artifact)
+-- 실행 순서:
+--   python manage.py migrate reports          (report_artifact 테이블 생성)
+--   python manage.py execute_sql_file sql/create_report_artifact_invalidation.sql
+--   python manage.py build_report_artifacts   (지난 기간 저장본 채우기 + 열린 기간 행 미리 생성, 매일 cron)
+--
+-- 마감된 기간(지난 날짜/주/달)의 보고서는 reports/artifacts.py가 계산 결과(JSON, Excel 파일 경로)를
+-- report_artifact에 저장해 두고 다시 계산하지 않는다. 이 Trigger가 설치되어 있어야 저장본을 사용한다.
+--
+-- CDC로 이력이 늦게 들어오거나(INSERT) 수정/삭제되면, 바뀐 행의 MOVE_DATE 날짜를 포함하는
+-- 저장본만 payload_json/xlsx_path를 비우고 invalidation_count를 올린다.
+-- 계산 중에 무효화된 저장본은 invalidation_count가 달라져 저장되지 않는다.
+-- 문장(statement) 단위 Trigger라 CDC 배치 한 번에 UPDATE 한 번이며, 해당 저장본이 없으면 아무 행도 바꾸지 않는다.
+-- 주간/월간 Excel 저장본은 이력이 아니라 일별 스냅샷 합계(hist_snapshot_daily_total)를 비교하므로
+-- 그 테이블이 바뀌면(스냅샷 재실행, 백필) 해당 날짜를 비교에 쓰는 저장본의 xlsx_path만 비운다.
+-- (월간은 지난 달 말일 스냅샷도 쓰므로 기간 시작 전날까지 본다. 화면 payload는 이력 기반이라 그대로 둔다.)
+-- 저장본 행은 기간이 열려 있을 때 build_report_artifacts가 미리 만든다. 그래야 커밋 전 CDC 트랜잭션이
+-- 이 UPDATE로 행을 잠그고 있어, 조회 쪽 저장(invalidation_count 조건부 UPDATE)이 커밋을 기다린 뒤 거부된다.
+
+CREATE OR REPLACE FUNCTION report_artifact_invalidate(p_days DATE[])
+RETURNS VOID AS $$
+BEGIN
+    IF p_days IS NULL OR cardinality(p_days) = 0 THEN
+        RETURN;
+    END IF;
+
+    UPDATE report_artifact a
+    SET payload_json = NULL,
+        xlsx_path = NULL,
+        invalidation_count = a.invalidation_count + 1,
+        invalidated_at = NOW()
+    WHERE a.period_start <= (SELECT MAX(d) FROM unnest(p_days) d)
+      AND a.period_end >= (SELECT MIN(d) FROM unnest(p_days) d)
+      AND EXISTS (
+          SELECT 1 FROM unnest(p_days) d
+          WHERE d BETWEEN a.period_start AND a.period_end
+      );
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- Trigger 함수 (전이 테이블은 이벤트별로만 존재하므로 TG_OP로 분기)
+CREATE OR REPLACE FUNCTION trigger_report_artifact_invalidate()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM report_artifact_invalidate(ARRAY(
+            SELECT DISTINCT n."MOVE_DATE"::DATE FROM artifact_new n WHERE n."MOVE_DATE" IS NOT NULL
+        ));
+    ELSIF TG_OP = 'UPDATE' THEN
+        PERFORM report_artifact_invalidate(ARRAY(
+            SELECT o."MOVE_DATE"::DATE FROM artifact_old o WHERE o."MOVE_DATE" IS NOT NULL
+            UNION
+            SELECT n."MOVE_DATE"::DATE FROM artifact_new n WHERE n."MOVE_DATE" IS NOT NULL
+        ));
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM report_artifact_invalidate(ARRAY(
+            SELECT DISTINCT o."MOVE_DATE"::DATE FROM artifact_old o WHERE o."MOVE_DATE" IS NOT NULL
+        ));
+    ELSIF TG_OP = 'TRUNCATE' THEN
+        UPDATE report_artifact
+        SET payload_json = NULL,
+            xlsx_path = NULL,
+            invalidation_count = invalidation_count + 1,
+            invalidated_at = NOW();
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- reports/artifacts.py는 아래 INSERT Trigger 이름으로 설치 여부를 확인한다.
+DROP TRIGGER IF EXISTS trigger_report_artifact_invalidate_insert ON "fcms_cdc"."tr_cylinder_status_histories";
+CREATE TRIGGER trigger_report_artifact_invalidate_insert
+AFTER INSERT ON "fcms_cdc"."tr_cylinder_status_histories"
+REFERENCING NEW TABLE AS artifact_new
+FOR EACH STATEMENT EXECUTE FUNCTION trigger_report_artifact_invalidate();
+
+DROP TRIGGER IF EXISTS trigger_report_artifact_invalidate_update ON "fcms_cdc"."tr_cylinder_status_histories";
+CREATE TRIGGER trigger_report_artifact_invalidate_update
+AFTER UPDATE ON "fcms_cdc"."tr_cylinder_status_histories"
+REFERENCING OLD TABLE AS artifact_old NEW TABLE AS artifact_new
+FOR EACH STATEMENT EXECUTE FUNCTION trigger_report_artifact_invalidate();
+
+DROP TRIGGER IF EXISTS trigger_report_artifact_invalidate_delete ON "fcms_cdc"."tr_cylinder_status_histories";
+CREATE TRIGGER trigger_report_artifact_invalidate_delete
+AFTER DELETE ON "fcms_cdc"."tr_cylinder_status_histories"
+REFERENCING OLD TABLE AS artifact_old
+FOR EACH STATEMENT EXECUTE FUNCTION trigger_report_artifact_invalidate();
+
+DROP TRIGGER IF EXISTS trigger_report_artifact_invalidate_truncate ON "fcms_cdc"."tr_cylinder_status_histories";
+CREATE TRIGGER trigger_report_artifact_invalidate_truncate
+AFTER TRUNCATE ON "fcms_cdc"."tr_cylinder_status_histories"
+FOR EACH STATEMENT EXECUTE FUNCTION trigger_report_artifact_invalidate();
+
+
+-- 스냅샷 기반 Excel 무효화 (주간: 주 시작/말, 월간: 지난 달 말일/그 달 말일 스냅샷)
+CREATE OR REPLACE FUNCTION report_artifact_invalidate_xlsx(p_days DATE[])
+RETURNS VOID AS $$
+BEGIN
+    IF p_days IS NULL OR cardinality(p_days) = 0 THEN
+        RETURN;
+    END IF;
+
+    UPDATE report_artifact a
+    SET xlsx_path = NULL,
+        invalidation_count = a.invalidation_count + 1,
+        invalidated_at = NOW()
+    WHERE a.report_type IN ('WEEKLY', 'MONTHLY')
+      AND a.period_start - 1 <= (SELECT MAX(d) FROM unnest(p_days) d)
+      AND a.period_end >= (SELECT MIN(d) FROM unnest(p_days) d)
+      AND EXISTS (
+          SELECT 1 FROM unnest(p_days) d
+          WHERE d BETWEEN a.period_start - 1 AND a.period_end
+      );
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION trigger_report_artifact_invalidate_snapshot()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM report_artifact_invalidate_xlsx(ARRAY(
+            SELECT DISTINCT n.snapshot_date FROM snapshot_artifact_new n
+        ));
+    ELSIF TG_OP = 'UPDATE' THEN
+        PERFORM report_artifact_invalidate_xlsx(ARRAY(
+            SELECT o.snapshot_date FROM snapshot_artifact_old o
+            UNION
+            SELECT n.snapshot_date FROM snapshot_artifact_new n
+        ));
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM report_artifact_invalidate_xlsx(ARRAY(
+            SELECT DISTINCT o.snapshot_date FROM snapshot_artifact_old o
+        ));
+    ELSIF TG_OP = 'TRUNCATE' THEN
+        UPDATE report_artifact
+        SET xlsx_path = NULL,
+            invalidation_count = invalidation_count + 1,
+            invalidated_at = NOW()
+        WHERE report_type IN ('WEEKLY', 'MONTHLY');
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_report_artifact_invalidate_snapshot_insert ON hist_snapshot_daily_total;
+CREATE TRIGGER trigger_report_artifact_invalidate_snapshot_insert
+AFTER INSERT ON hist_snapshot_daily_total
+REFERENCING NEW TABLE AS snapshot_artifact_new
+FOR EACH STATEMENT EXECUTE FUNCTION trigger_report_artifact_invalidate_snapshot();
+
+DROP TRIGGER IF EXISTS trigger_report_artifact_invalidate_snapshot_update ON hist_snapshot_daily_total;
+CREATE TRIGGER trigger_report_artifact_invalidate_snapshot_update
+AFTER UPDATE ON hist_snapshot_daily_total
+REFERENCING OLD TABLE AS snapshot_artifact_old NEW TABLE AS snapshot_artifact_new
+FOR EACH STATEMENT EXECUTE FUNCTION trigger_report_artifact_invalidate_snapshot();
+
+DROP TRIGGER IF EXISTS trigger_report_artifact_invalidate_snapshot_delete ON hist_snapshot_daily_total;
+CREATE TRIGGER trigger_report_artifact_invalidate_snapshot_delete
+AFTER DELETE ON hist_snapshot_daily_total
+REFERENCING OLD TABLE AS snapshot_artifact_old
+FOR EACH STATEMENT EXECUTE FUNCTION trigger_report_artifact_invalidate_snapshot();
+
+DROP TRIGGER IF EXISTS trigger_report_artifact_invalidate_snapshot_truncate ON hist_snapshot_daily_total;
+CREATE TRIGGER trigger_report_artifact_invalidate_snapshot_truncate
+AFTER TRUNCATE ON hist_snapshot_daily_total
+FOR EACH STATEMENT EXECUTE FUNCTION trigger_report_artifact_invalidate_snapshot();
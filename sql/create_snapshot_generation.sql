@@ -0,0 +1,40 @@
+-- 스냅샷 세대(generation) 카운터 (cy_snapshot_generation_seq)
+-- 실행: python manage.py execute_sql_file sql/create_snapshot_generation.sql
+--
+-- core/utils/snapshot_cache.py는 시퀀스 last_value를 캐시 키에 넣어 재고 요약/용기종류 그룹 결과를
+-- gunicorn 워커 간에 공유하고, 스냅샷이 바뀌면 자동으로 무효화한다.
+--
+-- 시퀀스는 트랜잭션과 무관하게 바로 보이므로 커밋 전에 올리면(문장 Trigger, DEFERRED Trigger 모두)
+-- 조회 쪽이 새 세대 키에 커밋 전(이전) 데이터를 캐시할 수 있다. 그래서 세대는 커밋 후에만 올린다.
+-- - cy_cylinder_current가 바뀌면(INSERT/UPDATE/DELETE/TRUNCATE) Trigger는 cy_snapshot_changed NOTIFY만 한다.
+--   NOTIFY는 커밋된 뒤에만 전달되고 롤백되면 버려진다. (같은 트랜잭션의 같은 payload는 하나로 합쳐짐)
+-- - listen_cylinder_changes 리스너가 이 NOTIFY를 받아 nextval로 세대를 올린다.
+--   배치/단일 함수를 직접 부르는 SQL 경로, CDC Trigger 경로도 이걸로 반영된다.
+-- - Python writer(snapshot_sync, sync_cylinder_snapshot)는 transaction.on_commit으로 직접 한 번 더 올린다.
+--   (리스너를 띄우지 않은 환경 대비, 중복 증가는 캐시 재계산 한 번일 뿐이라 무해)
+--
+-- 한 행짜리 카운터 테이블을 UPDATE하면 스냅샷 writer들이 그 행 잠금에서 줄을 서므로 시퀀스를 쓴다.
+
+-- 이전 버전 정리 (카운터 테이블, 커밋 전 증가 Trigger)
+DROP TRIGGER IF EXISTS trigger_cy_snapshot_generation ON cy_cylinder_current;
+DROP TABLE IF EXISTS cy_snapshot_generation;
+DROP TRIGGER IF EXISTS trigger_cy_snapshot_generation_commit ON cy_cylinder_current;
+DROP FUNCTION IF EXISTS cy_snapshot_generation_bump_at_commit();
+
+CREATE SEQUENCE IF NOT EXISTS cy_snapshot_generation_seq;
+
+
+-- 변경 알림 (커밋 후 전달)
+CREATE OR REPLACE FUNCTION cy_snapshot_generation_bump()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify('cy_snapshot_changed', '');
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 전이 테이블을 쓰지 않으므로 여러 이벤트를 하나의 Trigger로 묶을 수 있다.
+DROP TRIGGER IF EXISTS trigger_cy_snapshot_generation_statement ON cy_cylinder_current;
+CREATE TRIGGER trigger_cy_snapshot_generation_statement
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON cy_cylinder_current
+FOR EACH STATEMENT EXECUTE FUNCTION cy_snapshot_generation_bump();
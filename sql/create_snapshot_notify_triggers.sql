@@ -0,0 +1,41 @@
+-- cy_cylinder_current 갱신용 경량 NOTIFY Trigger
+-- 실행: python manage.py execute_sql_file sql/create_snapshot_notify_triggers.sql
+--
+-- 기존 create_sync_triggers.sql은 CDC 행마다 sync_cylinder_current_single()을
+-- Debezium sink 트랜잭션 안에서 실행해 sink 처리량을 떨어뜨린다.
+-- 이 파일은 그 Trigger를 제거하고 용기번호만 NOTIFY 하도록 교체한다.
+-- 실제 스냅샷 갱신은 `python manage.py listen_cylinder_changes` 데몬이 배치로 수행한다.
+-- (같은 트랜잭션 안의 동일 payload NOTIFY는 PostgreSQL이 1건으로 합친다)
+-- 워터마크 catch-up(core/utils/sync_cursor.py)과 같은 소스를 보도록 상태 이력(tr_cylinder_status_histories) 변경도 NOTIFY 한다.
+
+CREATE OR REPLACE FUNCTION notify_cylinder_changed()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM pg_notify('cy_cylinder_changed', RTRIM(OLD."CYLINDER_NO"));
+        RETURN OLD;
+    END IF;
+    PERFORM pg_notify('cy_cylinder_changed', RTRIM(NEW."CYLINDER_NO"));
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 기존 무거운 Trigger 제거
+DROP TRIGGER IF EXISTS trigger_sync_cylinder_current_cylinders ON "fcms_cdc"."ma_cylinders";
+DROP TRIGGER IF EXISTS trigger_sync_cylinder_current_status ON "fcms_cdc"."tr_latest_cylinder_statuses";
+
+-- 경량 NOTIFY Trigger 생성
+DROP TRIGGER IF EXISTS trigger_notify_cylinder_changed ON "fcms_cdc"."ma_cylinders";
+CREATE TRIGGER trigger_notify_cylinder_changed
+AFTER INSERT OR UPDATE OR DELETE ON "fcms_cdc"."ma_cylinders"
+FOR EACH ROW EXECUTE FUNCTION notify_cylinder_changed();
+
+DROP TRIGGER IF EXISTS trigger_notify_cylinder_changed ON "fcms_cdc"."tr_latest_cylinder_statuses";
+CREATE TRIGGER trigger_notify_cylinder_changed
+AFTER INSERT OR UPDATE ON "fcms_cdc"."tr_latest_cylinder_statuses"
+FOR EACH ROW EXECUTE FUNCTION notify_cylinder_changed();
+
+DROP TRIGGER IF EXISTS trigger_notify_cylinder_changed ON "fcms_cdc"."tr_cylinder_status_histories";
+CREATE TRIGGER trigger_notify_cylinder_changed
+AFTER INSERT OR UPDATE OR DELETE ON "fcms_cdc"."tr_cylinder_status_histories"
+FOR EACH ROW EXECUTE FUNCTION notify_cylinder_changed();
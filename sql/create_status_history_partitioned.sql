@@ -0,0 +1,298 @@
+-- 상태 이력 월 파티션 읽기 모델 (cy_status_history)
+-- 실행: python manage.py execute_sql_file sql/create_status_history_partitioned.sql
+--
+-- 보고서/이력 화면(HistoryRepository, reports/views.py)은 모두 MOVE_DATE 기간으로
+-- tr_cylinder_status_histories를 읽는다. 원천 테이블은 Debezium sink가 적재하는 단일 테이블이라
+-- 수년치 이력이 한 힙/인덱스에 쌓여 있고, 일주일 보고서도 큰 인덱스를 타거나 전체를 읽게 된다.
+--
+-- cy_status_history는 원천과 같은 컬럼(이름/타입)을 가진 CYNOW 소유 복제본이며
+-- MOVE_DATE 기준 월 단위 RANGE 파티션으로 나뉜다. 쿼리는 테이블 이름만 바꾸면 되고,
+-- MOVE_DATE >= 시작 AND MOVE_DATE < 끝 조건이면 플래너가 해당 월 파티션(1~2개)만 읽는다.
+-- (DATE(MOVE_DATE) = ... 같은 식은 파티션 프루닝/인덱스 모두 쓰지 못하므로 쓰지 않는다.)
+--
+-- 원천 테이블 Trigger가 CDC 적재(INSERT/UPDATE/DELETE)를 행 단위로 반영한다.
+-- Trigger는 INSERT만 하고 파티션을 만들지 않는다. (CREATE TABLE ... PARTITION OF는 부모에
+-- ACCESS EXCLUSIVE 잠금을 잡아 CDC 적재와 보고서 조회를 모두 막는다.)
+-- 다가오는 달 파티션은 cron으로 미리 만든다. 파티션이 없는 달/MOVE_DATE NULL 행은 DEFAULT 파티션에 들어간다.
+--   0 3 * * * /path/to/venv/bin/python /path/to/manage.py ensure_status_history_partitions --months 3
+-- Trigger/채우기의 INSERT는 SELECT NEW.* 대신 두 테이블에 모두 있는 컬럼을 이름으로 나열한다.
+-- (아래 DO 블록이 설치 시점의 컬럼 목록으로 Trigger 함수를 만든다. 원천에 컬럼이 추가/재배열되어도
+--  CDC 적재가 깨지지 않고, 새 컬럼은 이 스크립트를 다시 실행하기 전까지 복제하지 않는다.)
+-- 새 컬럼까지 복제하려면 cy_status_history를 DROP 한 뒤 이 스크립트를 다시 실행한다.
+-- Trigger 안의 오류는 잡아서 cy_status_history_repair에 행(JSON)을 남기고 원천 적재는 그대로 진행한다.
+-- 보정: SELECT cy_status_history_replay_repairs();  (원천의 현재 행으로 해당 키를 다시 복사)
+-- 기존 이력 채우기는 아래 INSERT ... SELECT 가 수행한다. (재실행 시 이미 있는 파티션의 행은 건너뜀)
+
+CREATE TABLE IF NOT EXISTS cy_status_history (
+    LIKE "fcms_cdc"."tr_cylinder_status_histories" INCLUDING DEFAULTS
+) PARTITION BY RANGE ("MOVE_DATE");
+
+CREATE TABLE IF NOT EXISTS cy_status_history_default
+    PARTITION OF cy_status_history DEFAULT;
+
+-- 부모에 만든 인덱스는 모든 파티션(이후 생성분 포함)에 자동으로 만들어진다.
+-- Trigger의 행 교체용
+CREATE INDEX IF NOT EXISTS idx_cy_status_history_key
+    ON cy_status_history ("CYLINDER_NO", "HISTORY_SEQ");
+-- 기간 조회 / 이동코드 + 기간 조회
+CREATE INDEX IF NOT EXISTS idx_cy_status_history_move_date
+    ON cy_status_history ("MOVE_DATE");
+CREATE INDEX IF NOT EXISTS idx_cy_status_history_code_date
+    ON cy_status_history ("MOVE_CODE", "MOVE_DATE");
+-- 용기 + 기간 조회 (RTRIM 키, create_trimmed_key_indexes.sql 참고)
+CREATE INDEX IF NOT EXISTS idx_cy_status_history_no_rtrim
+    ON cy_status_history ((RTRIM("CYLINDER_NO")), "MOVE_DATE" DESC);
+
+
+-- 월 파티션 생성 (이미 있으면 아무것도 하지 않음, 만들었으면 TRUE)
+-- Trigger에서는 호출하지 않는다. ensure_status_history_partitions 명령(cron)과 아래 채우기에서만 쓴다.
+-- 그 달 행이 이미 DEFAULT 파티션에 들어와 있으면 PARTITION OF가 실패하므로,
+-- 빈 테이블을 만들어 DEFAULT의 해당 월 행을 옮긴 뒤 ATTACH 한다. (인덱스는 ATTACH 때 자동 생성)
+CREATE OR REPLACE FUNCTION cy_status_history_ensure_partition(p_moment TIMESTAMP)
+RETURNS BOOLEAN AS $$
+DECLARE
+    v_from DATE := date_trunc('month', p_moment)::DATE;
+    v_to DATE := (date_trunc('month', p_moment) + INTERVAL '1 month')::DATE;
+    v_name TEXT := 'cy_status_history_' || to_char(p_moment, 'YYYY"m"MM');
+BEGIN
+    IF p_moment IS NULL OR to_regclass(v_name) IS NOT NULL THEN
+        RETURN FALSE;
+    END IF;
+
+    -- 다른 세션과 동시에 만들지 않도록 부모를 먼저 잠근다.
+    LOCK TABLE cy_status_history IN SHARE ROW EXCLUSIVE MODE;
+    IF to_regclass(v_name) IS NOT NULL THEN
+        RETURN FALSE;
+    END IF;
+
+    EXECUTE format('CREATE TABLE %I (LIKE cy_status_history INCLUDING DEFAULTS)', v_name);
+    EXECUTE format(
+        'WITH moved AS (
+             DELETE FROM cy_status_history_default
+             WHERE "MOVE_DATE" >= %L AND "MOVE_DATE" < %L
+             RETURNING *
+         )
+         INSERT INTO %I SELECT * FROM moved',
+        v_from, v_to, v_name
+    );
+    EXECUTE format(
+        'ALTER TABLE cy_status_history ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+        v_name, v_from, v_to
+    );
+    RETURN TRUE;
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- Trigger에서 반영하지 못한 이력 (old_row/new_row는 원천 행 JSON)
+CREATE TABLE IF NOT EXISTS cy_status_history_repair (
+    id BIGSERIAL PRIMARY KEY,
+    op TEXT NOT NULL,                     -- INSERT / UPDATE / DELETE
+    cylinder_no TEXT,
+    history_seq TEXT,
+    old_row JSONB,
+    new_row JSONB,
+    error TEXT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    replayed_at TIMESTAMPTZ
+);
+
+
+-- Trigger 함수 / 보정 함수 (tr_cylinder_status_histories 변경 시)
+-- (CYLINDER_NO, HISTORY_SEQ, MOVE_DATE)로 기존 행을 지우고 새 행을 넣는다. 파티션은 만들지 않는다.
+-- MOVE_DATE 조건이 있어 삭제도 한 파티션만 본다. CDC 재전송(같은 행 INSERT 반복)에도 중복되지 않는다.
+-- INSERT 컬럼 목록은 cy_status_history와 원천에 모두 있는 컬럼 (cy_status_history 컬럼 순서)
+DO $do$
+DECLARE
+    v_cols TEXT;
+    v_new_cols TEXT;
+    v_src_cols TEXT;
+BEGIN
+    SELECT
+        string_agg(quote_ident(a.attname), ', ' ORDER BY a.attnum),
+        string_agg('NEW.' || quote_ident(a.attname), ', ' ORDER BY a.attnum),
+        string_agg('h.' || quote_ident(a.attname), ', ' ORDER BY a.attnum)
+    INTO v_cols, v_new_cols, v_src_cols
+    FROM pg_attribute a
+    WHERE a.attrelid = 'cy_status_history'::regclass
+      AND a.attnum > 0
+      AND NOT a.attisdropped
+      AND EXISTS (
+          SELECT 1 FROM pg_attribute s
+          WHERE s.attrelid = '"fcms_cdc"."tr_cylinder_status_histories"'::regclass
+            AND s.attname = a.attname
+            AND s.attnum > 0
+            AND NOT s.attisdropped
+      );
+
+    EXECUTE format($fn$
+        CREATE OR REPLACE FUNCTION trigger_sync_status_history()
+        RETURNS TRIGGER AS $body$
+        BEGIN
+            BEGIN
+                IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                    IF OLD."MOVE_DATE" IS NULL THEN
+                        DELETE FROM cy_status_history
+                        WHERE "MOVE_DATE" IS NULL
+                          AND "CYLINDER_NO" = OLD."CYLINDER_NO"
+                          AND "HISTORY_SEQ" = OLD."HISTORY_SEQ";
+                    ELSE
+                        DELETE FROM cy_status_history
+                        WHERE "MOVE_DATE" = OLD."MOVE_DATE"
+                          AND "CYLINDER_NO" = OLD."CYLINDER_NO"
+                          AND "HISTORY_SEQ" = OLD."HISTORY_SEQ";
+                    END IF;
+                END IF;
+
+                IF TG_OP = 'INSERT' THEN
+                    IF NEW."MOVE_DATE" IS NULL THEN
+                        DELETE FROM cy_status_history
+                        WHERE "MOVE_DATE" IS NULL
+                          AND "CYLINDER_NO" = NEW."CYLINDER_NO"
+                          AND "HISTORY_SEQ" = NEW."HISTORY_SEQ";
+                    ELSE
+                        DELETE FROM cy_status_history
+                        WHERE "MOVE_DATE" = NEW."MOVE_DATE"
+                          AND "CYLINDER_NO" = NEW."CYLINDER_NO"
+                          AND "HISTORY_SEQ" = NEW."HISTORY_SEQ";
+                    END IF;
+                END IF;
+
+                IF TG_OP <> 'DELETE' THEN
+                    INSERT INTO cy_status_history (%1$s) VALUES (%2$s);
+                END IF;
+            EXCEPTION WHEN OTHERS THEN
+                -- 복제본 오류로 CDC sink 트랜잭션을 실패시키지 않는다. (복제본 변경만 되돌림)
+                RAISE WARNING 'cy_status_history 반영 실패 (%%): %%', TG_OP, SQLERRM;
+                INSERT INTO cy_status_history_repair (op, cylinder_no, history_seq, old_row, new_row, error)
+                VALUES (
+                    TG_OP,
+                    CASE WHEN TG_OP = 'DELETE' THEN RTRIM(OLD."CYLINDER_NO"::TEXT) ELSE RTRIM(NEW."CYLINDER_NO"::TEXT) END,
+                    CASE WHEN TG_OP = 'DELETE' THEN OLD."HISTORY_SEQ"::TEXT ELSE NEW."HISTORY_SEQ"::TEXT END,
+                    CASE WHEN TG_OP <> 'INSERT' THEN to_jsonb(OLD) END,
+                    CASE WHEN TG_OP <> 'DELETE' THEN to_jsonb(NEW) END,
+                    SQLERRM
+                );
+            END;
+
+            IF TG_OP = 'DELETE' THEN
+                RETURN OLD;
+            END IF;
+            RETURN NEW;
+        END;
+        $body$ LANGUAGE plpgsql;
+    $fn$, v_cols, v_new_cols);
+
+    -- 보정: 실패한 키(UPDATE는 이전 키 포함)를 복제본에서 지우고 원천의 현재 행으로 다시 복사 (처리 건수 반환)
+    EXECUTE format($fn$
+        CREATE OR REPLACE FUNCTION cy_status_history_replay_repairs()
+        RETURNS INTEGER AS $body$
+        DECLARE
+            r RECORD;
+            v_count INTEGER := 0;
+        BEGIN
+            FOR r IN
+                SELECT id, cylinder_no, history_seq,
+                       RTRIM(old_row->>'CYLINDER_NO') AS old_cylinder_no,
+                       old_row->>'HISTORY_SEQ' AS old_history_seq
+                FROM cy_status_history_repair
+                WHERE replayed_at IS NULL
+                ORDER BY id
+                FOR UPDATE SKIP LOCKED
+            LOOP
+                DELETE FROM cy_status_history
+                WHERE (RTRIM("CYLINDER_NO") = r.cylinder_no AND "HISTORY_SEQ"::TEXT = r.history_seq)
+                   OR (RTRIM("CYLINDER_NO") = r.old_cylinder_no AND "HISTORY_SEQ"::TEXT = r.old_history_seq);
+
+                INSERT INTO cy_status_history (%1$s)
+                SELECT %2$s
+                FROM "fcms_cdc"."tr_cylinder_status_histories" h
+                WHERE (RTRIM(h."CYLINDER_NO") = r.cylinder_no AND h."HISTORY_SEQ"::TEXT = r.history_seq)
+                   OR (RTRIM(h."CYLINDER_NO") = r.old_cylinder_no AND h."HISTORY_SEQ"::TEXT = r.old_history_seq);
+
+                UPDATE cy_status_history_repair SET replayed_at = NOW() WHERE id = r.id;
+                v_count := v_count + 1;
+            END LOOP;
+            RETURN v_count;
+        END;
+        $body$ LANGUAGE plpgsql;
+    $fn$, v_cols, v_src_cols);
+END;
+$do$;
+
+DROP TRIGGER IF EXISTS trigger_sync_status_history ON "fcms_cdc"."tr_cylinder_status_histories";
+CREATE TRIGGER trigger_sync_status_history
+AFTER INSERT OR UPDATE OR DELETE ON "fcms_cdc"."tr_cylinder_status_histories"
+FOR EACH ROW EXECUTE FUNCTION trigger_sync_status_history();
+
+
+-- 기존 이력 채우기: 원천에 있는 모든 달 + 다음 달 파티션을 먼저 만들고, 비어 있는 달만 복사한다.
+-- (이후 달은 ensure_status_history_partitions 명령이 미리 만든다)
+DO $$
+DECLARE
+    v_month TIMESTAMP;
+    v_last TIMESTAMP;
+    v_name TEXT;
+    v_filled BOOLEAN;
+    v_cols TEXT;
+    v_src_cols TEXT;
+BEGIN
+    -- Trigger와 같은 컬럼 목록 (두 테이블에 모두 있는 컬럼)
+    SELECT
+        string_agg(quote_ident(a.attname), ', ' ORDER BY a.attnum),
+        string_agg('h.' || quote_ident(a.attname), ', ' ORDER BY a.attnum)
+    INTO v_cols, v_src_cols
+    FROM pg_attribute a
+    WHERE a.attrelid = 'cy_status_history'::regclass
+      AND a.attnum > 0
+      AND NOT a.attisdropped
+      AND EXISTS (
+          SELECT 1 FROM pg_attribute s
+          WHERE s.attrelid = '"fcms_cdc"."tr_cylinder_status_histories"'::regclass
+            AND s.attname = a.attname
+            AND s.attnum > 0
+            AND NOT s.attisdropped
+      );
+
+    SELECT date_trunc('month', MIN("MOVE_DATE")), date_trunc('month', GREATEST(MAX("MOVE_DATE"), NOW()::TIMESTAMP))
+    INTO v_month, v_last
+    FROM "fcms_cdc"."tr_cylinder_status_histories";
+
+    IF v_month IS NULL THEN
+        v_month := date_trunc('month', NOW()::TIMESTAMP);
+        v_last := v_month;
+    END IF;
+    v_last := v_last + INTERVAL '1 month';
+
+    WHILE v_month <= v_last LOOP
+        PERFORM cy_status_history_ensure_partition(v_month);
+        v_name := 'cy_status_history_' || to_char(v_month, 'YYYY"m"MM');
+
+        EXECUTE format('SELECT EXISTS (SELECT 1 FROM %I)', v_name) INTO v_filled;
+        IF NOT v_filled THEN
+            EXECUTE format(
+                'INSERT INTO cy_status_history (%s)
+                 SELECT %s
+                 FROM "fcms_cdc"."tr_cylinder_status_histories" h
+                 WHERE h."MOVE_DATE" >= $1
+                   AND h."MOVE_DATE" < $1 + INTERVAL ''1 month''',
+                v_cols, v_src_cols
+            ) USING v_month;
+        END IF;
+
+        v_month := v_month + INTERVAL '1 month';
+    END LOOP;
+
+    IF NOT EXISTS (SELECT 1 FROM cy_status_history_default) THEN
+        EXECUTE format(
+            'INSERT INTO cy_status_history (%s)
+             SELECT %s
+             FROM "fcms_cdc"."tr_cylinder_status_histories" h
+             WHERE h."MOVE_DATE" IS NULL',
+            v_cols, v_src_cols
+        );
+    END IF;
+END;
+$$;
+
+ANALYZE cy_status_history;
@@ -0,0 +1,257 @@
+-- cy_cylinder_current 배치 동기화 함수
+-- 실행: python manage.py execute_sql_file sql/create_sync_batch_function.sql
+-- 주의: update_sync_function_pressure.sql 먼저 실행 필요 (내압 컬럼)
+--
+-- sync_cylinder_current_single()과 동일한 조인/정책(상태 매핑, EndUser 예외/기본값,
+-- 밸브 그룹, 번역, 내압 계산)을 용기번호 배열 단위로 한 번에 처리한다.
+-- 용기 3만 개 재동기화가 3만 번 왕복 대신 청크 수만큼의 호출로 끝난다.
+--
+-- 사용 예:
+--   SELECT synced_cylinder_no FROM sync_cylinder_current_batch(ARRAY['AB1234', 'AB1235']);
+-- 반환: 실제로 Upsert된 용기번호 (원천 ma_cylinders에 없는 용기는 반환되지 않음)
+
+CREATE OR REPLACE FUNCTION sync_cylinder_current_batch(p_cylinder_nos TEXT[])
+RETURNS TABLE(synced_cylinder_no VARCHAR) AS $$
+BEGIN
+    RETURN QUERY
+    WITH req AS (
+        SELECT DISTINCT RTRIM(x) AS cyl_no
+        FROM unnest(p_cylinder_nos) AS x
+        WHERE x IS NOT NULL
+    ),
+    -- FCMS 테이블 조인하여 Raw 값 조회 (용기번호당 1행)
+    src AS (
+        SELECT DISTINCT ON (req.cyl_no)
+            req.cyl_no,
+            COALESCE(i."DISPLAY_NAME", i."FORMAL_NAME", '') AS gas_name,
+            c."CAPACITY" AS capacity,
+            c."VALVE_SPEC_CODE" AS valve_spec_code,
+            COALESCE(vs."NAME", '') AS valve_spec_name,
+            c."CYLINDER_SPEC_CODE" AS cylinder_spec_code,
+            COALESCE(cs."NAME", '') AS cylinder_spec_name,
+            COALESCE(c."USE_DEPARTMENT_CODE", '') AS usage_place,
+            COALESCE(ls."POSITION_USER_NAME", '') AS location,
+            COALESCE(ls."CONDITION_CODE", '') AS condition_code,
+            ls."POSITION_USER_NAME" AS position_user_name,
+            ls."MOVE_DATE" AS move_date,
+            c."WITHSTAND_PRESSURE_MAINTE_DATE" AS pressure_due_date,
+            GREATEST(
+                COALESCE(c."UPDATE_DATETIME", c."ADD_DATETIME"),
+                COALESCE(ls."MOVE_DATE", NOW())
+            ) AS source_updated_at,
+            c."MANUFACTURE_DATE"::DATE AS manufacture_date,
+            c."WITHSTAND_PRESSURE_MAINTE_DATE"::DATE AS pressure_test_date,
+            COALESCE(c."WITHSTAND_PRESSURE_TEST_TERM", 5)::INTEGER AS pressure_test_term  -- 기본값 5년
+        FROM req
+        JOIN "fcms_cdc"."ma_cylinders" c ON RTRIM(c."CYLINDER_NO") = req.cyl_no
+        LEFT JOIN "fcms_cdc"."ma_items" i ON c."ITEM_CODE" = i."ITEM_CODE"
+        LEFT JOIN "fcms_cdc"."ma_cylinder_specs" cs ON c."CYLINDER_SPEC_CODE" = cs."CYLINDER_SPEC_CODE"
+        LEFT JOIN "fcms_cdc"."ma_valve_specs" vs ON c."VALVE_SPEC_CODE" = vs."VALVE_SPEC_CODE"
+        LEFT JOIN "fcms_cdc"."tr_latest_cylinder_statuses" ls ON RTRIM(c."CYLINDER_NO") = RTRIM(ls."CYLINDER_NO")
+        ORDER BY req.cyl_no, ls."MOVE_DATE" DESC NULLS LAST
+    ),
+    -- 정책 적용 (상태, EndUser, 밸브 그룹)
+    resolved AS (
+        SELECT
+            s.*,
+            -- 상태 코드 → 상태명 변환 (status_mapper.py와 동일한 매핑)
+            CASE
+                WHEN s.condition_code = '00' THEN '보관:미회수'
+                WHEN s.condition_code = '100' THEN '보관:미회수'
+                WHEN s.condition_code = '102' THEN '보관:회수'
+                WHEN s.condition_code = '210' THEN '충전중'
+                WHEN s.condition_code = '220' THEN '충전완료'
+                WHEN s.condition_code = '410' THEN '분석중'
+                WHEN s.condition_code = '420' THEN '분석완료'
+                WHEN s.condition_code = '500' THEN '제품'
+                WHEN s.condition_code = '600' THEN '출하'
+                WHEN s.condition_code = '190' THEN '이상'
+                WHEN s.condition_code IN ('950', '952') THEN '정비대상'
+                WHEN s.condition_code = '990' THEN '폐기'
+                ELSE '기타'
+            END AS status,
+            -- 내압만료일 계산 (내압시험일 + 검사갱신년수)
+            (s.pressure_test_date + make_interval(years => s.pressure_test_term))::DATE AS pressure_expire_date,
+            -- 제조일로부터 10년 이상 경과했는데 검사갱신년수가 3이 아닌 경우
+            COALESCE(
+                EXTRACT(YEAR FROM AGE(CURRENT_DATE, s.manufacture_date)) >= 10
+                AND s.pressure_test_term != 3,
+                FALSE
+            ) AS needs_fcms_fix,
+            -- EndUser 결정 (예외 우선, 기본값 차순)
+            COALESCE(
+                (SELECT e.enduser FROM cy_enduser_exception e
+                 WHERE RTRIM(e.cylinder_no) = s.cyl_no AND e.is_active = TRUE
+                 LIMIT 1),
+                (SELECT d.default_enduser FROM cy_enduser_default d
+                 WHERE d.gas_name = s.gas_name
+                   AND (d.capacity IS NULL OR d.capacity = s.capacity)
+                   AND (d.valve_spec_code IS NULL OR d.valve_spec_code = s.valve_spec_code)
+                   AND (d.cylinder_spec_code IS NULL OR d.cylinder_spec_code = s.cylinder_spec_code)
+                   AND d.is_active = TRUE
+                 ORDER BY
+                   CASE WHEN d.capacity IS NOT NULL THEN 1 ELSE 2 END,
+                   CASE WHEN d.valve_spec_code IS NOT NULL THEN 1 ELSE 2 END,
+                   CASE WHEN d.cylinder_spec_code IS NOT NULL THEN 1 ELSE 2 END
+                 LIMIT 1)
+            ) AS enduser,
+            -- 밸브 그룹 조회
+            (SELECT vg.group_name
+             FROM cy_valve_group_mapping vgm
+             JOIN cy_valve_group vg ON vgm.group_id = vg.id
+             WHERE vgm.valve_spec_code = s.valve_spec_code
+               AND vgm.valve_spec_name = s.valve_spec_name
+               AND vgm.is_active = TRUE
+               AND vg.is_active = TRUE
+             LIMIT 1) AS valve_group_name
+        FROM src s
+    ),
+    -- Dashboard 밸브명 결정 (그룹이 있으면 대표 밸브명)
+    grouped AS (
+        SELECT
+            r.*,
+            COALESCE(
+                (SELECT vgm2.valve_spec_name
+                 FROM cy_valve_group_mapping vgm2
+                 JOIN cy_valve_group vg2 ON vgm2.group_id = vg2.id
+                 WHERE r.valve_group_name IS NOT NULL
+                   AND vg2.group_name = r.valve_group_name
+                   AND vgm2.is_primary = TRUE
+                   AND vgm2.is_active = TRUE
+                 LIMIT 1),
+                r.valve_spec_name
+            ) AS dashboard_valve_spec_name
+        FROM resolved r
+    ),
+    -- 번역 적용
+    translated AS (
+        SELECT
+            g.*,
+            COALESCE(
+                (SELECT t.display_ko FROM core_translation t
+                 WHERE t.field_type = 'gas_name'
+                   AND UPPER(TRIM(t.source_text)) = UPPER(TRIM(g.gas_name))
+                   AND t.is_active = TRUE
+                 LIMIT 1),
+                g.gas_name
+            ) AS dashboard_gas_name,
+            COALESCE(
+                (SELECT t.display_ko FROM core_translation t
+                 WHERE t.field_type = 'valve_spec'
+                   AND UPPER(TRIM(t.source_text)) = UPPER(TRIM(g.dashboard_valve_spec_name))
+                   AND t.is_active = TRUE
+                 LIMIT 1),
+                g.dashboard_valve_spec_name
+            ) AS dashboard_valve_spec_name_translated,
+            COALESCE(
+                (SELECT t.display_ko FROM core_translation t
+                 WHERE t.field_type = 'cylinder_spec'
+                   AND UPPER(TRIM(t.source_text)) = UPPER(TRIM(g.cylinder_spec_name))
+                   AND t.is_active = TRUE
+                 LIMIT 1),
+                g.cylinder_spec_name
+            ) AS dashboard_cylinder_spec_name_translated,
+            COALESCE(
+                (SELECT t.display_ko FROM core_translation t
+                 WHERE t.field_type = 'location'
+                   AND UPPER(TRIM(t.source_text)) = UPPER(TRIM(g.location))
+                   AND t.is_active = TRUE
+                 LIMIT 1),
+                g.location
+            ) AS dashboard_location_translated
+        FROM grouped g
+    ),
+    final AS (
+        SELECT
+            t.*,
+            -- cylinder_type_key 생성
+            MD5(
+                COALESCE(t.dashboard_gas_name, '') || '|' ||
+                COALESCE(CAST(t.capacity AS TEXT), '') || '|' ||
+                COALESCE(t.valve_group_name, t.dashboard_valve_spec_name_translated, '') || '|' ||
+                COALESCE(t.dashboard_cylinder_spec_name_translated, '') || '|' ||
+                COALESCE(t.enduser, '')
+            ) AS cylinder_type_key,
+            MD5(
+                COALESCE(t.gas_name, '') || '|' ||
+                COALESCE(CAST(t.capacity AS TEXT), '') || '|' ||
+                COALESCE(t.valve_spec_name, '') || '|' ||
+                COALESCE(t.cylinder_spec_name, '') || '|' ||
+                COALESCE(t.usage_place, '')
+            ) AS cylinder_type_key_raw,
+            t.status IN ('보관', '충전') AS is_available
+        FROM translated t
+    ),
+    upserted AS (
+        INSERT INTO cy_cylinder_current AS cc (
+            cylinder_no,
+            raw_gas_name, raw_capacity, raw_valve_spec_code, raw_valve_spec_name,
+            raw_cylinder_spec_code, raw_cylinder_spec_name, raw_usage_place,
+            raw_location, raw_condition_code, raw_position_user_name,
+            dashboard_gas_name, dashboard_capacity, dashboard_valve_spec_code,
+            dashboard_valve_spec_name, dashboard_valve_group_name,
+            dashboard_cylinder_spec_code, dashboard_cylinder_spec_name,
+            dashboard_location, dashboard_status,
+            dashboard_enduser, cylinder_type_key, cylinder_type_key_raw,
+            condition_code, move_date, pressure_due_date, last_event_at,
+            status_category, is_available, source_updated_at,
+            manufacture_date, pressure_test_date, pressure_test_term,
+            pressure_expire_date, needs_fcms_fix
+        )
+        SELECT
+            f.cyl_no,
+            f.gas_name, f.capacity, f.valve_spec_code, f.valve_spec_name,
+            f.cylinder_spec_code, f.cylinder_spec_name, f.usage_place,
+            f.location, f.condition_code, f.position_user_name,
+            f.dashboard_gas_name, f.capacity, f.valve_spec_code,
+            f.dashboard_valve_spec_name_translated, f.valve_group_name,
+            f.cylinder_spec_code, f.dashboard_cylinder_spec_name_translated,
+            f.dashboard_location_translated, f.status,
+            f.enduser, f.cylinder_type_key, f.cylinder_type_key_raw,
+            f.condition_code, f.move_date, f.pressure_due_date, f.move_date,
+            CASE WHEN f.is_available THEN '가용' ELSE '비가용' END,
+            f.is_available, f.source_updated_at,
+            f.manufacture_date, f.pressure_test_date, f.pressure_test_term,
+            f.pressure_expire_date, f.needs_fcms_fix
+        FROM final f
+        ON CONFLICT (cylinder_no) DO UPDATE SET
+            raw_gas_name = EXCLUDED.raw_gas_name,
+            raw_capacity = EXCLUDED.raw_capacity,
+            raw_valve_spec_code = EXCLUDED.raw_valve_spec_code,
+            raw_valve_spec_name = EXCLUDED.raw_valve_spec_name,
+            raw_cylinder_spec_code = EXCLUDED.raw_cylinder_spec_code,
+            raw_cylinder_spec_name = EXCLUDED.raw_cylinder_spec_name,
+            raw_usage_place = EXCLUDED.raw_usage_place,
+            raw_location = EXCLUDED.raw_location,
+            raw_condition_code = EXCLUDED.raw_condition_code,
+            raw_position_user_name = EXCLUDED.raw_position_user_name,
+            dashboard_gas_name = EXCLUDED.dashboard_gas_name,
+            dashboard_capacity = EXCLUDED.dashboard_capacity,
+            dashboard_valve_spec_code = EXCLUDED.dashboard_valve_spec_code,
+            dashboard_valve_spec_name = EXCLUDED.dashboard_valve_spec_name,
+            dashboard_valve_group_name = EXCLUDED.dashboard_valve_group_name,
+            dashboard_cylinder_spec_code = EXCLUDED.dashboard_cylinder_spec_code,
+            dashboard_cylinder_spec_name = EXCLUDED.dashboard_cylinder_spec_name,
+            dashboard_location = EXCLUDED.dashboard_location,
+            dashboard_status = EXCLUDED.dashboard_status,
+            dashboard_enduser = EXCLUDED.dashboard_enduser,
+            cylinder_type_key = EXCLUDED.cylinder_type_key,
+            cylinder_type_key_raw = EXCLUDED.cylinder_type_key_raw,
+            condition_code = EXCLUDED.condition_code,
+            move_date = EXCLUDED.move_date,
+            pressure_due_date = EXCLUDED.pressure_due_date,
+            last_event_at = EXCLUDED.last_event_at,
+            status_category = EXCLUDED.status_category,
+            is_available = EXCLUDED.is_available,
+            source_updated_at = EXCLUDED.source_updated_at,
+            manufacture_date = EXCLUDED.manufacture_date,
+            pressure_test_date = EXCLUDED.pressure_test_date,
+            pressure_test_term = EXCLUDED.pressure_test_term,
+            pressure_expire_date = EXCLUDED.pressure_expire_date,
+            needs_fcms_fix = EXCLUDED.needs_fcms_fix,
+            snapshot_updated_at = NOW()
+        RETURNING cc.cylinder_no
+    )
+    SELECT u.cylinder_no FROM upserted u;
+END;
+$$ LANGUAGE plpgsql;
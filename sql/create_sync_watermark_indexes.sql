@@ -0,0 +1,14 @@
+-- 증분 동기화 워터마크(cy_sync_cursor)용 인덱스
+-- 실행: python manage.py execute_sql_file sql/create_sync_watermark_indexes.sql
+-- MAX() / 범위 조건이 fcms_cdc 테이블 전체 스캔 없이 인덱스로 처리되도록 한다.
+
+CREATE INDEX IF NOT EXISTS idx_ma_cylinders_watermark
+    ON "fcms_cdc"."ma_cylinders" ((COALESCE("UPDATE_DATETIME", "ADD_DATETIME")));
+
+CREATE INDEX IF NOT EXISTS idx_tr_latest_cylinder_statuses_move_date
+    ON "fcms_cdc"."tr_latest_cylinder_statuses" ("MOVE_DATE");
+
+-- 이력 워터마크는 MOVE_DATE (HISTORY_SEQ는 용기별 순번일 수 있어 전역 비교 불가)
+DROP INDEX IF EXISTS "fcms_cdc".idx_tr_cylinder_status_histories_history_seq;
+CREATE INDEX IF NOT EXISTS idx_tr_cylinder_status_histories_move_date
+    ON "fcms_cdc"."tr_cylinder_status_histories" ("MOVE_DATE");
@@ -0,0 +1,52 @@
+-- 용기번호/이동서번호 정규화 키(RTRIM) 표현식 인덱스
+-- 실행: python manage.py execute_sql_file sql/create_trimmed_key_indexes.sql
+--
+-- FCMS(Oracle CHAR) 값은 오른쪽 공백이 붙어 있어 조인을 RTRIM(col)로 한다.
+-- 일반 btree 인덱스는 RTRIM(col) 조건에 쓰이지 않으므로, 같은 식으로 표현식 인덱스를 만들어
+-- 조인/조회 비용이 테이블 크기가 아닌 실제 선택된 행 수에 비례하도록 한다.
+--
+-- 주의: 인덱스를 타려면 쿼리에서도 반드시 RTRIM(col) 형태로 작성해야 한다.
+--       (TRIM(col), col::text 등 다른 식은 이 인덱스를 사용하지 못함)
+-- fcms_cdc 테이블은 Debezium sink가 적재하므로 컬럼 추가 대신 인덱스만 둔다.
+
+-- ma_cylinders
+CREATE INDEX IF NOT EXISTS idx_ma_cylinders_no_rtrim
+    ON "fcms_cdc"."ma_cylinders" ((RTRIM("CYLINDER_NO")));
+
+-- tr_latest_cylinder_statuses
+CREATE INDEX IF NOT EXISTS idx_tr_latest_cylinder_statuses_no_rtrim
+    ON "fcms_cdc"."tr_latest_cylinder_statuses" ((RTRIM("CYLINDER_NO")));
+
+-- tr_cylinder_status_histories (용기별 최신 이력 조회: ORDER BY MOVE_DATE DESC, HISTORY_SEQ DESC)
+CREATE INDEX IF NOT EXISTS idx_tr_cylinder_status_histories_no_rtrim
+    ON "fcms_cdc"."tr_cylinder_status_histories" ((RTRIM("CYLINDER_NO")), "MOVE_DATE" DESC, "HISTORY_SEQ" DESC);
+
+CREATE INDEX IF NOT EXISTS idx_tr_cylinder_status_histories_report_rtrim
+    ON "fcms_cdc"."tr_cylinder_status_histories" ((RTRIM("MOVE_REPORT_NO")));
+
+-- tr_move_report_details (용기별 최신 이동서: ORDER BY ADD_DATETIME DESC)
+CREATE INDEX IF NOT EXISTS idx_tr_move_report_details_no_rtrim
+    ON "fcms_cdc"."tr_move_report_details" ((RTRIM("CYLINDER_NO")), "ADD_DATETIME" DESC);
+
+CREATE INDEX IF NOT EXISTS idx_tr_move_report_details_report_rtrim
+    ON "fcms_cdc"."tr_move_report_details" ((RTRIM("MOVE_REPORT_NO")), (RTRIM("CYLINDER_NO")));
+
+-- 이동서 헤더/주문 (이동서번호 조인)
+CREATE INDEX IF NOT EXISTS idx_tr_move_reports_report_rtrim
+    ON "fcms_cdc"."tr_move_reports" ((RTRIM("MOVE_REPORT_NO")));
+
+CREATE INDEX IF NOT EXISTS idx_tr_orders_arrival_shipping_rtrim
+    ON "fcms_cdc"."tr_orders" ((RTRIM("ARRIVAL_SHIPPING_NO")));
+
+CREATE INDEX IF NOT EXISTS idx_tr_order_informations_report_rtrim
+    ON "fcms_cdc"."tr_order_informations" ((RTRIM("MOVE_REPORT_NO")));
+
+-- cy_cylinder_current
+CREATE INDEX IF NOT EXISTS idx_cy_cylinder_current_no_rtrim
+    ON cy_cylinder_current ((RTRIM(cylinder_no)));
+
+ANALYZE "fcms_cdc"."ma_cylinders";
+ANALYZE "fcms_cdc"."tr_latest_cylinder_statuses";
+ANALYZE "fcms_cdc"."tr_cylinder_status_histories";
+ANALYZE "fcms_cdc"."tr_move_report_details";
+ANALYZE cy_cylinder_current;
@@ -1,5 +1,5 @@
 -- sync_cylinder_current_single 함수 수정
--- cylinder_no_trimmed 컬럼을 UNIQUE KEY로 사용
+-- cylinder_no는 RTRIM된 값만 저장 (PK + cy_cylinder_current_no_trimmed_chk), ON CONFLICT (cylinder_no)
 
 CREATE OR REPLACE FUNCTION sync_cylinder_current_single(p_cylinder_no VARCHAR)
 RETURNS VOID AS $$
@@ -83,7 +83,7 @@ BEGIN
     END;
     
     -- EndUser 결정 (예외 우선, 기본값 차순)
-    -- cylinder_no_trimmed 기준으로 비교
+    -- trimmed cylinder_no 기준으로 비교
     SELECT COALESCE(
         (SELECT enduser FROM cy_enduser_exception WHERE RTRIM(cylinder_no) = v_cylinder_no_trimmed AND is_active = TRUE),
         (SELECT default_enduser FROM cy_enduser_default 
@@ -182,10 +182,9 @@ BEGIN
     
     v_is_available := v_status IN ('보관', '충전');
     
-    -- Upsert (cylinder_no_trimmed 기준으로 CONFLICT 처리)
+    -- Upsert (trimmed cylinder_no 기준으로 CONFLICT 처리)
     INSERT INTO cy_cylinder_current (
         cylinder_no,
-        cylinder_no_trimmed,  -- 새 컬럼 추가
         raw_gas_name, raw_capacity, raw_valve_spec_code, raw_valve_spec_name,
         raw_cylinder_spec_code, raw_cylinder_spec_name, raw_usage_place,
         raw_location, raw_condition_code, raw_position_user_name,
@@ -197,8 +196,7 @@ BEGIN
         condition_code, move_date, pressure_due_date, last_event_at,
         status_category, is_available, source_updated_at
     ) VALUES (
-        v_cylinder_no_trimmed,  -- cylinder_no도 trimmed 값 사용
-        v_cylinder_no_trimmed,  -- cylinder_no_trimmed
+        v_cylinder_no_trimmed,  -- cylinder_no는 trimmed 값만 저장
         v_gas_name, v_capacity, v_valve_spec_code, v_valve_spec_name,
         v_cylinder_spec_code, v_cylinder_spec_name, v_usage_place,
         v_location, v_condition_code, v_position_user_name,
@@ -211,8 +209,7 @@ BEGIN
         CASE WHEN v_is_available THEN '가용' ELSE '비가용' END,
         v_is_available, v_source_updated_at
     )
-    ON CONFLICT (cylinder_no_trimmed) DO UPDATE SET
-        cylinder_no = EXCLUDED.cylinder_no,
+    ON CONFLICT (cylinder_no) DO UPDATE SET
         raw_gas_name = EXCLUDED.raw_gas_name,
         raw_capacity = EXCLUDED.raw_capacity,
         raw_valve_spec_code = EXCLUDED.raw_valve_spec_code,
@@ -254,7 +251,7 @@ DECLARE
 BEGIN
     v_cylinder_no_trimmed := RTRIM(p_cylinder_no);
     DELETE FROM cy_cylinder_current 
-    WHERE cylinder_no_trimmed = v_cylinder_no_trimmed;
+    WHERE cylinder_no = v_cylinder_no_trimmed;
 END;
 $$ LANGUAGE plpgsql;
 
@@ -0,0 +1,17 @@
+"""견적서/단가표 백그라운드 작업 핸들러 (core/jobs.py)"""
+from core.jobs import register
+
+from .services.docx_generator import generate_price_list_from_products
+from .views import DOCX_CONTENT_TYPE, build_quote_docx, price_list_filename
+
+
+@register('voucher.quote_docx')
+def quote_docx(params):
+    output_path, filename = build_quote_docx(params['pk'])
+    return output_path, filename, DOCX_CONTENT_TYPE
+
+
+@register('voucher.price_list_docx')
+def price_list_docx(params):
+    year = params['year']
+    return generate_price_list_from_products(year), price_list_filename(year), DOCX_CONTENT_TYPE
@@ -16,6 +16,7 @@ from django.contrib import messages
 from django.conf import settings
 from django.db import models
 
+from core import jobs
 from .models import Quote, QuoteItem, Customer, DocumentTemplate, CompanyInfo
 from products.models import ProductCode
 from .services.docx_generator import (
@@ -82,44 +83,64 @@ def quote_delete(request, pk):
     return redirect('voucher:quote_list')
 
 
-@login_required
-def quote_download(request, pk):
+DOCX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+
+def build_quote_docx(pk):
     """
-    견적서 DOCX 다운로드
+    견적서 DOCX 생성 - (생성된 파일 경로, 다운로드 파일명)
     
     1. DB에서 견적서 조회
     2. 템플릿 컨텍스트 구성
     3. DOCX 생성
-    4. FileResponse로 다운로드
     """
-    quote = get_object_or_404(Quote.objects.prefetch_related('items'), pk=pk)
+    quote = Quote.objects.get(pk=pk)
     
-    try:
-        # 템플릿 조회
-        template = DocumentTemplate.get_default_template('QUOTE')
-        template_name = template.filename if template else 'offer_template.docx'
-        
-        # 컨텍스트 구성
-        context_data = build_quote_context_from_db(pk)
-        
-        # DOCX 생성
-        generator = QuoteDocxGenerator(template_name)
-        output_path = generator.generate_quote(
-            quote_info=context_data['quote_info'],
-            supplier_info=context_data['supplier_info'],
-            customer_info=context_data['customer_info'],
-            items=context_data['items'],
-            footer_info=context_data['footer_info'],
-            output_filename=f"견적서_{quote.quote_no}.docx"
+    # 템플릿 조회
+    template = DocumentTemplate.get_default_template('QUOTE')
+    template_name = template.filename if template else 'offer_template.docx'
+    
+    # 컨텍스트 구성
+    context_data = build_quote_context_from_db(pk)
+    
+    # DOCX 생성
+    filename = f"견적서_{quote.quote_no}.docx"
+    generator = QuoteDocxGenerator(template_name)
+    output_path = generator.generate_quote(
+        quote_info=context_data['quote_info'],
+        supplier_info=context_data['supplier_info'],
+        customer_info=context_data['customer_info'],
+        items=context_data['items'],
+        footer_info=context_data['footer_info'],
+        output_filename=filename
+    )
+    return output_path, filename
+
+
+@login_required
+def quote_download(request, pk):
+    """
+    견적서 DOCX 다운로드
+    
+    백그라운드 작업(core/jobs.py)이 켜져 있으면 워커가 생성하고 상태 페이지로 이동한다.
+    """
+    quote = get_object_or_404(Quote, pk=pk)
+    
+    if jobs.is_enabled():
+        return jobs.enqueue_response(
+            request, 'voucher.quote_docx', {'pk': quote.pk}, label=f"견적서 {quote.quote_no}"
         )
+    
+    try:
+        output_path, filename = build_quote_docx(quote.pk)
         
         # 파일 응답
         response = FileResponse(
             open(output_path, 'rb'),
             as_attachment=True,
-            filename=f"견적서_{quote.quote_no}.docx"
+            filename=filename
         )
-        response['Content-Type'] = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+        response['Content-Type'] = DOCX_CONTENT_TYPE
         
         return response
         
@@ -148,18 +169,22 @@ def price_list_download(request):
     else:
         year = date.today().year
     
+    if jobs.is_enabled():
+        return jobs.enqueue_response(
+            request, 'voucher.price_list_docx', {'year': year}, label=f"{year}년 단가표"
+        )
+    
     try:
         # DOCX 생성
         output_path = generate_price_list_from_products(year)
         
         # 파일 응답
-        filename = f"{year}년단가표_KDKK.docx"
         response = FileResponse(
             open(output_path, 'rb'),
             as_attachment=True,
-            filename=filename
+            filename=price_list_filename(year)
         )
-        response['Content-Type'] = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+        response['Content-Type'] = DOCX_CONTENT_TYPE
         
         return response
         
@@ -169,6 +194,10 @@ def price_list_download(request):
         return JsonResponse({'error': f"문서 생성 오류: {e}"}, status=500)
 
 
+def price_list_filename(year):
+    return f"{year}년단가표_KDKK.docx"
+
+
 @login_required
 def generate_quote_preview(request, pk):
     """